@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Backup tool for the Personal Agent memory database.
+
+Takes online snapshots of the memory database without stopping the agent, lists
+and prunes existing snapshots, and restores a snapshot into the live database.
+
+Usage:
+    python scripts/backup_memory.py snapshot
+    python scripts/backup_memory.py list
+    python scripts/backup_memory.py prune --keep 5
+    python scripts/backup_memory.py restore data/backups/memory-20250101T000000000000.db
+    python scripts/backup_memory.py schedule --interval 3600
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add the src directory to the Python path so we can import the agent module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_agent.config.settings import Config
+from personal_agent.config.constants import DATABASE
+from personal_agent.memory.backup import MemoryBackupManager
+
+
+def main() -> int:
+    """
+    Main function to run the backup tool.
+    """
+    parser = argparse.ArgumentParser(description="Back up and restore the memory database")
+    parser.add_argument("--db", help="Database path (default: from configuration)")
+    parser.add_argument("--backup-dir", help="Snapshot directory (default: from configuration)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = subparsers.add_parser("snapshot", help="Take a snapshot now")
+    snapshot_parser.add_argument("--label", help="Label appended to the snapshot filename")
+
+    subparsers.add_parser("list", help="List snapshots, newest first")
+
+    prune_parser = subparsers.add_parser("prune", help="Delete old snapshots")
+    prune_parser.add_argument("--keep", type=int, help="Number of snapshots to keep")
+
+    restore_parser = subparsers.add_parser("restore", help="Restore a snapshot into the database")
+    restore_parser.add_argument("snapshot", help="Path to the snapshot to restore")
+
+    schedule_parser = subparsers.add_parser("schedule", help="Take snapshots periodically")
+    schedule_parser.add_argument("--interval", type=int, default=DATABASE.BACKUP_INTERVAL,
+                                 help="Seconds between snapshots")
+
+    args = parser.parse_args()
+
+    config = Config.load()
+    manager = MemoryBackupManager(
+        db_path=args.db or config.memory.database_path,
+        backup_dir=args.backup_dir or config.memory.backup_directory,
+        max_snapshots=config.memory.max_backups
+    )
+
+    if args.command == "snapshot":
+        path = manager.create_snapshot(label=args.label)
+        if not path:
+            print("Snapshot failed.")
+            return 1
+        print(f"Snapshot written to {path}")
+
+    elif args.command == "list":
+        snapshots = manager.list_snapshots()
+        if not snapshots:
+            print("No snapshots found.")
+        for snapshot in snapshots:
+            print(f"{snapshot['created_at'].isoformat()}  {snapshot['size']:>10}  {snapshot['path']}")
+
+    elif args.command == "prune":
+        removed = manager.rotate(keep=args.keep)
+        print(f"Removed {removed} snapshots.")
+
+    elif args.command == "restore":
+        if not manager.restore(args.snapshot):
+            print("Restore failed.")
+            return 1
+        print(f"Restored {manager.db_path} from {args.snapshot}")
+
+    elif args.command == "schedule":
+        manager.start_scheduler(interval=args.interval)
+        print(f"Taking a snapshot every {args.interval}s. Press Ctrl+C to stop.")
+        try:
+            while manager.is_scheduler_running():
+                time.sleep(1)
+        except KeyboardInterrupt:
+            manager.stop_scheduler()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
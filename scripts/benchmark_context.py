@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the Personal Agent context processor.
+
+Times entity and relationship extraction on generated messages of increasing
+length, up to the maximum message length accepted by input validation, and compares
+them with the previous implementations (one uncompiled ``re.finditer`` pass per
+pattern; a keyword scan between every ordered pair of entities).
+
+Usage:
+    python scripts/benchmark_context.py
+    python scripts/benchmark_context.py --repeat 50 --seed 7
+"""
+
+import argparse
+import random
+import re
+import sys
+import os
+import time
+
+# Add the src directory to the Python path so we can import the agent module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_agent.config.constants import VALIDATION
+from personal_agent.context.processor import ContextProcessor, Entity, Relationship
+
+
+PROSE_WORDS = [
+    "the", "meeting", "was", "moved", "and", "we", "talked", "about", "plans",
+    "for", "next", "week", "with", "Alice", "Johnson", "from", "Acme", "Corp"
+]
+ENTITY_WORDS = [
+    "Jan 5, 2024", "12/05/2023", "10:30 AM", "john.doe@example.com",
+    "+1 555-123-4567", "https://example.com/docs", "\"quarterly report\""
+]
+
+
+def generate_message(length: int, entity_ratio: float, rng: random.Random) -> str:
+    """
+    Generate a message of roughly the given length.
+
+    Args:
+        length (int): Message length in characters
+        entity_ratio (float): Share of words that are dates, emails, URLs, ...
+        rng (random.Random): Random generator
+
+    Returns:
+        str: Generated message
+    """
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(ENTITY_WORDS if rng.random() < entity_ratio else PROSE_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:length]
+
+
+def legacy_extract_entities(patterns, text):
+    """Entity extraction as implemented before the extraction engine."""
+    entities = []
+    entity_id_counter = 0
+    for entity_type, pattern in patterns.items():
+        for match in re.finditer(pattern, text):
+            entity_id_counter += 1
+            entities.append(Entity(
+                id=f"entity_{entity_id_counter}",
+                type=entity_type,
+                value=match.group(),
+                confidence=0.8 if entity_type in ["email", "phone", "url"] else 0.6,
+                metadata={"position": match.span()}
+            ))
+    for match in re.finditer(r'"([^"]*)"', text):
+        entity_id_counter += 1
+        entities.append(Entity(
+            id=f"entity_{entity_id_counter}",
+            type="quoted_phrase",
+            value=match.group(1),
+            confidence=0.7,
+            metadata={"position": match.span()}
+        ))
+    return entities
+
+
+def legacy_extract_relationships(entities, text):
+    """Relationship extraction as implemented before the windowed matcher."""
+    relationships = []
+    relationship_keywords = [
+        "works at", "works for", "employed by", "member of",
+        "located in", "based in", "from", "to", "between",
+        "associated with", "connected to", "related to"
+    ]
+    for i, entity1 in enumerate(entities):
+        for j, entity2 in enumerate(entities):
+            if i != j:
+                pos1 = entity1.metadata.get("position", (0, 0))
+                pos2 = entity2.metadata.get("position", (0, 0))
+                if abs(pos1[0] - pos2[0]) < 50:
+                    start = min(pos1[1], pos2[1])
+                    end = max(pos1[0], pos2[0])
+                    between_text = text[start:end].lower()
+                    for keyword in relationship_keywords:
+                        if keyword in between_text:
+                            relationships.append(Relationship(
+                                source_entity_id=entity1.id,
+                                target_entity_id=entity2.id,
+                                relationship_type=keyword,
+                                confidence=0.7,
+                                metadata={"keyword": keyword, "text": between_text}
+                            ))
+                            break
+    return relationships
+
+
+def time_call(function, repeat: int) -> float:
+    """
+    Time a function.
+
+    Args:
+        function: Function without arguments
+        repeat (int): Number of calls
+
+    Returns:
+        float: Mean milliseconds per call
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def benchmark_extraction(repeat: int, rng: random.Random):
+    """Benchmark entity extraction against the legacy implementation."""
+    processor = ContextProcessor()
+    lengths = [200, 1000, 5000, VALIDATION.MESSAGE_CONTENT_MAX_LENGTH]
+
+    print("Entity extraction (ms per message)")
+    print(f"{'length':>8} {'mix':>6} {'legacy':>9} {'engine':>9} {'speedup':>8}")
+    for entity_ratio in (0.0, 0.1):
+        for length in lengths:
+            text = generate_message(length, entity_ratio, rng)
+
+            if processor.extract_entities(text) != legacy_extract_entities(processor.entity_patterns, text):
+                raise SystemExit(f"Extraction mismatch on a {length}-character message")
+
+            legacy = time_call(lambda: legacy_extract_entities(processor.entity_patterns, text), repeat)
+            engine = time_call(lambda: processor.extract_entities(text), repeat)
+            print(f"{length:>8} {entity_ratio:>6.1f} {legacy:>9.3f} {engine:>9.3f} {legacy / engine:>7.2f}x")
+
+
+def benchmark_relationships(repeat: int, rng: random.Random):
+    """Benchmark relationship extraction against the legacy implementation."""
+    processor = ContextProcessor()
+    lengths = [200, 1000, 5000, VALIDATION.MESSAGE_CONTENT_MAX_LENGTH]
+
+    print("Relationship extraction (ms per message)")
+    print(f"{'length':>8} {'entities':>9} {'legacy':>9} {'matcher':>9} {'speedup':>8}")
+    for length in lengths:
+        text = generate_message(length, 0.1, rng)
+        entities = processor.extract_entities(text)
+
+        if processor.extract_relationships(entities, text) != legacy_extract_relationships(entities, text):
+            raise SystemExit(f"Relationship mismatch on a {length}-character message")
+
+        legacy = time_call(lambda: legacy_extract_relationships(entities, text), repeat)
+        matcher = time_call(lambda: processor.extract_relationships(entities, text), repeat)
+        print(f"{length:>8} {len(entities):>9} {legacy:>9.3f} {matcher:>9.3f} {legacy / matcher:>7.2f}x")
+
+
+def main() -> int:
+    """
+    Main function to run the benchmarks.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the context processor")
+    parser.add_argument("--repeat", type=int, default=20, help="Calls per measurement")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for generated messages")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    benchmark_extraction(args.repeat, rng)
+    print()
+    benchmark_relationships(args.repeat, rng)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
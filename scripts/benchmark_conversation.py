@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the Personal Agent conversation analyzers.
+
+Times the per-turn cost of ambiguity detection and dialogue act recognition on
+generated user turns and compares them with the previous implementations (one
+uncompiled ``re.finditer`` or ``re.search`` pass per pattern). Dialogue acts are
+timed with and without the memo, on turns where short replies like "thanks" repeat.
+
+Usage:
+    python scripts/benchmark_conversation.py
+    python scripts/benchmark_conversation.py --turns 2000 --seed 7
+"""
+
+import argparse
+import random
+import re
+import sys
+import os
+import time
+
+# Add the src directory to the Python path so we can import the agent module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_agent.conversation.ambiguity_detector import AmbiguityDetector
+from personal_agent.conversation.dialogue_act import DialogueActRecognizer
+from personal_agent.conversation.state import DialogueAct
+
+
+TURN_WORDS = [
+    "can", "you", "help", "me", "with", "this", "that", "the", "report", "for",
+    "Alice", "about", "meeting", "later", "some", "of", "them", "a", "lot",
+    "schedule", "email", "as", "we", "discussed", "tomorrow", "at", "3pm", "thing"
+]
+SHORT_REPLIES = ["thanks", "ok", "Thanks!", "yes", "no", "got it", "hi", "bye", "sure", "ok thanks"]
+
+
+def generate_turn(rng: random.Random, short_ratio: float = 0.0) -> str:
+    """
+    Generate a user turn of a few words.
+
+    Args:
+        rng (random.Random): Random generator
+        short_ratio (float): Share of turns that are short replies like "thanks"
+
+    Returns:
+        str: Generated turn, sometimes a question
+    """
+    if rng.random() < short_ratio:
+        return rng.choice(SHORT_REPLIES)
+    turn = " ".join(rng.choice(TURN_WORDS) for _ in range(rng.randint(2, 20)))
+    turn = turn[0].upper() + turn[1:]
+    return turn + ("?" if rng.random() < 0.4 else ".")
+
+
+def legacy_detect_ambiguities(detector: AmbiguityDetector, text: str):
+    """Ambiguity detection as implemented before the compiled pattern set."""
+    text_lower = text.lower().strip()
+    ambiguities = []
+    for ambiguity_type, patterns in detector.patterns.items():
+        for pattern in patterns:
+            for match in re.finditer(pattern, text_lower, re.IGNORECASE):
+                ambiguities.append(detector._create_ambiguity_detection(
+                    ambiguity_type, match.span(), text, text_lower
+                ))
+    ambiguities.extend(detector._detect_keyword_ambiguities(text_lower))
+    dialogue_ambiguity = detector._detect_dialogue_act_ambiguity(text)
+    if dialogue_ambiguity:
+        ambiguities.append(dialogue_ambiguity)
+    unique_ambiguities = detector._remove_duplicates(ambiguities)
+    unique_ambiguities.sort(key=lambda x: x.confidence, reverse=True)
+    return unique_ambiguities
+
+
+def legacy_recognize_act(recognizer: DialogueActRecognizer, text: str):
+    """Dialogue act recognition as implemented before the compiled recognizer."""
+    text_lower = text.lower().strip()
+    if not text_lower:
+        return DialogueAct.ERROR, 0.0
+    best_act = DialogueAct.STATEMENT
+    best_score = 0.1
+    for act, patterns in recognizer.patterns.items():
+        score = 0.0
+        for pattern in patterns:
+            if re.search(pattern, text_lower, re.IGNORECASE):
+                score = 0.9 if re.fullmatch(pattern, text_lower, re.IGNORECASE) else 0.7
+                break
+        if score > best_score:
+            best_score = score
+            best_act = act
+    return best_act, best_score
+
+
+def time_turns(function, turns) -> float:
+    """
+    Time a function over a list of turns.
+
+    Args:
+        function: Function taking one turn
+        turns (list): Turns to process
+
+    Returns:
+        float: Mean microseconds per turn
+    """
+    start = time.perf_counter()
+    for turn in turns:
+        function(turn)
+    return (time.perf_counter() - start) / len(turns) * 1e6
+
+
+def benchmark_ambiguity(turns):
+    """Benchmark ambiguity detection against the legacy implementation."""
+    detector = AmbiguityDetector()
+    for turn in turns:
+        if detector.detect_ambiguities(turn) != legacy_detect_ambiguities(detector, turn):
+            raise SystemExit(f"Ambiguity mismatch on {turn!r}")
+
+    legacy = time_turns(lambda turn: legacy_detect_ambiguities(detector, turn), turns)
+    compiled = time_turns(detector.detect_ambiguities, turns)
+    print("Ambiguity detection (us per turn)")
+    print(f"{'legacy':>9} {'compiled':>9} {'speedup':>8}")
+    print(f"{legacy:>9.1f} {compiled:>9.1f} {legacy / compiled:>7.2f}x")
+
+
+def benchmark_dialogue_acts(turns):
+    """Benchmark dialogue act recognition against the legacy implementation."""
+    memoized = DialogueActRecognizer()
+    compiled = DialogueActRecognizer(memo_size=0)
+    for turn in turns:
+        if memoized.recognize_act(turn) != legacy_recognize_act(compiled, turn):
+            raise SystemExit(f"Dialogue act mismatch on {turn!r}")
+
+    legacy = time_turns(lambda turn: legacy_recognize_act(compiled, turn), turns)
+    uncached = time_turns(compiled.recognize_act, turns)
+    cached = time_turns(memoized.recognize_act, turns)
+    print("Dialogue act recognition (us per turn)")
+    print(f"{'legacy':>9} {'compiled':>9} {'memoized':>9} {'speedup':>8}")
+    print(f"{legacy:>9.1f} {uncached:>9.1f} {cached:>9.1f} {legacy / cached:>7.2f}x")
+
+
+def main() -> int:
+    """
+    Main function to run the benchmarks.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the conversation analyzers")
+    parser.add_argument("--turns", type=int, default=5000, help="Generated turns per measurement")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for generated turns")
+    parser.add_argument("--short-ratio", type=float, default=0.3,
+                        help="Share of short replies among the dialogue act turns")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    turns = [generate_turn(rng) for _ in range(args.turns)]
+    benchmark_ambiguity(turns)
+    print()
+    benchmark_dialogue_acts([generate_turn(rng, args.short_ratio) for _ in range(args.turns)])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
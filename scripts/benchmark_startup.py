@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the Personal Agent.
+
+Times, in fresh interpreter processes, importing the agent module and creating the
+first agent, and checks that the slow optional dependencies (openai, bleach, yaml,
+aiosqlite) are not imported until they are needed. Exits with status 1 when the
+median cold start exceeds the budget or a deferred module was imported, so it can
+guard against regressions in CI.
+
+Usage:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --runs 10 --budget-ms 400
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import os
+import tempfile
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Median milliseconds allowed for importing the agent module and creating the first agent
+STARTUP_BUDGET_MS = 500
+
+# Modules that creating an agent must not import
+DEFERRED_MODULES = ("openai", "bleach", "yaml", "aiosqlite")
+
+CHILD_CODE = """
+import json, sys, time
+sys.path.insert(0, {src_dir!r})
+start = time.perf_counter()
+from personal_agent.core.agent import Agent
+imported = time.perf_counter()
+Agent(user_id="benchmark_user")
+created = time.perf_counter()
+Agent(user_id="another_user")
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "first_agent_ms": (created - imported) * 1000,
+    "next_agent_ms": (time.perf_counter() - created) * 1000,
+    "deferred_loaded": [name for name in {deferred!r} if name in sys.modules]
+}}))
+"""
+
+
+def measure_cold_start(workdir: str) -> dict:
+    """
+    Measure one cold start in a fresh interpreter.
+
+    Args:
+        workdir (str): Working directory without configuration files
+
+    Returns:
+        dict: Import and agent creation times in milliseconds, and deferred modules loaded
+    """
+    env = dict(os.environ)
+    env["PA_MEMORY__DATABASE_PATH"] = os.path.join(workdir, "benchmark_memory.db")
+    env.setdefault("PA_LLM__API_KEY", "benchmark-key")
+    code = CHILD_CODE.format(src_dir=SRC_DIR, deferred=DEFERRED_MODULES)
+    result = subprocess.run([sys.executable, "-c", code], cwd=workdir, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    """
+    Main function to run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the agent's cold start")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreter runs")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="Median milliseconds allowed for import plus first agent")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        runs = [measure_cold_start(workdir) for _ in range(args.runs)]
+
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    first_agent_ms = statistics.median(run["first_agent_ms"] for run in runs)
+    next_agent_ms = statistics.median(run["next_agent_ms"] for run in runs)
+    cold_start_ms = statistics.median(run["import_ms"] + run["first_agent_ms"] for run in runs)
+    deferred_loaded = sorted({name for run in runs for name in run["deferred_loaded"]})
+
+    print(f"Cold start (median of {args.runs} runs, ms)")
+    print(f"{'import':>9} {'1st agent':>10} {'next agent':>11} {'total':>9} {'budget':>9}")
+    print(f"{import_ms:>9.1f} {first_agent_ms:>10.2f} {next_agent_ms:>11.2f} "
+          f"{cold_start_ms:>9.1f} {args.budget_ms:>9.1f}")
+
+    failed = False
+    if cold_start_ms > args.budget_ms:
+        print(f"Cold start exceeds the budget by {cold_start_ms - args.budget_ms:.1f} ms")
+        failed = True
+    if deferred_loaded:
+        print(f"Deferred modules imported at startup: {', '.join(deferred_loaded)}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Deduplicate the Personal Agent memory database.
+
+Knowledge saved since content hashing was introduced is deduplicated as it is saved.
+This tool merges the duplicates in a database written before then, and hashes the
+content of the items it keeps so later saves of the same content update them.
+Safe to run repeatedly; take a snapshot with scripts/backup_memory.py first.
+
+Usage:
+    python scripts/deduplicate_memory.py
+    python scripts/deduplicate_memory.py --db data/memory.db
+"""
+
+import argparse
+import sys
+import os
+
+# Add the src directory to the Python path so we can import the agent module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_agent.config.settings import Config
+from personal_agent.memory.storage import SQLiteMemoryStorage
+
+
+def main() -> int:
+    """
+    Main function to run the deduplication tool.
+    """
+    parser = argparse.ArgumentParser(description="Merge duplicate memory items")
+    parser.add_argument("--db", help="Database path (default: from configuration)")
+    args = parser.parse_args()
+
+    config = Config.load()
+    storage = SQLiteMemoryStorage(db_path=args.db or config.memory.database_path)
+
+    removed = storage.deduplicate_memory_items()
+    print(f"Removed {removed} duplicate memory items from {storage.db_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Rebuild the feedback statistics of the Personal Agent memory database.
+
+Feedback statistics are maintained incrementally as feedback is saved. This tool
+recomputes them from the raw feedback, e.g. after feedback rows were edited by hand.
+
+Usage:
+    python scripts/rebuild_feedback_stats.py
+    python scripts/rebuild_feedback_stats.py --db data/memory.db --user default_user
+"""
+
+import argparse
+import sys
+import os
+
+# Add the src directory to the Python path so we can import the agent module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_agent.config.settings import Config
+from personal_agent.memory.storage import SQLiteMemoryStorage
+
+
+def main() -> int:
+    """
+    Main function to run the rebuild tool.
+    """
+    parser = argparse.ArgumentParser(description="Recompute feedback statistics from raw feedback")
+    parser.add_argument("--db", help="Database path (default: from configuration)")
+    parser.add_argument("--user", help="Print the rebuilt statistics of this user")
+    args = parser.parse_args()
+
+    config = Config.load()
+    storage = SQLiteMemoryStorage(db_path=args.db or config.memory.database_path)
+
+    if not storage.rebuild_feedback_stats():
+        print("Rebuild failed.")
+        return 1
+
+    stats = storage.get_feedback_stats(args.user)
+    print(f"Feedback statistics rebuilt for {storage.db_path}")
+    for key, value in stats.items():
+        print(f"  {key}: {value}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
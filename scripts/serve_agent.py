@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Server for the Personal Agent.
+
+Hosts the agents of many users on one asyncio event loop and speaks a JSON-lines
+protocol over a Unix socket or a localhost TCP port (see personal_agent.core.server).
+
+Usage:
+    python scripts/serve_agent.py --unix /tmp/personal_agent.sock
+    python scripts/serve_agent.py --port 8765
+    echo '{"id": "1", "user_id": "alice", "text": "Hello"}' | nc -q 5 127.0.0.1 8765
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+import os
+
+# Add the src directory to the Python path so we can import the agent module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from personal_agent.config.constants import SERVER
+from personal_agent.core.manager import AgentManager
+from personal_agent.core.server import AgentServer
+
+
+async def serve(args: argparse.Namespace):
+    """
+    Run the server until SIGINT or SIGTERM, then close it gracefully.
+    """
+    server = AgentServer(
+        AgentManager(),
+        max_concurrent=args.max_concurrent,
+        max_pending=args.max_pending,
+        max_pending_per_user=args.max_pending_per_user
+    )
+    if args.unix:
+        await server.start_unix(args.unix)
+        print(f"Serving on {args.unix}")
+    else:
+        host, port = await server.start_tcp(args.host, args.port)
+        print(f"Serving on {host}:{port}")
+
+    loop = asyncio.get_running_loop()
+    serving = asyncio.ensure_future(server.serve_forever())
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, serving.cancel)
+    await serving
+
+    print("Shutting down...")
+    await server.close()
+
+
+def main() -> int:
+    """
+    Main function to run the server.
+    """
+    parser = argparse.ArgumentParser(description="Serve the personal agent over a local JSON-lines protocol")
+    parser.add_argument("--unix", help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--host", default=SERVER.DEFAULT_HOST, help="TCP host to bind")
+    parser.add_argument("--port", type=int, default=SERVER.DEFAULT_PORT, help="TCP port to bind")
+    parser.add_argument("--max-concurrent", type=int, default=SERVER.MAX_CONCURRENT_TURNS,
+                        help="Turns processed at once")
+    parser.add_argument("--max-pending", type=int, default=SERVER.MAX_PENDING_TURNS,
+                        help="Turns admitted before requests are rejected as busy")
+    parser.add_argument("--max-pending-per-user", type=int, default=SERVER.MAX_PENDING_PER_USER,
+                        help="Turns one user may have admitted")
+
+    args = parser.parse_args()
+    asyncio.run(serve(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
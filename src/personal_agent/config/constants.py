@@ -77,10 +77,23 @@ class DatabaseSettings:
     # Query timeouts (seconds)
     DEFAULT_QUERY_TIMEOUT: int = 30
     LONG_QUERY_TIMEOUT: int = 300
+    MEMORY_SOURCE_TIMEOUT: float = 2.0  # per memory-context source; slower sources are skipped
     
     # Batch processing
     DEFAULT_BATCH_SIZE: int = 100
     MAX_BATCH_SIZE: int = 1000
+    
+    # Background enrichment (entity/relationship extraction after a turn is saved)
+    ENRICHMENT_QUEUE_SIZE: int = 256
+    ENRICHMENT_WORKERS: int = 1
+    ENRICHMENT_SUBMIT_TIMEOUT: float = 0.05  # seconds to wait for room before enriching inline
+    ENRICHMENT_DRAIN_TIMEOUT: float = 10.0   # seconds pending jobs may take at shutdown
+    
+    # Online backup settings
+    BACKUP_PAGES_PER_STEP: int = 256
+    BACKUP_STEP_SLEEP: float = 0.005  # seconds between steps, lets writers in
+    BACKUP_INTERVAL: int = 3600       # 1 hour in seconds
+    MAX_BACKUP_SNAPSHOTS: int = 24
 
 
 @dataclass(frozen=True)
@@ -98,6 +111,11 @@ class LLMSettings:
     DEFAULT_CONTEXT_WINDOW: int = 4096
     MAX_CONTEXT_WINDOW: int = 32768
     
+    # Prompt budgeting
+    DEFAULT_PROMPT_HISTORY_MESSAGES: int = 10  # Most recent history messages considered
+    TOKENS_PER_MESSAGE: int = 4  # Chat framing overhead per message
+    PROMPT_SAFETY_MARGIN: int = 64  # Tokens held back for estimation error
+    
     # Timeout settings
     DEFAULT_TIMEOUT: int = 30  # seconds
     LONG_TIMEOUT: int = 120    # seconds
@@ -118,6 +136,10 @@ class FeedbackSettings:
     
     # Collection settings
     FEEDBACK_COLLECTION_ENABLED: bool = True
+    
+    # Statistics
+    POSITIVE_RATING_THRESHOLD: int = 4  # Ratings at or above count as positive
+    NEGATIVE_RATING_THRESHOLD: int = 2  # Ratings at or below count as negative
 
 
 @dataclass(frozen=True)
@@ -138,6 +160,14 @@ class ContextSettings:
     MIN_RELATIONSHIP_CONFIDENCE: float = 0.0
     MAX_RELATIONSHIP_CONFIDENCE: float = 1.0
     DEFAULT_RELATIONSHIP_THRESHOLD: float = 0.6
+    
+    # Memory context
+    MAX_RELEVANT_KNOWLEDGE: int = 5  # Knowledge items kept after relevance scoring
+    PINNED_KNOWLEDGE: int = 5  # Newest knowledge items sent ahead of the history in the prefix-stable layout
+    RECENCY_HALF_LIFE: int = 604800  # Recency factor halves every 7 days (seconds)
+    
+    # Batch analysis
+    BATCH_CHUNKS_PER_WORKER: int = 4  # Chunks each worker process receives per batch
 
 
 @dataclass(frozen=True)
@@ -147,13 +177,24 @@ class ConversationSettings:
     # Turn limits
     MAX_TURNS_PER_SESSION: int = 100
     DEFAULT_HISTORY_WINDOW: int = 10
+    HISTORY_SPILL_BATCH: int = 20  # evicted history messages written to storage at a time
     
     # Timeout settings
     SESSION_TIMEOUT: int = 3600  # 1 hour in seconds
     IDLE_TIMEOUT: int = 1800     # 30 minutes in seconds
+    MAX_ACTIVE_SESSIONS: int = 1000  # sessions kept in memory; least recently used ones are saved to disk
     
     # Processing limits
     MAX_PARALLEL_CONVERSATIONS: int = 10
+    DIALOGUE_ACT_MEMO_SIZE: int = 1024  # normalized inputs whose dialogue act scores are kept
+    
+    # Tiered memory settings
+    HOT_TIER_CONVERSATIONS: int = 5   # recent conversation items kept in process
+    HOT_TIER_KNOWLEDGE: int = 10      # knowledge items kept in process
+    HOT_TIER_SUMMARIES: int = 3       # conversation summaries kept in process
+    SUMMARY_AGE_THRESHOLD: int = 86400  # conversations older than 1 day are summarized
+    SUMMARY_INTERVAL: int = 3600      # background summarization every hour
+    SUMMARY_MAX_LENGTH: int = 2000    # characters per summary item
 
 
 @dataclass(frozen=True)
@@ -208,6 +249,32 @@ class CacheSettings:
     LLM_CACHE_SIZE: int = 500
 
 
+@dataclass(frozen=True)
+class TracingSettings:
+    """Per-turn latency tracing settings."""
+    
+    MAX_TRACES: int = 200               # recent turn traces kept
+    MAX_SAMPLES_PER_STAGE: int = 1000   # recent timings per stage used for percentiles
+
+
+@dataclass(frozen=True)
+class ServerSettings:
+    """Agent server (scripts/serve_agent.py) settings."""
+    
+    # Local transport
+    DEFAULT_HOST: str = "127.0.0.1"
+    DEFAULT_PORT: int = 8765
+    
+    # Admission control
+    MAX_CONCURRENT_TURNS: int = 32    # turns processed at once across all users
+    MAX_PENDING_TURNS: int = 256      # turns admitted (running or waiting); more are rejected
+    MAX_PENDING_PER_USER: int = 4     # turns one user may have admitted
+    
+    # Wire protocol
+    MAX_LINE_BYTES: int = 65536       # longest JSON request line
+    STREAM_CHUNK_CHARS: int = 64      # reply characters per chunk event
+
+
 # Global constants instance - use these throughout the application
 VALIDATION = ValidationLimits()
 RETRY = RetrySettings()
@@ -220,6 +287,8 @@ CONVERSATION = ConversationSettings()
 SECURITY = SecuritySettings()
 LOGGING = LoggingSettings()
 CACHE = CacheSettings()
+TRACING = TracingSettings()
+SERVER = ServerSettings()
 
 
 # Utility function to get all constants as a dictionary
@@ -242,6 +311,8 @@ def get_all_constants() -> Dict[str, Any]:
         "security": SECURITY,
         "logging": LOGGING,
         "cache": CACHE,
+        "tracing": TRACING,
+        "server": SERVER,
     }
 
 
@@ -5,10 +5,15 @@ This module contains the configuration classes and loading logic for the persona
 """
 
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Optional, List, Dict
 import os
 import json
-import yaml
+from .constants import LLM
+from ..utils.lazy_import import lazy_import
+from ..utils.resources import get_resource_registry
+
+# yaml is only imported when a YAML configuration file is loaded
+yaml = lazy_import("yaml")
 
 
 @dataclass
@@ -19,6 +24,8 @@ class LLMConfig:
     api_key: Optional[str] = None
     temperature: float = 0.7
     max_tokens: int = 1000
+    context_window: int = LLM.DEFAULT_CONTEXT_WINDOW  # prompt budget is context_window - max_tokens
+    prompt_layout: str = "default"  # "prefix_stable" orders prompts for provider prompt caching
     system_prompt: str = "You are a helpful assistant."
     rate_limit_requests: int = 60  # requests per minute
     rate_limit_period: int = 60  # seconds
@@ -30,6 +37,10 @@ class MemoryConfig:
     backend: str = "sqlite"
     database_path: str = "data/memory.db"
     max_memory_items: int = 1000
+    backup_directory: str = "data/backups"
+    max_backups: int = 24
+    tiered: bool = False  # keep the active session's memory in process (TieredMemoryService)
+    background_enrichment: bool = False  # extract entities/relationships after saving, off the request path
 
 
 @dataclass
@@ -38,6 +49,10 @@ class AgentConfig:
     name: str = "PersonalAgent"
     personality: str = "helpful"
     max_history_length: int = 10
+    request_keywords: Dict[str, List[str]] = field(default_factory=dict)  # request classifier tables by category
+    session_directory: str = "data/sessions"  # idle sessions saved by the agent manager
+    turn_timeout: float = 60.0  # seconds a process_input_async turn may take (0 disables)
+    trace_turns: bool = True  # record per-stage latency of each turn (see core/latency_metrics.py)
 
 
 @dataclass
@@ -79,6 +94,22 @@ class Config:
         
         return config
     
+    @classmethod
+    def load_shared(cls, config_path: Optional[str] = None) -> 'Config':
+        """
+        Get the shared configuration, loading it on first use.
+        
+        Components created without a configuration use this one, so configuration
+        files are parsed once per process rather than once per component.
+        
+        Args:
+            config_path: Optional path to a specific configuration file
+            
+        Returns:
+            Config: Shared configuration object
+        """
+        return get_resource_registry().get("config", config_path, lambda: cls.load(config_path))
+    
     def _load_from_file(self, config_path: Optional[str] = None):
         """
         Load configuration from YAML/JSON files.
@@ -177,6 +208,8 @@ class Config:
             self.llm.max_tokens = int(os.getenv("PA_LLM__MAX_TOKENS"))
         if os.getenv("PA_LLM__SYSTEM_PROMPT"):
             self.llm.system_prompt = os.getenv("PA_LLM__SYSTEM_PROMPT")
+        if os.getenv("PA_LLM__PROMPT_LAYOUT"):
+            self.llm.prompt_layout = os.getenv("PA_LLM__PROMPT_LAYOUT")
         
         # Memory settings
         if os.getenv("PA_MEMORY__DATABASE_PATH"):
@@ -5,10 +5,16 @@ This module provides functionality for context understanding and utilization.
 """
 
 from .processor import ContextProcessor, Entity, Relationship, ContextRelevanceScore
+from .budget import PromptAssembler, AssembledPrompt, DroppedContent, MemoryContext, estimate_tokens
 
 __all__ = [
     "ContextProcessor",
     "Entity",
     "Relationship",
-    "ContextRelevanceScore"
+    "ContextRelevanceScore",
+    "PromptAssembler",
+    "AssembledPrompt",
+    "DroppedContent",
+    "MemoryContext",
+    "estimate_tokens"
 ]
\ No newline at end of file
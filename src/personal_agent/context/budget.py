@@ -0,0 +1,308 @@
+"""
+Prompt Budget for Personal Agent
+
+This module assembles LLM prompts under a token budget. Tokens are estimated locally
+with a fast approximate tokenizer, and memory context lines and history messages are
+kept in order of value until the budget derived from the model's context window and
+the response's max_tokens is used up. Whatever did not fit is reported.
+
+The prefix-stable layout orders the messages from most to least stable across turns,
+so providers that cache prompt prefixes can reuse everything up to the first change.
+Only the pinned knowledge, a set that does not depend on the user input, goes ahead of
+the history; knowledge ranked by relevance to the input changes every turn and follows it.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple
+from ..llm.models import Message
+from ..config.constants import LLM
+
+
+KNOWLEDGE_SECTION_HEADER = "User knowledge:"
+PINNED_KNOWLEDGE_SECTION_HEADER = "Known about the user:"
+CONTEXT_PREAMBLE = "Use the following context to inform your response:\n\n"
+
+# Prompt layouts
+PROMPT_LAYOUT_DEFAULT = "default"  # system prompt, memory context, history, user input
+PROMPT_LAYOUT_PREFIX_STABLE = "prefix_stable"  # most to least stable, for prompt caching
+PROMPT_LAYOUTS = (PROMPT_LAYOUT_DEFAULT, PROMPT_LAYOUT_PREFIX_STABLE)
+
+# Words, numbers and single punctuation marks; roughly what BPE tokenizers split on
+_TOKEN_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text.
+
+    Each word costs one token per five characters (rounded up) and each punctuation
+    mark one token, which tracks BPE tokenizers closely enough for budgeting
+    without loading one.
+
+    Args:
+        text (str): Text to estimate
+
+    Returns:
+        int: Estimated token count
+    """
+    return sum((len(piece) + 4) // 5 for piece in _TOKEN_PIECE_PATTERN.findall(text))
+
+
+def estimate_message_tokens(message: Message) -> int:
+    """
+    Estimate the tokens a chat message takes, including its framing overhead.
+
+    Args:
+        message (Message): Chat message
+
+    Returns:
+        int: Estimated token count
+    """
+    return estimate_tokens(message.content) + LLM.TOKENS_PER_MESSAGE
+
+
+@dataclass
+class DroppedContent:
+    """Prompt content left out because it did not fit the budget."""
+    source: str  # "history" or "memory"
+    content: str
+    tokens: int
+
+
+@dataclass
+class AssembledPrompt:
+    """Messages assembled under a token budget."""
+    messages: List[Message]
+    estimated_tokens: int
+    budget: int
+    dropped: List[DroppedContent] = field(default_factory=list)
+
+    @property
+    def dropped_tokens(self) -> int:
+        """Estimated tokens of the dropped content."""
+        return sum(item.tokens for item in self.dropped)
+
+    @property
+    def over_budget(self) -> bool:
+        """Whether the required messages alone exceed the budget."""
+        return self.estimated_tokens > self.budget
+
+
+class MemoryContext(str):
+    """
+    Memory context text that carries its sections.
+
+    It is the formatted context wherever a string is expected; PromptAssembler
+    budgets its sections directly, so entries whose text contains blank lines or
+    lines ending in ":" are kept whole.
+    """
+
+    sections: List[Tuple[Optional[str], List[str]]]
+
+    def __new__(cls, sections: List[Tuple[Optional[str], List[str]]]):
+        """
+        Create the memory context from its sections.
+
+        Args:
+            sections (List[Tuple[Optional[str], List[str]]]): (header, entries)
+                sections; sections without entries are left out
+
+        Returns:
+            MemoryContext: Sections joined as "header\nentry\n...", separated by blank lines
+        """
+        sections = [(header, list(entries)) for header, entries in sections if entries]
+        text = "\n".join(
+            (f"{header}\n" if header else "") + "".join(f"{entry}\n" for entry in entries)
+            for header, entries in sections
+        )
+        memory_context = super().__new__(cls, text)
+        memory_context.sections = sections
+        return memory_context
+
+
+def _split_memory_context(memory_context: str) -> List[Tuple[Optional[str], List[str]]]:
+    """
+    Split a memory context string into (header, lines) sections.
+
+    Args:
+        memory_context (str): Memory context; a MemoryContext is not parsed, its
+            sections are used as they are
+
+    Returns:
+        List[Tuple[Optional[str], List[str]]]: Sections with their header and item lines
+    """
+    if isinstance(memory_context, MemoryContext):
+        return memory_context.sections
+
+    sections = []
+    for block in memory_context.split("\n\n"):
+        lines = [line for line in block.strip("\n").split("\n") if line.strip()]
+        if not lines:
+            continue
+        header = lines[0] if lines[0].endswith(":") else None
+        sections.append((header, lines[1:] if header else lines))
+    return sections
+
+
+class PromptAssembler:
+    """
+    Assembles prompts that fit the model's context window.
+
+    The system prompt and the user input are always included. The remaining budget
+    goes, in this order, to the latest exchange of the history, the pinned and the
+    ranked user knowledge, older history (newest first) and the other memory
+    context. History is kept contiguous: once a message does not fit, older messages
+    are dropped too.
+
+    The layout only decides the order of the messages. The default layout puts all
+    memory context in one system message before the history. The prefix-stable
+    layout sends the system prompt, then the pinned knowledge, then the history, and
+    only then the per-turn memory context (including the ranked knowledge) and the
+    user input, so consecutive turns share a long common prefix.
+    """
+
+    def __init__(self, context_window: int = LLM.DEFAULT_CONTEXT_WINDOW,
+                 max_tokens: int = LLM.DEFAULT_MAX_TOKENS,
+                 max_history_messages: int = LLM.DEFAULT_PROMPT_HISTORY_MESSAGES,
+                 safety_margin: int = LLM.PROMPT_SAFETY_MARGIN,
+                 layout: str = PROMPT_LAYOUT_DEFAULT):
+        """
+        Initialize the prompt assembler.
+
+        Args:
+            context_window (int): Model context window in tokens
+            max_tokens (int): Tokens reserved for the response
+            max_history_messages (int): Most recent history messages considered
+            safety_margin (int): Tokens held back for estimation error
+            layout (str): Message order, one of PROMPT_LAYOUTS
+        """
+        if layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"Unknown prompt layout: {layout}")
+        self.context_window = context_window
+        self.max_tokens = max_tokens
+        self.max_history_messages = max_history_messages
+        self.safety_margin = safety_margin
+        self.layout = layout
+
+    @property
+    def budget(self) -> int:
+        """Tokens available for the prompt."""
+        return max(self.context_window - self.max_tokens - self.safety_margin, 0)
+
+    def assemble(self, user_input: str, conversation_history: List[Dict[str, str]],
+                 memory_context: str = "", system_prompt: str = None,
+                 context_preamble: str = CONTEXT_PREAMBLE) -> AssembledPrompt:
+        """
+        Assemble the prompt messages under the token budget.
+
+        Args:
+            user_input (str): The current user input
+            conversation_history (List[Dict[str, str]]): Conversation history, oldest first
+            memory_context (str): Retrieved context from memory, ideally a MemoryContext
+            system_prompt (str): Optional system prompt
+            context_preamble (str): Text introducing the memory context
+
+        Returns:
+            AssembledPrompt: Messages, estimated size and dropped content
+        """
+        budget = self.budget
+        system_message = Message(role="system", content=system_prompt) if system_prompt else None
+        user_message = Message(role="user", content=user_input)
+
+        used = estimate_message_tokens(user_message)
+        if system_message:
+            used += estimate_message_tokens(system_message)
+
+        history = conversation_history[-self.max_history_messages:] if self.max_history_messages > 0 else []
+        history_messages = [Message(role=turn["role"], content=turn["content"]) for turn in history]
+        history_costs = [estimate_message_tokens(message) for message in history_messages]
+
+        sections = _split_memory_context(memory_context) if memory_context else []
+        line_costs = [[estimate_tokens(line) + 1 for line in lines] for _, lines in sections]
+        header_costs = [estimate_tokens(header) + 1 if header else 0 for header, _ in sections]
+        context_overhead = estimate_tokens(context_preamble) + LLM.TOKENS_PER_MESSAGE
+
+        kept_history = [False] * len(history_messages)
+        kept_lines = [[False] * len(lines) for _, lines in sections]
+        dropped: List[DroppedContent] = []
+
+        # Candidates in order of value: ("history", index) or ("memory", section, line)
+        newest_first = list(range(len(history_messages) - 1, -1, -1))
+        pinned = [i for i, (header, _) in enumerate(sections) if header == PINNED_KNOWLEDGE_SECTION_HEADER]
+        knowledge = pinned + [i for i, (header, _) in enumerate(sections) if header == KNOWLEDGE_SECTION_HEADER]
+        others = [i for i in range(len(sections)) if i not in knowledge]
+
+        # Memory sections sent in the same context message; each message pays the overhead once
+        prefix_stable = self.layout == PROMPT_LAYOUT_PREFIX_STABLE
+        if prefix_stable:
+            message_groups = [pinned, [i for i in range(len(sections)) if i not in pinned]]
+        else:
+            message_groups = [list(range(len(sections)))]
+        group_of = {section: group for group, members in enumerate(message_groups) for section in members}
+        candidates = (
+            [("history", i) for i in newest_first[:2]] +
+            [("memory", s, j) for s in knowledge for j in range(len(sections[s][1]))] +
+            [("history", i) for i in newest_first[2:]] +
+            [("memory", s, j) for s in others for j in range(len(sections[s][1]))]
+        )
+
+        history_blocked = False
+        blocked_sections = set()
+        for candidate in candidates:
+            if candidate[0] == "history":
+                index = candidate[1]
+                cost = history_costs[index]
+                if not history_blocked and used + cost <= budget:
+                    kept_history[index] = True
+                    used += cost
+                    continue
+                history_blocked = True
+                dropped.append(DroppedContent("history", history_messages[index].content, cost))
+            else:
+                _, section, line = candidate
+                cost = line_costs[section][line]
+                if not any(any(kept_lines[member]) for member in message_groups[group_of[section]]):
+                    cost += context_overhead
+                if not any(kept_lines[section]):
+                    cost += header_costs[section]
+                if section not in blocked_sections and used + cost <= budget:
+                    kept_lines[section][line] = True
+                    used += cost
+                    continue
+                # Knowledge is ranked, so a smaller later item may still fit;
+                # other sections are kept contiguous
+                if section not in knowledge:
+                    blocked_sections.add(section)
+                dropped.append(DroppedContent("memory", sections[section][1][line], line_costs[section][line]))
+
+        context_messages = []
+        for members in message_groups:
+            kept_sections = []
+            for section in members:
+                header, lines = sections[section]
+                section_lines = [line for line, keep in zip(lines, kept_lines[section]) if keep]
+                if section_lines:
+                    body = "".join(f"{line}\n" for line in section_lines)
+                    kept_sections.append(f"{header}\n{body}" if header else body)
+            context_messages.append(
+                Message(role="system", content=context_preamble + "\n".join(kept_sections))
+                if kept_sections else None
+            )
+
+        kept_history_messages = [message for message, keep in zip(history_messages, kept_history) if keep]
+        messages = [system_message] if system_message else []
+        if prefix_stable:
+            stable_context, volatile_context = context_messages
+            if stable_context:
+                messages.append(stable_context)
+            messages.extend(kept_history_messages)
+            if volatile_context:
+                messages.append(volatile_context)
+        else:
+            if context_messages[0]:
+                messages.append(context_messages[0])
+            messages.extend(kept_history_messages)
+        messages.append(user_message)
+
+        return AssembledPrompt(messages=messages, estimated_tokens=used, budget=budget, dropped=dropped)
@@ -0,0 +1,114 @@
+"""
+Entity Extraction Engine for Personal Agent
+
+This module contains the entity extraction engine used by the context processor.
+Entity patterns are compiled once, and each pattern is guarded by a cheap necessary
+condition (an ``@`` for emails, a digit for dates and phones, ...), so a message is
+only scanned by the patterns that can match it.
+"""
+
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+
+QUOTED_PHRASE_TYPE = "quoted_phrase"
+QUOTED_PHRASE_PATTERN = r'"([^"]*)"'
+
+DEFAULT_ENTITY_PATTERNS = {
+    "person": r"\b(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b",
+    "date": r"\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4})\b",
+    "time": r"\b(?:\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM|am|pm)?)\b",
+    "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+    "phone": r"\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b",
+    "url": r"\b(?:https?://|www\.)[^\s]+\b"
+}
+
+# Necessary conditions of the default patterns: text without a match of the
+# prefilter cannot contain a match of the pattern. Keyed by pattern source, so
+# customized patterns are always scanned.
+_PREFILTERS = {
+    DEFAULT_ENTITY_PATTERNS["date"]: r"\d",
+    DEFAULT_ENTITY_PATTERNS["time"]: r"\d:\d",
+    DEFAULT_ENTITY_PATTERNS["email"]: r"@",
+    DEFAULT_ENTITY_PATTERNS["phone"]: r"\d",
+    DEFAULT_ENTITY_PATTERNS["url"]: r"https?://|www\.",
+    QUOTED_PHRASE_PATTERN: r'"'
+}
+
+
+class EntityExtractionEngine:
+    """
+    Finds the matches of several entity patterns.
+
+    Results are identical to running ``re.finditer`` once per pattern: within a type,
+    matches never overlap and the leftmost match wins; across types, overlapping
+    matches are all kept. Matches are returned grouped by type in pattern order, and
+    by position within a type.
+    """
+
+    def __init__(self, patterns: Dict[str, str], quoted_phrases: bool = True):
+        """
+        Compile the entity patterns.
+
+        Args:
+            patterns (Dict[str, str]): Regular expression per entity type
+            quoted_phrases (bool): Also extract text between double quotes as
+                ``quoted_phrase`` entities (value without the quotes)
+        """
+        sources = dict(patterns)
+        if quoted_phrases:
+            sources[QUOTED_PHRASE_TYPE] = QUOTED_PHRASE_PATTERN
+
+        # (type, compiled pattern, compiled prefilter or None, value group)
+        self._scanners = []
+        for entity_type, source in sources.items():
+            prefilter: Optional[Pattern] = re.compile(_PREFILTERS[source]) if source in _PREFILTERS else None
+            group = 1 if entity_type == QUOTED_PHRASE_TYPE else 0
+            self._scanners.append((entity_type, re.compile(source), prefilter, group))
+
+    @property
+    def types(self) -> List[str]:
+        """Entity types in output order."""
+        return [entity_type for entity_type, _, _, _ in self._scanners]
+
+    def find(self, text: str) -> List[Tuple[str, str, Tuple[int, int]]]:
+        """
+        Find the entity matches in a text.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            List[Tuple[str, str, Tuple[int, int]]]: (type, value, span) per match, grouped
+                by type (pattern order), by position within a type
+        """
+        matches = []
+        for entity_type, pattern, prefilter, group in self._scanners:
+            if prefilter is not None and prefilter.search(text) is None:
+                continue
+            matches.extend((entity_type, match.group(group), match.span())
+                           for match in pattern.finditer(text))
+        return matches
+
+
+_engine_cache: Dict[tuple, EntityExtractionEngine] = {}
+
+
+def get_extraction_engine(patterns: Dict[str, str],
+                          quoted_phrases: bool = True) -> EntityExtractionEngine:
+    """
+    Get the compiled engine for a set of patterns, compiling it on first use.
+
+    Args:
+        patterns (Dict[str, str]): Regular expression per entity type
+        quoted_phrases (bool): Whether quoted phrases are extracted
+
+    Returns:
+        EntityExtractionEngine: Compiled engine shared by all callers with the same patterns
+    """
+    key = (tuple(patterns.items()), quoted_phrases)
+    engine = _engine_cache.get(key)
+    if engine is None:
+        engine = EntityExtractionEngine(patterns, quoted_phrases)
+        _engine_cache[key] = engine
+    return engine
@@ -8,7 +8,12 @@ from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from ..memory.models import MemoryItem
 from ..llm.models import Message
-import re
+from .budget import PromptAssembler, AssembledPrompt
+from .extraction import get_extraction_engine, DEFAULT_ENTITY_PATTERNS, QUOTED_PHRASE_TYPE
+from .relationships import RelationshipMatcher
+from .scoring import RelevanceScorer
+from ..utils.parallel import process_map, effective_workers
+from ..utils.resources import get_resource_registry
 
 
 @dataclass
@@ -44,14 +49,9 @@ class ContextProcessor:
     
     def __init__(self):
         """Initialize the context processor."""
-        self.entity_patterns = {
-            "person": r"\b(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b",
-            "date": r"\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4})\b",
-            "time": r"\b(?:\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM|am|pm)?)\b",
-            "email": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
-            "phone": r"\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b",
-            "url": r"\b(?:https?://|www\.)[^\s]+\b"
-        }
+        self.entity_patterns = dict(DEFAULT_ENTITY_PATTERNS)
+        self.prompt_assembler = PromptAssembler()
+        self.relevance_scorer = RelevanceScorer()
     
     def create_context_aware_prompt(self, user_input: str, conversation_history: List[Dict[str, str]], 
                                   memory_context: str) -> List[Message]:
@@ -66,25 +66,31 @@ class ContextProcessor:
         Returns:
             List[Message]: Context-aware messages for the LLM
         """
-        messages = []
-        
-        # Add system message with context-aware instructions
-        system_prompt = self._generate_context_aware_system_prompt()
-        messages.append(Message(role="system", content=system_prompt))
-        
-        # Add context information
-        if memory_context:
-            context_message = f"Use the following context to inform your response:\n\n{memory_context}"
-            messages.append(Message(role="system", content=context_message))
-        
-        # Add conversation history
-        for turn in conversation_history[-6:]:  # Last 3 turns (6 messages)
-            messages.append(Message(role=turn["role"], content=turn["content"]))
-        
-        # Add current user input
-        messages.append(Message(role="user", content=user_input))
+        return self.assemble_context_aware_prompt(user_input, conversation_history, memory_context).messages
+    
+    def assemble_context_aware_prompt(self, user_input: str, conversation_history: List[Dict[str, str]],
+                                      memory_context: str,
+                                      assembler: PromptAssembler = None) -> AssembledPrompt:
+        """
+        Create a context-aware prompt for the LLM that fits the token budget.
         
-        return messages
+        Args:
+            user_input (str): The current user input
+            conversation_history (List[Dict[str, str]]): Recent conversation history
+            memory_context (str): Retrieved context from memory
+            assembler (PromptAssembler): Budgeted assembler (default: prompt_assembler)
+            
+        Returns:
+            AssembledPrompt: Context-aware messages with their estimated size and
+                the history and memory content that did not fit
+        """
+        assembler = assembler or self.prompt_assembler
+        return assembler.assemble(
+            user_input=user_input,
+            conversation_history=conversation_history,
+            memory_context=memory_context,
+            system_prompt=self._generate_context_aware_system_prompt()
+        )
     
     def _generate_context_aware_system_prompt(self) -> str:
         """Generate a context-aware system prompt."""
@@ -111,32 +117,21 @@ Remember to be helpful, accurate, and concise in your responses."""
         Returns:
             List[Entity]: List of extracted entities
         """
-        entities = []
-        entity_id_counter = 0
-        
-        for entity_type, pattern in self.entity_patterns.items():
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                entity_id_counter += 1
-                entities.append(Entity(
-                    id=f"entity_{entity_id_counter}",
-                    type=entity_type,
-                    value=match.group(),
-                    confidence=0.8 if entity_type in ["email", "phone", "url"] else 0.6,
-                    metadata={"position": match.span()}
-                ))
+        # Patterns are compiled once and skipped when the text cannot match them
+        engine = get_extraction_engine(self.entity_patterns)
         
-        # Additional entity extraction for specific patterns
-        # Extract quoted phrases as potential entities
-        quoted_matches = re.finditer(r'"([^"]*)"', text)
-        for match in quoted_matches:
-            entity_id_counter += 1
+        entities = []
+        for entity_id_counter, (entity_type, value, span) in enumerate(engine.find(text), start=1):
+            if entity_type == QUOTED_PHRASE_TYPE:
+                confidence = 0.7
+            else:
+                confidence = 0.8 if entity_type in ["email", "phone", "url"] else 0.6
             entities.append(Entity(
                 id=f"entity_{entity_id_counter}",
-                type="quoted_phrase",
-                value=match.group(1),
-                confidence=0.7,
-                metadata={"position": match.span()}
+                type=entity_type,
+                value=value,
+                confidence=confidence,
+                metadata={"position": span}
             ))
         
         return entities
@@ -153,43 +148,59 @@ Remember to be helpful, accurate, and concise in your responses."""
             List[Relationship]: List of extracted relationships
         """
         relationships = []
-        relationship_id_counter = 0
         
-        # Simple relationship extraction based on proximity and keywords
-        relationship_keywords = [
-            "works at", "works for", "employed by", "member of", 
-            "located in", "based in", "from", "to", "between",
-            "associated with", "connected to", "related to"
-        ]
+        # Only entities within the proximity window are paired, and keyword
+        # occurrences are located once for the whole text
+        matcher = RelationshipMatcher(text)
+        spans = [entity.metadata.get("position", (0, 0)) for entity in entities]
         
-        for i, entity1 in enumerate(entities):
-            for j, entity2 in enumerate(entities):
-                if i != j:
-                    # Check if entities are close to each other in text
-                    pos1 = entity1.metadata.get("position", (0, 0))
-                    pos2 = entity2.metadata.get("position", (0, 0))
-                    
-                    # If entities are within 50 characters of each other
-                    if abs(pos1[0] - pos2[0]) < 50:
-                        # Check for relationship keywords between entities
-                        start = min(pos1[1], pos2[1])
-                        end = max(pos1[0], pos2[0])
-                        between_text = text[start:end].lower()
-                        
-                        for keyword in relationship_keywords:
-                            if keyword in between_text:
-                                relationship_id_counter += 1
-                                relationships.append(Relationship(
-                                    source_entity_id=entity1.id,
-                                    target_entity_id=entity2.id,
-                                    relationship_type=keyword,
-                                    confidence=0.7,
-                                    metadata={"keyword": keyword, "text": between_text}
-                                ))
-                                break
+        for i, j, keyword, start, end in matcher.match(spans):
+            relationships.append(Relationship(
+                source_entity_id=entities[i].id,
+                target_entity_id=entities[j].id,
+                relationship_type=keyword,
+                confidence=0.7,
+                metadata={"keyword": keyword, "text": text[start:end].lower()}
+            ))
         
         return relationships
     
+    def extract(self, text: str) -> Tuple[List[Entity], List[Relationship]]:
+        """
+        Extract the entities of a text and the relationships between them.
+        
+        Args:
+            text (str): Text to analyze
+            
+        Returns:
+            Tuple[List[Entity], List[Relationship]]: Extracted entities and relationships
+        """
+        entities = self.extract_entities(text)
+        return entities, self.extract_relationships(entities, text)
+    
+    def extract_batch(self, texts: List[str], workers: Optional[int] = None,
+                      chunksize: Optional[int] = None) -> List[Tuple[List[Entity], List[Relationship]]]:
+        """
+        Extract entities and relationships from many texts, e.g. to re-index memory.
+        
+        Texts are processed in chunks by a pool of worker processes using this
+        processor's entity patterns; a single worker processes the batch in-process.
+        
+        Args:
+            texts (List[str]): Texts to analyze
+            workers (Optional[int]): Worker processes (default: number of CPUs)
+            chunksize (Optional[int]): Texts sent to a worker at a time
+            
+        Returns:
+            List[Tuple[List[Entity], List[Relationship]]]: Entities and relationships
+                per text, in text order
+        """
+        if effective_workers(len(texts), workers) <= 1:
+            return [self.extract(text) for text in texts]
+        
+        return process_map(_extract_in_worker, texts, workers=workers, chunksize=chunksize,
+                           initializer=_init_extraction_worker, initargs=(self.entity_patterns,))
+    
     def score_context_relevance(self, user_input: str, context_items: List[MemoryItem]) -> List[Tuple[MemoryItem, ContextRelevanceScore]]:
         """
         Score the relevance of context items to the user input.
@@ -203,14 +214,12 @@ Remember to be helpful, accurate, and concise in your responses."""
         """
         scored_items = []
         
-        # Extract keywords from user input
-        user_keywords = set(re.findall(r'\b\w+\b', user_input.lower()))
-        
-        for item in context_items:
-            score, reasoning, factors = self._calculate_relevance_score(user_input, user_keywords, item)
+        # Item keywords are cached per item version; the whole batch shares one
+        # tokenization of the user input
+        for item, (score, factors) in zip(context_items, self.relevance_scorer.score_batch(user_input, context_items)):
             relevance_score = ContextRelevanceScore(
                 score=score,
-                reasoning=reasoning,
+                reasoning=self._format_relevance_reasoning(factors),
                 factors=factors
             )
             scored_items.append((item, relevance_score))
@@ -220,58 +229,14 @@ Remember to be helpful, accurate, and concise in your responses."""
         
         return scored_items
     
-    def _calculate_relevance_score(self, user_input: str, user_keywords: set, context_item: MemoryItem) -> Tuple[float, str, Dict[str, float]]:
-        """
-        Calculate the relevance score for a context item.
-        
-        Args:
-            user_input (str): The current user input
-            user_keywords (set): Keywords extracted from user input
-            context_item (MemoryItem): The context item to score
-            
-        Returns:
-            Tuple[float, str, Dict[str, float]]: Score, reasoning, and factors
-        """
-        factors = {}
-        
-        # Convert context item content to string for comparison
-        context_content = str(context_item.content).lower()
-        context_keywords = set(re.findall(r'\b\w+\b', context_content))
-        
-        # Keyword overlap factor (0.0 to 1.0)
-        if user_keywords and context_keywords:
-            overlap = len(user_keywords.intersection(context_keywords))
-            keyword_factor = overlap / len(user_keywords)
-        else:
-            keyword_factor = 0.0
-        factors["keyword_overlap"] = keyword_factor
-        
-        # Type relevance factor
-        type_relevance = {
-            "conversation": 0.7,
-            "knowledge": 0.9,
-            "task": 0.6,
-            "skill": 0.5
-        }
-        type_factor = type_relevance.get(context_item.type, 0.5)
-        factors["type_relevance"] = type_factor
-        
-        # Recency factor (newer items are more relevant)
-        # This would require timestamp information which we'll assume is available
-        recency_factor = 1.0  # Simplified for now
-        factors["recency"] = recency_factor
-        
-        # Calculate weighted score
-        score = (
-            0.5 * keyword_factor +
-            0.3 * type_factor +
-            0.2 * recency_factor
+    @staticmethod
+    def _format_relevance_reasoning(factors: Dict[str, float]) -> str:
+        """Describe the factors of a relevance score."""
+        return (
+            f"Keyword overlap: {factors['keyword_overlap']:.2f}, "
+            f"Type relevance: {factors['type_relevance']:.2f}, "
+            f"Recency: {factors['recency']:.2f}"
         )
-        
-        # Generate reasoning
-        reasoning = f"Keyword overlap: {keyword_factor:.2f}, Type relevance: {type_factor:.2f}, Recency: {recency_factor:.2f}"
-        
-        return score, reasoning, factors
     
     def enhance_memory_with_context(self, memory_item: MemoryItem, entities: List[Entity], 
                                   relationships: List[Relationship]) -> MemoryItem:
@@ -310,4 +275,30 @@ Remember to be helpful, accurate, and concise in your responses."""
             for rel in relationships
         ]
         
-        return memory_item
\ No newline at end of file
+        return memory_item
+
+
+def get_shared_context_processor() -> ContextProcessor:
+    """
+    Get the context processor shared by all agents and services.
+    
+    Returns:
+        ContextProcessor: Shared context processor, with one warm relevance cache
+    """
+    return get_resource_registry().get("context_processor", None, ContextProcessor)
+
+
+# Processor of a batch extraction worker process
+_worker_processor: Optional[ContextProcessor] = None
+
+
+def _init_extraction_worker(entity_patterns: Dict[str, str]):
+    """Create the worker process's context processor."""
+    global _worker_processor
+    _worker_processor = ContextProcessor()
+    _worker_processor.entity_patterns = dict(entity_patterns)
+
+
+def _extract_in_worker(text: str) -> Tuple[List[Entity], List[Relationship]]:
+    """Extract entities and relationships in a worker process."""
+    return _worker_processor.extract(text)
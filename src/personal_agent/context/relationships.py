@@ -0,0 +1,135 @@
+"""
+Relationship Extraction for Personal Agent
+
+This module contains the windowed relationship extractor used by the context
+processor. Entities are sorted by position once, so each entity is only paired with
+the entities that start within the proximity window, and every relationship keyword
+occurrence is located once per text, so checking a pair is a binary search per
+keyword instead of slicing and scanning the text between the two entities.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Tuple, Optional
+
+
+# Checked in this order; the first keyword found between two entities wins
+RELATIONSHIP_KEYWORDS = [
+    "works at", "works for", "employed by", "member of",
+    "located in", "based in", "from", "to", "between",
+    "associated with", "connected to", "related to"
+]
+
+# Entities relate only if their start positions are less than this many characters apart
+PROXIMITY_WINDOW = 50
+
+
+def find_keyword_occurrences(text: str, keywords: List[str]) -> Dict[str, List[int]]:
+    """
+    Find the start positions of every (possibly overlapping) keyword occurrence.
+
+    Args:
+        text (str): Text to search
+        keywords (List[str]): Keywords to find
+
+    Returns:
+        Dict[str, List[int]]: Sorted start positions per keyword that occurs in the text
+    """
+    occurrences = {}
+    for keyword in keywords:
+        positions = []
+        position = text.find(keyword)
+        while position != -1:
+            positions.append(position)
+            position = text.find(keyword, position + 1)
+        if positions:
+            occurrences[keyword] = positions
+    return occurrences
+
+
+class RelationshipMatcher:
+    """
+    Finds the related entity pairs of one text.
+
+    Pairs, their order and their keywords are identical to comparing every ordered
+    pair of entities and scanning the lowercased text between them for the keywords.
+    """
+
+    def __init__(self, text: str, keywords: List[str] = None, window: int = PROXIMITY_WINDOW):
+        """
+        Index the keyword occurrences of a text.
+
+        Args:
+            text (str): Text the entities were extracted from
+            keywords (List[str]): Relationship keywords in priority order
+            window (int): Maximum distance between related entity start positions
+        """
+        self.text = text
+        self.keywords = keywords if keywords is not None else RELATIONSHIP_KEYWORDS
+        self.window = window
+
+        lowered = text.lower()
+        # Lowercasing can change the length of some non-ASCII text; positions in
+        # the lowered text then no longer line up and pairs are checked by slicing.
+        self._aligned = len(lowered) == len(text)
+        occurrences = find_keyword_occurrences(lowered, self.keywords) if self._aligned else {}
+        self._occurrences: List[Tuple[str, int, List[int]]] = [
+            (keyword, len(keyword), occurrences[keyword])
+            for keyword in self.keywords if keyword in occurrences
+        ]
+
+    def keyword_between(self, start: int, end: int) -> Optional[str]:
+        """
+        Get the first keyword (in priority order) inside ``text[start:end]``.
+
+        Args:
+            start (int): Start of the span
+            end (int): End of the span
+
+        Returns:
+            Optional[str]: The keyword, or None if no keyword occurs in the span
+        """
+        if not self._aligned:
+            between = self.text[start:end].lower()
+            for keyword in self.keywords:
+                if keyword in between:
+                    return keyword
+            return None
+
+        if start >= end:
+            return None
+        for keyword, length, positions in self._occurrences:
+            # The first occurrence starting in the span ends earliest
+            index = bisect_left(positions, start)
+            if index < len(positions) and positions[index] + length <= end:
+                return keyword
+        return None
+
+    def match(self, spans: List[Tuple[int, int]]) -> List[Tuple[int, int, str, int, int]]:
+        """
+        Find the related pairs among entity spans.
+
+        Args:
+            spans (List[Tuple[int, int]]): (start, end) of each entity
+
+        Returns:
+            List[Tuple[int, int, str, int, int]]: (source index, target index, keyword,
+                span start, span end) per related ordered pair, in the order of the
+                pairwise comparison
+        """
+        order = sorted(range(len(spans)), key=lambda index: spans[index][0])
+        starts = [spans[index][0] for index in order]
+
+        pairs = []
+        for i, (start1, end1) in enumerate(spans):
+            low = bisect_right(starts, start1 - self.window)
+            high = bisect_left(starts, start1 + self.window)
+            for j in sorted(order[low:high]):
+                if i == j:
+                    continue
+                start2, end2 = spans[j]
+                start = min(end1, end2)
+                end = max(start1, start2)
+                keyword = self.keyword_between(start, end)
+                if keyword is not None:
+                    pairs.append((i, j, keyword, start, end))
+        return pairs
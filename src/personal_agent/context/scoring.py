@@ -0,0 +1,150 @@
+"""
+Relevance Scoring for Personal Agent
+
+This module contains the relevance scorer used by the context processor. Each memory
+item's keyword set is computed once and cached by ``(id, updated_at)``, so scoring a
+batch of candidates against a user input only tokenizes the input and intersects it
+with the cached sets. The recency factor decays exponentially with the time since an
+item was last updated.
+"""
+
+import re
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import List, Dict, Tuple, FrozenSet
+from ..memory.models import MemoryItem
+from ..config.constants import CACHE, CONTEXT
+
+
+_KEYWORD_PATTERN = re.compile(r'\b\w+\b')
+
+# Type relevance factor per memory item type
+TYPE_RELEVANCE = {
+    "conversation": 0.7,
+    "knowledge": 0.9,
+    "task": 0.6,
+    "skill": 0.5
+}
+DEFAULT_TYPE_RELEVANCE = 0.5
+
+# Weights of the keyword overlap, type relevance and recency factors
+KEYWORD_WEIGHT = 0.5
+TYPE_WEIGHT = 0.3
+RECENCY_WEIGHT = 0.2
+
+
+def extract_keywords(text: str) -> FrozenSet[str]:
+    """
+    Get the set of lowercased words in a text.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        FrozenSet[str]: Distinct keywords
+    """
+    return frozenset(_KEYWORD_PATTERN.findall(text.lower()))
+
+
+class RelevanceScorer:
+    """
+    Scores memory items against a user input, caching each item's keywords.
+    """
+
+    def __init__(self, max_cached_items: int = CACHE.DEFAULT_CACHE_SIZE,
+                 recency_half_life: float = CONTEXT.RECENCY_HALF_LIFE):
+        """
+        Initialize the relevance scorer.
+
+        Args:
+            max_cached_items (int): Memory items whose keyword sets are cached
+            recency_half_life (float): Seconds after which the recency factor halves
+        """
+        self.max_cached_items = max_cached_items
+        self.recency_half_life = recency_half_life
+        self._keywords: "OrderedDict[Tuple[str, datetime], FrozenSet[str]]" = OrderedDict()
+        self._lock = Lock()
+
+    def item_keywords(self, item: MemoryItem) -> FrozenSet[str]:
+        """
+        Get the keywords of a memory item, tokenizing it only once per version.
+
+        Args:
+            item (MemoryItem): Memory item
+
+        Returns:
+            FrozenSet[str]: Keywords of the item's content
+        """
+        key = (item.id, item.updated_at)
+        with self._lock:
+            keywords = self._keywords.get(key)
+            if keywords is not None:
+                self._keywords.move_to_end(key)
+                return keywords
+
+        keywords = extract_keywords(str(item.content))
+
+        if self.max_cached_items > 0:
+            with self._lock:
+                self._keywords[key] = keywords
+                while len(self._keywords) > self.max_cached_items:
+                    self._keywords.popitem(last=False)
+        return keywords
+
+    def recency_factor(self, item: MemoryItem, now: datetime = None) -> float:
+        """
+        Get the recency factor of a memory item.
+
+        Args:
+            item (MemoryItem): Memory item
+            now (datetime): Reference time (default: now)
+
+        Returns:
+            float: 1.0 for an item updated now, halving every recency_half_life seconds
+        """
+        if item.updated_at is None or self.recency_half_life <= 0:
+            return 1.0
+        if now is None or (now.tzinfo is None) != (item.updated_at.tzinfo is None):
+            now = datetime.now(item.updated_at.tzinfo)
+        age = max((now - item.updated_at).total_seconds(), 0.0)
+        return 0.5 ** (age / self.recency_half_life)
+
+    def score_batch(self, user_input: str, items: List[MemoryItem],
+                    now: datetime = None) -> List[Tuple[float, Dict[str, float]]]:
+        """
+        Score a batch of memory items against a user input.
+
+        Args:
+            user_input (str): The current user input
+            items (List[MemoryItem]): Memory items to score
+            now (datetime): Reference time for recency (default: now)
+
+        Returns:
+            List[Tuple[float, Dict[str, float]]]: Score and factors per item, in item order
+        """
+        user_keywords = extract_keywords(user_input)
+        user_keyword_count = len(user_keywords)
+        now = now or datetime.now()
+
+        results = []
+        for item in items:
+            item_keywords = self.item_keywords(item)
+            if user_keyword_count and item_keywords:
+                keyword_factor = len(user_keywords & item_keywords) / user_keyword_count
+            else:
+                keyword_factor = 0.0
+            type_factor = TYPE_RELEVANCE.get(item.type, DEFAULT_TYPE_RELEVANCE)
+            recency = self.recency_factor(item, now)
+
+            score = (
+                KEYWORD_WEIGHT * keyword_factor +
+                TYPE_WEIGHT * type_factor +
+                RECENCY_WEIGHT * recency
+            )
+            results.append((score, {
+                "keyword_overlap": keyword_factor,
+                "type_relevance": type_factor,
+                "recency": recency
+            }))
+        return results
@@ -23,6 +23,17 @@ from .response_generator import (
     response_generator
 )
 
+from .history import (
+    ConversationHistory,
+    HistoryView
+)
+
+from .analysis import (
+    TextAnalysis,
+    analyze_text,
+    analyze_batch
+)
+
 from .interface import (
     EnhancedConversationInterface,
     create_enhanced_interface
@@ -36,6 +47,11 @@ __all__ = [
     "StateTransition",
     "DialogueActRecognizer",
     "dialogue_act_recognizer",
+    "ConversationHistory",
+    "HistoryView",
+    "TextAnalysis",
+    "analyze_text",
+    "analyze_batch",
     "ResponseGenerator",
     "response_generator",
     "EnhancedConversationInterface",
@@ -9,6 +9,7 @@ from enum import Enum
 import re
 from dataclasses import dataclass
 from .state import DialogueAct
+from .pattern_set import get_pattern_set
 
 
 class AmbiguityType(Enum):
@@ -22,6 +23,39 @@ class AmbiguityType(Enum):
     CONTEXT_AMBIGUITY = "context_ambiguity"  # Missing context for proper understanding
 
 
+# Base confidence of a pattern match per ambiguity type
+_BASE_CONFIDENCE = {
+    AmbiguityType.ENTITY_AMBIGUITY: 0.7,
+    AmbiguityType.SCOPE_AMBIGUITY: 0.6,
+    AmbiguityType.INTENT_AMBIGUITY: 0.8,
+    AmbiguityType.TEMPORAL_AMBIGUITY: 0.6,
+    AmbiguityType.QUANTIFIER_AMBIGUITY: 0.5,
+    AmbiguityType.REFERENCE_AMBIGUITY: 0.7,
+    AmbiguityType.CONTEXT_AMBIGUITY: 0.6
+}
+
+# Description of a pattern match per ambiguity type, formatted with the matched text
+_DESCRIPTION_TEMPLATES = {
+    AmbiguityType.ENTITY_AMBIGUITY: "Unclear reference to '{}'",
+    AmbiguityType.SCOPE_AMBIGUITY: "Unclear scope with '{}'",
+    AmbiguityType.INTENT_AMBIGUITY: "Unclear intent with '{}'",
+    AmbiguityType.TEMPORAL_AMBIGUITY: "Unclear timing with '{}'",
+    AmbiguityType.QUANTIFIER_AMBIGUITY: "Unclear quantity with '{}'",
+    AmbiguityType.REFERENCE_AMBIGUITY: "Unclear reference to '{}'",
+    AmbiguityType.CONTEXT_AMBIGUITY: "Missing context with '{}'"
+}
+
+_CLARIFICATIONS = {
+    AmbiguityType.ENTITY_AMBIGUITY: "Could you be more specific about what you're referring to?",
+    AmbiguityType.SCOPE_AMBIGUITY: "Could you clarify what you mean by that?",
+    AmbiguityType.INTENT_AMBIGUITY: "What exactly would you like me to help you with?",
+    AmbiguityType.TEMPORAL_AMBIGUITY: "When are you referring to?",
+    AmbiguityType.QUANTIFIER_AMBIGUITY: "How much or how many are you referring to?",
+    AmbiguityType.REFERENCE_AMBIGUITY: "What specifically are you referring to?",
+    AmbiguityType.CONTEXT_AMBIGUITY: "Could you provide more context for your request?"
+}
+
+
 @dataclass
 class AmbiguityDetection:
     """Represents a detected ambiguity in user input."""
@@ -100,18 +134,29 @@ class AmbiguityDetector:
         text_lower = text.lower().strip()
         ambiguities = []
         
-        # Check for pattern-based ambiguities
-        for ambiguity_type, patterns in self.patterns.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, text_lower, re.IGNORECASE)
-                for match in matches:
-                    ambiguity = self._create_ambiguity_detection(
-                        ambiguity_type, 
-                        match, 
-                        text, 
-                        text_lower
-                    )
-                    ambiguities.append(ambiguity)
+        # Check for pattern-based ambiguities; all patterns are scanned together and
+        # the matches come back per pattern, in pattern order
+        pattern_types = [
+            (ambiguity_type, pattern)
+            for ambiguity_type, patterns in self.patterns.items()
+            for pattern in patterns
+        ]
+        pattern_set = get_pattern_set(tuple(pattern for _, pattern in pattern_types), re.IGNORECASE)
+        seen = set()
+        for (ambiguity_type, _), spans in zip(pattern_types, pattern_set.finditer_spans(text_lower)):
+            for span in spans:
+                # Several patterns of a type often match the same interval; only the first counts
+                key = (span, ambiguity_type)
+                if key in seen:
+                    continue
+                seen.add(key)
+                ambiguity = self._create_ambiguity_detection(
+                    ambiguity_type, 
+                    span, 
+                    text, 
+                    text_lower
+                )
+                ambiguities.append(ambiguity)
         
         # Check for keyword-based ambiguities
         keyword_ambiguities = self._detect_keyword_ambiguities(text_lower)
@@ -129,20 +174,20 @@ class AmbiguityDetector:
         return unique_ambiguities
     
     def _create_ambiguity_detection(self, ambiguity_type: AmbiguityType, 
-                                  match, text: str, text_lower: str) -> AmbiguityDetection:
+                                  span: Tuple[int, int], text: str, text_lower: str) -> AmbiguityDetection:
         """
         Create an AmbiguityDetection object based on a pattern match.
         
         Args:
             ambiguity_type (AmbiguityType): Type of ambiguity detected
-            match: Regex match object
+            span (Tuple[int, int]): Start and end of the match in text_lower
             text (str): Original text
             text_lower (str): Lowercase version of text
             
         Returns:
             AmbiguityDetection: Created ambiguity detection object
         """
-        start, end = match.span()
+        start, end = span
         matched_text = text[start:end]
         
         # Calculate confidence based on match characteristics
@@ -175,15 +220,7 @@ class AmbiguityDetector:
             float: Confidence score between 0.0 and 1.0
         """
         # Base confidence based on ambiguity type
-        base_confidence = {
-            AmbiguityType.ENTITY_AMBIGUITY: 0.7,
-            AmbiguityType.SCOPE_AMBIGUITY: 0.6,
-            AmbiguityType.INTENT_AMBIGUITY: 0.8,
-            AmbiguityType.TEMPORAL_AMBIGUITY: 0.6,
-            AmbiguityType.QUANTIFIER_AMBIGUITY: 0.5,
-            AmbiguityType.REFERENCE_AMBIGUITY: 0.7,
-            AmbiguityType.CONTEXT_AMBIGUITY: 0.6
-        }.get(ambiguity_type, 0.5)
+        base_confidence = _BASE_CONFIDENCE.get(ambiguity_type, 0.5)
         
         # Adjust based on context
         adjustment = 0.0
@@ -211,28 +248,9 @@ class AmbiguityDetector:
         Returns:
             Tuple[str, str]: Description and suggested clarification
         """
-        descriptions = {
-            AmbiguityType.ENTITY_AMBIGUITY: f"Unclear reference to '{matched_text}'",
-            AmbiguityType.SCOPE_AMBIGUITY: f"Unclear scope with '{matched_text}'",
-            AmbiguityType.INTENT_AMBIGUITY: f"Unclear intent with '{matched_text}'",
-            AmbiguityType.TEMPORAL_AMBIGUITY: f"Unclear timing with '{matched_text}'",
-            AmbiguityType.QUANTIFIER_AMBIGUITY: f"Unclear quantity with '{matched_text}'",
-            AmbiguityType.REFERENCE_AMBIGUITY: f"Unclear reference to '{matched_text}'",
-            AmbiguityType.CONTEXT_AMBIGUITY: f"Missing context with '{matched_text}'"
-        }
-        
-        clarifications = {
-            AmbiguityType.ENTITY_AMBIGUITY: "Could you be more specific about what you're referring to?",
-            AmbiguityType.SCOPE_AMBIGUITY: "Could you clarify what you mean by that?",
-            AmbiguityType.INTENT_AMBIGUITY: "What exactly would you like me to help you with?",
-            AmbiguityType.TEMPORAL_AMBIGUITY: "When are you referring to?",
-            AmbiguityType.QUANTIFIER_AMBIGUITY: "How much or how many are you referring to?",
-            AmbiguityType.REFERENCE_AMBIGUITY: "What specifically are you referring to?",
-            AmbiguityType.CONTEXT_AMBIGUITY: "Could you provide more context for your request?"
-        }
-        
-        description = descriptions.get(ambiguity_type, f"Ambiguity detected with '{matched_text}'")
-        clarification = clarifications.get(ambiguity_type, "Could you clarify what you mean?")
+        template = _DESCRIPTION_TEMPLATES.get(ambiguity_type, "Ambiguity detected with '{}'")
+        description = template.format(matched_text)
+        clarification = _CLARIFICATIONS.get(ambiguity_type, "Could you clarify what you mean?")
         
         return description, clarification
     
@@ -250,8 +268,8 @@ class AmbiguityDetector:
         
         # Check for vague terms
         for term in self.ambiguity_indicators["vague_terms"]:
-            if term in text_lower:
-                start = text_lower.find(term)
+            start = text_lower.find(term)
+            if start != -1:
                 end = start + len(term)
                 ambiguities.append(AmbiguityDetection(
                     type=AmbiguityType.ENTITY_AMBIGUITY,
@@ -0,0 +1,91 @@
+"""
+Batch Text Analysis for Personal Agent
+
+This module runs the conversation analyzers (dialogue act recognition and ambiguity
+detection) over a text in one call, and over large batches of texts in a pool of
+worker processes, e.g. to reprocess historical memory.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from .state import DialogueAct
+from .dialogue_act import DialogueActRecognizer, dialogue_act_recognizer
+from .ambiguity_detector import AmbiguityDetector, AmbiguityDetection, ambiguity_detector
+from ..utils.parallel import process_map, effective_workers
+
+
+@dataclass
+class TextAnalysis:
+    """Results of the conversation analyzers for one text."""
+    dialogue_act: DialogueAct
+    dialogue_act_confidence: float
+    ambiguities: List[AmbiguityDetection]
+
+
+def analyze_text(text: str, recognizer: DialogueActRecognizer = None,
+                 detector: AmbiguityDetector = None) -> TextAnalysis:
+    """
+    Analyze a text with the conversation analyzers.
+
+    Args:
+        text (str): Text to analyze
+        recognizer (DialogueActRecognizer): Dialogue act recognizer (default: shared instance)
+        detector (AmbiguityDetector): Ambiguity detector (default: shared instance)
+
+    Returns:
+        TextAnalysis: Dialogue act and ambiguities of the text
+    """
+    recognizer = recognizer or dialogue_act_recognizer
+    detector = detector or ambiguity_detector
+
+    act, confidence = recognizer.recognize_act(text)
+    return TextAnalysis(
+        dialogue_act=act,
+        dialogue_act_confidence=confidence,
+        ambiguities=detector.detect_ambiguities(text)
+    )
+
+
+def analyze_batch(texts: List[str], workers: Optional[int] = None, chunksize: Optional[int] = None,
+                  recognizer: DialogueActRecognizer = None,
+                  detector: AmbiguityDetector = None) -> List[TextAnalysis]:
+    """
+    Analyze many texts with the conversation analyzers.
+
+    Texts are processed in chunks by a pool of worker processes, each with a copy of
+    the analyzers; a single worker processes the batch in-process.
+
+    Args:
+        texts (List[str]): Texts to analyze
+        workers (Optional[int]): Worker processes (default: number of CPUs)
+        chunksize (Optional[int]): Texts sent to a worker at a time
+        recognizer (DialogueActRecognizer): Dialogue act recognizer (default: shared instance)
+        detector (AmbiguityDetector): Ambiguity detector (default: shared instance)
+
+    Returns:
+        List[TextAnalysis]: Analysis per text, in text order
+    """
+    recognizer = recognizer or dialogue_act_recognizer
+    detector = detector or ambiguity_detector
+
+    if effective_workers(len(texts), workers) <= 1:
+        return [analyze_text(text, recognizer, detector) for text in texts]
+
+    return process_map(_analyze_in_worker, texts, workers=workers, chunksize=chunksize,
+                       initializer=_init_analysis_worker, initargs=(recognizer, detector))
+
+
+# Analyzers of a batch analysis worker process
+_worker_analyzers: Optional[Tuple[DialogueActRecognizer, AmbiguityDetector]] = None
+
+
+def _init_analysis_worker(recognizer: DialogueActRecognizer, detector: AmbiguityDetector):
+    """Install the worker process's analyzers."""
+    global _worker_analyzers
+    _worker_analyzers = (recognizer, detector)
+
+
+def _analyze_in_worker(text: str) -> TextAnalysis:
+    """Analyze a text in a worker process."""
+    recognizer, detector = _worker_analyzers
+    return analyze_text(text, recognizer, detector)
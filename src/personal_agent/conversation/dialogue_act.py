@@ -6,15 +6,23 @@ This module provides functionality for recognizing dialogue acts to enable more
 
 from typing import List, Dict, Tuple
 import re
+from collections import OrderedDict
 from enum import Enum
+from threading import Lock
 from .state import DialogueAct
+from ..config.constants import CONVERSATION
 
 
 class DialogueActRecognizer:
     """Recognizes dialogue acts from user input."""
     
-    def __init__(self):
-        """Initialize the dialogue act recognizer."""
+    def __init__(self, memo_size: int = CONVERSATION.DIALOGUE_ACT_MEMO_SIZE):
+        """
+        Initialize the dialogue act recognizer.
+        
+        Args:
+            memo_size (int): Normalized inputs whose scores are memoized (0 disables)
+        """
         # Define patterns for different dialogue acts
         self.patterns = {
             DialogueAct.GREETING: [
@@ -49,6 +57,27 @@ class DialogueActRecognizer:
                 r'\b(thanks|thank you|appreciate it)\b'
             ]
         }
+        
+        # Compiled patterns per act, recompiled when self.patterns is changed
+        self._compiled: List[Tuple[DialogueAct, List[re.Pattern]]] = []
+        self._compiled_from = None
+        
+        # Scores of recent normalized inputs; short inputs like "thanks" repeat a lot
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[str, Tuple[Tuple[DialogueAct, float], ...]]" = OrderedDict()
+        self._lock = Lock()
+    
+    def __getstate__(self):
+        """Get the state to pickle, e.g. for batch analysis worker processes."""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_memo"] = OrderedDict()
+        return state
+    
+    def __setstate__(self, state):
+        """Restore a pickled recognizer."""
+        self.__dict__.update(state)
+        self._lock = Lock()
     
     def recognize_act(self, text: str) -> Tuple[DialogueAct, float]:
         """
@@ -70,32 +99,78 @@ class DialogueActRecognizer:
         best_act = DialogueAct.STATEMENT
         best_score = 0.1  # Default low confidence for statement
         
-        for act, patterns in self.patterns.items():
-            score = self._calculate_pattern_score(text_lower, patterns)
+        for act, score in self._score_acts(text_lower):
             if score > best_score:
                 best_score = score
                 best_act = act
         
         return best_act, best_score
     
-    def _calculate_pattern_score(self, text: str, patterns: List[str]) -> float:
+    def _score_acts(self, text_lower: str) -> Tuple[Tuple[DialogueAct, float], ...]:
+        """
+        Score every dialogue act against normalized text, memoizing the result.
+        
+        Args:
+            text_lower (str): Lowercase, stripped user input
+            
+        Returns:
+            Tuple[Tuple[DialogueAct, float], ...]: Score per act, in pattern order
+        """
+        compiled = self._get_compiled_patterns()
+        
+        with self._lock:
+            scores = self._memo.get(text_lower)
+            if scores is not None:
+                self._memo.move_to_end(text_lower)
+                return scores
+        
+        scores = tuple(
+            (act, self._calculate_pattern_score(text_lower, patterns))
+            for act, patterns in compiled
+        )
+        
+        if self.memo_size > 0:
+            with self._lock:
+                self._memo[text_lower] = scores
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        return scores
+    
+    def _get_compiled_patterns(self) -> List[Tuple[DialogueAct, List[re.Pattern]]]:
+        """
+        Get the compiled patterns, compiling them again if self.patterns was changed.
+        
+        Returns:
+            List[Tuple[DialogueAct, List[re.Pattern]]]: Compiled patterns per act
+        """
+        if tuple(self.patterns.items()) != self._compiled_from:
+            source = tuple((act, list(patterns)) for act, patterns in self.patterns.items())
+            compiled = [
+                (act, [re.compile(pattern, re.IGNORECASE) for pattern in patterns])
+                for act, patterns in source
+            ]
+            with self._lock:
+                self._compiled = compiled
+                self._compiled_from = source
+                self._memo.clear()
+        return self._compiled
+    
+    @staticmethod
+    def _calculate_pattern_score(text: str, patterns: List[re.Pattern]) -> float:
         """
         Calculate confidence score based on pattern matching.
         
         Args:
             text (str): Text to match against
-            patterns (List[str]): List of regex patterns
+            patterns (List[re.Pattern]): Compiled patterns of an act
             
         Returns:
-            float: Confidence score between 0.0 and 1.0
+            float: 0.9 if the first pattern found in the text matches all of it,
+                0.7 if it matches part of it, 0.0 if no pattern is found
         """
         for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                # Return higher confidence for exact matches, lower for partial
-                if re.fullmatch(pattern, text, re.IGNORECASE):
-                    return 0.9
-                else:
-                    return 0.7
+            if pattern.search(text):
+                return 0.9 if pattern.fullmatch(text) else 0.7
         
         return 0.0
     
@@ -116,10 +191,7 @@ class DialogueActRecognizer:
             return [(DialogueAct.ERROR, 0.0)]
         
         # Calculate scores for all acts
-        scores = []
-        for act, patterns in self.patterns.items():
-            score = self._calculate_pattern_score(text_lower, patterns)
-            scores.append((act, score))
+        scores = list(self._score_acts(text_lower))
         
         # Sort by score and return top N
         scores.sort(key=lambda x: x[1], reverse=True)
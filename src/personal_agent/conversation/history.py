@@ -0,0 +1,163 @@
+"""
+Conversation History for Personal Agent
+
+This module contains the bounded in-process history of a conversation. Messages are
+kept in a ring buffer; the oldest ones are evicted once it is full and optionally
+handed to a spill callback (e.g. to save them to storage) in batches. Recent messages
+are returned as read-only views instead of copies, and messages can be looked up by
+ID in constant time.
+"""
+
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+from ..config.constants import CONVERSATION
+
+
+class HistoryView(Sequence):
+    """
+    Read-only view of a range of a conversation history.
+
+    The range is fixed when the view is created: messages added later are not part
+    of it, and reading a message that has since been evicted raises IndexError.
+    Slicing a view returns a list.
+    """
+
+    def __init__(self, history: "ConversationHistory", start: int, stop: int):
+        """
+        Initialize the view.
+
+        Args:
+            history (ConversationHistory): Viewed history
+            start (int): Absolute index of the first message
+            stop (int): Absolute index after the last message
+        """
+        self._history = history
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history view index out of range")
+        return self._history._get_absolute(self._start + index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (HistoryView, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"HistoryView({list(self)!r})"
+
+
+class ConversationHistory:
+    """
+    Bounded ring buffer of conversation messages with an index by message ID.
+    """
+
+    def __init__(self, max_messages: int = 2 * CONVERSATION.MAX_TURNS_PER_SESSION,
+                 spill: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+                 spill_batch: int = CONVERSATION.HISTORY_SPILL_BATCH):
+        """
+        Initialize the conversation history.
+
+        Args:
+            max_messages (int): Messages kept in process
+            spill (Optional[Callable[[List[Dict[str, Any]]], Any]]): Called with evicted
+                messages, oldest first; evicted messages are dropped if None
+            spill_batch (int): Evicted messages collected before spill is called
+        """
+        self.max_messages = max(1, max_messages)
+        self.spill = spill
+        self.spill_batch = max(1, spill_batch)
+        self._messages: "deque[Dict[str, Any]]" = deque()
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._evicted: List[Dict[str, Any]] = []
+        self._offset = 0  # absolute index of the oldest kept message
+
+    def append(self, message: Dict[str, Any]):
+        """
+        Add a message, evicting the oldest one when the history is full.
+
+        Args:
+            message (Dict[str, Any]): Message with role, content and optionally id
+        """
+        self._messages.append(message)
+        message_id = message.get("id")
+        if message_id is not None:
+            self._by_id[message_id] = message
+
+        while len(self._messages) > self.max_messages:
+            evicted = self._messages.popleft()
+            self._offset += 1
+            evicted_id = evicted.get("id")
+            if evicted_id is not None and self._by_id.get(evicted_id) is evicted:
+                del self._by_id[evicted_id]
+            if self.spill is not None:
+                self._evicted.append(evicted)
+                if len(self._evicted) >= self.spill_batch:
+                    self.flush()
+
+    def flush(self):
+        """Hand the evicted messages that are still pending to the spill callback."""
+        if self._evicted and self.spill is not None:
+            evicted, self._evicted = self._evicted, []
+            self.spill(evicted)
+
+    def recent(self, limit: int) -> HistoryView:
+        """
+        Get a view of the most recent messages.
+
+        Args:
+            limit (int): Maximum number of messages
+
+        Returns:
+            HistoryView: Read-only view of up to limit messages, oldest first
+        """
+        stop = self._offset + len(self._messages)
+        return HistoryView(self, max(self._offset, stop - max(0, limit)), stop)
+
+    def get(self, message_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a kept message by ID.
+
+        Args:
+            message_id (str): Message ID
+
+        Returns:
+            Optional[Dict[str, Any]]: The message, or None if unknown or evicted
+        """
+        return self._by_id.get(message_id)
+
+    def clear(self):
+        """Remove all messages, spilling those already evicted."""
+        self.flush()
+        self._offset += len(self._messages)
+        self._messages.clear()
+        self._by_id.clear()
+
+    def _get_absolute(self, index: int) -> Dict[str, Any]:
+        """Get a message by absolute index; IndexError if it was evicted."""
+        position = index - self._offset
+        if not 0 <= position < len(self._messages):
+            raise IndexError("history message was evicted")
+        return self._messages[position]
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        return self.recent(len(self._messages))[index]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.recent(len(self._messages)))
@@ -10,6 +10,7 @@ from .dialogue_act import DialogueActRecognizer, dialogue_act_recognizer
 from .response_generator import ResponseGenerator, response_generator
 from .ambiguity_detector import AmbiguityDetector, ambiguity_detector
 from .question_generator import QuestionGenerator, question_generator
+from .history import ConversationHistory
 from ..llm.models import Message
 import re
 import random
@@ -30,7 +31,7 @@ class EnhancedConversationInterface:
         self.response_generator = response_generator
         self.ambiguity_detector = ambiguity_detector
         self.question_generator = question_generator
-        self.conversation_history: List[Dict[str, str]] = []
+        self.conversation_history = ConversationHistory()
         self.ambiguity_threshold = 0.6  # Minimum confidence to consider an ambiguity
     
     def process_input(self, user_input: str, llm_response: str = None) -> str:
@@ -207,10 +208,37 @@ class EnhancedConversationInterface:
         
         return state_descriptions.get(context.state, "Unknown state")
     
+    def to_dict(self, history_limit: int = 10) -> Dict[str, Any]:
+        """
+        Convert the interface's conversation to a dictionary.
+        
+        Args:
+            history_limit (int): Most recent history messages to include
+            
+        Returns:
+            Dict[str, Any]: Conversation state and recent history
+        """
+        return {
+            "state": self.state_manager.to_dict(),
+            "history": list(self.conversation_history.recent(history_limit))
+        }
+    
+    def restore_from_dict(self, data: Dict[str, Any]) -> None:
+        """
+        Restore a conversation saved with to_dict.
+        
+        Args:
+            data (Dict[str, Any]): Dictionary representation
+        """
+        self.state_manager = ConversationStateManager.from_dict(data["state"])
+        self.conversation_history.clear()
+        for message in data.get("history", []):
+            self.conversation_history.append(message)
+    
     def reset_conversation(self) -> None:
         """Reset the conversation to initial state."""
         self.state_manager.reset_conversation()
-        self.conversation_history = []
+        self.conversation_history.clear()
     
     def get_conversation_summary(self) -> str:
         """
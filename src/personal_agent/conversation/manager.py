@@ -5,8 +5,10 @@ This module contains the ConversationManager class that handles conversation sta
 history management, and related operations.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 from .state import ConversationState
+from .history import ConversationHistory
+from ..config.constants import CONVERSATION
 from ..utils.common import generate_id
 from ..memory.models import MemoryItem
 from ..memory.storage import MemoryStorage
@@ -17,17 +19,28 @@ class ConversationManager:
     Manages conversation state, history, and related operations.
     """
     
-    def __init__(self, user_id: str = "default_user", memory_storage: MemoryStorage = None):
+    def __init__(self, user_id: str = "default_user", memory_storage: MemoryStorage = None,
+                 history_window: int = CONVERSATION.DEFAULT_HISTORY_WINDOW,
+                 max_history_messages: int = 2 * CONVERSATION.MAX_TURNS_PER_SESSION,
+                 spill_evicted: bool = True):
         """
         Initialize the conversation manager.
         
         Args:
             user_id (str): ID of the user interacting with the agent
             memory_storage (MemoryStorage): Memory storage instance
+            history_window (int): Messages returned by get_recent_history by default
+            max_history_messages (int): Messages kept in process; older ones are evicted
+            spill_evicted (bool): Save evicted messages to memory storage
         """
         self.user_id = user_id
         self.memory_storage = memory_storage
-        self.conversation_history = []
+        self.history_window = history_window
+        spill = self._spill_messages if memory_storage is not None and spill_evicted else None
+        self.conversation_history = ConversationHistory(
+            max_messages=max(max_history_messages, history_window),
+            spill=spill
+        )
         self.conversation_id = generate_id()
         self.state = ConversationState.IN_PROGRESS
         self.clarification_context = {}
@@ -70,17 +83,55 @@ class ConversationManager:
         self.conversation_history.append(message)
         return message
     
-    def get_recent_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_recent_history(self, limit: int = None) -> Sequence[Dict[str, Any]]:
         """
         Get recent conversation history.
         
         Args:
-            limit (int): Maximum number of messages to retrieve
+            limit (int): Maximum number of messages to retrieve (default: history_window)
+            
+        Returns:
+            Sequence[Dict[str, Any]]: Read-only view of the recent conversation history
+        """
+        return self.conversation_history.recent(self.history_window if limit is None else limit)
+    
+    def find_conversation_id(self, message_id: str) -> Optional[str]:
+        """
+        Find the conversation ID of a message in the kept history.
+        
+        Args:
+            message_id (str): ID of the message to find
             
         Returns:
-            List[Dict[str, Any]]: Recent conversation history
+            Optional[str]: Conversation ID if the message is known, None otherwise
         """
-        return self.conversation_history[-limit:] if self.conversation_history else []
+        message = self.conversation_history.get(message_id)
+        if message is None:
+            return None
+        return message.get("conversation_id", self.conversation_id)
+    
+    def _spill_messages(self, messages: List[Dict[str, Any]]) -> bool:
+        """
+        Save messages evicted from the in-process history to memory storage.
+        
+        Args:
+            messages (List[Dict[str, Any]]): Evicted messages, oldest first
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        memory_item = MemoryItem(
+            type="conversation",
+            content={
+                "conversation_id": self.conversation_id,
+                "user_id": self.user_id,
+                "turns": [
+                    {"role": message["role"], "content": message["content"]}
+                    for message in messages
+                ]
+            }
+        )
+        return self.memory_storage.save(memory_item)
     
     def save_conversation_turn(self, user_input: str, agent_response: str) -> bool:
         """
@@ -175,4 +226,32 @@ class ConversationManager:
         """
         Clear the clarification context.
         """
-        self.clarification_context.clear()
\ No newline at end of file
+        self.clarification_context.clear()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the conversation to a dictionary, e.g. to persist an idle session.
+        
+        Returns:
+            Dict[str, Any]: Conversation ID, state, clarification context and recent history
+        """
+        return {
+            "conversation_id": self.conversation_id,
+            "state": self.state.value,
+            "clarification_context": dict(self.clarification_context),
+            "history": list(self.get_recent_history())
+        }
+    
+    def restore_from_dict(self, data: Dict[str, Any]) -> None:
+        """
+        Restore a conversation saved with to_dict.
+        
+        Args:
+            data (Dict[str, Any]): Dictionary representation
+        """
+        self.conversation_id = data["conversation_id"]
+        self.state = ConversationState(data["state"])
+        self.clarification_context = dict(data.get("clarification_context", {}))
+        self.conversation_history.clear()
+        for message in data.get("history", []):
+            self.conversation_history.append(message)
\ No newline at end of file
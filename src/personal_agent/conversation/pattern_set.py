@@ -0,0 +1,173 @@
+"""
+Compiled Pattern Sets for Personal Agent
+
+This module scans a text for a whole list of regular expressions at once. Most of the
+conversation analyzers' patterns are word lists such as ``\\b(this|that|these)\\b``;
+those are merged into one phrase index keyed by first word, so a single tokenization
+of the text finds the matches of all of them. The remaining patterns are compiled once
+and run as usual. Results are identical to ``re.finditer`` per pattern.
+"""
+
+import re
+from typing import Dict, List, Pattern, Tuple
+
+
+# \bword\b or \b(phrase|phrase ...)\b where phrases are words separated by single spaces
+_PHRASE = r"\w+(?: \w+)*"
+_WORD_LIST_PATTERN = re.compile(rf"\\b(?:\((?P<group>{_PHRASE}(?:\|{_PHRASE})*)\)|(?P<word>\w+))\\b")
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def parse_word_list(pattern: str) -> List[str]:
+    """
+    Get the alternatives of a word-list pattern.
+
+    Args:
+        pattern (str): Regular expression
+
+    Returns:
+        List[str]: Phrases in alternation order, or an empty list if the pattern is
+            not a plain ``\\b(...|...)\\b`` word list
+    """
+    match = _WORD_LIST_PATTERN.fullmatch(pattern)
+    if match is None:
+        return []
+    if match.group("word") is not None:
+        return [match.group("word")]
+    return match.group("group").split("|")
+
+
+class PatternSet:
+    """
+    A list of regular expressions scanned together.
+
+    Word-list patterns are matched through a phrase index on ASCII text; other
+    patterns, and all patterns on non-ASCII text (where case folding and word
+    boundaries follow Unicode rules), use the compiled regular expressions.
+    """
+
+    def __init__(self, patterns: List[str], flags: int = 0):
+        """
+        Compile the patterns.
+
+        Args:
+            patterns (List[str]): Regular expressions
+            flags (int): ``re`` flags applied to every pattern
+        """
+        self.patterns = list(patterns)
+        self.flags = flags
+        self._compiled: List[Pattern] = [re.compile(pattern, flags) for pattern in self.patterns]
+        self._ignore_case = bool(flags & re.IGNORECASE)
+
+        # First word -> (pattern index, alternative rank, words) of every phrase
+        self._phrases: Dict[str, List[Tuple[int, int, Tuple[str, ...]]]] = {}
+        self._regex_indexes: List[int] = []
+        for index, pattern in enumerate(self.patterns):
+            alternatives = parse_word_list(pattern)
+            if not alternatives or not all(phrase.isascii() for phrase in alternatives):
+                self._regex_indexes.append(index)
+                continue
+            for rank, phrase in enumerate(alternatives):
+                words = tuple(word.lower() if self._ignore_case else word for word in phrase.split(" "))
+                self._phrases.setdefault(words[0], []).append((index, rank, words))
+
+    def finditer_spans(self, text: str) -> List[List[Tuple[int, int]]]:
+        """
+        Find the matches of every pattern.
+
+        Args:
+            text (str): Text to scan
+
+        Returns:
+            List[List[Tuple[int, int]]]: Spans of the non-overlapping matches of each
+                pattern, in pattern order, as ``re.finditer`` would return them
+        """
+        if not text.isascii():
+            return [[match.span() for match in compiled.finditer(text)] for compiled in self._compiled]
+
+        spans: List[List[Tuple[int, int]]] = [[] for _ in self.patterns]
+        for index in self._regex_indexes:
+            spans[index] = [match.span() for match in self._compiled[index].finditer(text)]
+
+        if self._phrases:
+            self._find_phrases(text, spans)
+        return spans
+
+    def _find_phrases(self, text: str, spans: List[List[Tuple[int, int]]]):
+        """
+        Add the matches of the word-list patterns to spans.
+
+        Args:
+            text (str): ASCII text to scan
+            spans (List[List[Tuple[int, int]]]): Spans per pattern, filled in place
+        """
+        scanned = text.lower() if self._ignore_case else text
+        tokens = [(match.group(), match.start(), match.end()) for match in _WORD_PATTERN.finditer(scanned)]
+        last_end: Dict[int, int] = {}
+
+        for position, (word, start, _) in enumerate(tokens):
+            candidates = self._phrases.get(word)
+            if candidates is None:
+                continue
+
+            # Per pattern, the first alternative matching here wins, like regex alternation
+            chosen: Dict[int, Tuple[int, int]] = {}
+            for index, rank, words in candidates:
+                if start < last_end.get(index, 0):
+                    continue
+                end = self._phrase_end(scanned, tokens, position, words)
+                if end is not None and (index not in chosen or rank < chosen[index][0]):
+                    chosen[index] = (rank, end)
+
+            for index, (_, end) in chosen.items():
+                spans[index].append((start, end))
+                last_end[index] = end
+
+    @staticmethod
+    def _phrase_end(text: str, tokens: List[Tuple[str, int, int]], position: int,
+                    words: Tuple[str, ...]) -> int:
+        """
+        Get the end of a phrase starting at a token.
+
+        Args:
+            text (str): Scanned text
+            tokens (List[Tuple[str, int, int]]): (word, start, end) of the text's words
+            position (int): Index of the first token
+            words (Tuple[str, ...]): Words of the phrase
+
+        Returns:
+            int: End offset of the phrase, or None if it does not occur at the token
+        """
+        if position + len(words) > len(tokens):
+            return None
+        end = tokens[position][2]
+        for offset in range(1, len(words)):
+            word, start, next_end = tokens[position + offset]
+            # Phrase words are separated by exactly one space
+            if word != words[offset] or start != end + 1 or text[end] != " ":
+                return None
+            end = next_end
+        return end
+
+
+_pattern_set_cache: Dict[Tuple[Tuple[str, ...], int], PatternSet] = {}
+
+
+def get_pattern_set(patterns: Tuple[str, ...], flags: int = 0) -> PatternSet:
+    """
+    Get the compiled pattern set for a list of patterns, compiling it on first use.
+
+    Args:
+        patterns (Tuple[str, ...]): Regular expressions
+        flags (int): ``re`` flags applied to every pattern
+
+    Returns:
+        PatternSet: Compiled pattern set shared by all callers with the same patterns
+    """
+    key = (tuple(patterns), flags)
+    pattern_set = _pattern_set_cache.get(key)
+    if pattern_set is None:
+        pattern_set = PatternSet(list(patterns), flags)
+        _pattern_set_cache[key] = pattern_set
+    return pattern_set
+
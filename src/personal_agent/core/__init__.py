@@ -10,5 +10,6 @@ from .reasoning import ReasoningEngine, DecisionContext, DecisionOption, Reasoni
 from .decision_trees import DecisionTreeManager, DecisionTree, DecisionNode, ScenarioType
 from .error_recovery import ErrorRecoveryManager, error_recovery_manager
 from .error_metrics import ErrorMetricsCollector, error_metrics_collector
+from .latency_metrics import LatencyMetricsCollector, latency_metrics_collector
 
-__all__ = ["Agent", "Task", "TaskStatus", "PlanningEngine", "ReasoningEngine", "DecisionContext", "DecisionOption", "ReasoningType", "DecisionTreeManager", "DecisionTree", "DecisionNode", "ScenarioType", "ErrorRecoveryManager", "error_recovery_manager", "ErrorMetricsCollector", "error_metrics_collector"]
\ No newline at end of file
+__all__ = ["Agent", "Task", "TaskStatus", "PlanningEngine", "ReasoningEngine", "DecisionContext", "DecisionOption", "ReasoningType", "DecisionTreeManager", "DecisionTree", "DecisionNode", "ScenarioType", "ErrorRecoveryManager", "error_recovery_manager", "ErrorMetricsCollector", "error_metrics_collector", "LatencyMetricsCollector", "latency_metrics_collector"]
\ No newline at end of file
@@ -4,6 +4,8 @@ Agent Module for Personal Agent
 This module contains the core Agent class that orchestrates the personal agent's functionality.
 """
 
+import asyncio
+from functools import cached_property
 from typing import List
 from ..memory.storage import SQLiteMemoryStorage, MemoryStorage
 from ..memory.models import MemoryItem
@@ -15,18 +17,21 @@ from .error_recovery import error_recovery_manager
 from .feedback import FeedbackSystem
 from ..utils.validation import validate_message_content, ValidationError
 from ..utils.logging import get_logger, log_exception
-from ..utils.common import generate_id, find_conversation_id
+from ..utils.common import generate_id
+from ..utils.resources import get_resource_registry
 from .planning import PlanningEngine, Task
 from .reasoning import ReasoningEngine, DecisionContext, DecisionOption, ReasoningType
 from .decision_trees import DecisionTreeManager, ScenarioType
-from ..context.processor import ContextProcessor
+from ..context.processor import get_shared_context_processor
 from ..conversation.interface import EnhancedConversationInterface
 from ..conversation.dialogue_act import dialogue_act_recognizer
 from ..conversation.state import ConversationState
 from .error_metrics import error_metrics_collector
+from .latency_metrics import latency_metrics_collector, TurnTrace, NULL_TRACE
 from ..conversation.manager import ConversationManager
 from ..core.error_handler import ErrorHandler
 from ..memory.service import MemoryService
+from ..memory.tiered import TieredMemoryService
 from ..llm.service import LLMService
 from ..core.response_processor import ResponseProcessor
 from ..core.request_classifier import RequestClassifier
@@ -44,7 +49,7 @@ class Agent:
         
         Args:
             user_id (str): ID of the user interacting with the agent
-            config (Config): Configuration object. If None, will load default config.
+            config (Config): Configuration object. If None, uses the shared configuration.
             memory_storage (MemoryStorage): Memory storage instance. If None, will create default.
             llm_client (LLMClient): LLM client instance. If None, will create default.
             feedback_system (FeedbackSystem): Feedback system instance. If None, will create default.
@@ -54,41 +59,94 @@ class Agent:
         self.user_id = user_id
         
         # Initialize configuration
-        self.config = config or Config.load()
+        self.config = config or Config.load_shared()
         
         # Initialize core services
-        self.conversation_manager = ConversationManager(user_id=user_id, memory_storage=memory_storage)
+        # Turns are saved by the memory service as they happen, so evicted history is not spilled again
+        self.conversation_manager = ConversationManager(
+            user_id=user_id,
+            memory_storage=memory_storage,
+            history_window=self.config.agent.max_history_length,
+            spill_evicted=False
+        )
         self.error_handler = ErrorHandler()
-        self.memory_service = MemoryService(config=self.config, memory_storage=memory_storage)
+        memory_service_class = TieredMemoryService if self.config.memory.tiered else MemoryService
+        self.memory_service = memory_service_class(config=self.config, memory_storage=memory_storage)
+        if self.config.memory.tiered:
+            # Aged conversations are rolled up into summaries until the agent is closed
+            self.memory_service.start_background_summarization()
         self.llm_service = LLMService(config=self.config, llm_client=llm_client)
         self.response_processor = ResponseProcessor(user_id=user_id, feedback_system=feedback_system)
-        self.request_classifier = RequestClassifier()
-        
-        # Initialize planning engine
-        self.planning_engine = PlanningEngine()
         
-        # Initialize reasoning engine
-        self.reasoning_engine = ReasoningEngine(config=self.config, llm_client=llm_client)
+        # Stateless analyzers are shared by all agents
+        registry = get_resource_registry()
+        request_keywords = self.config.agent.request_keywords or {}
+        self.request_classifier = registry.get(
+            "request_classifier",
+            tuple((category, tuple(keywords)) for category, keywords in request_keywords.items()),
+            lambda: RequestClassifier(keywords=request_keywords)
+        )
         
-        # Initialize decision tree manager
-        self.decision_tree_manager = DecisionTreeManager()
+        # The planning and reasoning engines and the decision trees are created on first use
         
         # Initialize context processor
-        self.context_processor = ContextProcessor()
+        self.context_processor = get_shared_context_processor()
+        
+        # Memory save of the last async turn, finished while the next turn retrieves context
+        self._pending_save = None
+    
+    @cached_property
+    def planning_engine(self) -> PlanningEngine:
+        """Planning engine, created on the first planning request."""
+        return PlanningEngine()
+    
+    @cached_property
+    def reasoning_engine(self) -> ReasoningEngine:
+        """Reasoning engine sharing the LLM service's client, created on first use."""
+        return ReasoningEngine(config=self.config, llm_client=self.llm_service.client)
+    
+    @cached_property
+    def decision_tree_manager(self) -> DecisionTreeManager:
+        """Decision tree manager shared by all agents; the default trees are built on first use."""
+        return get_resource_registry().get("decision_trees", None, DecisionTreeManager)
     
     def process_input(self, user_input: str) -> str:
         """
         Process user input and generate a response.
         
+        Each stage of the turn is timed when config.agent.trace_turns is set (see
+        get_latency_metrics and get_recent_traces).
+        
         Args:
             user_input (str): The input from the user
             
+        Returns:
+            str: The agent's response
+        """
+        trace = self._start_trace()
+        try:
+            return self._process_input(user_input, trace)
+        except BaseException as e:
+            trace.fail(e)
+            raise
+        finally:
+            latency_metrics_collector.finish_trace(trace)
+    
+    def _process_input(self, user_input: str, trace: TurnTrace) -> str:
+        """
+        Process user input (see process_input).
+        
+        Args:
+            user_input (str): The input from the user
+            trace (TurnTrace): Trace of the turn
+            
         Returns:
             str: The agent's response
         """
         # Validate user input
         try:
-            validated_input = validate_message_content(user_input)
+            with trace.span("validation"):
+                validated_input = validate_message_content(user_input)
         except ValidationError as e:
             logger = get_logger()
             logger.warning(f"Input validation error: {e}")
@@ -105,43 +163,53 @@ class Agent:
             # Check if we're currently asking for clarification
             if self.conversation_manager.get_state() == ConversationState.ASKING_CLARIFICATION:
                 # We're in a clarification loop, process the response as clarification
-                response = self._handle_clarification_response(validated_input)
+                with trace.span("clarification"):
+                    response = self._handle_clarification_response(validated_input)
             else:
                 # Normal processing flow
-                # Check for planning requests
-                if self.request_classifier.is_planning_request(validated_input):
-                    raw_response = self._handle_planning_request(validated_input)
+                # Classify the request once and dispatch on its category
+                with trace.span("classification"):
+                    category = self.request_classifier.classify(validated_input).category
+                if category == "planning":
+                    with trace.span("planning"):
+                        raw_response = self._handle_planning_request(validated_input)
                     # Enhance the response using the response processor
-                    response = self.response_processor.enhance_response(validated_input, raw_response)
-                # Check for reasoning requests
-                elif self.request_classifier.is_reasoning_request(validated_input):
-                    raw_response = self._handle_reasoning_request(validated_input)
+                    with trace.span("enhancement"):
+                        response = self.response_processor.enhance_response(validated_input, raw_response)
+                elif category == "reasoning":
+                    with trace.span("reasoning"):
+                        raw_response = self._handle_reasoning_request(validated_input)
                     # Enhance the response using the response processor
-                    response = self.response_processor.enhance_response(validated_input, raw_response)
-                # Check for decision tree requests
-                elif self.request_classifier.is_decision_tree_request(validated_input):
-                    raw_response = self._handle_decision_tree_request(validated_input)
+                    with trace.span("enhancement"):
+                        response = self.response_processor.enhance_response(validated_input, raw_response)
+                elif category == "decision_tree":
+                    with trace.span("decision_tree"):
+                        raw_response = self._handle_decision_tree_request(validated_input)
                     # Enhance the response using the response processor
-                    response = self.response_processor.enhance_response(validated_input, raw_response)
+                    with trace.span("enhancement"):
+                        response = self.response_processor.enhance_response(validated_input, raw_response)
                 else:
                     # Try to generate a response using LLM
                     try:
                         # Get memory context using memory service
-                        memory_context = self.memory_service.get_memory_context(
-                            self.user_id,
-                            self.conversation_manager.get_recent_history(),
-                            validated_input
-                        )
+                        with trace.span("memory_context"):
+                            memory_context = self.memory_service.get_memory_context(
+                                self.user_id,
+                                self.conversation_manager.get_recent_history(),
+                                validated_input
+                            )
                         
                         # Generate response using LLM service
-                        raw_response = self.llm_service.generate_response(
-                            validated_input,
-                            self.conversation_manager.get_recent_history(),
-                            memory_context
-                        )
+                        with trace.span("llm"):
+                            raw_response = self.llm_service.generate_response(
+                                validated_input,
+                                self.conversation_manager.get_recent_history(),
+                                memory_context
+                            )
                         
                         # Enhance the response using the response processor
-                        response = self.response_processor.enhance_response(validated_input, raw_response)
+                        with trace.span("enhancement"):
+                            response = self.response_processor.enhance_response(validated_input, raw_response)
                     except LLMException as e:
                         # Handle LLM exceptions using error handler
                         context = {
@@ -164,19 +232,226 @@ class Agent:
                         previous_response_id = recent_history[-2].get("id") if recent_history[-2].get("role") == "assistant" else None
                         if previous_response_id:
                             # Adapt response based on feedback using response processor
-                            response = self.response_processor.adapt_response_based_on_feedback(response, previous_response_id)
+                            with trace.span("feedback"):
+                                response = self.response_processor.adapt_response_based_on_feedback(response, previous_response_id)
+        
+        # Generate a unique ID for this response
+        response_id = generate_id()
+        
+        with trace.span("persistence"):
+            # Store agent response in conversation history with ID using conversation manager
+            self.conversation_manager.add_agent_message(response, response_id)
+            
+            # Save conversation turn to memory using memory service
+            self.memory_service.save_conversation_turn(self.user_id, user_input, response)
+        
+        return response
+    
+    def _start_trace(self) -> TurnTrace:
+        """
+        Start tracing a turn.
+        
+        Returns:
+            TurnTrace: The turn's trace, or NULL_TRACE if config.agent.trace_turns is off
+        """
+        if not self.config.agent.trace_turns:
+            return NULL_TRACE
+        return latency_metrics_collector.start_trace(self.user_id)
+    
+    async def process_input_async(self, user_input: str, timeout: float = None) -> str:
+        """
+        Process user input and generate a response without blocking the event loop.
+        
+        Runs the same stages as process_input with async storage and the async LLM
+        client. Memory context retrieval runs alongside the previous turn's memory
+        save, and the feedback lookup alongside the LLM call; this turn's save
+        finishes in the background (see flush_async).
+        
+        Cancelling the call cancels the turn's pending retrievals and LLM request.
+        
+        Args:
+            user_input (str): The input from the user
+            timeout (float): Seconds the turn may take (default: config.agent.turn_timeout;
+                0 disables the limit)
+            
+        Returns:
+            str: The agent's response
+            
+        Raises:
+            asyncio.TimeoutError: If the turn takes longer than the timeout
+        """
+        timeout = self.config.agent.turn_timeout if timeout is None else timeout
+        trace = self._start_trace()
+        try:
+            if timeout and timeout > 0:
+                return await asyncio.wait_for(self._process_input_async(user_input, trace), timeout)
+            return await self._process_input_async(user_input, trace)
+        except BaseException as e:
+            trace.fail(e)
+            raise
+        finally:
+            latency_metrics_collector.finish_trace(trace)
+    
+    async def _process_input_async(self, user_input: str, trace: TurnTrace) -> str:
+        """
+        Process user input asynchronously (see process_input_async).
+        
+        Args:
+            user_input (str): The input from the user
+            trace (TurnTrace): Trace of the turn
+            
+        Returns:
+            str: The agent's response
+        """
+        # Validate user input
+        try:
+            with trace.span("validation"):
+                validated_input = validate_message_content(user_input)
+        except ValidationError as e:
+            logger = get_logger()
+            logger.warning(f"Input validation error: {e}")
+            return "I'm sorry, but your input contains invalid characters. Please try again."
+        
+        # Store user input in conversation history using conversation manager
+        self.conversation_manager.add_user_message(validated_input)
+        
+        # Check for exit commands
+        if self.conversation_manager.is_exit_command(validated_input):
+            response = "Goodbye! Have a great day!"
+        elif self.conversation_manager.get_state() == ConversationState.ASKING_CLARIFICATION:
+            # We're in a clarification loop, process the response as clarification
+            with trace.span("clarification"):
+                response = self._handle_clarification_response(validated_input)
+        else:
+            # Classify the request once and dispatch on its category
+            with trace.span("classification"):
+                category = self.request_classifier.classify(validated_input).category
+            handler = {
+                "planning": self._handle_planning_request,
+                "reasoning": self._handle_reasoning_request,
+                "decision_tree": self._handle_decision_tree_request
+            }.get(category)
+            if handler is not None:
+                # The handlers are synchronous (reasoning may call the LLM), so run them off the event loop
+                loop = asyncio.get_running_loop()
+                with trace.span(category):
+                    raw_response = await loop.run_in_executor(None, handler, validated_input)
+                with trace.span("enhancement"):
+                    response = self.response_processor.enhance_response(validated_input, raw_response)
+            else:
+                response = await self._generate_response_async(validated_input, trace)
         
         # Generate a unique ID for this response
         response_id = generate_id()
         
-        # Store agent response in conversation history with ID using conversation manager
-        self.conversation_manager.add_agent_message(response, response_id)
+        with trace.span("persistence"):
+            # Store agent response in conversation history with ID using conversation manager
+            self.conversation_manager.add_agent_message(response, response_id)
+            
+            # Save the turn in the background; the next turn waits for it while it retrieves context
+            await self._finish_pending_save()
+            save = asyncio.ensure_future(
+                self.memory_service.save_conversation_turn_async(self.user_id, user_input, response)
+            )
+            self._pending_save = (save, user_input, response)
         
-        # Save conversation turn to memory using memory service
-        self.memory_service.save_conversation_turn(self.user_id, user_input, response)
+        return response
+    
+    async def _generate_response_async(self, validated_input: str, trace: TurnTrace = NULL_TRACE) -> str:
+        """
+        Generate an LLM response to a general request asynchronously.
+        
+        Args:
+            validated_input (str): The validated user input
+            trace (TurnTrace): Trace of the turn
+            
+        Returns:
+            str: The enhanced (and possibly feedback-adapted) response
+        """
+        # Look up feedback on the previous response while the response is generated
+        recent_history = self.conversation_manager.get_recent_history()
+        feedback_lookup = None
+        if len(recent_history) >= 2 and recent_history[-2].get("role") == "assistant":
+            previous_response_id = recent_history[-2].get("id")
+            if previous_response_id:
+                feedback_lookup = asyncio.ensure_future(trace.timed(
+                    "feedback", self.response_processor.get_feedback_adaptation_async(previous_response_id)
+                ))
+        
+        try:
+            try:
+                # Get memory context using memory service, while the previous turn is saved
+                memory_context, _ = await asyncio.gather(
+                    trace.timed("memory_context", self.memory_service.get_memory_context_async(
+                        self.user_id, recent_history, validated_input
+                    )),
+                    trace.timed("previous_save", self._finish_pending_save())
+                )
+                
+                # Generate response using LLM service
+                with trace.span("llm"):
+                    raw_response = await self.llm_service.generate_response_async(
+                        validated_input,
+                        self.conversation_manager.get_recent_history(),
+                        memory_context
+                    )
+                
+                # Enhance the response using the response processor
+                with trace.span("enhancement"):
+                    response = self.response_processor.enhance_response(validated_input, raw_response)
+            except LLMException as e:
+                # Handle LLM exceptions using error handler
+                context = {
+                    "user_input": validated_input,
+                    "conversation_history": self.conversation_manager.get_recent_history()
+                }
+                response = self.error_handler.handle_llm_exception(e, context)
+            except Exception as e:
+                # Handle unexpected exceptions using error handler
+                context = {
+                    "user_input": validated_input,
+                    "conversation_history": self.conversation_manager.get_recent_history()
+                }
+                response = self.error_handler.handle_unexpected_exception(e, context)
+            
+            # Adapt the response based on feedback for the previous response
+            if feedback_lookup is not None:
+                response = self.response_processor.apply_feedback_adaptation(response, await feedback_lookup)
+        finally:
+            if feedback_lookup is not None and not feedback_lookup.done():
+                feedback_lookup.cancel()
         
         return response
     
+    async def _finish_pending_save(self):
+        """
+        Wait for the memory save of the previous async turn.
+        
+        The save is shielded, so cancelling the current turn does not cancel it. A
+        save cancelled because its event loop was closed (e.g. asyncio.run per turn)
+        is redone on the current loop.
+        """
+        pending = self._pending_save
+        if pending is None:
+            return
+        
+        save, user_input, response = pending
+        if save.get_loop() is asyncio.get_running_loop():
+            await asyncio.shield(save)
+        elif save.cancelled():
+            await self.memory_service.save_conversation_turn_async(self.user_id, user_input, response)
+        
+        if self._pending_save is pending:
+            self._pending_save = None
+    
+    async def flush_async(self):
+        """
+        Wait until the memory save of the last async turn has finished.
+        
+        Call before closing the event loop that ran process_input_async.
+        """
+        await self._finish_pending_save()
+    
     def _handle_clarification_response(self, user_input: str) -> str:
         """
         Handle user responses to clarification questions.
@@ -382,7 +657,7 @@ class Agent:
             bool: True if feedback was saved successfully, False otherwise
         """
         # Get current conversation ID if available
-        conversation_id = find_conversation_id(self.conversation_manager.get_recent_history(), message_id)
+        conversation_id = self.conversation_manager.find_conversation_id(message_id)
         
         # Delegate to response processor
         return self.response_processor.collect_rating_feedback(
@@ -405,7 +680,7 @@ class Agent:
             bool: True if feedback was saved successfully, False otherwise
         """
         # Get current conversation ID if available
-        conversation_id = find_conversation_id(self.conversation_manager.get_recent_history(), message_id)
+        conversation_id = self.conversation_manager.find_conversation_id(message_id)
         
         # Delegate to response processor
         return self.response_processor.collect_thumbs_feedback(
@@ -581,4 +856,62 @@ class Agent:
             dict: Error metrics summary
         """
         # Delegate to error handler
-        return self.error_handler.get_error_metrics()
\ No newline at end of file
+        return self.error_handler.get_error_metrics()
+    
+    def get_latency_metrics(self) -> dict:
+        """
+        Get per-stage latency metrics of the traced turns of all agents.
+        
+        Returns:
+            dict: For each stage (and "turn" for whole turns), the count and the mean,
+                p50, p95, p99 and max latency in milliseconds
+        """
+        return latency_metrics_collector.get_latency_summary()
+    
+    def get_recent_traces(self, limit: int = 10) -> list:
+        """
+        Get the traces of this agent's recent turns.
+        
+        Args:
+            limit (int): Maximum number of traces to return
+            
+        Returns:
+            list: Recent traces, oldest first, each with a trace ID, the turn's duration
+                and the offset and duration of each stage in milliseconds
+        """
+        return latency_metrics_collector.get_recent_traces(limit, user_id=self.user_id)
+    
+    def export_session(self) -> dict:
+        """
+        Get the session state of the agent, e.g. to persist it while the user is idle.
+        
+        Returns:
+            dict: Conversation state, context and recent history
+        """
+        history_limit = self.conversation_manager.history_window
+        return {
+            "user_id": self.user_id,
+            "conversation": self.conversation_manager.to_dict(),
+            "interface": self.response_processor.conversation_interface.to_dict(history_limit)
+        }
+    
+    def restore_session(self, session: dict) -> None:
+        """
+        Restore session state saved with export_session.
+        
+        Args:
+            session (dict): Session state
+        """
+        self.conversation_manager.restore_from_dict(session["conversation"])
+        self.response_processor.conversation_interface.restore_from_dict(session["interface"])
+    
+    def close(self) -> bool:
+        """
+        Stop the agent's background memory work (with tiered memory, its use of
+        conversation summarization). Turns queued for enrichment are still enriched
+        by the storage's shared workers.
+        
+        Returns:
+            bool: True if no pending memory enrichment was lost
+        """
+        return self.memory_service.shutdown()
\ No newline at end of file
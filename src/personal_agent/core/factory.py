@@ -8,6 +8,7 @@ from ..memory.storage import MemoryStorage
 from ..memory.plugin_manager import load_memory_storage_plugin, get_loaded_memory_storage_provider
 from ..llm.client import LLMClient
 from ..llm.client_plugin_manager import load_llm_client_plugin, get_loaded_llm_client_provider
+from ..utils.resources import get_resource_registry, config_key
 from .agent import Agent
 from .feedback import FeedbackSystem
 
@@ -15,8 +16,55 @@ from .feedback import FeedbackSystem
 class ComponentFactory:
     """
     Factory class for creating instances of core components with dependency injection.
+    
+    The create_* methods build new instances; the get_shared_* methods return the
+    process-wide instances from the resource registry, which agents share.
     """
     
+    @staticmethod
+    def get_shared_config(config_path: Optional[str] = None) -> Config:
+        """
+        Get the shared configuration, loading it on first use.
+        
+        Args:
+            config_path (Optional[str]): Optional path to a specific configuration file
+            
+        Returns:
+            Config: Shared configuration object
+        """
+        return Config.load_shared(config_path)
+    
+    @staticmethod
+    def get_shared_memory_storage(config: Config) -> MemoryStorage:
+        """
+        Get the shared memory storage for the configured backend and database.
+        
+        Args:
+            config (Config): Configuration object
+            
+        Returns:
+            MemoryStorage: Shared memory storage instance
+        """
+        key = (config.memory.backend, config.memory.database_path)
+        return get_resource_registry().get(
+            "memory_storage", key, lambda: ComponentFactory.create_memory_storage(config)
+        )
+    
+    @staticmethod
+    def get_shared_llm_client(config: Config) -> LLMClient:
+        """
+        Get the shared LLM client for the LLM settings of a configuration.
+        
+        Args:
+            config (Config): Configuration object
+            
+        Returns:
+            LLMClient: Shared LLM client instance
+        """
+        return get_resource_registry().get(
+            "llm_client", config_key(config.llm), lambda: ComponentFactory.create_llm_client(config)
+        )
+    
     @staticmethod
     def create_memory_storage(config: Config) -> MemoryStorage:
         """
@@ -78,15 +126,22 @@ class ComponentFactory:
             FeedbackSystem: Feedback system instance
         """
         if config is None:
-            config = Config.load()
+            config = ComponentFactory.get_shared_config()
         
-        return FeedbackSystem(user_id=user_id)
+        return FeedbackSystem(
+            user_id=user_id,
+            config=config,
+            storage=ComponentFactory.get_shared_memory_storage(config)
+        )
     
     @staticmethod
     def create_agent(user_id: str = "default_user", config: Optional[Config] = None) -> Agent:
         """
         Create an agent instance with injected dependencies.
         
+        The agent uses the shared storage and LLM client, so creating one per user
+        opens no new database handles or HTTP connection pools.
+        
         Args:
             user_id (str): ID of the user interacting with the agent
             config (Optional[Config]): Configuration object. If None, will load default config.
@@ -95,11 +150,11 @@ class ComponentFactory:
             Agent: Agent instance with injected dependencies
         """
         if config is None:
-            config = Config.load()
+            config = ComponentFactory.get_shared_config()
         
-        # Create dependencies
-        memory_storage = ComponentFactory.create_memory_storage(config)
-        llm_client = ComponentFactory.create_llm_client(config)
+        # Get shared dependencies
+        memory_storage = ComponentFactory.get_shared_memory_storage(config)
+        llm_client = ComponentFactory.get_shared_llm_client(config)
         feedback_system = ComponentFactory.create_feedback_system(user_id, config)
         
         # Create agent with injected dependencies
@@ -4,6 +4,7 @@ Feedback System for Personal Agent
 This module contains the feedback system that allows the agent to learn from user feedback.
 """
 
+import asyncio
 from typing import Optional, Dict, Any, List
 from ..memory.storage import SQLiteMemoryStorage
 from ..memory.models import Feedback
@@ -13,6 +14,7 @@ from ..utils.validation import (
 )
 from ..utils.logging import get_logger, log_exception
 from ..utils.common import generate_id
+from ..utils.resources import get_resource_registry
 
 
 class FeedbackSystem:
@@ -20,16 +22,24 @@ class FeedbackSystem:
     Feedback system that handles collection, storage, and analysis of user feedback.
     """
     
-    def __init__(self, user_id: str = "default_user"):
+    def __init__(self, user_id: str = "default_user", config: Optional[Config] = None,
+                 storage: Optional[SQLiteMemoryStorage] = None):
         """
         Initialize the feedback system.
         
         Args:
             user_id (str): ID of the user interacting with the agent
+            config (Optional[Config]): Configuration object (default: shared configuration)
+            storage (Optional[SQLiteMemoryStorage]): Feedback storage (default: shared storage
+                of the configured database)
         """
+        registry = get_resource_registry()
         self.user_id = user_id
-        self.storage = SQLiteMemoryStorage()
-        self.config = Config.load()
+        self.config = config or Config.load_shared()
+        database_path = self.config.memory.database_path
+        self.storage = storage or registry.get(
+            "memory_storage", ("sqlite", database_path), lambda: SQLiteMemoryStorage(database_path)
+        )
         
         # Feedback configuration
         self.rating_scale = self.config.feedback.rating_scale
@@ -168,6 +178,22 @@ class FeedbackSystem:
         """
         return self.storage.get_feedback_stats(self.user_id)
     
+    async def get_feedback_for_message_async(self, message_id: str) -> Optional[Feedback]:
+        """
+        Retrieve feedback for a specific message without blocking the event loop.
+        
+        Args:
+            message_id (str): ID of the message
+            
+        Returns:
+            Optional[Feedback]: Feedback object if found, None otherwise
+        """
+        async_storage = getattr(self.storage, "async_storage", None)
+        if async_storage is not None:
+            return await async_storage.get_feedback(message_id)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.storage.get_feedback, message_id)
+    
     def should_adapt_response(self, message_id: str) -> bool:
         """
         Determine if the agent should adapt its response based on feedback.
@@ -181,7 +207,18 @@ class FeedbackSystem:
         if not self.config.feedback.enabled:
             return False
             
-        feedback = self.get_feedback_for_message(message_id)
+        return self._should_adapt(self.get_feedback_for_message(message_id))
+    
+    def _should_adapt(self, feedback: Optional[Feedback]) -> bool:
+        """
+        Determine if feedback calls for adapting the response.
+        
+        Args:
+            feedback (Optional[Feedback]): Feedback for the message, if any
+            
+        Returns:
+            bool: True if the agent should adapt, False otherwise
+        """
         if not feedback:
             return False
         
@@ -198,7 +235,39 @@ class FeedbackSystem:
         Returns:
             Optional[str]: Suggestion for adaptation, None if no adaptation needed
         """
-        feedback = self.get_feedback_for_message(message_id)
+        return self._adaptation_suggestion(self.get_feedback_for_message(message_id))
+    
+    async def get_adaptation_suggestion_async(self, message_id: str) -> Optional[str]:
+        """
+        Get the adaptation suggestion for a message if its feedback calls for one.
+        
+        Combines should_adapt_response and get_adaptation_suggestion with a single
+        feedback lookup that does not block the event loop.
+        
+        Args:
+            message_id (str): ID of the message to get adaptation for
+            
+        Returns:
+            Optional[str]: Suggestion for adaptation, None if no adaptation needed
+        """
+        if not self.config.feedback.enabled:
+            return None
+        
+        feedback = await self.get_feedback_for_message_async(message_id)
+        if not self._should_adapt(feedback):
+            return None
+        return self._adaptation_suggestion(feedback)
+    
+    def _adaptation_suggestion(self, feedback: Optional[Feedback]) -> Optional[str]:
+        """
+        Get a suggestion for how to adapt the response based on feedback.
+        
+        Args:
+            feedback (Optional[Feedback]): Feedback for the message, if any
+            
+        Returns:
+            Optional[str]: Suggestion for adaptation, None if no adaptation needed
+        """
         if not feedback:
             return None
         
@@ -0,0 +1,237 @@
+"""
+Latency Metrics Module for Personal Agent
+
+This module contains functionality for tracing the stages of each agent turn and
+reporting per-stage latency percentiles.
+"""
+
+from typing import Dict, Any, Awaitable, List, Optional
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from datetime import datetime
+import threading
+import time
+from ..config.constants import TRACING
+from ..utils.common import generate_id
+
+
+class _Span:
+    """Times one stage of a turn and records it on the trace."""
+
+    __slots__ = ("trace", "stage", "start")
+
+    def __init__(self, trace: "TurnTrace", stage: str):
+        self.trace = trace
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter()
+        self.trace.spans.append((self.stage, self.start - self.trace.start, end - self.start))
+        return False
+
+
+class TurnTrace:
+    """Stage timings of one agent turn, measured with a monotonic clock."""
+
+    def __init__(self, user_id: str):
+        """
+        Start a trace.
+
+        Args:
+            user_id (str): ID of the user whose turn is traced
+        """
+        self.trace_id = generate_id()
+        self.user_id = user_id
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        # (stage, offset from the start of the turn, duration) in seconds
+        self.spans: List[tuple] = []
+
+    def span(self, stage: str) -> _Span:
+        """
+        Get a context manager timing a stage of the turn.
+
+        Args:
+            stage (str): Name of the stage, e.g. "llm"
+
+        Returns:
+            _Span: Context manager recording the stage when it exits
+        """
+        return _Span(self, stage)
+
+    def timed(self, stage: str, awaitable: Awaitable) -> Awaitable:
+        """
+        Time an awaitable as a stage, e.g. one that runs alongside other stages.
+
+        Args:
+            stage (str): Name of the stage
+            awaitable (Awaitable): Awaitable to time
+
+        Returns:
+            Awaitable: Awaitable with the same result
+        """
+        async def run():
+            with self.span(stage):
+                return await awaitable
+        return run()
+
+    def fail(self, exception: BaseException):
+        """
+        Mark the turn as ended by an exception, e.g. a timeout.
+
+        Args:
+            exception (BaseException): The exception
+        """
+        self.error = type(exception).__name__
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the trace to a dictionary, with timings in milliseconds.
+
+        Returns:
+            Dict[str, Any]: Dictionary representation of the trace
+        """
+        return {
+            "trace_id": self.trace_id,
+            "user_id": self.user_id,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": None if self.duration is None else self.duration * 1000,
+            "error": self.error,
+            "spans": [
+                {"stage": stage, "offset_ms": offset * 1000, "duration_ms": duration * 1000}
+                for stage, offset, duration in self.spans
+            ]
+        }
+
+
+class _NullTrace:
+    """Trace that records nothing, used when tracing is disabled."""
+
+    _span = nullcontext()
+
+    def span(self, stage: str):
+        return self._span
+
+    def timed(self, stage: str, awaitable: Awaitable) -> Awaitable:
+        return awaitable
+
+    def fail(self, exception: BaseException):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class LatencyMetricsCollector:
+    """Collects turn traces and reports per-stage latency for monitoring and analysis."""
+
+    def __init__(self, max_traces: int = TRACING.MAX_TRACES,
+                 max_samples: int = TRACING.MAX_SAMPLES_PER_STAGE):
+        """
+        Initialize the latency metrics collector.
+
+        Args:
+            max_traces (int): Maximum number of recent traces to keep
+            max_samples (int): Maximum number of recent timings per stage used for percentiles
+        """
+        self.max_traces = max_traces
+        self.max_samples = max_samples
+        self.traces = deque(maxlen=max_traces)
+        self.stage_counts = defaultdict(int)
+        self.stage_samples = defaultdict(lambda: deque(maxlen=max_samples))
+        self._lock = threading.Lock()
+
+    def start_trace(self, user_id: str) -> TurnTrace:
+        """
+        Start tracing a turn.
+
+        Args:
+            user_id (str): ID of the user whose turn is traced
+
+        Returns:
+            TurnTrace: The new trace
+        """
+        return TurnTrace(user_id)
+
+    def finish_trace(self, trace: TurnTrace):
+        """
+        Record a finished trace; the whole turn is recorded as the "turn" stage.
+
+        Args:
+            trace (TurnTrace): The trace, or NULL_TRACE, which is ignored
+        """
+        if trace is NULL_TRACE:
+            return
+
+        trace.duration = time.perf_counter() - trace.start
+        with self._lock:
+            self.traces.append(trace)
+            for stage, _, duration in trace.spans:
+                self.stage_counts[stage] += 1
+                self.stage_samples[stage].append(duration)
+            self.stage_counts["turn"] += 1
+            self.stage_samples["turn"].append(trace.duration)
+
+    def get_recent_traces(self, limit: int = 10, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get recent traces, oldest first.
+
+        Args:
+            limit (int): Maximum number of traces to return
+            user_id (Optional[str]): Only return this user's traces
+
+        Returns:
+            List[Dict[str, Any]]: Recent traces (see TurnTrace.to_dict)
+        """
+        with self._lock:
+            traces = [trace for trace in self.traces if user_id is None or trace.user_id == user_id]
+        return [trace.to_dict() for trace in traces[-limit:]] if limit > 0 else []
+
+    def get_latency_summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-stage latency over the recent timings of each stage.
+
+        Returns:
+            Dict[str, Dict[str, float]]: For each stage, the total count and the mean,
+                p50, p95, p99 and max of its recent timings in milliseconds
+        """
+        with self._lock:
+            samples = {stage: sorted(timings) for stage, timings in self.stage_samples.items()}
+            counts = dict(self.stage_counts)
+
+        summary = {}
+        for stage, timings in samples.items():
+            if not timings:
+                continue
+            summary[stage] = {
+                "count": counts[stage],
+                "mean_ms": sum(timings) / len(timings) * 1000,
+                "p50_ms": self._percentile(timings, 50) * 1000,
+                "p95_ms": self._percentile(timings, 95) * 1000,
+                "p99_ms": self._percentile(timings, 99) * 1000,
+                "max_ms": timings[-1] * 1000
+            }
+        return summary
+
+    @staticmethod
+    def _percentile(sorted_timings: List[float], percent: float) -> float:
+        """Nearest-rank percentile of sorted timings."""
+        rank = max(1, -(-len(sorted_timings) * percent // 100))
+        return sorted_timings[int(rank) - 1]
+
+    def reset_metrics(self):
+        """Reset all latency metrics."""
+        with self._lock:
+            self.traces.clear()
+            self.stage_counts.clear()
+            self.stage_samples.clear()
+
+
+# Global latency metrics collector instance
+latency_metrics_collector = LatencyMetricsCollector()
@@ -11,23 +11,51 @@ from typing import Dict, Optional, List
 from ..config.settings import Config
 from ..core.agent import Agent
 from ..core.factory import ComponentFactory
+from ..core.session_store import SessionStore
+from ..memory.enrichment import shutdown_enrichment_queues
 from ..utils.logging import get_logger, log_exception
 
 
 class AgentManager:
     """
     Manager class for handling the lifecycle of agents.
+    
+    Agents of idle users are saved to the session directory and rehydrated
+    on their next use (see SessionStore).
     """
     
-    def __init__(self):
+    def __init__(self, config: Optional[Config] = None):
         """
         Initialize the agent manager.
+        
+        Args:
+            config (Optional[Config]): Configuration for the managed agents. If None, uses the shared config.
         """
-        self.agents: Dict[str, Agent] = {}
-        self.config = Config.load()
+        self.config = config or ComponentFactory.get_shared_config()
         self.logger = get_logger()
+        # Configurations of the agents created with their own, reused on rehydration
+        self.agent_configs: Dict[str, Config] = {}
+        self.sessions = SessionStore(
+            factory=self._create_session_agent,
+            directory=self.config.agent.session_directory
+        )
+        # Agents in memory, least recently used first
+        self.agents: Dict[str, Agent] = self.sessions.sessions
         self.logger.info("AgentManager initialized")
     
+    def _create_session_agent(self, user_id: str) -> Agent:
+        """
+        Create the agent of a session being rehydrated or started.
+        
+        Args:
+            user_id (str): ID of the user
+            
+        Returns:
+            Agent: Agent with the configuration it was created with
+        """
+        return ComponentFactory.create_agent(user_id=user_id,
+                                             config=self.agent_configs.get(user_id, self.config))
+    
     def create_agent(self, user_id: str = "default_user", 
                      config: Optional[Config] = None) -> Agent:
         """
@@ -42,21 +70,25 @@ class AgentManager:
         """
         self.logger.info(f"Creating agent for user: {user_id}")
         
-        # Use provided config or default
+        # Use provided config or default; a session rehydrated later uses the same one
         agent_config = config or self.config
+        if agent_config is self.config:
+            self.agent_configs.pop(user_id, None)
+        else:
+            self.agent_configs[user_id] = agent_config
         
         # Create agent using factory
         agent = ComponentFactory.create_agent(user_id=user_id, config=agent_config)
         
         # Store agent
-        self.agents[user_id] = agent
+        self.sessions.add(user_id, agent)
         
         self.logger.info(f"Agent created for user: {user_id}")
         return agent
     
     def get_agent(self, user_id: str) -> Optional[Agent]:
         """
-        Get an existing agent by user ID.
+        Get an existing agent by user ID, rehydrating it if its session was saved.
         
         Args:
             user_id (str): ID of the user
@@ -64,11 +96,11 @@ class AgentManager:
         Returns:
             Optional[Agent]: Agent instance if found, None otherwise
         """
-        return self.agents.get(user_id)
+        return self.sessions.get(user_id, create=False)
     
     def remove_agent(self, user_id: str) -> bool:
         """
-        Remove an agent from management.
+        Remove an agent from management, including its saved session.
         
         Args:
             user_id (str): ID of the user
@@ -76,15 +108,16 @@ class AgentManager:
         Returns:
             bool: True if agent was removed, False if not found
         """
-        if user_id in self.agents:
+        if user_id in self.sessions:
             self.logger.info(f"Removing agent for user: {user_id}")
-            del self.agents[user_id]
+            self.sessions.remove(user_id)
+            self.agent_configs.pop(user_id, None)
             return True
         return False
     
     def list_agents(self) -> List[str]:
         """
-        List all managed agent user IDs.
+        List all managed agent user IDs in memory.
         
         Returns:
             List[str]: List of user IDs for managed agents
@@ -164,9 +197,16 @@ class AgentManager:
     def shutdown(self):
         """
         Shutdown the agent manager and all managed agents.
+        
+        Sessions are saved first so that users resume their conversations. The
+        shared memory enrichment workers are drained and stopped once, after the agents.
         """
         self.logger.info("Shutting down AgentManager")
+        saved = self.sessions.save_all()
+        self.logger.info(f"Saved {saved} agent sessions")
         self.stop_all_agents()
+        if not shutdown_enrichment_queues():
+            self.logger.warning("Pending memory enrichment was discarded at shutdown")
         self.logger.info("AgentManager shutdown complete")
 
 
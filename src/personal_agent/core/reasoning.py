@@ -54,7 +54,7 @@ class ReasoningEngine:
             config (Config): Configuration object
             llm_client (LLMClient): LLM client instance
         """
-        self.config = config or Config.load()
+        self.config = config or Config.load_shared()
         self.llm_client = llm_client or LLMClient(self.config)
         self.logger = get_logger()
 
@@ -5,33 +5,154 @@ This module contains the RequestClassifier class that handles classification of
 user requests into different categories such as planning, reasoning, decision tree, etc.
 """
 
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
+
+
+# Categories in priority order; the first matching category handles the request
+DEFAULT_REQUEST_KEYWORDS: Dict[str, List[str]] = {
+    "planning": [
+        "plan", "schedule", "organize", "break down", "steps to",
+        "how to", "need to do", "tasks for", "project plan"
+    ],
+    "reasoning": [
+        "reason", "think", "conclude", "deduce", "infer",
+        "logic", "conclusion", "because", "therefore", "thus"
+    ],
+    "decision_tree": [
+        "decide", "choose", "select", "pick", "which one",
+        "what should I do", "conflict", "schedule", "priority"
+    ]
+}
+
+GENERAL_CATEGORY = "general"
+
+
+def _is_word_char(char: str) -> bool:
+    """Check whether a character is a word character, like \\w in a regex."""
+    return char.isalnum() or char == "_"
+
+
+@dataclass
+class RequestClassification:
+    """Categories whose keywords occur in a request."""
+    scores: Dict[str, float] = field(default_factory=dict)  # matching categories, in priority order
+    keywords: Dict[str, List[str]] = field(default_factory=dict)  # matched keywords per category
+    
+    @property
+    def category(self) -> str:
+        """The category that handles the request: the first match, or "general"."""
+        return next(iter(self.scores), GENERAL_CATEGORY)
 
 
 class RequestClassifier:
     """
     Classifies user requests into different categories for appropriate handling.
+    
+    The input is lowercased once and checked against the keywords of all categories
+    in one pass. A keyword matches at the start of a word: single words also match
+    longer words starting with them ("plan" matches "planning" but not "explain"),
+    phrases match whole words.
     """
     
-    def __init__(self):
+    def __init__(self, keywords: Optional[Dict[str, List[str]]] = None):
         """
         Initialize the request classifier.
+        
+        Args:
+            keywords (Optional[Dict[str, List[str]]]): Keyword tables by category, e.g.
+                from config.agent.request_keywords. They replace the default table of
+                the same category; new categories are matched after the default ones.
         """
         # Define keywords for different request types
-        self.planning_keywords = [
-            "plan", "schedule", "organize", "break down", "steps to",
-            "how to", "need to do", "tasks for", "project plan"
-        ]
+        self.keywords: Dict[str, List[str]] = {
+            category: list(category_keywords)
+            for category, category_keywords in DEFAULT_REQUEST_KEYWORDS.items()
+        }
+        for category, category_keywords in (keywords or {}).items():
+            self.keywords[category] = list(category_keywords)
         
-        self.reasoning_keywords = [
-            "reason", "think", "conclude", "deduce", "infer",
-            "logic", "conclusion", "because", "therefore", "thus"
-        ]
+        self.planning_keywords = self.keywords["planning"]
+        self.reasoning_keywords = self.keywords["reasoning"]
+        self.decision_tree_keywords = self.keywords["decision_tree"]
+        
+        # Keyword index, rebuilt when the keyword tables change
+        self._index_from = None
+        self._index: List[Tuple[str, bool, List[Tuple[str, str]]]] = []
+    
+    def _build_index(self):
+        """
+        Index the keywords of every category.
+        
+        Each distinct lowercase keyword is kept once, with whether it must end at a
+        word boundary and the (category, keyword) entries it stands for.
+        """
+        source = tuple((category, list(words)) for category, words in self.keywords.items())
+        entries: Dict[str, List[Tuple[str, str]]] = {}
+        for category, category_keywords in source:
+            for keyword in category_keywords:
+                entries.setdefault(keyword.lower(), []).append((category, keyword))
         
-        self.decision_tree_keywords = [
-            "decide", "choose", "select", "pick", "which one",
-            "what should I do", "conflict", "schedule", "priority"
+        # Single words also match longer words ("plan" in "planning"), phrases do not
+        self._index = [
+            (keyword_lower, " " in keyword_lower.strip(), keyword_entries)
+            for keyword_lower, keyword_entries in entries.items()
         ]
+        self._index_from = source
+    
+    def classify(self, user_input: str) -> RequestClassification:
+        """
+        Find every category whose keywords occur in the user input.
+        
+        Args:
+            user_input (str): The user input
+            
+        Returns:
+            RequestClassification: Matching categories with scores (1 - 0.5^n for n
+                distinct matched keywords) and the keywords found
+        """
+        if tuple(self.keywords.items()) != self._index_from:
+            self._build_index()
+        
+        input_lower = user_input.lower()
+        found = set()
+        for keyword_lower, whole_words, entries in self._index:
+            # The substring test rules out most keywords before word boundaries are checked
+            if keyword_lower in input_lower and self._find_keyword(input_lower, keyword_lower, whole_words):
+                found.update(entries)
+        
+        classification = RequestClassification()
+        if not found:
+            return classification
+        for category, category_keywords in self.keywords.items():
+            matched = [keyword for keyword in category_keywords if (category, keyword) in found]
+            if matched:
+                classification.scores[category] = 1.0 - 0.5 ** len(matched)
+                classification.keywords[category] = matched
+        return classification
+    
+    @staticmethod
+    def _find_keyword(text: str, keyword: str, whole_words: bool) -> bool:
+        """
+        Check whether a keyword occurs in a text at the start of a word.
+        
+        Args:
+            text (str): Lowercase text
+            keyword (str): Lowercase keyword
+            whole_words (bool): Whether the keyword must also end at a word boundary
+            
+        Returns:
+            bool: True if the keyword occurs
+        """
+        # str.find is much faster than a regex search for \bkeyword on long inputs
+        start = text.find(keyword)
+        while start != -1:
+            end = start + len(keyword)
+            if (start == 0 or not _is_word_char(text[start - 1])) and \
+                    (not whole_words or end == len(text) or not _is_word_char(text[end])):
+                return True
+            start = text.find(keyword, start + 1)
+        return False
     
     def is_planning_request(self, user_input: str) -> bool:
         """
@@ -43,8 +164,7 @@ class RequestClassifier:
         Returns:
             bool: True if it's a planning request, False otherwise
         """
-        input_lower = user_input.lower()
-        return any(keyword in input_lower for keyword in self.planning_keywords)
+        return "planning" in self.classify(user_input).scores
     
     def is_reasoning_request(self, user_input: str) -> bool:
         """
@@ -56,8 +176,7 @@ class RequestClassifier:
         Returns:
             bool: True if it's a reasoning request, False otherwise
         """
-        input_lower = user_input.lower()
-        return any(keyword in input_lower for keyword in self.reasoning_keywords)
+        return "reasoning" in self.classify(user_input).scores
     
     def is_decision_tree_request(self, user_input: str) -> bool:
         """
@@ -69,8 +188,7 @@ class RequestClassifier:
         Returns:
             bool: True if it's a decision tree request, False otherwise
         """
-        input_lower = user_input.lower()
-        return any(keyword in input_lower for keyword in self.decision_tree_keywords)
+        return "decision_tree" in self.classify(user_input).scores
     
     def classify_request(self, user_input: str) -> str:
         """
@@ -82,14 +200,7 @@ class RequestClassifier:
         Returns:
             str: The request category ("planning", "reasoning", "decision_tree", or "general")
         """
-        if self.is_planning_request(user_input):
-            return "planning"
-        elif self.is_reasoning_request(user_input):
-            return "reasoning"
-        elif self.is_decision_tree_request(user_input):
-            return "decision_tree"
-        else:
-            return "general"
+        return self.classify(user_input).category
     
     def get_keywords_for_category(self, category: str) -> List[str]:
         """
@@ -101,9 +212,4 @@ class RequestClassifier:
         Returns:
             List[str]: List of keywords for the category
         """
-        keyword_map = {
-            "planning": self.planning_keywords,
-            "reasoning": self.reasoning_keywords,
-            "decision_tree": self.decision_tree_keywords
-        }
-        return keyword_map.get(category, [])
\ No newline at end of file
+        return self.keywords.get(category, [])
@@ -61,14 +61,47 @@ class ResponseProcessor:
         try:
             if self.feedback_system.should_adapt_response(previous_response_id):
                 adaptation_suggestion = self.feedback_system.get_adaptation_suggestion(previous_response_id)
-                if adaptation_suggestion:
-                    # Add adaptation suggestion to the response
-                    return f"[Adapted based on feedback: {adaptation_suggestion}] {response}"
+                return self.apply_feedback_adaptation(response, adaptation_suggestion)
         except Exception as e:
             self.logger.warning(f"Error adapting response based on feedback: {e}")
         
         return response
     
+    async def get_feedback_adaptation_async(self, previous_response_id: str) -> Optional[str]:
+        """
+        Look up the feedback adaptation for a previous response without blocking the event loop.
+        
+        The lookup does not depend on the current response, so it can run while the
+        response is being generated; apply the result with apply_feedback_adaptation.
+        
+        Args:
+            previous_response_id (str): ID of the previous response to check for feedback
+            
+        Returns:
+            Optional[str]: Adaptation suggestion if feedback suggests adaptation, None otherwise
+        """
+        try:
+            return await self.feedback_system.get_adaptation_suggestion_async(previous_response_id)
+        except Exception as e:
+            self.logger.warning(f"Error adapting response based on feedback: {e}")
+            return None
+    
+    def apply_feedback_adaptation(self, response: str, adaptation_suggestion: Optional[str]) -> str:
+        """
+        Apply a feedback adaptation suggestion to a response.
+        
+        Args:
+            response (str): The current response
+            adaptation_suggestion (Optional[str]): Suggestion from the feedback system, if any
+            
+        Returns:
+            str: The adapted response, or the original response without a suggestion
+        """
+        if adaptation_suggestion:
+            # Add adaptation suggestion to the response
+            return f"[Adapted based on feedback: {adaptation_suggestion}] {response}"
+        return response
+    
     def get_welcome_message(self) -> str:
         """
         Generate a welcome message for new conversations.
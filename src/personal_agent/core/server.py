@@ -0,0 +1,296 @@
+"""
+Agent Server for Personal Agent
+
+This module contains the AgentServer class, which hosts the agents of many users on
+one asyncio event loop behind a local transport (a Unix socket or a localhost TCP
+port). Agents are obtained from an AgentManager, so idle sessions are saved and
+rehydrated as usual.
+
+Wire protocol: newline-delimited JSON in both directions. Each request line is an
+object with an "id" chosen by the client, which is echoed on every event for that
+request, and a "type":
+
+    {"id": "1", "type": "message", "user_id": "alice", "text": "Hello"}
+    {"id": "2", "type": "ping"}
+    {"id": "3", "type": "stats"}
+
+A message is answered with an "accepted" event, the reply as a sequence of "chunk"
+events and a final "done" event carrying the full reply; ping and stats are answered
+with a single "pong" or "stats" event:
+
+    {"id": "1", "event": "accepted"}
+    {"id": "1", "event": "chunk", "text": "Hello! How"}
+    {"id": "1", "event": "done", "text": "Hello! How can I help?"}
+
+A request that fails gets an "error" event instead, e.g. {"id": "1", "event":
+"error", "error": "busy"} when admission control turns it away. Requests on one
+connection are handled concurrently, so events of different requests may interleave;
+the messages of one user are processed one at a time, in the order they arrived.
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+from ..config.constants import SERVER
+from ..core.manager import AgentManager
+from ..utils.logging import get_logger
+
+
+class AgentServer:
+    """
+    Asyncio server routing JSON-lines requests to per-user agents.
+
+    Admission control: at most max_concurrent turns run at once; a message is
+    rejected as "busy" when max_pending turns are already admitted, or when its
+    user already has max_pending_per_user turns admitted.
+    """
+
+    def __init__(self, manager: AgentManager,
+                 max_concurrent: int = SERVER.MAX_CONCURRENT_TURNS,
+                 max_pending: int = SERVER.MAX_PENDING_TURNS,
+                 max_pending_per_user: int = SERVER.MAX_PENDING_PER_USER,
+                 chunk_chars: int = SERVER.STREAM_CHUNK_CHARS):
+        """
+        Initialize the agent server.
+
+        Args:
+            manager (AgentManager): Manager providing the per-user agents
+            max_concurrent (int): Turns processed at once across all users
+            max_pending (int): Turns admitted (running or waiting) across all users
+            max_pending_per_user (int): Turns one user may have admitted
+            chunk_chars (int): Reply characters per chunk event
+        """
+        self.manager = manager
+        self.max_pending = max_pending
+        self.max_pending_per_user = max_pending_per_user
+        self.chunk_chars = max(1, chunk_chars)
+        self.logger = get_logger()
+
+        self._turn_slots = asyncio.Semaphore(max_concurrent)
+        # Per-user locks and admitted turn counts; both are dropped when a user has no turns
+        self._user_locks: Dict[str, asyncio.Lock] = {}
+        self._user_pending: Dict[str, int] = {}
+        self._pending = 0
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._unix_path: Optional[str] = None
+        # Connection tasks and their readers, so close() can end the connections
+        self._connections: Dict[asyncio.Task, asyncio.StreamReader] = {}
+        self._stats = {"connections": 0, "turns": 0, "rejected": 0, "errors": 0}
+
+    async def start_unix(self, path: str):
+        """
+        Start listening on a Unix socket.
+
+        Args:
+            path (str): Socket path; a stale socket file is replaced
+        """
+        if os.path.exists(path):
+            os.remove(path)
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection, path=path, limit=SERVER.MAX_LINE_BYTES
+        )
+        self._unix_path = path
+        self.logger.info(f"AgentServer listening on {path}")
+
+    async def start_tcp(self, host: str = SERVER.DEFAULT_HOST, port: int = SERVER.DEFAULT_PORT) -> Tuple[str, int]:
+        """
+        Start listening on a TCP port.
+
+        Args:
+            host (str): Host to bind; keep it local, the protocol has no authentication
+            port (int): Port to bind (0 picks a free port)
+
+        Returns:
+            Tuple[str, int]: Bound host and port
+        """
+        self._server = await asyncio.start_server(
+            self._handle_connection, host=host, port=port, limit=SERVER.MAX_LINE_BYTES
+        )
+        address = self._server.sockets[0].getsockname()[:2]
+        self.logger.info(f"AgentServer listening on {address[0]}:{address[1]}")
+        return address
+
+    async def serve_forever(self):
+        """Serve until the task is cancelled or close() is called."""
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    async def close(self):
+        """
+        Stop the server gracefully.
+
+        New connections are refused, admitted turns finish, the agents' pending memory
+        saves are flushed and the manager is shut down, which saves every session.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._unix_path is not None and os.path.exists(self._unix_path):
+            os.remove(self._unix_path)
+            self._unix_path = None
+
+        # End the connections' input; they finish their admitted turns and close
+        connections = dict(self._connections)
+        for reader in connections.values():
+            reader.feed_eof()
+        if connections:
+            await asyncio.gather(*connections, return_exceptions=True)
+
+        for agent in list(self.manager.agents.values()):
+            await agent.flush_async()
+        await asyncio.get_running_loop().run_in_executor(None, self.manager.shutdown)
+        self.logger.info("AgentServer closed")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Read requests from a connection until the client closes it.
+
+        Args:
+            reader (asyncio.StreamReader): Connection reader
+            writer (asyncio.StreamWriter): Connection writer
+        """
+        self._connections[asyncio.current_task()] = reader
+        self._stats["connections"] += 1
+        requests: Set[asyncio.Future] = set()
+
+        async def send(event: Dict[str, Any]):
+            writer.write(json.dumps(event).encode("utf-8") + b"\n")
+            try:
+                await writer.drain()
+            except ConnectionError:
+                # The client went away; its admitted turns still finish
+                pass
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The line exceeded MAX_LINE_BYTES; the stream reader discarded it
+                    await send({"id": None, "event": "error", "error": "request too long"})
+                    continue
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                task = self._dispatch(line, send)
+                requests.add(task)
+                task.add_done_callback(requests.discard)
+
+            if requests:
+                await asyncio.gather(*requests, return_exceptions=True)
+        finally:
+            writer.close()
+            self._connections.pop(asyncio.current_task(), None)
+
+    def _dispatch(self, line: bytes, send: Callable) -> asyncio.Future:
+        """
+        Parse a request line, admit it and start handling it.
+
+        Admission happens here, before any await, so the turns of a user are queued
+        on its lock in the order their lines arrived.
+
+        Args:
+            line (bytes): Raw request line
+            send (Callable): Coroutine function sending an event to the client
+
+        Returns:
+            asyncio.Future: Task handling the request
+        """
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request is not an object")
+        except ValueError:
+            self._stats["errors"] += 1
+            return asyncio.ensure_future(send({"id": None, "event": "error", "error": "invalid request"}))
+
+        request_id = request.get("id")
+        request_type = request.get("type", "message")
+
+        if request_type == "ping":
+            return asyncio.ensure_future(send({"id": request_id, "event": "pong"}))
+        if request_type == "stats":
+            return asyncio.ensure_future(send({"id": request_id, "event": "stats", "stats": self.get_stats()}))
+
+        user_id = request.get("user_id")
+        text = request.get("text")
+        if request_type != "message" or not isinstance(user_id, str) or not user_id or not isinstance(text, str):
+            self._stats["errors"] += 1
+            return asyncio.ensure_future(send({"id": request_id, "event": "error", "error": "invalid request"}))
+
+        if (self._pending >= self.max_pending
+                or self._user_pending.get(user_id, 0) >= self.max_pending_per_user):
+            self._stats["rejected"] += 1
+            return asyncio.ensure_future(send({"id": request_id, "event": "error", "error": "busy"}))
+
+        self._pending += 1
+        self._user_pending[user_id] = self._user_pending.get(user_id, 0) + 1
+        lock = self._user_locks.setdefault(user_id, asyncio.Lock())
+        return asyncio.ensure_future(self._run_turn(request_id, user_id, text, lock, send))
+
+    async def _run_turn(self, request_id: Any, user_id: str, text: str,
+                        lock: asyncio.Lock, send: Callable):
+        """
+        Process an admitted message and stream the reply.
+
+        Args:
+            request_id (Any): Client's request ID
+            user_id (str): ID of the user
+            text (str): The user's message
+            lock (asyncio.Lock): The user's lock
+            send (Callable): Coroutine function sending an event to the client
+        """
+        try:
+            await send({"id": request_id, "event": "accepted"})
+            # The reply is streamed under the user's lock too, so a user's replies arrive in order
+            async with lock:
+                try:
+                    async with self._turn_slots:
+                        loop = asyncio.get_running_loop()
+                        # Rehydrating a saved session reads from disk, so do it off the event loop
+                        agent = await loop.run_in_executor(None, self.manager.start_agent, user_id)
+                        response = await agent.process_input_async(text)
+                except asyncio.TimeoutError:
+                    self._stats["errors"] += 1
+                    await send({"id": request_id, "event": "error", "error": "timeout"})
+                    return
+                except Exception as e:
+                    self._stats["errors"] += 1
+                    self.logger.error(f"Error processing message for user {user_id}: {e}")
+                    await send({"id": request_id, "event": "error", "error": "internal error"})
+                    return
+
+                self._stats["turns"] += 1
+                for start in range(0, len(response), self.chunk_chars):
+                    await send({"id": request_id, "event": "chunk",
+                                "text": response[start:start + self.chunk_chars]})
+                await send({"id": request_id, "event": "done", "text": response})
+        finally:
+            self._pending -= 1
+            self._user_pending[user_id] -= 1
+            if not self._user_pending[user_id]:
+                del self._user_pending[user_id]
+                del self._user_locks[user_id]
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the server's counters.
+
+        Returns:
+            Dict[str, int]: Connection, turn, rejection and error counts, admitted turns
+                and users, and agents in memory
+        """
+        stats = dict(self._stats)
+        stats["pending"] = self._pending
+        stats["active_users"] = len(self._user_pending)
+        stats["agents"] = len(self.manager.agents)
+        return stats
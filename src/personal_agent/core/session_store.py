@@ -0,0 +1,380 @@
+"""
+Session Store for Personal Agent
+
+This module keeps the sessions (agents) of active users in memory and saves idle
+ones to disk. Sessions are evicted least recently used first once more than
+max_active are in memory, and whenever they have been idle for idle_timeout
+seconds. Evicted sessions are written as one small JSON file per user and
+rehydrated lazily on the user's next message, so memory stays flat however many
+dormant users there are. Saved sessions idle for longer than session_timeout
+expire: the user starts a new conversation. Sessions are created and rehydrated
+outside the store lock, one user at a time, so a slow rehydration only delays
+that user.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ..config.constants import CONVERSATION
+from ..utils.logging import get_logger
+
+
+class SessionStore:
+    """
+    LRU store of in-memory sessions backed by one file per idle session.
+
+    Sessions are objects with export_session() and restore_session(data), such as
+    Agent. The factory creates a fresh session for a user. A session that has a
+    close() method is closed when it leaves memory, to stop its background work.
+    """
+
+    def __init__(self, factory: Callable[[str], Any], directory: str,
+                 max_active: int = CONVERSATION.MAX_ACTIVE_SESSIONS,
+                 idle_timeout: float = CONVERSATION.IDLE_TIMEOUT,
+                 session_timeout: float = CONVERSATION.SESSION_TIMEOUT):
+        """
+        Initialize the session store.
+
+        Args:
+            factory (Callable[[str], Any]): Creates a fresh session for a user ID
+            directory (str): Directory of the saved sessions
+            max_active (int): Sessions kept in memory
+            idle_timeout (float): Seconds after which an idle session is saved and evicted
+            session_timeout (float): Seconds after which a saved idle session expires
+        """
+        self.factory = factory
+        self.directory = directory
+        self.max_active = max(1, max_active)
+        self.idle_timeout = idle_timeout
+        self.session_timeout = session_timeout
+        self.logger = get_logger()
+
+        # User ID -> session, least recently used first
+        self.sessions: "OrderedDict[str, Any]" = OrderedDict()
+        self._last_active: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        # User ID -> [lock held while the user's session is built, threads using it]
+        self._build_locks: Dict[str, list] = {}
+        self._stats = {
+            "created": 0,
+            "rehydrated": 0,
+            "evicted": 0,
+            "expired": 0,
+            "save_errors": 0
+        }
+
+    def _path(self, user_id: str) -> str:
+        """
+        Get the file of a user's saved session.
+
+        User IDs are hashed into a safe file name; files are spread over 256
+        subdirectories so that no directory grows too large.
+
+        Args:
+            user_id (str): ID of the user
+
+        Returns:
+            str: Path of the session file
+        """
+        digest = hashlib.sha256(user_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.json")
+
+    def get(self, user_id: str, create: bool = True) -> Optional[Any]:
+        """
+        Get a user's session, rehydrating a saved one or creating a new one.
+
+        Args:
+            user_id (str): ID of the user
+            create (bool): Create a new session if the user has none
+
+        Returns:
+            Optional[Any]: The session, or None if the user has none and create is False
+        """
+        now = time.time()
+        evicted: List[Tuple[str, Any]] = []
+        try:
+            with self._lock:
+                evicted.extend(self._evict_idle(now))
+                session = self._touch(user_id, now)
+                if session is not None:
+                    return session
+                build_lock = self._acquire_build_lock(user_id)
+
+            try:
+                with build_lock:
+                    # Another thread may have built the session while this one waited
+                    with self._lock:
+                        session = self._touch(user_id, now)
+                    if session is not None:
+                        return session
+                    return self._build(user_id, now, create, evicted)
+            finally:
+                with self._lock:
+                    self._release_build_lock(user_id)
+        finally:
+            self._close_all(evicted)
+
+    def _build(self, user_id: str, now: float, create: bool,
+               evicted: List[Tuple[str, Any]]) -> Optional[Any]:
+        """
+        Rehydrate or create a user's session and publish it. The caller holds the
+        user's build lock but not the store lock.
+
+        Args:
+            user_id (str): ID of the user
+            now (float): Current time
+            create (bool): Create a new session if the user has none
+            evicted (List[Tuple[str, Any]]): Collects the sessions to close
+
+        Returns:
+            Optional[Any]: The session, or None if the user has none and create is False
+        """
+        data = self._load(user_id, now)
+        if data is None and not create:
+            return None
+
+        session = self.factory(user_id)
+        if data is not None:
+            session.restore_session(data["session"])
+
+        with self._lock:
+            current = self._touch(user_id, now)
+            if current is None:
+                self._stats["rehydrated" if data is not None else "created"] += 1
+                evicted.extend(self._add(user_id, session, now))
+                return session
+        # A session added meanwhile (see add) replaces the one built here
+        evicted.append((user_id, session))
+        return current
+
+    def _touch(self, user_id: str, now: float) -> Optional[Any]:
+        """
+        Mark a user's in-memory session as just used. The caller holds the lock.
+
+        Returns:
+            Optional[Any]: The session, or None if it is not in memory
+        """
+        session = self.sessions.get(user_id)
+        if session is not None:
+            self.sessions.move_to_end(user_id)
+            self._last_active[user_id] = now
+        return session
+
+    def _acquire_build_lock(self, user_id: str) -> threading.Lock:
+        """Register a thread about to build a user's session and get its lock. The caller holds the lock."""
+        entry = self._build_locks.setdefault(user_id, [threading.Lock(), 0])
+        entry[1] += 1
+        return entry[0]
+
+    def _release_build_lock(self, user_id: str):
+        """Unregister a thread that built a user's session. The caller holds the lock."""
+        entry = self._build_locks[user_id]
+        entry[1] -= 1
+        if not entry[1]:
+            del self._build_locks[user_id]
+
+    def add(self, user_id: str, session: Any):
+        """
+        Put a session in the store, replacing the user's current one.
+
+        Args:
+            user_id (str): ID of the user
+            session (Any): Session to keep
+        """
+        with self._lock:
+            replaced = self.sessions.get(user_id)
+            evicted = self._add(user_id, session, time.time())
+        if replaced is not None and replaced is not session:
+            evicted.append((user_id, replaced))
+        self._close_all(evicted)
+
+    def _add(self, user_id: str, session: Any, now: float) -> List[Tuple[str, Any]]:
+        """
+        Keep a session in memory and evict the least recently used ones. The caller
+        holds the lock and closes the evicted sessions once it has released it.
+
+        Returns:
+            List[Tuple[str, Any]]: Evicted (user ID, session) pairs
+        """
+        self.sessions[user_id] = session
+        self.sessions.move_to_end(user_id)
+        self._last_active[user_id] = now
+        evicted = []
+        while len(self.sessions) > self.max_active:
+            evicted.append(self._evict(next(iter(self.sessions))))
+        return evicted
+
+    def remove(self, user_id: str) -> bool:
+        """
+        Drop a user's session from memory and disk.
+
+        Args:
+            user_id (str): ID of the user
+
+        Returns:
+            bool: True if the user had a session
+        """
+        with self._lock:
+            session = self.sessions.pop(user_id, None)
+            found = session is not None
+            self._last_active.pop(user_id, None)
+            path = self._path(user_id)
+            if os.path.exists(path):
+                os.remove(path)
+                found = True
+        if session is not None:
+            self._close(user_id, session)
+        return found
+
+    def evict_idle(self, now: float = None) -> int:
+        """
+        Save and evict the sessions that have been idle for idle_timeout seconds.
+
+        Args:
+            now (float): Current time (default: time.time())
+
+        Returns:
+            int: Number of evicted sessions
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            evicted = self._evict_idle(now)
+        self._close_all(evicted)
+        return len(evicted)
+
+    def _evict_idle(self, now: float) -> List[Tuple[str, Any]]:
+        """
+        Save and drop the idle sessions. The caller holds the lock and closes the
+        evicted sessions once it has released it.
+
+        Returns:
+            List[Tuple[str, Any]]: Evicted (user ID, session) pairs
+        """
+        evicted = []
+        # Sessions are in order of last activity, so idle ones are at the front
+        for user_id in list(self.sessions):
+            if now - self._last_active.get(user_id, now) < self.idle_timeout:
+                break
+            evicted.append(self._evict(user_id))
+        return evicted
+
+    def save_all(self) -> int:
+        """
+        Save and evict every session in memory, e.g. at shutdown.
+
+        Returns:
+            int: Number of saved sessions
+        """
+        with self._lock:
+            evicted = [self._evict(user_id) for user_id in list(self.sessions)]
+        self._close_all(evicted)
+        return len(evicted)
+
+    def _evict(self, user_id: str) -> Tuple[str, Any]:
+        """
+        Save a session to disk and drop it from memory. The caller holds the lock.
+
+        Returns:
+            Tuple[str, Any]: The user ID and the session, to be closed
+        """
+        session = self.sessions.pop(user_id)
+        last_active = self._last_active.pop(user_id, time.time())
+        try:
+            self._save(user_id, session.export_session(), last_active)
+            self._stats["evicted"] += 1
+        except Exception as e:
+            self._stats["save_errors"] += 1
+            self.logger.error(f"Error saving session for user {user_id}: {e}")
+        return user_id, session
+
+    def _close_all(self, sessions: List[Tuple[str, Any]]):
+        """
+        Close sessions that left memory. Called without the lock, as closing may wait
+        for background work (e.g. memory enrichment) to finish.
+
+        Args:
+            sessions (List[Tuple[str, Any]]): (user ID, session) pairs
+        """
+        for user_id, session in sessions:
+            self._close(user_id, session)
+
+    def _close(self, user_id: str, session: Any):
+        """Stop the background work of a session leaving memory, if it has a close() method."""
+        close = getattr(session, "close", None)
+        if close is None:
+            return
+        try:
+            close()
+        except Exception as e:
+            self.logger.error(f"Error closing session for user {user_id}: {e}")
+
+    def _save(self, user_id: str, session_data: Dict[str, Any], last_active: float):
+        """
+        Write a session file atomically.
+
+        Args:
+            user_id (str): ID of the user
+            session_data (Dict[str, Any]): Exported session
+            last_active (float): Time of the user's last message
+        """
+        path = self._path(user_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "user_id": user_id,
+                "last_active": last_active,
+                "session": session_data
+            }, f, default=str)
+        os.replace(temp_path, path)
+
+    def _load(self, user_id: str, now: float) -> Optional[Dict[str, Any]]:
+        """
+        Read and delete a user's saved session.
+
+        Args:
+            user_id (str): ID of the user
+            now (float): Current time
+
+        Returns:
+            Optional[Dict[str, Any]]: The saved session, or None if there is none or
+                it has expired
+        """
+        path = self._path(user_id)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Discarding unreadable session for user {user_id}: {e}")
+            data = None
+        os.remove(path)
+
+        if data is None or data.get("user_id") != user_id:
+            return None
+        if now - data.get("last_active", 0) > self.session_timeout:
+            with self._lock:
+                self._stats["expired"] += 1
+            return None
+        return data
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self.sessions or os.path.exists(self._path(user_id))
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the store's counters.
+
+        Returns:
+            Dict[str, int]: Active sessions and created/rehydrated/evicted/expired counts
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["active"] = len(self.sessions)
+            return stats
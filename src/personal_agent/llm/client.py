@@ -4,6 +4,8 @@ LLM Client for Personal Agent
 This module contains the main LLM client interface and implementation.
 """
 
+import asyncio
+import functools
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from .providers.base import LLMProvider
@@ -148,11 +150,17 @@ class LLMClient:
         logger = get_logger()
         try:
             logger.info(f"Generating async response with {len(messages)} messages")
-            # Check if provider has async method, otherwise use sync method
-            if hasattr(self.provider, 'generate_response_async'):
+            # Use the provider's async method; run providers without one in the default
+            # executor so that the event loop is not blocked
+            try:
+                if not hasattr(self.provider, 'generate_response_async'):
+                    raise NotImplementedError
                 response = await self.provider.generate_response_async(messages, **kwargs)
-            else:
-                response = self.provider.generate_response(messages, **kwargs)
+            except NotImplementedError:
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(
+                    None, functools.partial(self.provider.generate_response, messages, **kwargs)
+                )
             logger.info("Async response generated successfully")
             
             # Cache the response
@@ -5,10 +5,30 @@ This module contains the abstract base class for LLM providers.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List
 from ..models import Message, LLMResponse
 
 
+def usage_to_dict(usage) -> Dict[str, int]:
+    """
+    Convert the usage of an OpenAI-compatible chat completion to a dictionary.
+    
+    Args:
+        usage: ``usage`` object of the completion response
+        
+    Returns:
+        Dict[str, int]: Prompt, completion and total tokens, plus the prompt tokens
+            served from the provider's prompt cache (0 when not reported)
+    """
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens,
+        "cached_tokens": getattr(details, "cached_tokens", None) or 0
+    }
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
     
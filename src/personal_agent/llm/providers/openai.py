@@ -4,19 +4,19 @@ OpenAI Provider for LLM Integration
 This module contains the OpenAI provider implementation.
 """
 
+from functools import cached_property
 from typing import List
-from .base import LLMProvider
+from .base import LLMProvider, usage_to_dict
 from ..models import Message, LLMResponse
 from ..exceptions import LLMException, AuthenticationError, RateLimitError, ModelError, InvalidRequestError, NetworkError, ServiceUnavailableError, TimeoutError, ContextLengthError, ContentPolicyError, QuotaExceededError
 from ...utils.logging import get_logger, log_exception
-from ...utils.retry import RetryConfig, retry_function
+from ...utils.retry import RetryConfig, retry_function, retry_function_async
+from ...utils.resources import get_resource_registry
+from ...utils.lazy_import import lazy_import, module_available
 
-# Try to import openai, but handle if it's not available
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# openai is slow to import, so it is imported when the first client is created
+openai = lazy_import("openai")
+OPENAI_AVAILABLE = module_available("openai")
 
 
 class OpenAIProvider(LLMProvider):
@@ -36,9 +36,35 @@ class OpenAIProvider(LLMProvider):
         
         if not OPENAI_AVAILABLE:
             raise LLMException("OpenAI library not available. Please install it with 'pip install openai'")
+    
+    @cached_property
+    def client(self):
+        """
+        Get the OpenAI client, created (and openai imported) on the first request.
+        
+        One client, and so one HTTP connection pool, is shared per API key.
         
-        # Initialize the OpenAI client
-        self.client = openai.OpenAI(api_key=config.api_key)
+        Returns:
+            openai.OpenAI: Client with its own HTTP connection pool
+        """
+        return get_resource_registry().get(
+            "http_client",
+            ("openai", self.config.api_key),
+            lambda: openai.OpenAI(api_key=self.config.api_key)
+        )
+    
+    def _get_async_client(self):
+        """
+        Get the async OpenAI client, shared per API key like the sync one.
+        
+        Returns:
+            openai.AsyncOpenAI: Async client with its own HTTP connection pool
+        """
+        return get_resource_registry().get(
+            "async_http_client",
+            ("openai", self.config.api_key),
+            lambda: openai.AsyncOpenAI(api_key=self.config.api_key)
+        )
     
     def _convert_messages(self, messages: List[Message]) -> List[dict]:
         """
@@ -161,11 +187,7 @@ class OpenAIProvider(LLMProvider):
             return LLMResponse(
                 content=response.choices[0].message.content,
                 finish_reason=response.choices[0].finish_reason,
-                usage={
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                },
+                usage=usage_to_dict(response.usage),
                 model=response.model
             )
         except RateLimitError:
@@ -260,10 +282,44 @@ class OpenAIProvider(LLMProvider):
         """
         logger = get_logger()
         
+        # Configure retry mechanism
+        retry_config = RetryConfig(
+            max_retries=3,
+            base_delay=1.0,
+            max_delay=30.0,
+            exponential_base=2.0,
+            jitter=True
+        )
+        client = self._get_async_client()
+        
+        async def _make_api_call():
+            logger.info(f"Calling OpenAI API asynchronously with model: {self.config.model or 'gpt-3.5-turbo'}")
+            response = await client.chat.completions.create(
+                model=self.config.model or "gpt-3.5-turbo",
+                messages=self._convert_messages(messages),
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+                **kwargs
+            )
+            logger.info("OpenAI async API call successful")
+            return response
+        
         try:
-            # For now, we'll use the sync method since the OpenAI library doesn't have native async support
-            # In a real implementation, you would use the async version of the OpenAI library
-            return self.generate_response(messages, **kwargs)
+            response = await retry_function_async(
+                _make_api_call,
+                retry_config,
+                retryable_exceptions=(LLMException, RateLimitError, NetworkError, ServiceUnavailableError, TimeoutError),
+                logger=logger
+            )
+            
+            return LLMResponse(
+                content=response.choices[0].message.content,
+                finish_reason=response.choices[0].finish_reason,
+                usage=usage_to_dict(response.usage),
+                model=response.model
+            )
+        except (RateLimitError, AuthenticationError, ModelError):
+            raise
         except Exception as e:
             log_exception(e, "OpenAI async API call")
             raise self._handle_openai_exception(e)
@@ -4,19 +4,19 @@ OpenRouter Provider for LLM Integration
 This module contains the OpenRouter provider implementation, which is compatible with the OpenAI API.
 """
 
+from functools import cached_property
 from typing import List
-from .base import LLMProvider
+from .base import LLMProvider, usage_to_dict
 from ..models import Message, LLMResponse
 from ..exceptions import LLMException, RateLimitError, AuthenticationError, ModelError, InvalidRequestError, NetworkError, ServiceUnavailableError, TimeoutError, ContextLengthError, ContentPolicyError, QuotaExceededError
 from ...utils.logging import get_logger, log_exception
-from ...utils.retry import RetryConfig, retry_function
+from ...utils.retry import RetryConfig, retry_function, retry_function_async
+from ...utils.resources import get_resource_registry
+from ...utils.lazy_import import lazy_import, module_available
 
-# Try to import openai, but handle if it's not available
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# openai is slow to import, so it is imported when the first client is created
+openai = lazy_import("openai")
+OPENAI_AVAILABLE = module_available("openai")
 
 
 class OpenRouterProvider(LLMProvider):
@@ -36,11 +36,34 @@ class OpenRouterProvider(LLMProvider):
         
         if not OPENAI_AVAILABLE:
             raise LLMException("OpenAI library not available. Please install it with 'pip install openai'")
+    
+    @cached_property
+    def client(self):
+        """
+        Get the OpenAI client, created (and openai imported) on the first request.
+        
+        One client, and so one HTTP connection pool, is shared per API key.
         
-        # Initialize the OpenAI client with OpenRouter base URL
-        self.client = openai.OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=config.api_key
+        Returns:
+            openai.OpenAI: Client with its own HTTP connection pool
+        """
+        return get_resource_registry().get(
+            "http_client",
+            ("openrouter", self.config.api_key),
+            lambda: openai.OpenAI(base_url="https://openrouter.ai/api/v1", api_key=self.config.api_key)
+        )
+    
+    def _get_async_client(self):
+        """
+        Get the async OpenAI client, shared per API key like the sync one.
+        
+        Returns:
+            openai.AsyncOpenAI: Async client with its own HTTP connection pool
+        """
+        return get_resource_registry().get(
+            "async_http_client",
+            ("openrouter", self.config.api_key),
+            lambda: openai.AsyncOpenAI(base_url="https://openrouter.ai/api/v1", api_key=self.config.api_key)
         )
     
     def _convert_messages(self, messages: List[Message]) -> List[dict]:
@@ -164,11 +187,7 @@ class OpenRouterProvider(LLMProvider):
             return LLMResponse(
                 content=response.choices[0].message.content,
                 finish_reason=response.choices[0].finish_reason,
-                usage={
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens
-                },
+                usage=usage_to_dict(response.usage),
                 model=response.model
             )
         except RateLimitError:
@@ -263,10 +282,44 @@ class OpenRouterProvider(LLMProvider):
         """
         logger = get_logger()
         
+        # Configure retry mechanism
+        retry_config = RetryConfig(
+            max_retries=3,
+            base_delay=1.0,
+            max_delay=30.0,
+            exponential_base=2.0,
+            jitter=True
+        )
+        client = self._get_async_client()
+        
+        async def _make_api_call():
+            logger.info(f"Calling OpenRouter API asynchronously with model: {self.config.model or 'qwen/qwen3-coder:free'}")
+            response = await client.chat.completions.create(
+                model=self.config.model or "qwen/qwen3-coder:free",
+                messages=self._convert_messages(messages),
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+                **kwargs
+            )
+            logger.info("OpenRouter async API call successful")
+            return response
+        
         try:
-            # For now, we'll use the sync method since the OpenAI library doesn't have native async support
-            # In a real implementation, you would use the async version of the OpenAI library
-            return self.generate_response(messages, **kwargs)
+            response = await retry_function_async(
+                _make_api_call,
+                retry_config,
+                retryable_exceptions=(LLMException, RateLimitError),
+                logger=logger
+            )
+            
+            return LLMResponse(
+                content=response.choices[0].message.content,
+                finish_reason=response.choices[0].finish_reason,
+                usage=usage_to_dict(response.usage),
+                model=response.model
+            )
+        except (RateLimitError, AuthenticationError, ModelError):
+            raise
         except Exception as e:
             log_exception(e, "OpenRouter async API call")
             raise self._handle_openrouter_exception(e)
@@ -9,7 +9,8 @@ from typing import List, Dict, Any, Optional
 from ..llm.client import LLMClient
 from ..llm.models import Message
 from ..config.settings import Config
-from ..context.processor import ContextProcessor
+from ..context.processor import get_shared_context_processor
+from ..context.budget import PromptAssembler
 from ..utils.logging import get_logger
 from ..llm.exceptions import LLMException
 
@@ -27,14 +28,25 @@ class LLMService:
             config (Config): Configuration object
             llm_client (LLMClient): LLM client instance
         """
-        self.config = config or Config.load()
+        self.config = config or Config.load_shared()
         try:
             self.client = llm_client or LLMClient(self.config)
         except Exception as e:
             logger = get_logger()
             logger.warning(f"Could not initialize LLM client: {e}")
             self.client = None
-        self.context_processor = ContextProcessor()
+        self.context_processor = get_shared_context_processor()
+        self.prompt_assembler = PromptAssembler(
+            context_window=self.config.llm.context_window,
+            max_tokens=self.config.llm.max_tokens,
+            layout=self.config.llm.prompt_layout
+        )
+        self.usage_totals = {
+            "requests": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "completion_tokens": 0
+        }
         self.logger = get_logger()
     
     def generate_response(self, user_input: str, conversation_history: List[Dict[str, str]], 
@@ -56,47 +68,125 @@ class LLMService:
         if not self.client:
             raise LLMException("LLM client not initialized")
         
-        # Use context processor to create context-aware prompt if available
-        if self.context_processor:
-            messages = self.context_processor.create_context_aware_prompt(
-                user_input=user_input,
-                conversation_history=conversation_history,
-                memory_context=memory_context
-            )
-        else:
-            # Fallback to original method
-            messages = []
-            
-            # Add memory context if available
-            if memory_context:
-                messages.append(Message(
-                    role="system",
-                    content=f"Use the following conversation history as context:\n{memory_context}"
-                ))
-            
-            # Add recent conversation history (limit to last 5 turns)
-            for turn in conversation_history[-10:]:  # Last 5 turns (10 messages)
-                messages.append(Message(
-                    role=turn["role"],
-                    content=turn["content"]
-                ))
-            
-            # Add the current user input
-            messages.append(Message(
-                role="user",
-                content=user_input
-            ))
+        messages = self._assemble_messages(user_input, conversation_history, memory_context)
         
         # Generate response from LLM
         try:
             self.logger.info(f"Generating LLM response with {len(messages)} messages")
             response = self.client.generate_response(messages)
             self.logger.info("LLM response generated successfully")
+            self._record_usage(getattr(response, "usage", None))
             return response.content
         except Exception as e:
             self.logger.error(f"Error generating LLM response: {e}")
             raise
     
+    async def generate_response_async(self, user_input: str, conversation_history: List[Dict[str, str]],
+                                      memory_context: str = "") -> str:
+        """
+        Generate a response using the LLM client without blocking the event loop.
+        
+        Args:
+            user_input (str): The user's input
+            conversation_history (List[Dict[str, str]]): Recent conversation history
+            memory_context (str): Context retrieved from memory
+            
+        Returns:
+            str: The LLM-generated response
+            
+        Raises:
+            LLMException: If there's an error with the LLM
+        """
+        if not self.client:
+            raise LLMException("LLM client not initialized")
+        
+        messages = self._assemble_messages(user_input, conversation_history, memory_context)
+        
+        try:
+            self.logger.info(f"Generating async LLM response with {len(messages)} messages")
+            response = await self.client.generate_response_async(messages)
+            self.logger.info("Async LLM response generated successfully")
+            self._record_usage(getattr(response, "usage", None))
+            return response.content
+        except Exception as e:
+            self.logger.error(f"Error generating async LLM response: {e}")
+            raise
+    
+    def _assemble_messages(self, user_input: str, conversation_history: List[Dict[str, str]],
+                           memory_context: str) -> List[Message]:
+        """
+        Assemble the prompt messages for a turn within the token budget.
+        
+        Args:
+            user_input (str): The user's input
+            conversation_history (List[Dict[str, str]]): Recent conversation history
+            memory_context (str): Context retrieved from memory
+            
+        Returns:
+            List[Message]: Messages to send to the LLM
+        """
+        # Use context processor to create context-aware prompt if available
+        if self.context_processor:
+            assembled = self.context_processor.assemble_context_aware_prompt(
+                user_input=user_input,
+                conversation_history=conversation_history,
+                memory_context=memory_context,
+                assembler=self.prompt_assembler
+            )
+        else:
+            # Fallback to original method
+            assembled = self.prompt_assembler.assemble(
+                user_input=user_input,
+                conversation_history=conversation_history,
+                memory_context=memory_context,
+                context_preamble="Use the following conversation history as context:\n"
+            )
+        messages = assembled.messages
+        
+        if assembled.dropped:
+            self.logger.info(
+                f"Prompt budget of {assembled.budget} tokens: dropped {len(assembled.dropped)} "
+                f"history/memory entries (~{assembled.dropped_tokens} tokens)"
+            )
+        if assembled.over_budget:
+            self.logger.warning(
+                f"Prompt of ~{assembled.estimated_tokens} tokens exceeds the budget of {assembled.budget} tokens"
+            )
+        
+        return messages
+    
+    def _record_usage(self, usage: Optional[Dict[str, int]]):
+        """
+        Add the token usage of a response to the running totals.
+        
+        Args:
+            usage (Optional[Dict[str, int]]): Usage reported with the response, if any
+        """
+        if not usage:
+            return
+        
+        self.usage_totals["requests"] += 1
+        for key in ("prompt_tokens", "cached_tokens", "completion_tokens"):
+            self.usage_totals[key] += usage.get(key) or 0
+        
+        if usage.get("cached_tokens"):
+            self.logger.info(
+                f"Prompt cache: {usage['cached_tokens']} of {usage.get('prompt_tokens', 0)} prompt tokens cached"
+            )
+    
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """
+        Get the token usage of the responses generated so far.
+        
+        Returns:
+            Dict[str, Any]: Requests with reported usage, prompt, cached and completion
+                token totals, and the share of prompt tokens served from the prompt cache
+        """
+        stats = dict(self.usage_totals)
+        prompt_tokens = stats["prompt_tokens"]
+        stats["cached_prompt_ratio"] = stats["cached_tokens"] / prompt_tokens if prompt_tokens else 0.0
+        return stats
+    
     def is_initialized(self) -> bool:
         """
         Check if the LLM service is properly initialized.
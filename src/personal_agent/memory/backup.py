@@ -0,0 +1,282 @@
+"""
+Memory Backup for Personal Agent
+
+This module contains the backup manager that takes point-in-time snapshots of the
+memory database while the agent is running. Snapshots use SQLite's online backup API,
+which copies the database a few pages at a time and lets writers in between steps.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from ..config.constants import DATABASE
+from ..utils.logging import get_logger
+
+
+class MemoryBackupManager:
+    """
+    Creates, rotates and restores snapshots of the memory database.
+    """
+
+    TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S%f"
+
+    def __init__(self, db_path: str, backup_dir: str = "data/backups",
+                 max_snapshots: int = DATABASE.MAX_BACKUP_SNAPSHOTS,
+                 pages_per_step: int = DATABASE.BACKUP_PAGES_PER_STEP,
+                 step_sleep: float = DATABASE.BACKUP_STEP_SLEEP):
+        """
+        Initialize the backup manager.
+
+        Args:
+            db_path (str): Path to the live SQLite database
+            backup_dir (str): Directory where snapshots are written
+            max_snapshots (int): Number of snapshots kept by rotation
+            pages_per_step (int): Pages copied per backup step
+            step_sleep (float): Seconds to sleep between steps so writers are not stalled
+        """
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.max_snapshots = max_snapshots
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.logger = get_logger()
+        self._snapshot_lock = threading.Lock()
+        self._scheduler_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @property
+    def _snapshot_prefix(self) -> str:
+        """Filename prefix shared by all snapshots of this database."""
+        return os.path.splitext(os.path.basename(self.db_path))[0] + "-"
+
+    def _copy(self, source_path: str, target_path: str):
+        """
+        Copy one database into another with the online backup API.
+
+        The source is opened read-only, so a missing source raises instead of being
+        created empty and copied over the target.
+
+        Args:
+            source_path (str): Database to copy from
+            target_path (str): Database to copy into (overwritten)
+        """
+        source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target, pages=self.pages_per_step, sleep=self.step_sleep)
+        finally:
+            target.close()
+            source.close()
+
+    @staticmethod
+    def verify_snapshot(snapshot_path: str) -> bool:
+        """
+        Check that a snapshot is a readable, consistent SQLite database.
+
+        Args:
+            snapshot_path (str): Path to the snapshot
+
+        Returns:
+            bool: True if the snapshot passes SQLite's quick check
+        """
+        if not os.path.exists(snapshot_path):
+            return False
+        try:
+            conn = sqlite3.connect(f"file:{snapshot_path}?mode=ro", uri=True)
+            try:
+                row = conn.execute("PRAGMA quick_check").fetchone()
+                return bool(row) and row[0] == "ok"
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return False
+
+    def create_snapshot(self, label: str = None, preserve: str = None) -> Optional[str]:
+        """
+        Take a point-in-time snapshot of the live database.
+
+        The snapshot is written to a temporary file and renamed into place once
+        complete, so a crash never leaves a torn snapshot behind.
+
+        Args:
+            label (str): Optional label appended to the snapshot filename
+            preserve (str): Snapshot that rotation must not delete
+
+        Returns:
+            Optional[str]: Path to the snapshot, or None if the backup failed
+        """
+        if not os.path.exists(self.db_path):
+            self.logger.warning(f"Cannot back up missing database: {self.db_path}")
+            return None
+
+        with self._snapshot_lock:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            timestamp = datetime.now().strftime(self.TIMESTAMP_FORMAT)
+            suffix = f"-{label}" if label else ""
+            snapshot_path = os.path.join(self.backup_dir, f"{self._snapshot_prefix}{timestamp}{suffix}.db")
+            partial_path = snapshot_path + ".partial"
+
+            try:
+                self._copy(self.db_path, partial_path)
+                os.replace(partial_path, snapshot_path)
+            except (sqlite3.Error, OSError) as e:
+                self.logger.error(f"Error creating snapshot of {self.db_path}: {e}")
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+                return None
+
+            self.logger.info(f"Memory snapshot created: {snapshot_path}")
+            self.rotate(preserve=preserve)
+            return snapshot_path
+
+    async def create_snapshot_async(self, label: str = None) -> Optional[str]:
+        """
+        Take a snapshot without blocking the event loop.
+
+        Args:
+            label (str): Optional label appended to the snapshot filename
+
+        Returns:
+            Optional[str]: Path to the snapshot, or None if the backup failed
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.create_snapshot, label)
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """
+        List the snapshots of this database, newest first.
+
+        Returns:
+            List[Dict[str, Any]]: Snapshot path, creation time and size in bytes
+        """
+        if not os.path.isdir(self.backup_dir):
+            return []
+
+        snapshots = []
+        for filename in os.listdir(self.backup_dir):
+            if not (filename.startswith(self._snapshot_prefix) and filename.endswith(".db")):
+                continue
+            timestamp = filename[len(self._snapshot_prefix):-len(".db")].split("-", 1)[0]
+            try:
+                created_at = datetime.strptime(timestamp, self.TIMESTAMP_FORMAT)
+            except ValueError:
+                continue
+            path = os.path.join(self.backup_dir, filename)
+            snapshots.append({
+                "path": path,
+                "created_at": created_at,
+                "size": os.path.getsize(path)
+            })
+
+        snapshots.sort(key=lambda snapshot: snapshot["created_at"], reverse=True)
+        return snapshots
+
+    def rotate(self, keep: int = None, preserve: str = None) -> int:
+        """
+        Delete the oldest snapshots beyond the retention limit.
+
+        Args:
+            keep (int): Number of snapshots to keep (default: max_snapshots)
+            preserve (str): Snapshot that is never deleted, e.g. one being restored
+
+        Returns:
+            int: Number of snapshots deleted
+        """
+        keep = self.max_snapshots if keep is None else keep
+        removed = 0
+        snapshots = self.list_snapshots()
+        if preserve:
+            preserve = os.path.abspath(preserve)
+            snapshots = [snapshot for snapshot in snapshots if os.path.abspath(snapshot["path"]) != preserve]
+            keep -= 1
+        for snapshot in snapshots[max(keep, 0):]:
+            try:
+                os.remove(snapshot["path"])
+                removed += 1
+            except OSError as e:
+                self.logger.warning(f"Could not remove snapshot {snapshot['path']}: {e}")
+
+        if removed:
+            self.logger.info(f"Snapshot rotation removed {removed} old snapshots")
+        return removed
+
+    def restore(self, snapshot_path: str, target_path: str = None) -> bool:
+        """
+        Restore a snapshot into the live database (or another target).
+
+        The snapshot is verified first, and the current database is snapshotted with
+        the ``pre-restore`` label so a restore can itself be undone. Other connections
+        see the restored contents on their next transaction.
+
+        Args:
+            snapshot_path (str): Snapshot to restore
+            target_path (str): Database to restore into (default: the live database)
+
+        Returns:
+            bool: True if the restore succeeded, False otherwise
+        """
+        target_path = target_path or self.db_path
+
+        if not self.verify_snapshot(snapshot_path):
+            self.logger.error(f"Refusing to restore invalid snapshot: {snapshot_path}")
+            return False
+
+        if target_path == self.db_path and os.path.exists(self.db_path):
+            if self.create_snapshot(label="pre-restore", preserve=snapshot_path) is None:
+                self.logger.error("Could not snapshot the live database before restore")
+                return False
+
+        try:
+            target_dir = os.path.dirname(target_path)
+            if target_dir:
+                os.makedirs(target_dir, exist_ok=True)
+            with self._snapshot_lock:
+                self._copy(snapshot_path, target_path)
+        except (sqlite3.Error, OSError) as e:
+            self.logger.error(f"Error restoring snapshot {snapshot_path}: {e}")
+            return False
+
+        self.logger.info(f"Restored {target_path} from snapshot {snapshot_path}")
+        return True
+
+    def start_scheduler(self, interval: int = DATABASE.BACKUP_INTERVAL):
+        """
+        Take snapshots periodically in a background thread.
+
+        Args:
+            interval (int): Seconds between snapshots
+        """
+        if self.is_scheduler_running():
+            return
+
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.wait(interval):
+                self.create_snapshot()
+
+        self._scheduler_thread = threading.Thread(target=run, name="memory_backup", daemon=True)
+        self._scheduler_thread.start()
+        self.logger.info(f"Memory backup scheduler started (every {interval}s)")
+
+    def stop_scheduler(self):
+        """Stop the background snapshot thread."""
+        if not self.is_scheduler_running():
+            return
+
+        self._stop_event.set()
+        self._scheduler_thread.join()
+        self._scheduler_thread = None
+        self.logger.info("Memory backup scheduler stopped")
+
+    def is_scheduler_running(self) -> bool:
+        """
+        Check whether scheduled snapshots are running.
+
+        Returns:
+            bool: True if the scheduler thread is alive
+        """
+        return self._scheduler_thread is not None and self._scheduler_thread.is_alive()
@@ -0,0 +1,352 @@
+"""
+Memory Context Builder for Personal Agent
+
+This module contains the per-session builder of the memory context. It keeps
+each memory item's formatted text and relevance scores, so adding a turn or a
+knowledge item only formats that item, and assembling the context for a turn only
+scores items that have not been scored for the same input before. The cached scores
+leave out the recency part, which is recomputed whenever the context is assembled.
+Summaries of conversations rolled up by the tiered service are listed after the
+knowledge, as the oldest context. With pinned knowledge, the newest knowledge items form
+a section of their own, in a fixed order whatever the input, and only the other items
+are ranked, so the prefix-stable prompt layout can cache them.
+"""
+
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple, Deque
+from .models import MemoryItem
+from ..config.constants import CONVERSATION, CONTEXT
+from ..context.budget import MemoryContext, KNOWLEDGE_SECTION_HEADER, PINNED_KNOWLEDGE_SECTION_HEADER
+from ..context.scoring import RECENCY_WEIGHT
+from ..utils.logging import get_logger
+
+
+CONVERSATION_HEADER = "Recent conversation history:"
+SUMMARY_HEADER = "Earlier conversation summaries:"
+
+
+def format_conversation_turns(item: MemoryItem) -> Tuple[str, ...]:
+    """
+    Format the turns of a conversation memory item as context entries.
+
+    Args:
+        item (MemoryItem): Conversation memory item
+
+    Returns:
+        Tuple[str, ...]: One entry per turn
+    """
+    return tuple(f"{turn['role']}: {turn['content']}" for turn in item.content.get("turns", []))
+
+
+def format_knowledge_line(item: MemoryItem) -> str:
+    """
+    Format a knowledge memory item as a context entry.
+
+    Args:
+        item (MemoryItem): Knowledge memory item
+
+    Returns:
+        str: Formatted entry, or an empty string for items that are neither preference nor fact
+    """
+    if "preference" in item.content:
+        return f"Preference: {item.content['preference']}"
+    elif "fact" in item.content:
+        return f"Fact: {item.content['fact']}"
+    return ""
+
+
+def format_summary_line(item: MemoryItem) -> str:
+    """
+    Format a conversation summary memory item as a context entry.
+
+    Args:
+        item (MemoryItem): Summary memory item
+
+    Returns:
+        str: The summarized period followed by the summary on one line
+    """
+    content = item.content
+    period = f"{str(content.get('period_start', ''))[:10]} to {str(content.get('period_end', ''))[:10]}"
+    summary = " | ".join(line for line in str(content.get("summary", "")).splitlines() if line.strip())
+    return f"{period}: {summary}"
+
+
+class MemoryContextBuilder:
+    """
+    Incrementally maintained memory context of one session.
+    """
+
+    def __init__(self, context_processor, conversation_limit: int = CONVERSATION.HOT_TIER_CONVERSATIONS,
+                 knowledge_limit: int = CONVERSATION.HOT_TIER_KNOWLEDGE,
+                 top_knowledge: int = CONTEXT.MAX_RELEVANT_KNOWLEDGE, max_cached_inputs: int = 16,
+                 summary_limit: int = CONVERSATION.HOT_TIER_SUMMARIES, pinned_knowledge: int = 0):
+        """
+        Initialize the context builder.
+
+        Args:
+            context_processor: ContextProcessor used to score knowledge relevance
+            conversation_limit (int): Conversation items kept (newest first)
+            knowledge_limit (int): Knowledge items kept (newest kept)
+            top_knowledge (int): Knowledge items included when scoring against an input
+            max_cached_inputs (int): User inputs whose scores are kept
+            summary_limit (int): Conversation summaries kept (newest first)
+            pinned_knowledge (int): Newest knowledge items listed, unranked, in their own
+                section (0: rank all knowledge)
+        """
+        self.context_processor = context_processor
+        self.top_knowledge = top_knowledge
+        self.pinned_knowledge = pinned_knowledge
+        self.max_cached_inputs = max_cached_inputs
+        self.logger = get_logger()
+
+        # (item id, updated_at, formatted turns), newest first
+        self._conversations: Deque[Tuple[str, datetime, Tuple[str, ...]]] = deque(maxlen=conversation_limit)
+        self.conversation_limit = conversation_limit
+        # item id -> (item, formatted line), newest last
+        self._knowledge: "OrderedDict[str, Tuple[MemoryItem, str]]" = OrderedDict()
+        self.knowledge_limit = knowledge_limit
+        # Formatted conversation summaries, newest first
+        self._summaries: List[str] = []
+        self.summary_limit = summary_limit
+
+        self._conversation_entries: Optional[List[str]] = None
+        # user input -> item id -> relevance score without its recency part
+        self._scores: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+
+    @property
+    def conversation_count(self) -> int:
+        """Number of conversation items in the builder."""
+        return len(self._conversations)
+
+    @property
+    def knowledge_count(self) -> int:
+        """Number of knowledge items in the builder."""
+        return len(self._knowledge)
+
+    @property
+    def summary_count(self) -> int:
+        """Number of conversation summaries in the builder."""
+        return len(self._summaries)
+
+    def reset(self, conversations: List[MemoryItem], knowledge: List[MemoryItem],
+              summaries: List[MemoryItem] = None):
+        """
+        Replace the builder contents, reusing formatted text and scores of unchanged items.
+
+        Args:
+            conversations (List[MemoryItem]): Conversation items, newest first
+            knowledge (List[MemoryItem]): Knowledge items, newest first
+            summaries (List[MemoryItem]): Conversation summary items, newest first
+                (default: keep the current summaries)
+        """
+        self.refresh([(item.id, item.updated_at) for item in conversations],
+                     [(item.id, item.updated_at) for item in knowledge],
+                     conversations + knowledge)
+        if summaries is not None:
+            self.set_summaries(summaries)
+
+    def set_summaries(self, summaries: List[MemoryItem]):
+        """
+        Replace the conversation summaries.
+
+        Args:
+            summaries (List[MemoryItem]): Conversation summary items, newest first
+        """
+        self._summaries = [format_summary_line(item) for item in summaries[:self.summary_limit]]
+
+    def stale_ids(self, conversation_versions: List[Tuple[str, datetime]],
+                  knowledge_versions: List[Tuple[str, datetime]]) -> List[str]:
+        """
+        Get the items a refresh to these versions needs loaded: those not in the builder
+        at the same version.
+
+        Args:
+            conversation_versions (List[Tuple[str, datetime]]): (id, updated_at) of the
+                conversation items, newest first
+            knowledge_versions (List[Tuple[str, datetime]]): (id, updated_at) of the
+                knowledge items, newest first
+
+        Returns:
+            List[str]: IDs of the items to load
+        """
+        held = {item_id: updated_at for item_id, updated_at, _ in self._conversations}
+        held.update((item_id, item.updated_at) for item_id, (item, _) in self._knowledge.items())
+        versions = (conversation_versions[:self.conversation_limit] +
+                    knowledge_versions[:self.knowledge_limit])
+        return [item_id for item_id, updated_at in versions
+                if item_id not in held or held[item_id] != updated_at]
+
+    def refresh(self, conversation_versions: Optional[List[Tuple[str, datetime]]],
+                knowledge_versions: Optional[List[Tuple[str, datetime]]],
+                items: List[MemoryItem]):
+        """
+        Bring the builder up to date with the current versions of its items.
+
+        Only the items that changed are formatted and dropped from the cached scores;
+        nothing is invalidated when no version changed.
+
+        Args:
+            conversation_versions (Optional[List[Tuple[str, datetime]]]): (id, updated_at)
+                of the conversation items, newest first; None keeps the conversations
+            knowledge_versions (Optional[List[Tuple[str, datetime]]]): (id, updated_at)
+                of the knowledge items, newest first; None keeps the knowledge
+            items (List[MemoryItem]): The items returned by stale_ids, loaded
+        """
+        loaded = {item.id: item for item in items}
+        if conversation_versions is not None:
+            self._refresh_conversations(conversation_versions[:self.conversation_limit], loaded)
+        if knowledge_versions is not None:
+            self._refresh_knowledge(knowledge_versions[:self.knowledge_limit], loaded)
+
+    def _refresh_conversations(self, versions: List[Tuple[str, datetime]], loaded: Dict[str, MemoryItem]):
+        """Replace the conversation items, formatting only the changed ones."""
+        if versions == [(item_id, updated_at) for item_id, updated_at, _ in self._conversations]:
+            return
+
+        previous = {item_id: (updated_at, turns) for item_id, updated_at, turns in self._conversations}
+        self._conversations.clear()
+        for item_id, updated_at in versions:
+            cached = previous.get(item_id)
+            if cached is not None and cached[0] == updated_at:
+                turns = cached[1]
+            elif item_id in loaded:
+                turns = format_conversation_turns(loaded[item_id])
+            else:
+                # Deleted since its version was read
+                continue
+            self._conversations.append((item_id, updated_at, turns))
+        self._conversation_entries = None
+
+    def _refresh_knowledge(self, versions: List[Tuple[str, datetime]], loaded: Dict[str, MemoryItem]):
+        """Replace the knowledge items, formatting and rescoring only the changed ones."""
+        current = [(item_id, item.updated_at) for item_id, (item, _) in reversed(self._knowledge.items())]
+        if versions == current:
+            return
+
+        previous = self._knowledge
+        self._knowledge = OrderedDict()
+        for item_id, updated_at in reversed(versions):
+            cached = previous.pop(item_id, None)
+            if cached is not None and cached[0].updated_at == updated_at:
+                self._knowledge[item_id] = cached
+            elif item_id in loaded:
+                self._forget_scores(item_id)
+                self._knowledge[item_id] = (loaded[item_id], format_knowledge_line(loaded[item_id]))
+        for item_id in previous:
+            self._forget_scores(item_id)
+
+    def add_conversation(self, item: MemoryItem):
+        """
+        Add a newly saved conversation item.
+
+        Args:
+            item (MemoryItem): Conversation memory item
+        """
+        self._conversations.appendleft((item.id, item.updated_at, format_conversation_turns(item)))
+        self._conversation_entries = None
+
+    def add_knowledge(self, item: MemoryItem):
+        """
+        Add or update a newly saved knowledge item.
+
+        Args:
+            item (MemoryItem): Knowledge memory item
+        """
+        self._knowledge.pop(item.id, None)
+        self._forget_scores(item.id)
+        self._knowledge[item.id] = (item, format_knowledge_line(item))
+        while len(self._knowledge) > self.knowledge_limit:
+            evicted_id, _ = self._knowledge.popitem(last=False)
+            self._forget_scores(evicted_id)
+
+    def _forget_scores(self, item_id: str):
+        """Drop cached scores of an item whose content changed or left the builder."""
+        for scores in self._scores.values():
+            scores.pop(item_id, None)
+
+    def _get_scores(self, user_input: str, candidates: List[MemoryItem]) -> Dict[str, float]:
+        """
+        Get relevance scores of the candidates, scoring only items not scored before.
+
+        Args:
+            user_input (str): Current user input
+            candidates (List[MemoryItem]): Knowledge items to score
+
+        Returns:
+            Dict[str, float]: Score without its recency part per item id
+        """
+        scores = self._scores.get(user_input)
+        if scores is None:
+            scores = {}
+            self._scores[user_input] = scores
+            while len(self._scores) > self.max_cached_inputs:
+                self._scores.popitem(last=False)
+        else:
+            self._scores.move_to_end(user_input)
+
+        unscored = [item for item in candidates if item.id not in scores]
+        if unscored:
+            for item, relevance in self.context_processor.score_context_relevance(user_input, unscored):
+                scores[item.id] = relevance.score - RECENCY_WEIGHT * relevance.factors["recency"]
+        return scores
+
+    def _build_knowledge_entries(self, user_input: str) -> Tuple[List[str], List[str]]:
+        """
+        Select and order the knowledge entries for a user input.
+
+        Args:
+            user_input (str): Current user input ("" includes all knowledge unscored)
+
+        Returns:
+            Tuple[List[str], List[str]]: Pinned entries, oldest first, and the other
+                knowledge entries, most relevant first
+        """
+        entries = list(reversed(self._knowledge.values()))
+        pinned = []
+        if self.pinned_knowledge > 0:
+            # Ordered by creation, so a new item is appended and the earlier lines stay put
+            newest = sorted(entries, key=lambda entry: (entry[0].created_at, entry[0].id))[-self.pinned_knowledge:]
+            pinned_ids = {item.id for item, _ in newest}
+            pinned = [line for _, line in newest if line]
+            entries = [entry for entry in entries if entry[0].id not in pinned_ids]
+
+        if entries and user_input:
+            scores = self._get_scores(user_input, [item for item, _ in entries])
+            scorer = self.context_processor.relevance_scorer
+            now = datetime.now()
+            ranking = {
+                item.id: scores[item.id] + RECENCY_WEIGHT * scorer.recency_factor(item, now)
+                for item, _ in entries
+            }
+            # Stable sort keeps newest-first order among equal scores
+            entries = sorted(entries, key=lambda entry: ranking[entry[0].id], reverse=True)
+            entries = entries[:self.top_knowledge]
+
+        return pinned, [line for _, line in entries if line]
+
+    def build(self, last_user_input: str = "") -> MemoryContext:
+        """
+        Assemble the memory context.
+
+        Args:
+            last_user_input (str): Last user input for relevance scoring
+
+        Returns:
+            MemoryContext: Formatted context from memory, with its sections
+        """
+        if self._conversation_entries is None:
+            self._conversation_entries = [turn for _, _, turns in self._conversations for turn in turns]
+
+        pinned_entries, knowledge_entries = [], []
+        try:
+            pinned_entries, knowledge_entries = self._build_knowledge_entries(last_user_input)
+        except Exception as e:
+            self.logger.error(f"Error retrieving knowledge items: {e}")
+
+        return MemoryContext([
+            (CONVERSATION_HEADER, self._conversation_entries),
+            (PINNED_KNOWLEDGE_SECTION_HEADER, pinned_entries),
+            (KNOWLEDGE_SECTION_HEADER, knowledge_entries),
+            (SUMMARY_HEADER, self._summaries)
+        ])
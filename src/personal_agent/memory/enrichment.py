@@ -0,0 +1,253 @@
+"""
+Background Enrichment for Personal Agent
+
+This module contains the bounded work queue that enriches saved memory items (entity
+and relationship extraction, optional embeddings) outside the user's turn. Items are
+persisted raw first; worker threads patch the stored item later. When the queue is
+full, submitters wait briefly and then enrich inline, which slows producers down
+instead of dropping work. Memory services share one queue and worker pool per storage
+(see get_shared_enrichment_queue), so the number of threads does not grow with the
+number of agents. Pending jobs are drained when the queues are shut down and at
+interpreter exit.
+"""
+
+import atexit
+import queue
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .models import MemoryItem
+from ..config.constants import DATABASE
+from ..utils.logging import get_logger
+from ..utils.resources import get_resource_registry
+
+
+# Started queues, drained at interpreter exit
+_active_queues: "weakref.WeakSet[EnrichmentQueue]" = weakref.WeakSet()
+# Serializes replacing a shared queue that was shut down
+_shared_queue_lock = threading.Lock()
+
+
+def shutdown_enrichment_queues(timeout: float = DATABASE.ENRICHMENT_DRAIN_TIMEOUT) -> bool:
+    """
+    Drain and stop every running enrichment queue, e.g. at shutdown.
+
+    Args:
+        timeout (float): Maximum seconds to wait for the pending items of each queue
+
+    Returns:
+        bool: True if no pending item was lost
+    """
+    drained = True
+    for enrichment_queue in list(_active_queues):
+        drained = enrichment_queue.shutdown(drain=True, timeout=timeout) and drained
+    return drained
+
+
+atexit.register(shutdown_enrichment_queues)
+
+
+def get_shared_enrichment_queue(storage: Any) -> "EnrichmentQueue":
+    """
+    Get the enrichment queue shared by all memory services of a storage.
+
+    Submitters pass their own handler with each item. A shared queue that was shut
+    down is replaced by a new one.
+
+    Args:
+        storage (Any): Memory storage the queued items belong to
+
+    Returns:
+        EnrichmentQueue: The storage's shared queue
+    """
+    registry = get_resource_registry()
+    with _shared_queue_lock:
+        enrichment_queue = registry.get("enrichment_queue", storage, EnrichmentQueue)
+        if enrichment_queue.closed:
+            registry.remove("enrichment_queue", storage)
+            enrichment_queue = registry.get("enrichment_queue", storage, EnrichmentQueue)
+        return enrichment_queue
+
+
+class EnrichmentQueue:
+    """
+    Bounded queue of memory items waiting for enrichment, served by worker threads.
+    """
+
+    def __init__(self, handler: Callable[[MemoryItem], None] = None,
+                 max_size: int = DATABASE.ENRICHMENT_QUEUE_SIZE,
+                 workers: int = DATABASE.ENRICHMENT_WORKERS,
+                 submit_timeout: float = DATABASE.ENRICHMENT_SUBMIT_TIMEOUT):
+        """
+        Initialize the enrichment queue. Workers start on the first submission.
+
+        Args:
+            handler (Callable[[MemoryItem], None]): Enriches one item (runs in a worker),
+                unless the item was submitted with its own handler
+            max_size (int): Items that may wait in the queue
+            workers (int): Worker threads
+            submit_timeout (float): Seconds submit waits for room when the queue is full
+        """
+        self.handler = handler
+        self.max_size = max_size
+        self.workers = max(1, workers)
+        self.submit_timeout = submit_timeout
+        self.logger = get_logger()
+
+        # (item, handler) pairs; None stops a worker
+        self._queue: "queue.Queue[Optional[Tuple[MemoryItem, Callable]]]" = queue.Queue(maxsize=max_size)
+        self._threads: List[threading.Thread] = []
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_depth": 0
+        }
+
+    def _start(self):
+        """Start the worker threads. The caller holds the condition."""
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"memory_enrichment_{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        _active_queues.add(self)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the queue was shut down and rejects new items."""
+        with self._condition:
+            return self._closed
+
+    def submit(self, item: MemoryItem, timeout: float = None,
+               handler: Callable[[MemoryItem], None] = None) -> bool:
+        """
+        Queue a memory item for enrichment.
+
+        Args:
+            item (MemoryItem): Saved memory item
+            timeout (float): Seconds to wait for room when full (default: submit_timeout)
+            handler (Callable[[MemoryItem], None]): Enriches this item (default: the
+                queue's handler)
+
+        Returns:
+            bool: True if queued; False if the queue is full or shut down, in which
+                case the caller should enrich the item itself
+        """
+        timeout = self.submit_timeout if timeout is None else timeout
+        entry = (item, handler or self.handler)
+        with self._condition:
+            if self._closed:
+                self._stats["rejected"] += 1
+                return False
+            self._start()
+            self._pending += 1
+
+        try:
+            if timeout > 0:
+                self._queue.put(entry, timeout=timeout)
+            else:
+                self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._condition:
+                self._pending -= 1
+                self._stats["rejected"] += 1
+                self._condition.notify_all()
+            return False
+
+        with self._condition:
+            self._stats["submitted"] += 1
+            self._stats["max_depth"] = max(self._stats["max_depth"], self._queue.qsize())
+        return True
+
+    def _run(self):
+        """Serve queued items until a stop sentinel is received."""
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+
+            item, handler = entry
+            try:
+                handler(item)
+                outcome = "completed"
+            except Exception as e:
+                self.logger.error(f"Error enriching memory item {item.id}: {e}")
+                outcome = "failed"
+
+            with self._condition:
+                self._stats[outcome] += 1
+                self._pending -= 1
+                self._condition.notify_all()
+
+    def drain(self, timeout: float = None) -> bool:
+        """
+        Wait until every submitted item has been enriched.
+
+        Args:
+            timeout (float): Maximum seconds to wait (default: no limit)
+
+        Returns:
+            bool: True if the queue is empty and idle, False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def shutdown(self, drain: bool = True, timeout: float = DATABASE.ENRICHMENT_DRAIN_TIMEOUT) -> bool:
+        """
+        Stop the workers, by default after enriching the pending items.
+
+        Args:
+            drain (bool): Enrich pending items first; otherwise they are discarded
+            timeout (float): Maximum seconds to wait for pending items
+
+        Returns:
+            bool: True if no pending item was lost
+        """
+        with self._condition:
+            if self._closed:
+                return self._pending == 0
+            self._closed = True
+
+        drained = self.drain(timeout) if drain else False
+        if not drained:
+            discarded = 0
+            while True:
+                try:
+                    if self._queue.get_nowait() is not None:
+                        discarded += 1
+                except queue.Empty:
+                    break
+            with self._condition:
+                self._pending -= discarded
+            if discarded:
+                self.logger.warning(f"Discarded {discarded} memory items pending enrichment")
+
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        _active_queues.discard(self)
+
+        with self._condition:
+            return self._pending == 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the queue depth and throughput counters.
+
+        Returns:
+            Dict[str, int]: Current depth, in-flight items (queued or running), high-water
+                depth, and submitted/completed/failed/rejected counts
+        """
+        with self._condition:
+            stats = dict(self._stats)
+            stats["depth"] = self._queue.qsize()
+            stats["pending"] = self._pending
+            return stats
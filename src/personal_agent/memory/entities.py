@@ -0,0 +1,72 @@
+"""
+Entity Registry Helpers for Personal Agent
+
+This module contains the normalization and id-interning rules used by the canonical
+entity registry. Entities extracted from different turns that refer to the same thing
+(e.g. "Alice" and "alice ") map to the same canonical entity id.
+"""
+
+import hashlib
+import re
+from typing import Tuple
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_PHONE_STRIP_RE = re.compile(r"[^\d+]")
+
+
+def normalize_entity_value(entity_type: str, value: str) -> str:
+    """
+    Normalize an entity value so equivalent mentions share one registry entry.
+
+    Args:
+        entity_type (str): Type of the entity (person, email, phone, ...)
+        value (str): Raw entity value as extracted from text
+
+    Returns:
+        str: Normalized entity value
+    """
+    if value is None:
+        return ""
+
+    normalized = _WHITESPACE_RE.sub(" ", str(value)).strip()
+
+    if entity_type == "phone":
+        return _PHONE_STRIP_RE.sub("", normalized)
+    if entity_type == "url":
+        return normalized.rstrip("/").lower()
+
+    return normalized.casefold()
+
+
+def canonical_entity_id(entity_type: str, normalized_value: str) -> str:
+    """
+    Get the interned id for a canonical entity.
+
+    The id is derived from the ``(type, normalized value)`` key, so the same entity
+    always gets the same id without a registry round trip.
+
+    Args:
+        entity_type (str): Type of the entity
+        normalized_value (str): Value returned by normalize_entity_value
+
+    Returns:
+        str: Canonical entity id
+    """
+    digest = hashlib.sha1(f"{entity_type}\x1f{normalized_value}".encode("utf-8")).hexdigest()
+    return f"ent_{digest[:16]}"
+
+
+def canonical_entity_key(entity_type: str, value: str) -> Tuple[str, str, str]:
+    """
+    Resolve a raw entity into its canonical registry key.
+
+    Args:
+        entity_type (str): Type of the entity
+        value (str): Raw entity value
+
+    Returns:
+        Tuple[str, str, str]: Canonical id, type and normalized value
+    """
+    normalized = normalize_entity_value(entity_type, value)
+    return canonical_entity_id(entity_type, normalized), entity_type, normalized
@@ -0,0 +1,83 @@
+"""
+Entity Graph Cache for Personal Agent
+
+This module contains the in-memory adjacency cache used by the knowledge-graph
+queries in memory storage.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Any
+from ..config.constants import CACHE
+
+
+class EntityAdjacencyCache:
+    """
+    Bounded LRU cache of entity neighbour lists.
+
+    Entries are keyed by canonical entity id. The whole cache is invalidated when
+    the graph changes, so cached neighbours are never stale.
+    """
+
+    def __init__(self, max_size: int = CACHE.DEFAULT_CACHE_SIZE):
+        """
+        Initialize the adjacency cache.
+
+        Args:
+            max_size (int): Maximum number of entities to keep neighbours for
+        """
+        self.max_size = max_size
+        self._cache: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, entity_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the cached neighbours of an entity.
+
+        Args:
+            entity_id (str): Canonical entity id
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Cached neighbours, or None on a miss
+        """
+        with self._lock:
+            neighbors = self._cache.get(entity_id)
+            if neighbors is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(entity_id)
+            self.hits += 1
+            return neighbors
+
+    def set(self, entity_id: str, neighbors: List[Dict[str, Any]]):
+        """
+        Cache the neighbours of an entity.
+
+        Args:
+            entity_id (str): Canonical entity id
+            neighbors (List[Dict[str, Any]]): Neighbour rows to cache
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._cache[entity_id] = neighbors
+            self._cache.move_to_end(entity_id)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def invalidate(self):
+        """Drop all cached neighbour lists."""
+        with self._lock:
+            self._cache.clear()
+
+    def size(self) -> int:
+        """
+        Get the number of cached entities.
+
+        Returns:
+            int: Number of cached entities
+        """
+        with self._lock:
+            return len(self._cache)
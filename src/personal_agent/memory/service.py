@@ -5,13 +5,22 @@ This module contains the MemoryService class that manages all memory-related ope
 including conversation history, knowledge storage, and context retrieval.
 """
 
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Awaitable, Tuple, Callable
 from ..memory.storage import SQLiteMemoryStorage, AsyncSQLiteMemoryStorage
 from ..memory.models import MemoryItem
+from ..memory.context_builder import MemoryContextBuilder
+from ..memory.enrichment import get_shared_enrichment_queue
 from ..config.settings import Config
-from ..context.processor import ContextProcessor
+from ..config.constants import CONVERSATION, DATABASE, CONTEXT
+from ..context.budget import PROMPT_LAYOUT_PREFIX_STABLE
+from ..context.processor import get_shared_context_processor
 from ..utils.logging import get_logger
+from ..utils.resources import get_resource_registry
 import asyncio
+import dataclasses
+import functools
+import inspect
 
 
 class MemoryService:
@@ -19,22 +28,230 @@ class MemoryService:
     Manages all memory-related operations for the agent.
     """
     
-    def __init__(self, config: Config = None, memory_storage=None):
+    def __init__(self, config: Config = None, memory_storage=None,
+                 embedder: Callable[[str], list] = None):
         """
         Initialize the memory service.
         
         Args:
             config (Config): Configuration object
             memory_storage: Memory storage instance (can be sync or async)
+            embedder (Callable[[str], list]): Optional text-to-embedding function used
+                when enriching conversation turns
         """
-        self.config = config or Config.load()
-        # If no storage is provided, create a default sync storage
+        self.config = config or Config.load_shared()
+        # If no storage is provided, use the shared sync storage of the configured database
         if memory_storage is None:
-            self.storage = SQLiteMemoryStorage(self.config.memory.database_path)
+            database_path = self.config.memory.database_path
+            self.storage = get_resource_registry().get(
+                "memory_storage", ("sqlite", database_path), lambda: SQLiteMemoryStorage(database_path)
+            )
         else:
             self.storage = memory_storage
-        self.context_processor = ContextProcessor()
+        self.context_processor = get_shared_context_processor()
+        self.embedder = embedder
+        self._context_builders: "OrderedDict[str, MemoryContextBuilder]" = OrderedDict()
+        # The prefix-stable prompt layout caches knowledge that does not change with the input
+        self.pinned_knowledge = (CONTEXT.PINNED_KNOWLEDGE
+                                 if self.config.llm.prompt_layout == PROMPT_LAYOUT_PREFIX_STABLE else 0)
         self.logger = get_logger()
+        # Turns are saved raw and enriched by the storage's shared background workers
+        # when the storage can patch stored items
+        self.enrichment_queue = None
+        if self.config.memory.background_enrichment and hasattr(self.storage, "update_item_enrichment"):
+            self.enrichment_queue = get_shared_enrichment_queue(self.storage)
+    
+    def _extract_turn_entities(self, turns: List[Dict[str, Any]]) -> Tuple[List[Any], List[Any]]:
+        """
+        Extract the entities and relationships of conversation turns.
+        
+        Entity ids are only unique within one extracted text, so the entities of
+        all turns are renumbered, and their relationships remapped, to keep the ids
+        unique within the memory item.
+        
+        Args:
+            turns (List[Dict[str, Any]]): Turns with role and content
+            
+        Returns:
+            Tuple[List[Entity], List[Relationship]]: Entities and relationships of all turns
+        """
+        all_entities = []
+        all_relationships = []
+        for turn in turns:
+            entities, relationships = self.context_processor.extract(str(turn.get("content", "")))
+            item_ids = {}
+            for entity in entities:
+                item_ids[entity.id] = f"entity_{len(all_entities) + 1}"
+                all_entities.append(dataclasses.replace(entity, id=item_ids[entity.id]))
+            for relationship in relationships:
+                all_relationships.append(dataclasses.replace(
+                    relationship,
+                    source_entity_id=item_ids.get(relationship.source_entity_id, relationship.source_entity_id),
+                    target_entity_id=item_ids.get(relationship.target_entity_id, relationship.target_entity_id)
+                ))
+        return all_entities, all_relationships
+    
+    def _build_conversation_item(self, user_id: str, user_input: str, agent_response: str) -> MemoryItem:
+        """
+        Build the memory item for a conversation turn.
+        
+        Entities and relationships are extracted here only when background
+        enrichment is disabled; otherwise the enrichment queue adds them later.
+        
+        Args:
+            user_id (str): ID of the user
+            user_input (str): User's input message
+            agent_response (str): Agent's response
+            
+        Returns:
+            MemoryItem: Conversation memory item
+        """
+        turns = [
+            {
+                "role": "user",
+                "content": user_input
+            },
+            {
+                "role": "assistant",
+                "content": agent_response
+            }
+        ]
+        
+        memory_item = MemoryItem(
+            type="conversation",
+            content={
+                "user_id": user_id,
+                "turns": turns
+            }
+        )
+        if self.enrichment_queue is None:
+            memory_item.entities, memory_item.relationships = self._extract_turn_entities(turns)
+        return memory_item
+    
+    def _enrich_item(self, memory_item: MemoryItem):
+        """
+        Extract the entities, relationships and embedding of a saved conversation
+        item and patch the stored item. Runs in an enrichment worker.
+        
+        Args:
+            memory_item (MemoryItem): Saved conversation item
+        """
+        turns = memory_item.content.get("turns", [])
+        entities, relationships = self._extract_turn_entities(turns)
+        embedding = None
+        if self.embedder is not None:
+            embedding = self.embedder("\n".join(str(turn.get("content", "")) for turn in turns))
+        
+        patched = self.storage.update_item_enrichment(memory_item.id, entities, relationships, embedding)
+        if inspect.isawaitable(patched):
+            patched = asyncio.run(patched)
+        
+        if patched:
+            memory_item.entities = entities
+            memory_item.relationships = relationships
+            if embedding is not None:
+                memory_item.embedding = embedding
+    
+    def _submit_enrichment(self, memory_item: MemoryItem, timeout: float = None) -> bool:
+        """
+        Queue a saved conversation item for enrichment.
+        
+        Args:
+            memory_item (MemoryItem): Saved conversation item
+            timeout (float): Seconds to wait for room in the queue (default: queue setting)
+            
+        Returns:
+            bool: True if queued (or nothing to enrich), False if the item must be
+                enriched inline
+        """
+        if self.enrichment_queue is None or memory_item.type != "conversation":
+            return True
+        return self.enrichment_queue.submit(memory_item, timeout, handler=self._enrich_item)
+    
+    def drain_enrichment(self, timeout: float = None) -> bool:
+        """
+        Wait until every conversation turn queued for the storage has been enriched.
+        
+        Args:
+            timeout (float): Maximum seconds to wait (default: no limit)
+            
+        Returns:
+            bool: True if no enrichment is pending
+        """
+        if self.enrichment_queue is None:
+            return True
+        return self.enrichment_queue.drain(timeout)
+    
+    def shutdown(self, timeout: float = DATABASE.ENRICHMENT_DRAIN_TIMEOUT) -> bool:
+        """
+        Stop the service's own background work.
+        
+        The enrichment workers are shared by every service of the storage and keep
+        enriching the turns this service queued, so nothing is waited for or lost
+        here; shutdown_enrichment_queues stops them (see AgentManager.shutdown).
+        
+        Args:
+            timeout (float): Maximum seconds to wait for the service's own background work
+            
+        Returns:
+            bool: True if no pending enrichment was lost
+        """
+        return True
+    
+    def get_enrichment_stats(self) -> Dict[str, int]:
+        """
+        Get the enrichment queue depth and counters.
+        
+        Returns:
+            Dict[str, int]: Metrics of the storage's shared queue (empty when background
+                enrichment is disabled)
+        """
+        if self.enrichment_queue is None:
+            return {}
+        return self.enrichment_queue.get_stats()
+    
+    @staticmethod
+    def _build_knowledge_item(user_id: str, category: str, text: str) -> MemoryItem:
+        """
+        Build the memory item for a preference or fact.
+        
+        Args:
+            user_id (str): ID of the user
+            category (str): "preference" or "fact"
+            text (str): The preference or fact
+            
+        Returns:
+            MemoryItem: Knowledge memory item
+        """
+        return MemoryItem(
+            type="knowledge",
+            content={category: text},
+            metadata={"user_id": user_id, "category": category}
+        )
+    
+    def _on_item_saved(self, user_id: str, memory_item: MemoryItem):
+        """
+        Hook called after a conversation turn or knowledge item was saved.
+        
+        Subclasses override this to keep in-process views of memory up to date.
+        
+        Args:
+            user_id (str): ID of the user the item belongs to
+            memory_item (MemoryItem): The saved memory item
+        """
+        pass
+    
+    async def _save_item_async(self, memory_item: MemoryItem) -> bool:
+        """
+        Save a memory item without blocking the event loop.
+        
+        Args:
+            memory_item (MemoryItem): Memory item to save
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return await self._call_storage_async('save', memory_item)
     
     def save_conversation_turn(self, user_id: str, user_input: str, agent_response: str) -> bool:
         """
@@ -49,39 +266,15 @@ class MemoryService:
             bool: True if successful, False otherwise
         """
         try:
-            # Extract entities and relationships from user input
-            user_entities = self.context_processor.extract_entities(user_input)
-            user_relationships = self.context_processor.extract_relationships(user_entities, user_input)
-            
-            # Extract entities and relationships from agent response
-            agent_entities = self.context_processor.extract_entities(agent_response)
-            agent_relationships = self.context_processor.extract_relationships(agent_entities, agent_response)
-            
-            # Combine all entities and relationships
-            all_entities = user_entities + agent_entities
-            all_relationships = user_relationships + agent_relationships
-            
-            # Create memory item
-            memory_item = MemoryItem(
-                type="conversation",
-                content={
-                    "user_id": user_id,
-                    "turns": [
-                        {
-                            "role": "user",
-                            "content": user_input
-                        },
-                        {
-                            "role": "assistant",
-                            "content": agent_response
-                        }
-                    ]
-                },
-                entities=all_entities,
-                relationships=all_relationships
-            )
+            memory_item = self._build_conversation_item(user_id, user_input, agent_response)
             
-            return self.storage.save(memory_item)
+            saved = self.storage.save(memory_item)
+            if saved:
+                self._on_item_saved(user_id, memory_item)
+                if not self._submit_enrichment(memory_item):
+                    # Queue full: enrich inline, which holds back the producer
+                    self._enrich_item(memory_item)
+            return saved
         except Exception as e:
             self.logger.error(f"Error saving conversation turn: {e}")
             return False
@@ -99,53 +292,44 @@ class MemoryService:
             bool: True if successful, False otherwise
         """
         try:
-            # Extract entities and relationships from user input
-            user_entities = self.context_processor.extract_entities(user_input)
-            user_relationships = self.context_processor.extract_relationships(user_entities, user_input)
-            
-            # Extract entities and relationships from agent response
-            agent_entities = self.context_processor.extract_entities(agent_response)
-            agent_relationships = self.context_processor.extract_relationships(agent_entities, agent_response)
-            
-            # Combine all entities and relationships
-            all_entities = user_entities + agent_entities
-            all_relationships = user_relationships + agent_relationships
-            
-            # Create memory item
-            memory_item = MemoryItem(
-                type="conversation",
-                content={
-                    "user_id": user_id,
-                    "turns": [
-                        {
-                            "role": "user",
-                            "content": user_input
-                        },
-                        {
-                            "role": "assistant",
-                            "content": agent_response
-                        }
-                    ]
-                },
-                entities=all_entities,
-                relationships=all_relationships
-            )
+            memory_item = self._build_conversation_item(user_id, user_input, agent_response)
             
-            # Check if storage supports async operations
-            if hasattr(self.storage, 'save') and callable(getattr(self.storage, 'save')):
-                # If it's our new async storage, call it directly
-                if hasattr(self.storage, '__class__') and 'AsyncSQLiteMemoryStorage' in str(self.storage.__class__):
-                    return await self.storage.save(memory_item)
-                # If it's our new sync storage with async methods, call them directly
-                elif hasattr(self.storage, '__class__') and 'SQLiteMemoryStorage' in str(self.storage.__class__):
-                    return self.storage.save(memory_item)
-            
-            # Fallback to sync method
-            return self.storage.save(memory_item)
+            saved = await self._save_item_async(memory_item)
+            if saved:
+                self._on_item_saved(user_id, memory_item)
+                if not self._submit_enrichment(memory_item, timeout=0):
+                    # Queue full: enrich inline, off the event loop
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, self._enrich_item, memory_item)
+            return saved
         except Exception as e:
             self.logger.error(f"Error saving conversation turn: {e}")
             return False
     
+    def _get_context_builder(self, user_id: str) -> MemoryContextBuilder:
+        """
+        Get the context builder of a session, creating it on first use.
+        
+        Builders keep formatted items and relevance scores between turns, so only
+        items that changed since the previous turn are formatted and scored again.
+        
+        Args:
+            user_id (str): ID of the user
+            
+        Returns:
+            MemoryContextBuilder: The session's context builder
+        """
+        builder = self._context_builders.get(user_id)
+        if builder is None:
+            builder = MemoryContextBuilder(self.context_processor, conversation_limit=5, knowledge_limit=10,
+                                           pinned_knowledge=self.pinned_knowledge)
+            self._context_builders[user_id] = builder
+            while len(self._context_builders) > CONVERSATION.MAX_PARALLEL_CONVERSATIONS:
+                self._context_builders.popitem(last=False)
+        else:
+            self._context_builders.move_to_end(user_id)
+        return builder
+    
     def get_memory_context(self, user_id: str, conversation_history: List[Dict[str, str]], 
                           last_user_input: str = "") -> str:
         """
@@ -159,59 +343,151 @@ class MemoryService:
         Returns:
             str: Formatted context from memory
         """
-        context_parts = []
+        builder = self._get_context_builder(user_id)
+        if hasattr(self.storage, 'get_recent_item_versions'):
+            # One cheap read of the current item versions; only changed items are loaded
+            try:
+                versions = self.storage.get_recent_item_versions(
+                    {"conversation": builder.conversation_limit, "knowledge": builder.knowledge_limit}
+                )
+                conversation_versions = versions.get("conversation")
+                knowledge_versions = versions.get("knowledge")
+                stale_ids = builder.stale_ids(conversation_versions or [], knowledge_versions or [])
+                items = self.storage.get_items(stale_ids) if stale_ids else []
+                builder.refresh(conversation_versions, knowledge_versions, items)
+            except Exception as e:
+                self.logger.error(f"Error refreshing memory context: {e}")
+            return builder.build(last_user_input)
         
         # Add conversation history
         try:
             # Try to use the more efficient method first
             if hasattr(self.storage, 'get_conversation_history'):
                 recent_memories = self.storage.get_conversation_history(limit=5)
-                recent_turns = []
-                for memory in recent_memories:
-                    recent_turns.extend(memory.content.get("turns", []))
             else:
                 # Fallback to search method
                 recent_memories = self.storage.search("", type="conversation", limit=5)
-                recent_turns = []
-                for memory in recent_memories:
-                    recent_turns.extend(memory.content.get("turns", []))
         except Exception as e:
             self.logger.error(f"Error retrieving conversation history: {e}")
-            recent_turns = []
-        
-        if recent_turns:
-            conversation_context = "Recent conversation history:\n"
-            for turn in recent_turns:
-                conversation_context += f"{turn['role']}: {turn['content']}\n"
-            context_parts.append(conversation_context)
+            recent_memories = []
         
         # Add knowledge items (preferences and facts)
         try:
             knowledge_items = self.storage.search("", type="knowledge", limit=10)
-            
-            # Use context processor to score relevance of knowledge items
-            if knowledge_items and last_user_input:
-                # Score context relevance
-                scored_items = self.context_processor.score_context_relevance(last_user_input, knowledge_items)
-                # Sort by relevance score and take top items
-                knowledge_items = [item for item, score in scored_items[:5]]  # Top 5 most relevant
-            
-            if knowledge_items:
-                knowledge_context = "User knowledge:\n"
-                for item in knowledge_items:
-                    if "preference" in item.content:
-                        knowledge_context += f"Preference: {item.content['preference']}\n"
-                    elif "fact" in item.content:
-                        knowledge_context += f"Fact: {item.content['fact']}\n"
-                context_parts.append(knowledge_context)
         except Exception as e:
             self.logger.error(f"Error retrieving knowledge items: {e}")
+            knowledge_items = []
+        
+        builder.reset(recent_memories, knowledge_items)
+        return builder.build(last_user_input)
+    
+    async def _call_storage_async(self, method: str, *args, **kwargs):
+        """
+        Call a storage method without blocking the event loop.
+        
+        Async storage is awaited directly, as is the sync SQLite wrapper's async
+        storage unless a subclass overrides the method; other sync storages run in
+        the default executor.
+        
+        Args:
+            method (str): Name of the storage method
+            *args: Positional arguments for the method
+            **kwargs: Keyword arguments for the method
+            
+        Returns:
+            The method's result
+        """
+        function = getattr(self.storage, method)
+        if (isinstance(self.storage, SQLiteMemoryStorage) and
+                getattr(type(self.storage), method) is getattr(SQLiteMemoryStorage, method)):
+            function = getattr(self.storage.async_storage, method)
+        if asyncio.iscoroutinefunction(function):
+            return await function(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(function, *args, **kwargs))
+    
+    def _memory_context_sources(self, user_id: str, last_user_input: str) -> Dict[str, Awaitable]:
+        """
+        Get the retrievals that feed the memory context, keyed by source name.
+        
+        Subclasses add sources (e.g. entity or semantic recall) here; all sources are
+        fetched concurrently by get_memory_context_async.
         
-        # Combine all context parts
-        if context_parts:
-            return "\n".join(context_parts)
+        Args:
+            user_id (str): ID of the user
+            last_user_input (str): Last user input for relevance scoring
+            
+        Returns:
+            Dict[str, Awaitable]: Pending retrieval per source
+        """
+        if hasattr(self.storage, 'get_conversation_history'):
+            conversations = self._call_storage_async('get_conversation_history', limit=5)
         else:
-            return ""
+            conversations = self._call_storage_async('search', "", type="conversation", limit=5)
+        
+        return {
+            "conversation": conversations,
+            "knowledge": self._call_storage_async('search', "", type="knowledge", limit=10)
+        }
+    
+    async def _fetch_memory_context_sources(self, sources: Dict[str, Awaitable],
+                                            timeout: float) -> Dict[str, List[MemoryItem]]:
+        """
+        Fetch memory context sources concurrently, each within its own timeout.
+        
+        A source that fails or times out contributes no items instead of failing
+        or delaying the whole context.
+        
+        Args:
+            sources (Dict[str, Awaitable]): Pending retrieval per source
+            timeout (float): Seconds each source may take
+            
+        Returns:
+            Dict[str, List[MemoryItem]]: Retrieved items per source
+        """
+        names = list(sources)
+        results = await asyncio.gather(
+            *(asyncio.wait_for(sources[name], timeout) for name in names),
+            return_exceptions=True
+        )
+        
+        items = {}
+        for name, result in zip(names, results):
+            if isinstance(result, asyncio.TimeoutError):
+                self.logger.warning(f"Memory context source '{name}' timed out after {timeout}s; skipping it")
+                result = []
+            elif isinstance(result, Exception):
+                self.logger.error(f"Error retrieving memory context source '{name}': {result}")
+                result = []
+            items[name] = result or []
+        return items
+    
+    async def get_memory_context_async(self, user_id: str, conversation_history: List[Dict[str, str]],
+                                       last_user_input: str = "",
+                                       timeout: float = DATABASE.MEMORY_SOURCE_TIMEOUT) -> str:
+        """
+        Retrieve relevant context from memory asynchronously.
+        
+        Conversation history and knowledge (and any other sources) are fetched
+        concurrently, so the turn waits for the slowest source rather than the sum
+        of all of them, and never longer than the timeout.
+        
+        Args:
+            user_id (str): ID of the user
+            conversation_history (List[Dict[str, str]]): Recent conversation history
+            last_user_input (str): Last user input for relevance scoring
+            timeout (float): Seconds each source may take before it is skipped
+            
+        Returns:
+            str: Formatted context from memory
+        """
+        items = await self._fetch_memory_context_sources(
+            self._memory_context_sources(user_id, last_user_input), timeout
+        )
+        
+        builder = self._get_context_builder(user_id)
+        builder.reset(items.get("conversation", []), items.get("knowledge", []))
+        return builder.build(last_user_input)
     
     def remember_preference(self, user_id: str, preference: str) -> bool:
         """
@@ -225,12 +501,11 @@ class MemoryService:
             bool: True if successful, False otherwise
         """
         try:
-            memory_item = MemoryItem(
-                type="knowledge",
-                content={"preference": preference},
-                metadata={"user_id": user_id, "category": "preference"}
-            )
-            return self.storage.save(memory_item)
+            memory_item = self._build_knowledge_item(user_id, "preference", preference)
+            saved = self.storage.save(memory_item)
+            if saved:
+                self._on_item_saved(user_id, memory_item)
+            return saved
         except Exception as e:
             self.logger.error(f"Error saving preference: {e}")
             return False
@@ -247,23 +522,12 @@ class MemoryService:
             bool: True if successful, False otherwise
         """
         try:
-            memory_item = MemoryItem(
-                type="knowledge",
-                content={"preference": preference},
-                metadata={"user_id": user_id, "category": "preference"}
-            )
+            memory_item = self._build_knowledge_item(user_id, "preference", preference)
             
-            # Check if storage supports async operations
-            if hasattr(self.storage, 'save') and callable(getattr(self.storage, 'save')):
-                # If it's our new async storage, call it directly
-                if hasattr(self.storage, '__class__') and 'AsyncSQLiteMemoryStorage' in str(self.storage.__class__):
-                    return await self.storage.save(memory_item)
-                # If it's our new sync storage with async methods, call them directly
-                elif hasattr(self.storage, '__class__') and 'SQLiteMemoryStorage' in str(self.storage.__class__):
-                    return self.storage.save(memory_item)
-            
-            # Fallback to sync method
-            return self.storage.save(memory_item)
+            saved = await self._save_item_async(memory_item)
+            if saved:
+                self._on_item_saved(user_id, memory_item)
+            return saved
         except Exception as e:
             self.logger.error(f"Error saving preference: {e}")
             return False
@@ -280,12 +544,11 @@ class MemoryService:
             bool: True if successful, False otherwise
         """
         try:
-            memory_item = MemoryItem(
-                type="knowledge",
-                content={"fact": fact},
-                metadata={"user_id": user_id, "category": "fact"}
-            )
-            return self.storage.save(memory_item)
+            memory_item = self._build_knowledge_item(user_id, "fact", fact)
+            saved = self.storage.save(memory_item)
+            if saved:
+                self._on_item_saved(user_id, memory_item)
+            return saved
         except Exception as e:
             self.logger.error(f"Error saving fact: {e}")
             return False
@@ -302,23 +565,12 @@ class MemoryService:
             bool: True if successful, False otherwise
         """
         try:
-            memory_item = MemoryItem(
-                type="knowledge",
-                content={"fact": fact},
-                metadata={"user_id": user_id, "category": "fact"}
-            )
+            memory_item = self._build_knowledge_item(user_id, "fact", fact)
             
-            # Check if storage supports async operations
-            if hasattr(self.storage, 'save') and callable(getattr(self.storage, 'save')):
-                # If it's our new async storage, call it directly
-                if hasattr(self.storage, '__class__') and 'AsyncSQLiteMemoryStorage' in str(self.storage.__class__):
-                    return await self.storage.save(memory_item)
-                # If it's our new sync storage with async methods, call them directly
-                elif hasattr(self.storage, '__class__') and 'SQLiteMemoryStorage' in str(self.storage.__class__):
-                    return self.storage.save(memory_item)
-            
-            # Fallback to sync method
-            return self.storage.save(memory_item)
+            saved = await self._save_item_async(memory_item)
+            if saved:
+                self._on_item_saved(user_id, memory_item)
+            return saved
         except Exception as e:
             self.logger.error(f"Error saving fact: {e}")
             return False
@@ -364,18 +616,7 @@ class MemoryService:
             List[MemoryItem]: List of matching knowledge items
         """
         try:
-            # Check if storage supports async operations
-            if hasattr(self.storage, 'search') and callable(getattr(self.storage, 'search')):
-                # If it's our new async storage, call it directly
-                if hasattr(self.storage, '__class__') and 'AsyncSQLiteMemoryStorage' in str(self.storage.__class__):
-                    results = await self.storage.search(query, type="knowledge", limit=limit)
-                # If it's our new sync storage with async methods, call them directly
-                elif hasattr(self.storage, '__class__') and 'SQLiteMemoryStorage' in str(self.storage.__class__):
-                    results = self.storage.search(query, type="knowledge", limit=limit)
-                else:
-                    results = self.storage.search(query, type="knowledge", limit=limit)
-            else:
-                results = self.storage.search(query, type="knowledge", limit=limit)
+            results = await self._call_storage_async('search', query, type="knowledge", limit=limit)
             
             # If user_id is specified, filter results
             if user_id:
@@ -389,6 +630,48 @@ class MemoryService:
             self.logger.error(f"Error searching knowledge: {e}")
             return []
     
+    def find_memories_by_entity(self, entity_type: str, value: str, limit: int = 10) -> List[MemoryItem]:
+        """
+        Find memory items mentioning an entity.
+        
+        Args:
+            entity_type (str): Type of the entity (person, email, ...)
+            value (str): Entity value, e.g. "Alice"
+            limit (int): Maximum number of results to return
+            
+        Returns:
+            List[MemoryItem]: Memory items mentioning the entity
+        """
+        try:
+            if hasattr(self.storage, 'find_memories_by_entity'):
+                return self.storage.find_memories_by_entity(entity_type, value, limit=limit)
+            return []
+        except Exception as e:
+            self.logger.error(f"Error finding memories by entity: {e}")
+            return []
+    
+    def get_related_entities(self, entity_type: str, value: str, max_hops: int = 1,
+                             limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get entities related to an entity through the knowledge graph.
+        
+        Args:
+            entity_type (str): Type of the entity (person, email, ...)
+            value (str): Entity value, e.g. "Alice"
+            max_hops (int): Maximum number of relationship hops to follow
+            limit (int): Maximum number of entities to return
+            
+        Returns:
+            List[Dict[str, Any]]: Related entities with their hop depth
+        """
+        try:
+            if hasattr(self.storage, 'expand_entity_graph'):
+                return self.storage.expand_entity_graph(entity_type, value, max_hops=max_hops, limit=limit)
+            return []
+        except Exception as e:
+            self.logger.error(f"Error retrieving related entities: {e}")
+            return []
+    
     def get_recent_conversation_history(self, limit: int = 5) -> List[MemoryItem]:
         """
         Get recent conversation history.
@@ -416,18 +699,7 @@ class MemoryService:
             List[MemoryItem]: List of recent conversation memory items
         """
         try:
-            # Check if storage supports async operations
-            if hasattr(self.storage, 'get_conversation_history') and callable(getattr(self.storage, 'get_conversation_history')):
-                # If it's our new async storage, call it directly
-                if hasattr(self.storage, '__class__') and 'AsyncSQLiteMemoryStorage' in str(self.storage.__class__):
-                    return await self.storage.get_conversation_history(limit=limit)
-                # If it's our new sync storage with async methods, call them directly
-                elif hasattr(self.storage, '__class__') and 'SQLiteMemoryStorage' in str(self.storage.__class__):
-                    return self.storage.get_conversation_history(limit=limit)
-                else:
-                    return self.storage.get_conversation_history(limit=limit)
-            else:
-                return self.storage.get_conversation_history(limit=limit)
+            return await self._call_storage_async('get_conversation_history', limit=limit)
         except Exception as e:
             self.logger.error(f"Error retrieving conversation history: {e}")
             return []
\ No newline at end of file
@@ -8,11 +8,50 @@ Implements async-first pattern with sync wrappers.
 import sqlite3
 import json
 import os
+import re
 import asyncio
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-import aiosqlite
+import hashlib
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta
 from .models import MemoryItem, Conversation, ConversationTurn, Feedback, Entity, Relationship
+from .entities import canonical_entity_key
+from .graph import EntityAdjacencyCache
+from ..config.constants import FEEDBACK
+from ..utils.lazy_import import lazy_import
+
+# aiosqlite is only needed by the async storage methods
+aiosqlite = lazy_import("aiosqlite")
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_content(value: Any) -> Any:
+    """Normalize content values so trivially different duplicates compare equal."""
+    if isinstance(value, str):
+        return _WHITESPACE_RE.sub(" ", value).strip().casefold()
+    if isinstance(value, dict):
+        return {key: _normalize_content(val) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_content(val) for val in value]
+    return value
+
+
+def compute_content_hash(content: Dict[str, Any]) -> str:
+    """
+    Compute the deduplication hash of memory item content.
+    
+    Strings are whitespace-collapsed and case-folded before hashing, so
+    "I like coffee" and "i like  coffee " hash the same.
+    
+    Args:
+        content (Dict[str, Any]): Memory item content
+        
+    Returns:
+        str: Hex digest of the normalized content
+    """
+    normalized = json.dumps(_normalize_content(content), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
 
 class MemoryStorage:
@@ -42,6 +81,9 @@ class MemoryStorage:
 class AsyncSQLiteMemoryStorage(MemoryStorage):
     """Async-first SQLite implementation of memory storage."""
     
+    # Memory item types saved with content-hash deduplication per user
+    DEDUPLICATED_TYPES = ("knowledge",)
+    
     def __init__(self, db_path: str = "data/memory.db", pool_size: int = 5):
         """
         Initialize the async SQLite memory storage.
@@ -53,6 +95,7 @@ class AsyncSQLiteMemoryStorage(MemoryStorage):
         self.db_path = db_path
         self.pool_size = pool_size
         self._initialized = False
+        self.graph_cache = EntityAdjacencyCache()
 
     async def _init_db(self):
         """Initialize the database with required tables."""
@@ -71,10 +114,26 @@ class AsyncSQLiteMemoryStorage(MemoryStorage):
                     metadata TEXT,
                     created_at TEXT,
                     updated_at TEXT,
-                    embedding TEXT
+                    embedding TEXT,
+                    user_id TEXT,
+                    content_hash TEXT
                 )
             ''')
             
+            await self._migrate_memory_items(db)
+            
+            # Duplicate knowledge saves resolve to the existing row with one index probe
+            await db.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_memory_items_content_hash
+                ON memory_items (user_id, type, content_hash)
+                WHERE content_hash IS NOT NULL
+            ''')
+            
+            await db.execute('''
+                CREATE INDEX IF NOT EXISTS idx_memory_items_type_updated
+                ON memory_items (type, updated_at)
+            ''')
+            
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS conversations (
                     id TEXT PRIMARY KEY,
@@ -109,6 +168,31 @@ class AsyncSQLiteMemoryStorage(MemoryStorage):
                 )
             ''')
             
+            # Feedback aggregates maintained by save_feedback, per user overall and per day
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS feedback_stats (
+                    user_id TEXT PRIMARY KEY,
+                    total_count INTEGER NOT NULL DEFAULT 0,
+                    rated_count INTEGER NOT NULL DEFAULT 0,
+                    rating_sum INTEGER NOT NULL DEFAULT 0,
+                    positive_count INTEGER NOT NULL DEFAULT 0,
+                    negative_count INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS feedback_daily_stats (
+                    user_id TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    total_count INTEGER NOT NULL DEFAULT 0,
+                    rated_count INTEGER NOT NULL DEFAULT 0,
+                    rating_sum INTEGER NOT NULL DEFAULT 0,
+                    positive_count INTEGER NOT NULL DEFAULT 0,
+                    negative_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (user_id, day)
+                )
+            ''')
+            
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS entities (
                     id TEXT PRIMARY KEY,
@@ -136,62 +220,451 @@ class AsyncSQLiteMemoryStorage(MemoryStorage):
                 )
             ''')
             
+            # Canonical entity registry: one row per (type, normalized value)
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS canonical_entities (
+                    id TEXT PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    normalized_value TEXT NOT NULL,
+                    display_value TEXT,
+                    first_seen TEXT,
+                    last_seen TEXT,
+                    UNIQUE (type, normalized_value)
+                )
+            ''')
+            
+            # Mentions link canonical entities to the memory items they appear in
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS entity_mentions (
+                    memory_item_id TEXT NOT NULL,
+                    local_entity_id TEXT NOT NULL,
+                    entity_id TEXT NOT NULL,
+                    value TEXT,
+                    confidence REAL,
+                    metadata TEXT,
+                    PRIMARY KEY (memory_item_id, local_entity_id),
+                    FOREIGN KEY (memory_item_id) REFERENCES memory_items (id),
+                    FOREIGN KEY (entity_id) REFERENCES canonical_entities (id)
+                )
+            ''')
+            
+            await db.execute('''
+                CREATE INDEX IF NOT EXISTS idx_entity_mentions_entity
+                ON entity_mentions (entity_id, memory_item_id)
+            ''')
+            
+            # Relationships resolved to canonical entities, stored in both directions
+            # so graph traversal is a single index probe per hop
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS entity_edges (
+                    memory_item_id TEXT NOT NULL,
+                    source_entity_id TEXT NOT NULL,
+                    target_entity_id TEXT NOT NULL,
+                    relationship_type TEXT,
+                    confidence REAL,
+                    direction TEXT NOT NULL,
+                    FOREIGN KEY (memory_item_id) REFERENCES memory_items (id),
+                    FOREIGN KEY (source_entity_id) REFERENCES canonical_entities (id),
+                    FOREIGN KEY (target_entity_id) REFERENCES canonical_entities (id)
+                )
+            ''')
+            
+            await db.execute('''
+                CREATE INDEX IF NOT EXISTS idx_entity_edges_source
+                ON entity_edges (source_entity_id, target_entity_id)
+            ''')
+            
+            await db.execute('''
+                CREATE INDEX IF NOT EXISTS idx_entity_edges_memory_item
+                ON entity_edges (memory_item_id)
+            ''')
+            
+            await db.execute('''
+                CREATE INDEX IF NOT EXISTS idx_relationships_memory_item
+                ON relationships (memory_item_id)
+            ''')
+            
+            # Databases created before the aggregates existed get them computed once
+            cursor = await db.execute('''
+                SELECT EXISTS (SELECT 1 FROM feedback)
+                   AND NOT EXISTS (SELECT 1 FROM feedback_stats)
+            ''')
+            if (await cursor.fetchone())[0]:
+                await self._rebuild_feedback_stats(db)
+            
             await db.commit()
         
         self._initialized = True
 
+    async def _migrate_memory_items(self, db):
+        """
+        Add columns missing from memory_items tables created by older versions.
+        
+        Args:
+            db: Open aiosqlite connection
+        """
+        cursor = await db.execute('PRAGMA table_info(memory_items)')
+        existing_columns = {row[1] for row in await cursor.fetchall()}
+        
+        for column in ('embedding', 'user_id', 'content_hash'):
+            if column not in existing_columns:
+                await db.execute(f'ALTER TABLE memory_items ADD COLUMN {column} TEXT')
+        
+        if 'user_id' not in existing_columns:
+            # Older items keep their owner in the JSON only; copy it out so
+            # per-user queries find them
+            await db.execute('''
+                UPDATE memory_items
+                SET user_id = COALESCE(json_extract(metadata, '$.user_id'),
+                                       json_extract(content, '$.user_id'))
+            ''')
+
+    async def _delete_item_rows(self, db, memory_item_id: str) -> bool:
+        """
+        Delete a memory item and every row that references it.
+        
+        The memory item row is deleted last, so ``changes()`` reflects whether it existed.
+        
+        Args:
+            db: Open aiosqlite connection
+            memory_item_id (str): ID of the memory item
+            
+        Returns:
+            bool: True if the memory item row existed
+        """
+        # Delete relationships first (foreign key constraint)
+        await db.execute('DELETE FROM relationships WHERE memory_item_id = ?', (memory_item_id,))
+        
+        # Delete entities, registry mentions and graph edges
+        await db.execute('DELETE FROM entities WHERE memory_item_id = ?', (memory_item_id,))
+        await db.execute('DELETE FROM entity_mentions WHERE memory_item_id = ?', (memory_item_id,))
+        await db.execute('DELETE FROM entity_edges WHERE memory_item_id = ?', (memory_item_id,))
+        
+        # Delete the memory item
+        cursor = await db.execute('DELETE FROM memory_items WHERE id = ?', (memory_item_id,))
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _item_user_id(item: MemoryItem) -> Optional[str]:
+        """Get the owning user of a memory item from its metadata or content."""
+        user_id = (item.metadata or {}).get("user_id")
+        if user_id is None and isinstance(item.content, dict):
+            user_id = item.content.get("user_id")
+        return user_id
+
+    def _dedup_key(self, item: MemoryItem) -> Optional[tuple]:
+        """
+        Get the (user_id, content_hash) deduplication key of a memory item.
+        
+        Args:
+            item (MemoryItem): Memory item to key
+            
+        Returns:
+            Optional[tuple]: Deduplication key, or None if the item type is not deduplicated
+        """
+        if item.type not in self.DEDUPLICATED_TYPES:
+            return None
+        user_id = (item.metadata or {}).get("user_id") or ""
+        return user_id, compute_content_hash(item.content)
+
+    @staticmethod
+    def _row_to_memory_item(row, entities: List[Entity] = None,
+                            relationships: List[Relationship] = None) -> MemoryItem:
+        """Build a MemoryItem from a memory_items row."""
+        return MemoryItem(
+            id=row['id'],
+            type=row['type'],
+            content=json.loads(row['content']),
+            metadata=json.loads(row['metadata']),
+            created_at=datetime.fromisoformat(row['created_at']),
+            updated_at=datetime.fromisoformat(row['updated_at']),
+            embedding=json.loads(row['embedding']) if row['embedding'] else None,
+            entities=entities or [],
+            relationships=relationships or []
+        )
+
+    async def _save_entity_mentions(self, db, item: MemoryItem):
+        """
+        Intern the entities of a memory item and record their mentions.
+        
+        Args:
+            db: Open aiosqlite connection
+            item (MemoryItem): Memory item whose entities should be registered
+        """
+        # Re-saving an item replaces its mentions
+        await db.execute('DELETE FROM entity_mentions WHERE memory_item_id = ?', (item.id,))
+        
+        seen_at = item.updated_at.isoformat()
+        for entity in item.entities:
+            canonical_id, entity_type, normalized = canonical_entity_key(entity.type, entity.value)
+            await db.execute('''
+                INSERT INTO canonical_entities
+                (id, type, normalized_value, display_value, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    display_value = excluded.display_value,
+                    last_seen = MAX(last_seen, excluded.last_seen)
+            ''', (canonical_id, entity_type, normalized, entity.value, seen_at, seen_at))
+            
+            await db.execute('''
+                INSERT OR REPLACE INTO entity_mentions
+                (memory_item_id, local_entity_id, entity_id, value, confidence, metadata)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                item.id,
+                entity.id,
+                canonical_id,
+                entity.value,
+                entity.confidence,
+                json.dumps(entity.metadata) if entity.metadata else None
+            ))
+
+    async def _save_entity_edges(self, db, item: MemoryItem):
+        """
+        Resolve the relationships of a memory item to canonical entity edges.
+        
+        Relationships whose endpoints are not entities of the item, or are ids shared
+        by several of its entities, are skipped.
+        
+        Args:
+            db: Open aiosqlite connection
+            item (MemoryItem): Memory item whose relationships should be indexed
+        """
+        await db.execute('DELETE FROM entity_edges WHERE memory_item_id = ?', (item.id,))
+        
+        canonical_ids = {}
+        for entity in item.entities:
+            canonical_id = canonical_entity_key(entity.type, entity.value)[0]
+            # An id shared by different entities cannot tell which one a relationship means
+            if canonical_ids.setdefault(entity.id, canonical_id) != canonical_id:
+                canonical_ids[entity.id] = None
+        for relationship in item.relationships:
+            source_id = canonical_ids.get(relationship.source_entity_id)
+            target_id = canonical_ids.get(relationship.target_entity_id)
+            if source_id is None or target_id is None or source_id == target_id:
+                continue
+            await db.executemany('''
+                INSERT INTO entity_edges
+                (memory_item_id, source_entity_id, target_entity_id,
+                 relationship_type, confidence, direction)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [
+                (item.id, source_id, target_id, relationship.relationship_type,
+                 relationship.confidence, 'out'),
+                (item.id, target_id, source_id, relationship.relationship_type,
+                 relationship.confidence, 'in')
+            ])
+
+    async def _get_neighbor_rows(self, db, entity_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the neighbours of a canonical entity, using the adjacency cache.
+        
+        Args:
+            db: Open aiosqlite connection with ``aiosqlite.Row`` row factory
+            entity_id (str): Canonical entity id
+            
+        Returns:
+            List[Dict[str, Any]]: One row per (neighbour, relationship type, direction)
+        """
+        neighbors = self.graph_cache.get(entity_id)
+        if neighbors is not None:
+            return neighbors
+        
+        cursor = await db.execute('''
+            SELECT ee.target_entity_id AS id, ce.type AS type, ce.display_value AS value,
+                   ee.relationship_type AS relationship_type, ee.direction AS direction,
+                   COUNT(*) AS weight, MAX(ee.confidence) AS confidence
+            FROM entity_edges ee
+            JOIN canonical_entities ce ON ce.id = ee.target_entity_id
+            WHERE ee.source_entity_id = ?
+            GROUP BY ee.target_entity_id, ee.relationship_type, ee.direction
+            ORDER BY weight DESC, ee.target_entity_id
+        ''', (entity_id,))
+        neighbors = [dict(row) for row in await cursor.fetchall()]
+        
+        self.graph_cache.set(entity_id, neighbors)
+        return neighbors
+
+    async def _get_entity_distances(self, db, entity_id: str, max_hops: int) -> Dict[str, int]:
+        """
+        Get the hop distance of every entity reachable within max_hops.
+        
+        Args:
+            db: Open aiosqlite connection
+            entity_id (str): Canonical id of the start entity
+            max_hops (int): Maximum number of hops to expand
+            
+        Returns:
+            Dict[str, int]: Canonical entity id to shortest hop distance (start included)
+        """
+        cursor = await db.execute('''
+            WITH RECURSIVE reach(entity_id, depth) AS (
+                SELECT ?, 0
+                UNION
+                SELECT ee.target_entity_id, reach.depth + 1
+                FROM reach
+                JOIN entity_edges ee ON ee.source_entity_id = reach.entity_id
+                WHERE reach.depth < ?
+            )
+            SELECT entity_id, MIN(depth) AS depth FROM reach GROUP BY entity_id
+        ''', (entity_id, max_hops))
+        return {row[0]: row[1] for row in await cursor.fetchall()}
+
+    async def _load_entities(self, db, memory_item_id: str) -> List[Entity]:
+        """
+        Load the entities mentioned in a memory item.
+        
+        Items saved before the entity registry existed fall back to the legacy
+        ``entities`` table.
+        
+        Args:
+            db: Open aiosqlite connection with ``aiosqlite.Row`` row factory
+            memory_item_id (str): ID of the memory item
+            
+        Returns:
+            List[Entity]: Entities mentioned in the memory item
+        """
+        cursor = await db.execute('''
+            SELECT em.local_entity_id AS id, ce.type AS type, em.value AS value,
+                   em.confidence AS confidence, em.metadata AS metadata
+            FROM entity_mentions em
+            JOIN canonical_entities ce ON ce.id = em.entity_id
+            WHERE em.memory_item_id = ?
+            ORDER BY em.rowid
+        ''', (memory_item_id,))
+        rows = await cursor.fetchall()
+        
+        if not rows:
+            cursor = await db.execute('''
+                SELECT * FROM entities WHERE memory_item_id = ?
+            ''', (memory_item_id,))
+            rows = await cursor.fetchall()
+        
+        return [
+            Entity(
+                id=entity_row['id'],
+                type=entity_row['type'],
+                value=entity_row['value'],
+                confidence=entity_row['confidence'],
+                metadata=json.loads(entity_row['metadata']) if entity_row['metadata'] else None
+            )
+            for entity_row in rows
+        ]
+
+    async def _save_item(self, db, item: MemoryItem):
+        """
+        Write a memory item with its entities and relationships on an open connection.
+        
+        The caller commits.
+        
+        Args:
+            db: Open aiosqlite connection
+            item (MemoryItem): Memory item to save
+        """
+        dedup_key = self._dedup_key(item)
+        user_id, content_hash = dedup_key if dedup_key else (self._item_user_id(item), None)
+        
+        if dedup_key:
+            # A duplicate save becomes an upsert of the existing item
+            await self._adopt_duplicate(db, item, user_id, content_hash)
+        
+        values = (
+            item.type,
+            json.dumps(item.content),
+            json.dumps(item.metadata),
+            item.created_at.isoformat(),
+            item.updated_at.isoformat(),
+            json.dumps(item.embedding) if item.embedding else None,
+            user_id,
+            content_hash
+        )
+        # Never INSERT OR REPLACE: a conflict on the content hash index would delete
+        # the other item's row and orphan its entity mentions and edges
+        cursor = await db.execute('''
+            INSERT INTO memory_items 
+            (type, content, metadata, created_at, updated_at, embedding,
+             user_id, content_hash, id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT DO NOTHING
+        ''', values + (item.id,))
+        
+        if cursor.rowcount == 0:
+            if dedup_key:
+                # A concurrent save of the same content may have won the race
+                await self._adopt_duplicate(db, item, user_id, content_hash)
+            # The stored created_at is kept
+            await db.execute('''
+                UPDATE memory_items
+                SET type = ?, content = ?, metadata = ?, updated_at = ?,
+                    embedding = ?, user_id = ?, content_hash = ?
+                WHERE id = ?
+            ''', values[:3] + values[4:] + (item.id,))
+        
+        # Save entities through the canonical registry
+        await self._save_entity_mentions(db, item)
+        
+        # Save relationships (re-saving an item replaces them)
+        await self._save_relationships(db, item)
+        
+        await self._save_entity_edges(db, item)
+
+    async def _adopt_duplicate(self, db, item: MemoryItem, user_id: str, content_hash: str):
+        """
+        Point a memory item at the stored item with the same content, if there is one.
+        
+        The item takes over the existing ID and ``created_at``; any rows saved under its
+        own ID are deleted.
+        
+        Args:
+            db: Open aiosqlite connection
+            item (MemoryItem): Memory item being saved
+            user_id (str): Owning user of the item
+            content_hash (str): Content hash of the item
+        """
+        cursor = await db.execute('''
+            SELECT id, created_at FROM memory_items
+            WHERE user_id = ? AND type = ? AND content_hash = ?
+        ''', (user_id, item.type, content_hash))
+        existing = await cursor.fetchone()
+        if existing and existing[0] != item.id:
+            await self._delete_item_rows(db, item.id)
+            item.id = existing[0]
+            item.created_at = datetime.fromisoformat(existing[1])
+
+    async def _save_relationships(self, db, item: MemoryItem):
+        """
+        Replace the relationship rows of a memory item.
+        
+        Args:
+            db: Open aiosqlite connection
+            item (MemoryItem): Memory item whose relationships should be saved
+        """
+        await db.execute('DELETE FROM relationships WHERE memory_item_id = ?', (item.id,))
+        for relationship in item.relationships:
+            await db.execute('''
+                INSERT OR REPLACE INTO relationships 
+                (memory_item_id, source_entity_id, target_entity_id, 
+                 relationship_type, confidence, metadata)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                item.id,
+                relationship.source_entity_id,
+                relationship.target_entity_id,
+                relationship.relationship_type,
+                relationship.confidence,
+                json.dumps(relationship.metadata) if relationship.metadata else None
+            ))
+
     async def save(self, item: MemoryItem) -> bool:
         """Save a memory item asynchronously."""
         await self._init_db()
         
         try:
             async with aiosqlite.connect(self.db_path) as db:
-                await db.execute('''
-                    INSERT OR REPLACE INTO memory_items 
-                    (id, type, content, metadata, created_at, updated_at, embedding)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    item.id,
-                    item.type,
-                    json.dumps(item.content),
-                    json.dumps(item.metadata),
-                    item.created_at.isoformat(),
-                    item.updated_at.isoformat(),
-                    json.dumps(item.embedding) if item.embedding else None
-                ))
-                
-                # Save entities
-                for entity in item.entities:
-                    await db.execute('''
-                        INSERT OR REPLACE INTO entities 
-                        (id, memory_item_id, type, value, confidence, metadata)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        entity.id,
-                        item.id,
-                        entity.type,
-                        entity.value,
-                        entity.confidence,
-                        json.dumps(entity.metadata) if entity.metadata else None
-                    ))
-                
-                # Save relationships
-                for relationship in item.relationships:
-                    await db.execute('''
-                        INSERT OR REPLACE INTO relationships 
-                        (memory_item_id, source_entity_id, target_entity_id, 
-                         relationship_type, confidence, metadata)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        item.id,
-                        relationship.source_entity_id,
-                        relationship.target_entity_id,
-                        relationship.relationship_type,
-                        relationship.confidence,
-                        json.dumps(relationship.metadata) if relationship.metadata else None
-                    ))
+                await self._save_item(db, item)
                 
                 await db.commit()
+                self.graph_cache.invalidate()
                 return True
                 
         except Exception as e:
@@ -217,20 +690,7 @@ class AsyncSQLiteMemoryStorage(MemoryStorage):
                     return None
                 
                 # Get entities
-                entities_cursor = await db.execute('''
-                    SELECT * FROM entities WHERE memory_item_id = ?
-                ''', (id,))
-                entities_rows = await entities_cursor.fetchall()
-                
-                entities = []
-                for entity_row in entities_rows:
-                    entities.append(Entity(
-                        id=entity_row['id'],
-                        type=entity_row['type'],
-                        value=entity_row['value'],
-                        confidence=entity_row['confidence'],
-                        metadata=json.loads(entity_row['metadata']) if entity_row['metadata'] else None
-                    ))
+                entities = await self._load_entities(db, id)
                 
                 # Get relationships
                 relationships_cursor = await db.execute('''
@@ -266,8 +726,9 @@ class AsyncSQLiteMemoryStorage(MemoryStorage):
             logger.error(f"Error retrieving memory item {id}: {e}")
             return None
 
-    async def search(self, query: str, type: str = None, limit: int = 10) -> List[MemoryItem]:
-        """Search for memory items asynchronously."""
+    async def search(self, query: str, type: str = None, limit: int = 10,
+                     user_id: str = None) -> List[MemoryItem]:
+        """Search for memory items asynchronously, optionally only those of one user."""
         await self._init_db()
         
         try:
@@ -283,6 +744,10 @@ class AsyncSQLiteMemoryStorage(MemoryStorage):
                     sql += ' AND type = ?'
                     params.append(type)
                 
+                if user_id is not None:
+                    sql += ' AND user_id = ?'
+                    params.append(user_id)
+                
                 # Add content search if query is not empty
                 if query is not None and query.strip():
                     sql += ' AND content LIKE ?'
@@ -329,16 +794,10 @@ class AsyncSQLiteMemoryStorage(MemoryStorage):
         
         try:
             async with aiosqlite.connect(self.db_path) as db:
-                # Delete relationships first (foreign key constraint)
-                await db.execute('DELETE FROM relationships WHERE memory_item_id = ?', (id,))
-                
-                # Delete entities
-                await db.execute('DELETE FROM entities WHERE memory_item_id = ?', (id,))
-                
-                # Delete the memory item
-                await db.execute('DELETE FROM memory_items WHERE id = ?', (id,))
+                await self._delete_item_rows(db, id)
                 
                 await db.commit()
+                self.graph_cache.invalidate()
                 # Check if any rows were affected
                 # Note: aiosqlite doesn't directly support rowcount, so we'll check differently
                 cursor = await db.execute('SELECT changes()')
@@ -357,6 +816,57 @@ class AsyncSQLiteMemoryStorage(MemoryStorage):
         item.updated_at = datetime.now()
         return await self.save(item)
 
+    async def update_item_enrichment(self, item_id: str, entities: List[Entity],
+                                     relationships: List[Relationship],
+                                     embedding: Optional[list] = None) -> bool:
+        """
+        Patch the extracted entities, relationships and embedding of a stored item.
+        
+        Content, metadata and timestamps are left untouched, so enrichment computed
+        after an item was saved never overwrites a concurrent update of its content.
+        
+        Args:
+            item_id (str): ID of the memory item
+            entities (List[Entity]): Extracted entities (replace the existing ones)
+            relationships (List[Relationship]): Extracted relationships (replace the existing ones)
+            embedding (Optional[list]): Embedding vector (None keeps the current one)
+            
+        Returns:
+            bool: True if the item exists and was patched, False otherwise
+        """
+        await self._init_db()
+        
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                cursor = await db.execute('SELECT updated_at FROM memory_items WHERE id = ?', (item_id,))
+                row = await cursor.fetchone()
+                if row is None:
+                    return False
+                
+                item = MemoryItem(
+                    id=item_id,
+                    updated_at=datetime.fromisoformat(row[0]),
+                    entities=entities,
+                    relationships=relationships
+                )
+                await self._save_entity_mentions(db, item)
+                await self._save_relationships(db, item)
+                await self._save_entity_edges(db, item)
+                
+                if embedding is not None:
+                    await db.execute('UPDATE memory_items SET embedding = ? WHERE id = ?',
+                                     (json.dumps(embedding), item_id))
+                
+                await db.commit()
+                self.graph_cache.invalidate()
+                return True
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error enriching memory item {item_id}: {e}")
+            return False
+
     # Conversation-specific methods
     async def save_conversation(self, conversation: Conversation) -> bool:
         """Save a conversation asynchronously."""
@@ -504,12 +1014,27 @@ class AsyncSQLiteMemoryStorage(MemoryStorage):
                 placeholders = ', '.join(['?' for _ in fields])
                 field_names = ', '.join(fields)
                 
+                # Replacing existing feedback takes its old values out of the aggregates
+                cursor = await db.execute(
+                    'SELECT user_id, rating, timestamp FROM feedback WHERE id = ?',
+                    (feedback_dict.get('id'),)
+                )
+                previous = await cursor.fetchone()
+                if previous:
+                    await self._update_feedback_stats(db, *previous, sign=-1)
+                
                 await db.execute(f'''
                     INSERT OR REPLACE INTO feedback
                     ({field_names})
                     VALUES ({placeholders})
                 ''', values)
                 
+                cursor = await db.execute(
+                    'SELECT user_id, rating, timestamp FROM feedback WHERE id = ?',
+                    (feedback_dict.get('id'),)
+                )
+                await self._update_feedback_stats(db, *(await cursor.fetchone()), sign=1)
+                
                 await db.commit()
                 return True
                 
@@ -572,79 +1097,581 @@ class AsyncSQLiteMemoryStorage(MemoryStorage):
             logger.error(f"Error retrieving feedback: {e}")
             return []
     
-    async def get_feedback_stats(self, user_id: str = None) -> Dict[str, Any]:
+    async def _update_feedback_stats(self, db, user_id: Optional[str], rating: Optional[int],
+                                     timestamp: Optional[str], sign: int):
+        """
+        Add one feedback row to (sign=1) or remove it from (sign=-1) the aggregates.
+        
+        Args:
+            db: Open aiosqlite connection
+            user_id (Optional[str]): User the feedback belongs to
+            rating (Optional[int]): Feedback rating
+            timestamp (Optional[str]): ISO timestamp of the feedback (default: today)
+            sign (int): 1 to add the feedback, -1 to remove it
+        """
+        rated = rating is not None
+        counts = (
+            sign,
+            sign if rated else 0,
+            sign * rating if rated else 0,
+            sign if rated and rating >= FEEDBACK.POSITIVE_RATING_THRESHOLD else 0,
+            sign if rated and rating <= FEEDBACK.NEGATIVE_RATING_THRESHOLD else 0
+        )
+        day = (timestamp or datetime.now().isoformat())[:10]
+        
+        await db.execute('''
+            INSERT INTO feedback_stats
+            (user_id, total_count, rated_count, rating_sum, positive_count, negative_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET
+                total_count = total_count + excluded.total_count,
+                rated_count = rated_count + excluded.rated_count,
+                rating_sum = rating_sum + excluded.rating_sum,
+                positive_count = positive_count + excluded.positive_count,
+                negative_count = negative_count + excluded.negative_count
+        ''', (user_id or "", *counts))
+        
+        await db.execute('''
+            INSERT INTO feedback_daily_stats
+            (user_id, day, total_count, rated_count, rating_sum, positive_count, negative_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, day) DO UPDATE SET
+                total_count = total_count + excluded.total_count,
+                rated_count = rated_count + excluded.rated_count,
+                rating_sum = rating_sum + excluded.rating_sum,
+                positive_count = positive_count + excluded.positive_count,
+                negative_count = negative_count + excluded.negative_count
+        ''', (user_id or "", day, *counts))
+    
+    async def _rebuild_feedback_stats(self, db):
+        """
+        Recompute the feedback aggregates from the raw feedback table.
+        
+        Args:
+            db: Open aiosqlite connection
+        """
+        await db.execute('DELETE FROM feedback_stats')
+        await db.execute('DELETE FROM feedback_daily_stats')
+        
+        aggregates = '''
+            COUNT(*), COUNT(rating), COALESCE(SUM(rating), 0),
+            COUNT(CASE WHEN rating >= ? THEN 1 END),
+            COUNT(CASE WHEN rating <= ? THEN 1 END)
+        '''
+        thresholds = (FEEDBACK.POSITIVE_RATING_THRESHOLD, FEEDBACK.NEGATIVE_RATING_THRESHOLD)
+        
+        await db.execute(f'''
+            INSERT INTO feedback_stats
+            (user_id, total_count, rated_count, rating_sum, positive_count, negative_count)
+            SELECT COALESCE(user_id, ''), {aggregates}
+            FROM feedback
+            GROUP BY COALESCE(user_id, '')
+        ''', thresholds)
+        
+        await db.execute(f'''
+            INSERT INTO feedback_daily_stats
+            (user_id, day, total_count, rated_count, rating_sum, positive_count, negative_count)
+            SELECT COALESCE(user_id, ''), day, {aggregates}
+            FROM (
+                SELECT user_id, rating,
+                       COALESCE(substr(timestamp, 1, 10), date('now', 'localtime')) AS day
+                FROM feedback
+            )
+            GROUP BY COALESCE(user_id, ''), day
+        ''', thresholds)
+    
+    async def rebuild_feedback_stats(self) -> bool:
+        """
+        Recompute the feedback aggregates from the raw feedback asynchronously.
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        await self._init_db()
+        
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                await self._rebuild_feedback_stats(db)
+                await db.commit()
+                return True
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error rebuilding feedback stats: {e}")
+            return False
+    
+    async def get_feedback_stats(self, user_id: str = None, window_days: int = None) -> Dict[str, Any]:
         """
         Get feedback statistics asynchronously.
         
+        Statistics are read from the aggregates maintained by save_feedback, so the
+        cost does not grow with the amount of feedback.
+        
         Args:
             user_id (str): Optional user ID to filter feedback
+            window_days (int): Optional rolling window; only feedback from the last
+                window_days days (including today) is counted
             
         Returns:
             Dict[str, Any]: Feedback statistics
         """
         await self._init_db()
         
+        empty_stats = {
+            'total_feedback': 0,
+            'average_rating': 0,
+            'positive_feedback': 0,
+            'negative_feedback': 0
+        }
+        
         try:
             async with aiosqlite.connect(self.db_path) as db:
                 db.row_factory = aiosqlite.Row
                 
-                if user_id:
-                    cursor = await db.execute('''
-                        SELECT
-                            COUNT(*) as total_feedback,
-                            AVG(rating) as average_rating,
-                            COUNT(CASE WHEN rating >= 4 THEN 1 END) as positive_feedback,
-                            COUNT(CASE WHEN rating <= 2 THEN 1 END) as negative_feedback
-                        FROM feedback
-                        WHERE user_id = ?
-                    ''', (user_id,))
+                conditions = []
+                params = []
+                if window_days is not None:
+                    table = 'feedback_daily_stats'
+                    start_day = (datetime.now() - timedelta(days=window_days - 1)).date()
+                    conditions.append('day >= ?')
+                    params.append(start_day.isoformat())
                 else:
-                    cursor = await db.execute('''
-                        SELECT
-                            COUNT(*) as total_feedback,
-                            AVG(rating) as average_rating,
-                            COUNT(CASE WHEN rating >= 4 THEN 1 END) as positive_feedback,
-                            COUNT(CASE WHEN rating <= 2 THEN 1 END) as negative_feedback
-                        FROM feedback
-                    ''')
+                    table = 'feedback_stats'
+                if user_id:
+                    conditions.append('user_id = ?')
+                    params.append(user_id)
+                where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                
+                cursor = await db.execute(f'''
+                    SELECT
+                        SUM(total_count) as total_feedback,
+                        SUM(rated_count) as rated_feedback,
+                        SUM(rating_sum) as rating_sum,
+                        SUM(positive_count) as positive_feedback,
+                        SUM(negative_count) as negative_feedback
+                    FROM {table}
+                    {where}
+                ''', params)
                 
                 row = await cursor.fetchone()
                 
-                if row:
+                if row and row['total_feedback']:
+                    rated = row['rated_feedback'] or 0
                     return {
-                        'total_feedback': row['total_feedback'] or 0,
-                        'average_rating': round(row['average_rating'] or 0, 2),
+                        'total_feedback': row['total_feedback'],
+                        'average_rating': round(row['rating_sum'] / rated, 2) if rated else 0,
                         'positive_feedback': row['positive_feedback'] or 0,
                         'negative_feedback': row['negative_feedback'] or 0
                     }
                 else:
-                    return {
-                        'total_feedback': 0,
-                        'average_rating': 0,
-                        'positive_feedback': 0,
-                        'negative_feedback': 0
-                    }
+                    return empty_stats
                 
         except Exception as e:
             from ..utils.logging import get_logger
             logger = get_logger()
             logger.error(f"Error retrieving feedback stats: {e}")
-            return {
-                'total_feedback': 0,
-                'average_rating': 0,
-                'positive_feedback': 0,
-                'negative_feedback': 0
-            }
+            return empty_stats
     
-    async def get_conversation_history(self, limit: int = 10) -> List[MemoryItem]:
+    async def get_canonical_entity(self, entity_type: str, value: str) -> Optional[Dict[str, Any]]:
         """
-        Get recent conversation history asynchronously.
+        Look up an entity in the canonical registry asynchronously.
         
         Args:
-            limit (int): Maximum number of conversation items to retrieve
+            entity_type (str): Type of the entity (person, email, ...)
+            value (str): Entity value; normalized before lookup
             
         Returns:
-            List[MemoryItem]: List of recent conversation memory items
+            Optional[Dict[str, Any]]: Registry entry with mention count, or None if unknown
+        """
+        await self._init_db()
+        
+        canonical_id, _, _ = canonical_entity_key(entity_type, value)
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                db.row_factory = aiosqlite.Row
+                
+                cursor = await db.execute('''
+                    SELECT ce.*,
+                           (SELECT COUNT(*) FROM entity_mentions em
+                            WHERE em.entity_id = ce.id) AS mention_count
+                    FROM canonical_entities ce
+                    WHERE ce.id = ?
+                ''', (canonical_id,))
+                row = await cursor.fetchone()
+                if not row:
+                    return None
+                
+                return {
+                    'id': row['id'],
+                    'type': row['type'],
+                    'normalized_value': row['normalized_value'],
+                    'value': row['display_value'],
+                    'first_seen': row['first_seen'],
+                    'last_seen': row['last_seen'],
+                    'mention_count': row['mention_count']
+                }
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error retrieving entity {entity_type}:{value}: {e}")
+            return None
+    
+    async def find_memories_by_entity(self, entity_type: str, value: str,
+                                      limit: int = 10) -> List[MemoryItem]:
+        """
+        Find memory items mentioning an entity asynchronously.
+        
+        Uses the entity mentions index, so the lookup cost does not depend on the
+        total number of memory items.
+        
+        Args:
+            entity_type (str): Type of the entity (person, email, ...)
+            value (str): Entity value; normalized before lookup
+            limit (int): Maximum number of memory items to return
+            
+        Returns:
+            List[MemoryItem]: Matching memory items, most recently updated first
+        """
+        await self._init_db()
+        
+        canonical_id, _, _ = canonical_entity_key(entity_type, value)
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                db.row_factory = aiosqlite.Row
+                
+                cursor = await db.execute('''
+                    SELECT mi.* FROM memory_items mi
+                    WHERE mi.id IN (
+                        SELECT memory_item_id FROM entity_mentions WHERE entity_id = ?
+                    )
+                    ORDER BY mi.updated_at DESC
+                    LIMIT ?
+                ''', (canonical_id, limit))
+                rows = await cursor.fetchall()
+                
+                # Entities/relationships are not loaded, same as search()
+                return [self._row_to_memory_item(row) for row in rows]
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error finding memories for entity {entity_type}:{value}: {e}")
+            return []
+    
+    async def backfill_entity_registry(self) -> int:
+        """
+        Register entities of items saved before the canonical registry existed.
+        
+        Reads the legacy ``entities`` table for memory items that have no mentions yet.
+        Safe to run repeatedly.
+        
+        Returns:
+            int: Number of mentions created
+        """
+        await self._init_db()
+        
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                db.row_factory = aiosqlite.Row
+                
+                cursor = await db.execute('''
+                    SELECT e.*, mi.updated_at AS item_updated_at
+                    FROM entities e
+                    JOIN memory_items mi ON mi.id = e.memory_item_id
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM entity_mentions em
+                        WHERE em.memory_item_id = e.memory_item_id
+                    )
+                ''')
+                rows = await cursor.fetchall()
+                
+                for row in rows:
+                    canonical_id, entity_type, normalized = canonical_entity_key(row['type'], row['value'])
+                    await db.execute('''
+                        INSERT INTO canonical_entities
+                        (id, type, normalized_value, display_value, first_seen, last_seen)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(id) DO UPDATE SET
+                            first_seen = MIN(first_seen, excluded.first_seen),
+                            last_seen = MAX(last_seen, excluded.last_seen)
+                    ''', (canonical_id, entity_type, normalized, row['value'],
+                          row['item_updated_at'], row['item_updated_at']))
+                    await db.execute('''
+                        INSERT OR IGNORE INTO entity_mentions
+                        (memory_item_id, local_entity_id, entity_id, value, confidence, metadata)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    ''', (row['memory_item_id'], row['id'], canonical_id, row['value'],
+                          row['confidence'], row['metadata']))
+                
+                await db.commit()
+                return len(rows)
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error backfilling entity registry: {e}")
+            return 0
+    
+    async def get_entity_neighbors(self, entity_type: str, value: str,
+                                   relationship_type: str = None,
+                                   limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get the entities directly related to an entity asynchronously.
+        
+        Args:
+            entity_type (str): Type of the entity (person, email, ...)
+            value (str): Entity value; normalized before lookup
+            relationship_type (str): Optional relationship type to filter on
+            limit (int): Maximum number of neighbours to return
+            
+        Returns:
+            List[Dict[str, Any]]: Neighbours with relationship type, direction and weight
+        """
+        await self._init_db()
+        
+        canonical_id, _, _ = canonical_entity_key(entity_type, value)
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                db.row_factory = aiosqlite.Row
+                neighbors = await self._get_neighbor_rows(db, canonical_id)
+                
+            if relationship_type:
+                neighbors = [n for n in neighbors if n['relationship_type'] == relationship_type]
+            return [dict(n) for n in neighbors[:limit]]
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error retrieving neighbors of {entity_type}:{value}: {e}")
+            return []
+    
+    async def expand_entity_graph(self, entity_type: str, value: str, max_hops: int = 2,
+                                  limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get the entities reachable from an entity within max_hops asynchronously.
+        
+        Args:
+            entity_type (str): Type of the start entity
+            value (str): Value of the start entity; normalized before lookup
+            max_hops (int): Maximum number of hops to expand
+            limit (int): Maximum number of entities to return
+            
+        Returns:
+            List[Dict[str, Any]]: Reachable entities with their hop depth, nearest first
+        """
+        await self._init_db()
+        
+        canonical_id, _, _ = canonical_entity_key(entity_type, value)
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                db.row_factory = aiosqlite.Row
+                
+                cursor = await db.execute('''
+                    WITH RECURSIVE reach(entity_id, depth) AS (
+                        SELECT ?, 0
+                        UNION
+                        SELECT ee.target_entity_id, reach.depth + 1
+                        FROM reach
+                        JOIN entity_edges ee ON ee.source_entity_id = reach.entity_id
+                        WHERE reach.depth < ?
+                    )
+                    SELECT ce.id AS id, ce.type AS type, ce.display_value AS value,
+                           MIN(reach.depth) AS depth
+                    FROM reach
+                    JOIN canonical_entities ce ON ce.id = reach.entity_id
+                    WHERE reach.entity_id != ?
+                    GROUP BY ce.id
+                    ORDER BY depth, ce.id
+                    LIMIT ?
+                ''', (canonical_id, max_hops, canonical_id, limit))
+                
+                return [dict(row) for row in await cursor.fetchall()]
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error expanding entity graph from {entity_type}:{value}: {e}")
+            return []
+    
+    async def find_entity_path(self, source_type: str, source_value: str,
+                               target_type: str, target_value: str,
+                               max_hops: int = 4) -> List[Dict[str, Any]]:
+        """
+        Find a shortest path between two entities asynchronously.
+        
+        Args:
+            source_type (str): Type of the source entity
+            source_value (str): Value of the source entity
+            target_type (str): Type of the target entity
+            target_value (str): Value of the target entity
+            max_hops (int): Maximum path length in hops
+            
+        Returns:
+            List[Dict[str, Any]]: Entities along the path, source first; empty if
+                the entities are not connected within max_hops
+        """
+        await self._init_db()
+        
+        source_id, _, _ = canonical_entity_key(source_type, source_value)
+        target_id, _, _ = canonical_entity_key(target_type, target_value)
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                db.row_factory = aiosqlite.Row
+                
+                distances = await self._get_entity_distances(db, source_id, max_hops)
+                if target_id not in distances:
+                    return []
+                
+                # Walk back from the target through neighbours one hop closer to the source
+                path_ids = [target_id]
+                current = target_id
+                for depth in range(distances[target_id] - 1, -1, -1):
+                    neighbors = await self._get_neighbor_rows(db, current)
+                    current = min(n['id'] for n in neighbors if distances.get(n['id']) == depth)
+                    path_ids.append(current)
+                path_ids.reverse()
+                
+                placeholders = ', '.join('?' for _ in path_ids)
+                cursor = await db.execute(f'''
+                    SELECT id, type, display_value AS value
+                    FROM canonical_entities WHERE id IN ({placeholders})
+                ''', path_ids)
+                entities = {row['id']: dict(row) for row in await cursor.fetchall()}
+                
+                return [entities[entity_id] for entity_id in path_ids if entity_id in entities]
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error finding path from {source_type}:{source_value} "
+                         f"to {target_type}:{target_value}: {e}")
+            return []
+    
+    async def rebuild_entity_graph(self) -> int:
+        """
+        Rebuild the canonical entity edges from the relationships table.
+        
+        Needed once for databases written before entity edges existed; run
+        backfill_entity_registry() first so their entities are registered.
+        
+        Returns:
+            int: Number of edges written (each relationship counts once)
+        """
+        await self._init_db()
+        
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.execute('DELETE FROM entity_edges')
+                await db.execute('''
+                    INSERT INTO entity_edges
+                    (memory_item_id, source_entity_id, target_entity_id,
+                     relationship_type, confidence, direction)
+                    SELECT r.memory_item_id, ms.entity_id, mt.entity_id,
+                           r.relationship_type, r.confidence, 'out'
+                    FROM relationships r
+                    JOIN entity_mentions ms ON ms.memory_item_id = r.memory_item_id
+                        AND ms.local_entity_id = r.source_entity_id
+                    JOIN entity_mentions mt ON mt.memory_item_id = r.memory_item_id
+                        AND mt.local_entity_id = r.target_entity_id
+                    WHERE ms.entity_id != mt.entity_id
+                ''')
+                await db.execute('''
+                    INSERT INTO entity_edges
+                    (memory_item_id, source_entity_id, target_entity_id,
+                     relationship_type, confidence, direction)
+                    SELECT memory_item_id, target_entity_id, source_entity_id,
+                           relationship_type, confidence, 'in'
+                    FROM entity_edges WHERE direction = 'out'
+                ''')
+                await db.commit()
+                
+                cursor = await db.execute("SELECT COUNT(*) FROM entity_edges WHERE direction = 'out'")
+                row = await cursor.fetchone()
+            
+            self.graph_cache.invalidate()
+            return row[0] if row else 0
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error rebuilding entity graph: {e}")
+            return 0
+    
+    async def deduplicate_memory_items(self) -> int:
+        """
+        Merge duplicate items of deduplicated types in an existing database.
+        
+        One-off pass for databases written before content hashing existed. Items with
+        the same user, type and normalized content are merged into the most recently
+        updated one, which keeps the earliest ``created_at``. Safe to run repeatedly.
+        
+        Returns:
+            int: Number of duplicate items removed
+        """
+        await self._init_db()
+        
+        placeholders = ', '.join('?' for _ in self.DEDUPLICATED_TYPES)
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                db.row_factory = aiosqlite.Row
+                
+                cursor = await db.execute(f'''
+                    SELECT id, type, content, metadata, created_at, updated_at
+                    FROM memory_items
+                    WHERE type IN ({placeholders})
+                    ORDER BY updated_at DESC
+                ''', self.DEDUPLICATED_TYPES)
+                rows = await cursor.fetchall()
+                
+                groups: Dict[tuple, List[Any]] = {}
+                for row in rows:
+                    item = MemoryItem(
+                        id=row['id'],
+                        type=row['type'],
+                        content=json.loads(row['content']),
+                        metadata=json.loads(row['metadata']) if row['metadata'] else {}
+                    )
+                    user_id, content_hash = self._dedup_key(item)
+                    groups.setdefault((user_id, row['type'], content_hash), []).append(row)
+                
+                removed = 0
+                for (user_id, _, content_hash), group_rows in groups.items():
+                    keeper, duplicates = group_rows[0], group_rows[1:]
+                    for duplicate in duplicates:
+                        await self._delete_item_rows(db, duplicate['id'])
+                    removed += len(duplicates)
+                    
+                    await db.execute('''
+                        UPDATE memory_items
+                        SET user_id = ?, content_hash = ?, created_at = ?
+                        WHERE id = ?
+                    ''', (user_id, content_hash, min(r['created_at'] for r in group_rows), keeper['id']))
+                
+                await db.commit()
+            
+            self.graph_cache.invalidate()
+            return removed
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error deduplicating memory items: {e}")
+            return 0
+    
+    async def get_items_updated_before(self, type: str, cutoff: datetime,
+                                       limit: int = 100) -> List[MemoryItem]:
+        """
+        Get the oldest memory items of a type last updated before a cutoff asynchronously.
+        
+        Args:
+            type (str): Memory item type
+            cutoff (datetime): Only items with ``updated_at`` before this are returned
+            limit (int): Maximum number of items to return
+            
+        Returns:
+            List[MemoryItem]: Matching items, oldest first, without entities/relationships
         """
         await self._init_db()
         
@@ -654,30 +1681,169 @@ class AsyncSQLiteMemoryStorage(MemoryStorage):
                 
                 cursor = await db.execute('''
                     SELECT * FROM memory_items
-                    WHERE type = 'conversation'
+                    WHERE type = ? AND updated_at < ?
+                    ORDER BY updated_at ASC
+                    LIMIT ?
+                ''', (type, cutoff.isoformat(), limit))
+                
+                return [self._row_to_memory_item(row) for row in await cursor.fetchall()]
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error retrieving {type} items updated before {cutoff}: {e}")
+            return []
+    
+    async def get_recent_item_versions(self, limits: Dict[str, int],
+                                       user_id: str = None) -> Dict[str, List[Tuple[str, datetime]]]:
+        """
+        Get the IDs and update times of the most recently updated items of some types.
+        
+        Reads no item content, in one query, so callers that keep items in memory can
+        tell cheaply which of them changed.
+        
+        Args:
+            limits (Dict[str, int]): Number of items per type
+            user_id (str): Only consider the items of this user (default: all users)
+            
+        Returns:
+            Dict[str, List[Tuple[str, datetime]]]: (id, updated_at) pairs per type, most
+                recently updated first; empty if the query failed
+        """
+        await self._init_db()
+        
+        user_filter = ' AND user_id = ?' if user_id is not None else ''
+        subqueries = []
+        params = []
+        for type, limit in limits.items():
+            subqueries.append(f'''
+                SELECT * FROM (
+                    SELECT id, type, updated_at FROM memory_items
+                    WHERE type = ?{user_filter}
                     ORDER BY updated_at DESC
                     LIMIT ?
-                ''', (limit,))
+                )''')
+            params.extend([type] + ([user_id] if user_id is not None else []) + [limit])
+        
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                cursor = await db.execute(' UNION ALL '.join(subqueries), params)
+                rows = await cursor.fetchall()
+            
+            versions = {type: [] for type in limits}
+            for item_id, type, updated_at in sorted(rows, key=lambda row: row[2], reverse=True):
+                versions[type].append((item_id, datetime.fromisoformat(updated_at)))
+            return versions
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error retrieving recent item versions: {e}")
+            return {}
+    
+    async def get_items(self, ids: List[str]) -> List[MemoryItem]:
+        """
+        Get memory items by ID asynchronously.
+        
+        Args:
+            ids (List[str]): IDs of the items
+            
+        Returns:
+            List[MemoryItem]: The items found, without entities/relationships
+        """
+        await self._init_db()
+        
+        if not ids:
+            return []
+        
+        placeholders = ', '.join('?' for _ in ids)
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                db.row_factory = aiosqlite.Row
+                
+                cursor = await db.execute(f'''
+                    SELECT * FROM memory_items WHERE id IN ({placeholders})
+                ''', list(ids))
+                
+                return [self._row_to_memory_item(row) for row in await cursor.fetchall()]
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error retrieving memory items: {e}")
+            return []
+    
+    async def replace_items(self, new_item: MemoryItem, replaced_ids: List[str]) -> bool:
+        """
+        Atomically save a memory item and delete the items it replaces asynchronously.
+        
+        Used to roll old items up into a summary item. Nothing is saved unless every
+        replaced item still existed, so concurrent roll-ups of the same items save
+        only one summary.
+        
+        Args:
+            new_item (MemoryItem): Item to save
+            replaced_ids (List[str]): IDs of the items to delete
+            
+        Returns:
+            bool: True if successful, False otherwise (including when a replaced item
+                was already gone)
+        """
+        await self._init_db()
+        
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                for item_id in replaced_ids:
+                    if item_id != new_item.id and not await self._delete_item_rows(db, item_id):
+                        await db.rollback()
+                        from ..utils.logging import get_logger
+                        logger = get_logger()
+                        logger.warning(f"Not saving {new_item.id}: replaced item {item_id} is gone")
+                        return False
+                
+                await self._save_item(db, new_item)
+                await db.commit()
+                self.graph_cache.invalidate()
+                return True
+                
+        except Exception as e:
+            from ..utils.logging import get_logger
+            logger = get_logger()
+            logger.error(f"Error replacing memory items with {new_item.id}: {e}")
+            return False
+    
+    async def get_conversation_history(self, limit: int = 10, user_id: str = None) -> List[MemoryItem]:
+        """
+        Get recent conversation history asynchronously.
+        
+        Args:
+            limit (int): Maximum number of conversation items to retrieve
+            user_id (str): Only return the conversations of this user (default: all users)
+            
+        Returns:
+            List[MemoryItem]: List of recent conversation memory items
+        """
+        await self._init_db()
+        
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                db.row_factory = aiosqlite.Row
+                
+                user_filter = ' AND user_id = ?' if user_id is not None else ''
+                params = (user_id, limit) if user_id is not None else (limit,)
+                cursor = await db.execute(f'''
+                    SELECT * FROM memory_items
+                    WHERE type = 'conversation'{user_filter}
+                    ORDER BY updated_at DESC
+                    LIMIT ?
+                ''', params)
                 
                 rows = await cursor.fetchall()
                 
                 items = []
                 for row in rows:
                     # Get entities
-                    entities_cursor = await db.execute('''
-                        SELECT * FROM entities WHERE memory_item_id = ?
-                    ''', (row['id'],))
-                    entities_rows = await entities_cursor.fetchall()
-                    
-                    entities = []
-                    for entity_row in entities_rows:
-                        entities.append(Entity(
-                            id=entity_row['id'],
-                            type=entity_row['type'],
-                            value=entity_row['value'],
-                            confidence=entity_row['confidence'],
-                            metadata=json.loads(entity_row['metadata']) if entity_row['metadata'] else None
-                        ))
+                    entities = await self._load_entities(db, row['id'])
                     
                     # Get relationships
                     relationships_cursor = await db.execute('''
@@ -759,9 +1925,10 @@ class SQLiteMemoryStorage:
         """Retrieve a memory item by ID synchronously."""
         return self._run_async(self.async_storage.retrieve(id))
 
-    def search(self, query: str, type: str = None, limit: int = 10) -> List[MemoryItem]:
-        """Search for memory items synchronously."""
-        return self._run_async(self.async_storage.search(query, type, limit))
+    def search(self, query: str, type: str = None, limit: int = 10,
+               user_id: str = None) -> List[MemoryItem]:
+        """Search for memory items synchronously, optionally only those of one user."""
+        return self._run_async(self.async_storage.search(query, type, limit, user_id))
 
     def delete(self, id: str) -> bool:
         """Delete a memory item synchronously."""
@@ -771,6 +1938,12 @@ class SQLiteMemoryStorage:
         """Update an existing memory item synchronously."""
         return self._run_async(self.async_storage.update(item))
 
+    def update_item_enrichment(self, item_id: str, entities: List[Entity],
+                               relationships: List[Relationship],
+                               embedding: Optional[list] = None) -> bool:
+        """Patch the extracted entities, relationships and embedding of a stored item."""
+        return self._run_async(self.async_storage.update_item_enrichment(item_id, entities, relationships, embedding))
+    
     def save_conversation(self, conversation: Conversation) -> bool:
         """Save a conversation synchronously."""
         return self._run_async(self.async_storage.save_conversation(conversation))
@@ -787,10 +1960,68 @@ class SQLiteMemoryStorage:
         """Get feedback items synchronously."""
         return self._run_async(self.async_storage.get_feedback(message_id, limit))
     
-    def get_feedback_stats(self, user_id: str = None) -> Dict[str, Any]:
+    def get_feedback_stats(self, user_id: str = None, window_days: int = None) -> Dict[str, Any]:
         """Get feedback statistics synchronously."""
-        return self._run_async(self.async_storage.get_feedback_stats(user_id))
+        return self._run_async(self.async_storage.get_feedback_stats(user_id, window_days))
+    
+    def rebuild_feedback_stats(self) -> bool:
+        """Recompute the feedback aggregates from the raw feedback synchronously."""
+        return self._run_async(self.async_storage.rebuild_feedback_stats())
+    
+    def get_conversation_history(self, limit: int = 10, user_id: str = None) -> List[MemoryItem]:
+        """Get recent conversation history synchronously, optionally of one user."""
+        return self._run_async(self.async_storage.get_conversation_history(limit, user_id))
+    
+    def get_canonical_entity(self, entity_type: str, value: str) -> Optional[Dict[str, Any]]:
+        """Look up an entity in the canonical registry synchronously."""
+        return self._run_async(self.async_storage.get_canonical_entity(entity_type, value))
+    
+    def find_memories_by_entity(self, entity_type: str, value: str, limit: int = 10) -> List[MemoryItem]:
+        """Find memory items mentioning an entity synchronously."""
+        return self._run_async(self.async_storage.find_memories_by_entity(entity_type, value, limit))
+    
+    def backfill_entity_registry(self) -> int:
+        """Register entities of items saved before the canonical registry existed synchronously."""
+        return self._run_async(self.async_storage.backfill_entity_registry())
+    
+    def get_entity_neighbors(self, entity_type: str, value: str, relationship_type: str = None,
+                             limit: int = 50) -> List[Dict[str, Any]]:
+        """Get the entities directly related to an entity synchronously."""
+        return self._run_async(self.async_storage.get_entity_neighbors(
+            entity_type, value, relationship_type, limit))
+    
+    def expand_entity_graph(self, entity_type: str, value: str, max_hops: int = 2,
+                            limit: int = 100) -> List[Dict[str, Any]]:
+        """Get the entities reachable from an entity within max_hops synchronously."""
+        return self._run_async(self.async_storage.expand_entity_graph(entity_type, value, max_hops, limit))
+    
+    def find_entity_path(self, source_type: str, source_value: str, target_type: str,
+                         target_value: str, max_hops: int = 4) -> List[Dict[str, Any]]:
+        """Find a shortest path between two entities synchronously."""
+        return self._run_async(self.async_storage.find_entity_path(
+            source_type, source_value, target_type, target_value, max_hops))
+    
+    def rebuild_entity_graph(self) -> int:
+        """Rebuild the canonical entity edges from the relationships table synchronously."""
+        return self._run_async(self.async_storage.rebuild_entity_graph())
+    
+    def deduplicate_memory_items(self) -> int:
+        """Merge duplicate items of deduplicated types synchronously."""
+        return self._run_async(self.async_storage.deduplicate_memory_items())
+    
+    def get_items_updated_before(self, type: str, cutoff: datetime, limit: int = 100) -> List[MemoryItem]:
+        """Get the oldest memory items of a type last updated before a cutoff synchronously."""
+        return self._run_async(self.async_storage.get_items_updated_before(type, cutoff, limit))
+    
+    def get_recent_item_versions(self, limits: Dict[str, int],
+                                 user_id: str = None) -> Dict[str, List[Tuple[str, datetime]]]:
+        """Get the IDs and update times of the most recently updated items of some types synchronously."""
+        return self._run_async(self.async_storage.get_recent_item_versions(limits, user_id))
+    
+    def get_items(self, ids: List[str]) -> List[MemoryItem]:
+        """Get memory items by ID synchronously."""
+        return self._run_async(self.async_storage.get_items(ids))
     
-    def get_conversation_history(self, limit: int = 10) -> List[MemoryItem]:
-        """Get recent conversation history synchronously."""
-        return self._run_async(self.async_storage.get_conversation_history(limit))
\ No newline at end of file
+    def replace_items(self, new_item: MemoryItem, replaced_ids: List[str]) -> bool:
+        """Atomically save a memory item and delete the items it replaces synchronously."""
+        return self._run_async(self.async_storage.replace_items(new_item, replaced_ids))
\ No newline at end of file
@@ -0,0 +1,499 @@
+"""
+Tiered Memory Service for Personal Agent
+
+This module contains the TieredMemoryService, which keeps the active sessions' recent
+conversation turns and knowledge in process (hot tier) on top of the SQLite store
+(cold tier). A background job rolls aged-out conversations in the cold tier up into
+compact summary items so the cold tier stays small; the newest summaries are part of
+the memory context and fill up the conversation history once no older turns remain.
+The background job runs once per storage, however many services share it.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+from .models import MemoryItem
+from .service import MemoryService
+from .context_builder import MemoryContextBuilder
+from ..config.settings import Config
+from ..config.constants import CONVERSATION, DATABASE
+from ..utils.logging import get_logger
+from ..utils.resources import get_resource_registry
+
+
+def summarize_turns(turns: List[Dict[str, Any]], max_length: int = CONVERSATION.SUMMARY_MAX_LENGTH) -> str:
+    """
+    Build an extractive summary of conversation turns.
+
+    Each turn contributes one line, truncated so the whole summary stays within
+    max_length characters.
+
+    Args:
+        turns (List[Dict[str, Any]]): Conversation turns with role and content
+        max_length (int): Maximum summary length in characters
+
+    Returns:
+        str: Compact summary of the turns
+    """
+    if not turns:
+        return ""
+
+    per_turn = max(max_length // len(turns), 20)
+    lines = []
+    for turn in turns:
+        content = " ".join(str(turn.get("content", "")).split())
+        if len(content) > per_turn:
+            content = content[:per_turn - 3] + "..."
+        lines.append(f"{turn.get('role', 'unknown')}: {content}")
+
+    return "\n".join(lines)[:max_length]
+
+
+class ConversationSummarizer:
+    """
+    Rolls a storage's aged conversations up into summary items, on demand or
+    periodically in one background thread shared by the services that started it.
+    """
+
+    SUMMARY_TYPE = "summary"
+
+    def __init__(self, storage, summary_age: int = CONVERSATION.SUMMARY_AGE_THRESHOLD,
+                 summarizer: Callable[[List[Dict[str, Any]]], str] = None):
+        """
+        Initialize the conversation summarizer.
+
+        Args:
+            storage: Memory storage whose conversations are summarized
+            summary_age (int): Seconds after which conversations are summarized
+            summarizer (Callable): Turns-to-text summarizer (default: extractive summarize_turns)
+        """
+        self.storage = storage
+        self.summary_age = summary_age
+        self.summarizer = summarizer or summarize_turns
+        self.logger = get_logger()
+        self._lock = threading.Lock()
+        self._users = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def summarize_aged_conversations(self, older_than: int = None,
+                                     batch_size: int = DATABASE.DEFAULT_BATCH_SIZE) -> int:
+        """
+        Roll aged-out conversations up into summary items.
+
+        Each user's aged conversations in the batch become one summary item, saved
+        atomically with the deletion of the originals. Items a concurrent run already
+        rolled up are left to that run.
+
+        Args:
+            older_than (int): Age in seconds after which conversations are summarized
+                (default: summary_age)
+            batch_size (int): Maximum number of conversations processed per call
+
+        Returns:
+            int: Number of conversation items rolled up
+        """
+        age = self.summary_age if older_than is None else older_than
+        cutoff = datetime.now() - timedelta(seconds=age)
+
+        try:
+            aged = self.storage.get_items_updated_before("conversation", cutoff, limit=batch_size)
+        except Exception as e:
+            self.logger.error(f"Error loading aged conversations: {e}")
+            return 0
+
+        by_user: Dict[str, List[MemoryItem]] = {}
+        for item in aged:
+            by_user.setdefault(item.content.get("user_id") or "", []).append(item)
+
+        rolled_up = 0
+        for user_id, items in by_user.items():
+            turns = [turn for item in items for turn in item.content.get("turns", [])]
+            summary = MemoryItem(
+                type=self.SUMMARY_TYPE,
+                content={
+                    "user_id": user_id,
+                    "summary": self.summarizer(turns),
+                    "turn_count": len(turns),
+                    "source_count": len(items),
+                    "period_start": min(item.created_at for item in items).isoformat(),
+                    "period_end": max(item.updated_at for item in items).isoformat()
+                },
+                metadata={"user_id": user_id, "category": "conversation_summary"}
+            )
+            if self.storage.replace_items(summary, [item.id for item in items]):
+                rolled_up += len(items)
+
+        if rolled_up:
+            self.logger.info(f"Summarized {rolled_up} aged conversation items")
+        return rolled_up
+
+    def start(self, interval: int = CONVERSATION.SUMMARY_INTERVAL):
+        """
+        Register a user of the background thread, starting it if it is not running.
+
+        Args:
+            interval (int): Seconds between summarization runs
+        """
+        with self._lock:
+            self._users += 1
+            if self._thread is not None:
+                return
+
+            self._stop_event.clear()
+
+            def run():
+                while not self._stop_event.wait(interval):
+                    self.summarize_aged_conversations()
+
+            self._thread = threading.Thread(target=run, name="memory_summarizer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Unregister a user of the background thread, stopping it when none is left."""
+        with self._lock:
+            self._users = max(self._users - 1, 0)
+            if self._users or self._thread is None:
+                return
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def is_running(self) -> bool:
+        """
+        Check whether the background thread is running.
+
+        Returns:
+            bool: True if the thread is alive
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+
+class TieredMemoryService(MemoryService):
+    """
+    MemoryService with an in-process hot tier for active sessions.
+
+    Writes go to SQLite and to the hot tier; memory context for a session is built
+    from the hot tier only, so reads for the active session never touch disk after
+    the session has been warmed with one initial read.
+    """
+
+    SUMMARY_TYPE = ConversationSummarizer.SUMMARY_TYPE
+
+    def __init__(self, config: Config = None, memory_storage=None,
+                 hot_conversation_limit: int = CONVERSATION.HOT_TIER_CONVERSATIONS,
+                 hot_knowledge_limit: int = CONVERSATION.HOT_TIER_KNOWLEDGE,
+                 hot_summary_limit: int = CONVERSATION.HOT_TIER_SUMMARIES,
+                 max_hot_sessions: int = CONVERSATION.MAX_PARALLEL_CONVERSATIONS,
+                 summary_age: int = CONVERSATION.SUMMARY_AGE_THRESHOLD,
+                 summarizer: Callable[[List[Dict[str, Any]]], str] = None):
+        """
+        Initialize the tiered memory service.
+
+        Args:
+            config (Config): Configuration object
+            memory_storage: Memory storage instance used as the cold tier
+            hot_conversation_limit (int): Conversation items kept per hot session
+            hot_knowledge_limit (int): Knowledge items kept per hot session
+            hot_summary_limit (int): Conversation summaries kept per hot session
+            max_hot_sessions (int): Sessions kept in the hot tier (least recently used evicted)
+            summary_age (int): Seconds after which cold conversations are summarized
+            summarizer (Callable): Turns-to-text summarizer (default: extractive summarize_turns)
+        """
+        super().__init__(config=config, memory_storage=memory_storage)
+        self.hot_conversation_limit = hot_conversation_limit
+        self.hot_knowledge_limit = hot_knowledge_limit
+        self.hot_summary_limit = hot_summary_limit
+        self.max_hot_sessions = max_hot_sessions
+        self.summary_age = summary_age
+        self.summarizer = summarizer or summarize_turns
+        self._hot_tiers: "OrderedDict[str, MemoryContextBuilder]" = OrderedDict()
+        self._lock = threading.RLock()
+        # Services of the same storage and summary settings share one background job
+        self.conversation_summarizer = get_resource_registry().get(
+            "conversation_summarizer", (self.storage, summary_age, self.summarizer),
+            lambda: ConversationSummarizer(self.storage, summary_age, self.summarizer)
+        )
+        self._summarizing = False
+
+    def _load_hot_tier(self, user_id: str) -> MemoryContextBuilder:
+        """
+        Warm a hot tier from the user's memory in the cold tier.
+
+        Args:
+            user_id (str): ID of the user
+
+        Returns:
+            MemoryContextBuilder: Context builder holding the user's most recent memory
+        """
+        try:
+            recent = self.storage.get_conversation_history(limit=self.hot_conversation_limit,
+                                                           user_id=user_id)
+        except Exception as e:
+            self.logger.error(f"Error warming conversation hot tier: {e}")
+            recent = []
+
+        try:
+            knowledge = self.storage.search("", type="knowledge", limit=self.hot_knowledge_limit,
+                                            user_id=user_id)
+        except Exception as e:
+            self.logger.error(f"Error warming knowledge hot tier: {e}")
+            knowledge = []
+
+        try:
+            summaries = self.storage.search("", type=self.SUMMARY_TYPE, limit=self.hot_summary_limit,
+                                            user_id=user_id)
+        except Exception as e:
+            self.logger.error(f"Error warming summary hot tier: {e}")
+            summaries = []
+
+        tier = self._new_hot_tier()
+        tier.reset(recent, knowledge, summaries)
+        return tier
+
+    def _new_hot_tier(self) -> MemoryContextBuilder:
+        """Create an empty hot tier sized by the hot tier limits."""
+        return MemoryContextBuilder(self.context_processor,
+                                    conversation_limit=self.hot_conversation_limit,
+                                    knowledge_limit=self.hot_knowledge_limit,
+                                    summary_limit=self.hot_summary_limit,
+                                    pinned_knowledge=self.pinned_knowledge)
+
+    def _get_hot_tier(self, user_id: str) -> MemoryContextBuilder:
+        """
+        Get the hot tier of a session, warming it on first use.
+
+        Args:
+            user_id (str): ID of the user
+
+        Returns:
+            MemoryContextBuilder: The session's hot tier
+        """
+        with self._lock:
+            tier = self._hot_tiers.get(user_id)
+            if tier is not None:
+                self._hot_tiers.move_to_end(user_id)
+                return tier
+
+        return self._install_hot_tier(user_id, self._load_hot_tier(user_id))
+
+    def _install_hot_tier(self, user_id: str, tier: MemoryContextBuilder) -> MemoryContextBuilder:
+        """
+        Add a freshly warmed hot tier, evicting the least recently used sessions.
+
+        Args:
+            user_id (str): ID of the user
+            tier (MemoryContextBuilder): Warmed hot tier
+
+        Returns:
+            MemoryContextBuilder: The session's hot tier (an existing one wins)
+        """
+        with self._lock:
+            # Another thread may have warmed the same session meanwhile
+            tier = self._hot_tiers.setdefault(user_id, tier)
+            self._hot_tiers.move_to_end(user_id)
+            while len(self._hot_tiers) > self.max_hot_sessions:
+                self._hot_tiers.popitem(last=False)
+            return tier
+
+    def _memory_context_sources(self, user_id: str, last_user_input: str) -> Dict[str, Awaitable]:
+        """
+        Get the retrievals that warm a session's hot tier, scoped to the user.
+
+        Args:
+            user_id (str): ID of the user
+            last_user_input (str): Last user input for relevance scoring
+
+        Returns:
+            Dict[str, Awaitable]: Pending retrieval per source
+        """
+        return {
+            "conversation": self._call_storage_async('get_conversation_history',
+                                                     limit=self.hot_conversation_limit, user_id=user_id),
+            "knowledge": self._call_storage_async('search', "", type="knowledge",
+                                                  limit=self.hot_knowledge_limit, user_id=user_id),
+            "summary": self._call_storage_async('search', "", type=self.SUMMARY_TYPE,
+                                                limit=self.hot_summary_limit, user_id=user_id)
+        }
+
+    def _on_item_saved(self, user_id: str, memory_item: MemoryItem):
+        """Write saved items through to the session's hot tier."""
+        tier = self._get_hot_tier(user_id)
+        with self._lock:
+            if memory_item.type == "conversation":
+                tier.add_conversation(memory_item)
+            elif memory_item.type == "knowledge":
+                tier.add_knowledge(memory_item)
+
+    def get_memory_context(self, user_id: str, conversation_history: List[Dict[str, str]],
+                           last_user_input: str = "") -> str:
+        """
+        Build the memory context for a session from its hot tier.
+
+        Args:
+            user_id (str): ID of the user
+            conversation_history (List[Dict[str, str]]): Recent conversation history
+            last_user_input (str): Last user input for relevance scoring
+
+        Returns:
+            str: Formatted context from memory
+        """
+        tier = self._get_hot_tier(user_id)
+        with self._lock:
+            return tier.build(last_user_input)
+
+    async def get_memory_context_async(self, user_id: str, conversation_history: List[Dict[str, str]],
+                                       last_user_input: str = "",
+                                       timeout: float = DATABASE.MEMORY_SOURCE_TIMEOUT) -> str:
+        """
+        Build the memory context for a session from its hot tier asynchronously.
+
+        A cold session is warmed by fetching its sources concurrently; a source that
+        times out leaves that part of the hot tier empty until new items are saved.
+
+        Args:
+            user_id (str): ID of the user
+            conversation_history (List[Dict[str, str]]): Recent conversation history
+            last_user_input (str): Last user input for relevance scoring
+            timeout (float): Seconds each source may take when warming the session
+
+        Returns:
+            str: Formatted context from memory
+        """
+        with self._lock:
+            tier = self._hot_tiers.get(user_id)
+
+        if tier is None:
+            items = await self._fetch_memory_context_sources(
+                self._memory_context_sources(user_id, last_user_input), timeout
+            )
+            tier = self._new_hot_tier()
+            tier.reset(items.get("conversation", []), items.get("knowledge", []), items.get("summary", []))
+            tier = self._install_hot_tier(user_id, tier)
+        else:
+            tier = self._get_hot_tier(user_id)
+
+        with self._lock:
+            return tier.build(last_user_input)
+
+    def evict_session(self, user_id: str) -> bool:
+        """
+        Drop a session from the hot tier; its memory stays in the cold tier.
+
+        Args:
+            user_id (str): ID of the user
+
+        Returns:
+            bool: True if the session was in the hot tier
+        """
+        with self._lock:
+            return self._hot_tiers.pop(user_id, None) is not None
+
+    def get_hot_tier_stats(self) -> Dict[str, int]:
+        """
+        Get the size of the hot tier.
+
+        Returns:
+            Dict[str, int]: Number of hot sessions, conversation items, knowledge items
+                and summaries
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._hot_tiers),
+                "conversation_items": sum(t.conversation_count for t in self._hot_tiers.values()),
+                "knowledge_items": sum(t.knowledge_count for t in self._hot_tiers.values()),
+                "summaries": sum(t.summary_count for t in self._hot_tiers.values())
+            }
+
+    def get_recent_conversation_history(self, limit: int = 5) -> List[MemoryItem]:
+        """
+        Get recent conversation history, followed by summaries of rolled-up conversations.
+
+        Args:
+            limit (int): Maximum number of items to retrieve
+
+        Returns:
+            List[MemoryItem]: Conversation items, newest first, then summary items,
+                newest first, up to the limit
+        """
+        history = super().get_recent_conversation_history(limit)
+        if len(history) >= limit:
+            return history
+
+        try:
+            return history + self.storage.search("", type=self.SUMMARY_TYPE, limit=limit - len(history))
+        except Exception as e:
+            self.logger.error(f"Error retrieving conversation summaries: {e}")
+            return history
+
+    async def get_recent_conversation_history_async(self, limit: int = 5) -> List[MemoryItem]:
+        """
+        Get recent conversation history and summaries asynchronously (see
+        get_recent_conversation_history).
+
+        Args:
+            limit (int): Maximum number of items to retrieve
+
+        Returns:
+            List[MemoryItem]: Conversation items, then summary items, up to the limit
+        """
+        history = await super().get_recent_conversation_history_async(limit)
+        if len(history) >= limit:
+            return history
+
+        try:
+            return history + await self._call_storage_async('search', "", type=self.SUMMARY_TYPE,
+                                                            limit=limit - len(history))
+        except Exception as e:
+            self.logger.error(f"Error retrieving conversation summaries: {e}")
+            return history
+
+    def summarize_aged_conversations(self, older_than: int = None,
+                                     batch_size: int = DATABASE.DEFAULT_BATCH_SIZE) -> int:
+        """
+        Roll aged-out cold conversations up into summary items.
+
+        Hot tiers keep their own copies, so active sessions are unaffected; sessions
+        warmed later see the summary.
+
+        Args:
+            older_than (int): Age in seconds after which conversations are summarized
+                (default: summary_age)
+            batch_size (int): Maximum number of conversations processed per call
+
+        Returns:
+            int: Number of conversation items rolled up
+        """
+        return self.conversation_summarizer.summarize_aged_conversations(older_than, batch_size)
+
+    def start_background_summarization(self, interval: int = CONVERSATION.SUMMARY_INTERVAL):
+        """
+        Summarize aged conversations periodically in the storage's background thread.
+
+        Args:
+            interval (int): Seconds between summarization runs, if the thread is not
+                running yet
+        """
+        if not self._summarizing:
+            self._summarizing = True
+            self.conversation_summarizer.start(interval)
+
+    def stop_background_summarization(self):
+        """Stop summarizing; the thread stops once no service of the storage uses it."""
+        if self._summarizing:
+            self._summarizing = False
+            self.conversation_summarizer.stop()
+
+    def shutdown(self, timeout: float = DATABASE.ENRICHMENT_DRAIN_TIMEOUT) -> bool:
+        """
+        Stop the service's background work, including its use of summarization.
+
+        Args:
+            timeout (float): Maximum seconds to wait for the service's own background work
+
+        Returns:
+            bool: True if no pending enrichment was lost
+        """
+        self.stop_background_summarization()
+        return super().shutdown(timeout)
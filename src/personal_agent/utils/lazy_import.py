@@ -0,0 +1,73 @@
+"""
+Lazy imports for the Personal Agent project.
+
+Some third-party modules take a long time to import (openai alone accounts for most of
+the agent's import time) but are only needed by some code paths: openai once an LLM
+request is made, aiosqlite for async storage, yaml when a YAML config file exists.
+A module imported with lazy_import is loaded on first attribute access instead.
+"""
+
+import importlib
+import importlib.util
+import threading
+from types import ModuleType
+from typing import Optional
+
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access."""
+
+    def __init__(self, name: str):
+        """
+        Initialize the stand-in.
+
+        Args:
+            name (str): Full name of the module, e.g. "openai"
+        """
+        self._name = name
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        """Import the module if it has not been imported yet."""
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Get a module that is imported on first use.
+
+    Args:
+        name (str): Full name of the module
+
+    Returns:
+        LazyModule: Stand-in for the module; an ImportError surfaces on first use
+    """
+    return LazyModule(name)
+
+
+def module_available(name: str) -> bool:
+    """
+    Check whether a module can be imported, without importing it.
+
+    Args:
+        name (str): Full name of the module
+
+    Returns:
+        bool: True if the module is installed
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
@@ -0,0 +1,79 @@
+"""
+Parallel batch processing for the Personal Agent project.
+
+This module maps CPU-bound functions over large batches of items in a process pool.
+Regex-heavy text analysis holds the GIL, so threads do not help; processes do.
+Items are sent to the workers in chunks to amortize the inter-process overhead,
+and results are returned in item order.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
+from ..config.constants import CONTEXT
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def effective_workers(item_count: int, workers: Optional[int] = None) -> int:
+    """
+    Get the number of worker processes worth starting for a batch.
+
+    Args:
+        item_count (int): Number of items in the batch
+        workers (Optional[int]): Requested workers (default: number of CPUs)
+
+    Returns:
+        int: Workers to use; 1 means the batch should be processed in-process
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, item_count))
+
+
+def default_chunksize(item_count: int, workers: int) -> int:
+    """
+    Get the number of items sent to a worker at a time.
+
+    Args:
+        item_count (int): Number of items in the batch
+        workers (int): Worker processes
+
+    Returns:
+        int: Chunk size giving each worker a few chunks, to balance uneven items
+    """
+    chunks = workers * CONTEXT.BATCH_CHUNKS_PER_WORKER
+    return max(1, -(-item_count // chunks))
+
+
+def process_map(function: Callable[[T], R], items: Sequence[T], workers: Optional[int] = None,
+                chunksize: Optional[int] = None, initializer: Callable[..., Any] = None,
+                initargs: tuple = ()) -> List[R]:
+    """
+    Apply a function to every item in a process pool.
+
+    The function, the items, the initializer arguments and the results must be
+    picklable; the function is typically a module-level function working on
+    state set up by the initializer in each worker.
+
+    Args:
+        function (Callable[[T], R]): Module-level function to apply
+        items (Sequence[T]): Items to process
+        workers (Optional[int]): Worker processes (default: number of CPUs)
+        chunksize (Optional[int]): Items per task (default: a few chunks per worker)
+        initializer (Callable[..., Any]): Called once in each worker before any item
+        initargs (tuple): Arguments for the initializer
+
+    Returns:
+        List[R]: Results in item order
+    """
+    if not items:
+        return []
+
+    workers = effective_workers(len(items), workers)
+    if chunksize is None:
+        chunksize = default_chunksize(len(items), workers)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        return list(executor.map(function, items, chunksize=chunksize))
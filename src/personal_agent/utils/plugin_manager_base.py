@@ -121,6 +121,13 @@ class BasePluginManager(Generic[T], ABC):
             self.logger.info(f"{self.plugin_type_name} provider {provider_name} already loaded")
             return self.providers[provider_name]
         
+        # Try to load built-in providers first; they need no provider file
+        builtin_provider = self._load_builtin_provider(provider_name)
+        if builtin_provider:
+            self.providers[provider_name] = builtin_provider
+            self.logger.info(f"Built-in {self.plugin_type_name} provider {provider_name} loaded successfully")
+            return builtin_provider
+        
         if providers_dir is None:
             providers_dir = self._get_default_providers_dir()
         
@@ -133,13 +140,6 @@ class BasePluginManager(Generic[T], ABC):
         try:
             self.logger.info(f"Loading {self.plugin_type_name} provider: {provider_name}")
             
-            # Try to load built-in providers first
-            builtin_provider = self._load_builtin_provider(provider_name)
-            if builtin_provider:
-                self.providers[provider_name] = builtin_provider
-                self.logger.info(f"Built-in {self.plugin_type_name} provider {provider_name} loaded successfully")
-                return builtin_provider
-            
             # For external providers, use dynamic loading
             # Load the module
             spec = importlib.util.spec_from_file_location(provider_name, provider_file)
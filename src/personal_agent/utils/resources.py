@@ -0,0 +1,121 @@
+"""
+Shared resources for the Personal Agent project.
+
+This module contains the process-wide registry of resources that every agent can
+share: parsed configuration, storage handles, LLM clients and their HTTP connection
+pools, and the stateless analyzers. Each resource is created once per kind and key
+on first use, so building another agent costs little more than its per-user state.
+A forked child process starts with an empty registry rather than reusing the
+parent's connections.
+"""
+
+import dataclasses
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+def config_key(config: Any) -> str:
+    """
+    Get a hashable key for a configuration dataclass.
+
+    Args:
+        config (Any): Configuration dataclass, e.g. LLMConfig
+
+    Returns:
+        str: Canonical JSON of the configuration's fields
+    """
+    return json.dumps(dataclasses.asdict(config), sort_keys=True, default=str)
+
+
+class ResourceRegistry:
+    """
+    Thread-safe registry of shared resources, keyed by kind and key.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._resources: Dict[Tuple[str, Hashable], Any] = {}
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+        self._stats = {"created": 0, "reused": 0}
+
+    def get(self, kind: str, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Get a shared resource, creating it on first use.
+
+        Args:
+            kind (str): Kind of resource, e.g. "memory_storage"
+            key (Hashable): Identifies the resource within its kind, e.g. a database path
+            factory (Callable[[], Any]): Creates the resource; exceptions propagate and
+                nothing is registered
+
+        Returns:
+            Any: The shared resource
+        """
+        with self._lock:
+            self._check_process()
+            resource_key = (kind, key)
+            if resource_key in self._resources:
+                self._stats["reused"] += 1
+                return self._resources[resource_key]
+
+            # Creating under the lock keeps concurrent first uses from building duplicates
+            resource = factory()
+            self._resources[resource_key] = resource
+            self._stats["created"] += 1
+            return resource
+
+    def _check_process(self):
+        """Forget the resources inherited from a parent process. The caller holds the lock."""
+        pid = os.getpid()
+        if pid != self._pid:
+            self._resources.clear()
+            self._pid = pid
+
+    def remove(self, kind: str, key: Hashable) -> bool:
+        """
+        Drop a shared resource; the next get creates a new one.
+
+        Args:
+            kind (str): Kind of resource
+            key (Hashable): Key of the resource
+
+        Returns:
+            bool: True if the resource was registered
+        """
+        with self._lock:
+            return self._resources.pop((kind, key), None) is not None
+
+    def clear(self):
+        """Drop every shared resource, e.g. after the configuration changed."""
+        with self._lock:
+            self._resources.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the registry's counters.
+
+        Returns:
+            Dict[str, int]: Created and reused counts, and registered resources per kind
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            for kind, _ in self._resources:
+                stats[kind] = stats.get(kind, 0) + 1
+            return stats
+
+
+# Global instance for easy access
+_resource_registry = ResourceRegistry()
+
+
+def get_resource_registry() -> ResourceRegistry:
+    """
+    Get the process-wide resource registry.
+
+    Returns:
+        ResourceRegistry: Global resource registry
+    """
+    return _resource_registry
@@ -6,8 +6,9 @@ This module contains retry mechanisms with exponential backoff for external serv
 
 import time
 import random
+import asyncio
 import logging
-from typing import Callable, Any, Tuple, Optional
+from typing import Callable, Any, Awaitable, Tuple, Optional
 from functools import wraps
 from ..config.constants import RETRY
 
@@ -180,5 +181,62 @@ def retry_function(
                 logger.error(f"Non-retryable exception in {func.__name__}: {e}")
             raise
     
+    # This should never be reached, but just in case
+    raise last_exception
+
+
+async def retry_function_async(
+    func: Callable[..., Awaitable[Any]],
+    config: RetryConfig,
+    *args,
+    retryable_exceptions: Tuple[type, ...] = (RetryableException,),
+    logger: Optional[logging.Logger] = None,
+    **kwargs
+) -> Any:
+    """
+    Retry a coroutine function with exponential backoff, without blocking the event loop.
+    
+    Cancellation is not retried: it propagates from the call or the backoff sleep.
+    
+    Args:
+        func (Callable[..., Awaitable[Any]]): Coroutine function to retry
+        config (RetryConfig): Retry configuration
+        *args: Positional arguments to pass to the function
+        retryable_exceptions (Tuple[type, ...]): Exceptions that should trigger a retry
+        logger (logging.Logger): Logger to use for logging retry attempts
+        **kwargs: Keyword arguments to pass to the function
+        
+    Returns:
+        Any: Result of the function call
+    """
+    last_exception = None
+    
+    for attempt in range(config.max_retries + 1):
+        try:
+            return await func(*args, **kwargs)
+        except retryable_exceptions as e:
+            last_exception = e
+            
+            # If this was the last attempt, re-raise the exception
+            if attempt == config.max_retries:
+                if logger:
+                    logger.error(f"Function {func.__name__} failed after {config.max_retries + 1} attempts: {e}")
+                raise
+            
+            # Calculate and apply delay
+            delay = calculate_delay(config, attempt)
+            if logger:
+                logger.warning(
+                    f"Attempt {attempt + 1} of {func.__name__} failed: {e}. "
+                    f"Retrying in {delay:.2f} seconds..."
+                )
+            
+            await asyncio.sleep(delay)
+        except Exception as e:
+            # Non-retryable exception, re-raise immediately
+            if logger:
+                logger.error(f"Non-retryable exception in {func.__name__}: {e}")
+            raise
+    
     # This should never be reached, but just in case
     raise last_exception
\ No newline at end of file
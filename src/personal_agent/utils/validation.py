@@ -5,9 +5,12 @@ This module contains functions for validating and sanitizing user inputs.
 """
 
 import re
-import bleach
 from typing import Optional, Tuple
 from ..config.constants import VALIDATION, SECURITY
+from .lazy_import import lazy_import
+
+# bleach is imported when the first input is sanitized
+bleach = lazy_import("bleach")
 
 
 class ValidationError(Exception):
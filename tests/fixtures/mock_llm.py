@@ -76,6 +76,10 @@ class MockLLMClient(LLMClient):
         
         return response
     
+    async def generate_response_async(self, messages: List[Message], **kwargs) -> Message:
+        """Generate a mock response asynchronously."""
+        return self.generate_response(messages, **kwargs)
+    
     def generate_completion(self, prompt: str, **kwargs) -> str:
         """Generate a mock completion."""
         message = Message(role="user", content=prompt)
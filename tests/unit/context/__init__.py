@@ -0,0 +1 @@
+"""Unit tests for context modules."""
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Unit tests for token-budgeted prompt assembly.
+"""
+
+import pytest
+from src.personal_agent.context.budget import (
+    PromptAssembler, MemoryContext, estimate_tokens, PROMPT_LAYOUT_PREFIX_STABLE
+)
+from src.personal_agent.context.processor import ContextProcessor
+
+
+MEMORY_CONTEXT = (
+    "Recent conversation history:\n"
+    "user: What is the weather like?\n"
+    "assistant: It is sunny today.\n"
+    "\n"
+    "User knowledge:\n"
+    "Preference: I like coffee\n"
+    "Fact: Birthday is in May\n"
+)
+
+PINNED_MEMORY_CONTEXT = (
+    "Known about the user:\n"
+    "Fact: Lives in Oslo\n"
+    "\n"
+) + MEMORY_CONTEXT
+
+
+def history(count):
+    return [
+        {"role": "user" if index % 2 == 0 else "assistant", "content": f"message number {index}"}
+        for index in range(count)
+    ]
+
+
+class TestEstimateTokens:
+    """Test the approximate tokenizer."""
+    
+    def test_estimates(self):
+        """Test word and punctuation counting."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("Hello, world!") == 4
+        assert estimate_tokens("internationalization") == 4
+
+
+class TestPromptAssembler:
+    """Test budget-aware prompt assembly."""
+    
+    def test_everything_fits(self):
+        """Test that a large budget keeps the layout of the full prompt."""
+        assembled = PromptAssembler(context_window=100000).assemble(
+            "Hi", history(4), MEMORY_CONTEXT, system_prompt="Be helpful."
+        )
+        
+        assert [m.role for m in assembled.messages] == ["system", "system", "user", "assistant",
+                                                        "user", "assistant", "user"]
+        assert assembled.messages[1].content.endswith(MEMORY_CONTEXT)
+        assert assembled.dropped == []
+        assert assembled.estimated_tokens <= assembled.budget
+    
+    def test_history_window(self):
+        """Test that only the most recent history messages are considered."""
+        assembled = PromptAssembler(context_window=100000, max_history_messages=4).assemble("Hi", history(20))
+        
+        contents = [m.content for m in assembled.messages]
+        assert contents == ["message number 16", "message number 17", "message number 18",
+                            "message number 19", "Hi"]
+    
+    def test_budget_drops_lowest_value_first(self):
+        """Test that a tight budget keeps the latest exchange and knowledge."""
+        assembler = PromptAssembler(context_window=110, max_tokens=0, safety_margin=0)
+        assembled = assembler.assemble("Hi", history(10), MEMORY_CONTEXT)
+        
+        assert assembled.estimated_tokens <= assembled.budget
+        contents = [m.content for m in assembled.messages]
+        assert "message number 9" in contents
+        assert "message number 8" in contents
+        assert "Preference: I like coffee" in contents[0]
+        assert "It is sunny" not in contents[0]
+        assert {item.source for item in assembled.dropped} == {"history", "memory"}
+        
+        # Kept history is contiguous
+        kept = [int(c.split()[-1]) for c in contents if c.startswith("message number")]
+        assert kept == list(range(min(kept), 10))
+    
+    def test_required_messages_are_always_kept(self):
+        """Test that the user input survives a budget it does not fit."""
+        assembled = PromptAssembler(context_window=10, max_tokens=0, safety_margin=0).assemble(
+            "word " * 50, history(2), MEMORY_CONTEXT
+        )
+        
+        assert [m.role for m in assembled.messages] == ["user"]
+        assert assembled.over_budget
+        assert len(assembled.dropped) == 6
+    
+    def test_memory_context_sections_are_not_reparsed(self):
+        """Test that entries with blank lines or trailing colons are budgeted whole."""
+        shopping = "user: Shopping list:\n\nmilk, eggs and " + "bread " * 40
+        memory_context = MemoryContext([
+            ("Recent conversation history:", [shopping, "assistant: Noted."]),
+            ("User knowledge:", ["Preference: I like coffee"])
+        ])
+        assert memory_context == (
+            "Recent conversation history:\n" + shopping + "\nassistant: Noted.\n"
+            "\n"
+            "User knowledge:\nPreference: I like coffee\n"
+        )
+        
+        assembled = PromptAssembler(context_window=60, max_tokens=0, safety_margin=0).assemble(
+            "Hi", [], memory_context
+        )
+        
+        assert assembled.messages[0].content.endswith("User knowledge:\nPreference: I like coffee\n")
+        assert [d.content for d in assembled.dropped] == [shopping, "assistant: Noted."]
+    
+    def test_context_processor_uses_budget(self):
+        """Test that the context processor assembles through its assembler."""
+        processor = ContextProcessor()
+        processor.prompt_assembler = PromptAssembler(context_window=100000)
+        messages = processor.create_context_aware_prompt("Hi", history(12), MEMORY_CONTEXT)
+        
+        assert messages[0].role == "system"
+        assert MEMORY_CONTEXT in messages[1].content
+        assert len(messages) == 2 + 10 + 1
+
+
+class TestPrefixStableLayout:
+    """Test the prompt layout for provider-side prompt caching."""
+    
+    def assemble(self, user_input, turns, memory_context, **kwargs):
+        assembler = PromptAssembler(context_window=100000, layout=PROMPT_LAYOUT_PREFIX_STABLE, **kwargs)
+        return assembler.assemble(user_input, turns, memory_context, system_prompt="Be helpful.")
+    
+    def test_order_from_stable_to_volatile(self):
+        """Test system prompt, pinned knowledge, history, volatile context, user input."""
+        assembled = self.assemble("Hi", history(2), PINNED_MEMORY_CONTEXT)
+        
+        messages = assembled.messages
+        assert [m.role for m in messages] == ["system", "system", "user", "assistant", "system", "user"]
+        assert messages[0].content == "Be helpful."
+        assert messages[1].content.endswith("Known about the user:\nFact: Lives in Oslo\n")
+        assert "User knowledge:\nPreference: I like coffee\nFact: Birthday is in May\n" in messages[4].content
+        assert "assistant: It is sunny today.\n" in messages[4].content
+        assert messages[-1].content == "Hi"
+    
+    def test_consecutive_turns_share_prefix(self):
+        """Test that the next turn's prompt extends the previous one up to the volatile part."""
+        turns = history(2)
+        first = self.assemble("First", turns, PINNED_MEMORY_CONTEXT)
+        reranked = PINNED_MEMORY_CONTEXT.replace(
+            "Preference: I like coffee\nFact: Birthday is in May\n",
+            "Fact: Works as a nurse\n"
+        )
+        second = self.assemble(
+            "Second",
+            turns + [{"role": "user", "content": "First"}, {"role": "assistant", "content": "Reply"}],
+            reranked.replace("sunny today", "rainy tomorrow")
+        )
+        
+        assert second.messages[:4] == first.messages[:4]
+        assert "Works as a nurse" in second.messages[6].content
+    
+    def test_same_priorities_as_default_layout(self):
+        """Test that the layout changes the order, not the budget priorities."""
+        default = PromptAssembler(context_window=1100, max_tokens=1000, safety_margin=0).assemble(
+            "Hi", history(6), MEMORY_CONTEXT, system_prompt="Be helpful."
+        )
+        stable = PromptAssembler(context_window=1100, max_tokens=1000, safety_margin=0,
+                                 layout=PROMPT_LAYOUT_PREFIX_STABLE).assemble(
+            "Hi", history(6), MEMORY_CONTEXT, system_prompt="Be helpful."
+        )
+        
+        assert default.dropped
+        assert [d.content for d in stable.dropped] == [d.content for d in default.dropped]
+        assert stable.estimated_tokens <= stable.budget
+    
+    def test_unknown_layout(self):
+        """Test that an unknown layout is rejected."""
+        with pytest.raises(ValueError):
+            PromptAssembler(layout="reversed")
+
@@ -0,0 +1,87 @@
+"""
+Unit tests for the entity extraction engine.
+"""
+
+import re
+import pytest
+from src.personal_agent.context.extraction import (
+    EntityExtractionEngine, DEFAULT_ENTITY_PATTERNS, get_extraction_engine
+)
+from src.personal_agent.context.processor import ContextProcessor
+
+
+SAMPLES = [
+    "",
+    "hello there",
+    "John Smith works at Acme Corp in New York.",
+    "Meet Mary on Jan 5, 2024 at 10:30 AM or 12/05/2023 14:00:00pm",
+    "Mail john.doe@example.com or x@y.com. and call +1 555-123-4567 or (555) 123-4567",
+    "See https://example.com/path?x=1 and www.test.org. for \"the docs\" and \"\"",
+    "An unterminated \" quote and 2023-01-02 then 5551234567",
+]
+
+
+def reference_find(patterns, text):
+    """One re.finditer pass per pattern, as extraction worked before the engine."""
+    matches = []
+    for entity_type, pattern in patterns.items():
+        matches.extend((entity_type, m.group(), m.span()) for m in re.finditer(pattern, text))
+    matches.extend(("quoted_phrase", m.group(1), m.span()) for m in re.finditer(r'"([^"]*)"', text))
+    return matches
+
+
+class TestEntityExtractionEngine:
+    """Test that the engine matches per-pattern scanning exactly."""
+    
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_matches_reference(self, text):
+        """Test identical results, including overlaps across types."""
+        engine = EntityExtractionEngine(DEFAULT_ENTITY_PATTERNS)
+        assert engine.find(text) == reference_find(DEFAULT_ENTITY_PATTERNS, text)
+    
+    def test_overlapping_types_are_kept(self):
+        """Test that a date also found as a person is reported for both types."""
+        found = EntityExtractionEngine(DEFAULT_ENTITY_PATTERNS).find("On Jan 5, 2024")
+        assert ("person", "On Jan", (0, 6)) in found
+        assert ("date", "Jan 5, 2024", (3, 14)) in found
+    
+    def test_custom_patterns_are_not_prefiltered(self):
+        """Test that a customized pattern is always scanned."""
+        patterns = dict(DEFAULT_ENTITY_PATTERNS, email=r"\buser\b")
+        assert get_extraction_engine(patterns).find("ask the user") == [
+            ("email", "user", (8, 12))
+        ]
+    
+    def test_processor_entities(self):
+        """Test entity ids, confidences and positions from the processor."""
+        entities = ContextProcessor().extract_entities('Email Bob at bob@example.com about "lunch"')
+        
+        assert [e.id for e in entities] == [f"entity_{i}" for i in range(1, len(entities) + 1)]
+        by_type = {e.type: e for e in entities}
+        assert by_type["email"].confidence == 0.8
+        assert by_type["person"].confidence == 0.6
+        assert by_type["quoted_phrase"].value == "lunch"
+        assert by_type["quoted_phrase"].confidence == 0.7
+        assert by_type["quoted_phrase"].metadata["position"] == (35, 42)
+
+
+class TestExtractBatch:
+    """Test batch extraction of entities and relationships."""
+
+    def test_in_process_batch(self):
+        """Test that a single worker extracts the batch in order."""
+        processor = ContextProcessor()
+
+        results = processor.extract_batch(SAMPLES, workers=1)
+
+        assert results == [processor.extract(text) for text in SAMPLES]
+
+    def test_process_pool_batch(self):
+        """Test that worker processes use the processor's patterns and keep the order."""
+        processor = ContextProcessor()
+        processor.entity_patterns = {"number": r"\d+"}
+
+        results = processor.extract_batch(SAMPLES, workers=2, chunksize=3)
+
+        assert results == [processor.extract(text) for text in SAMPLES]
+        assert all(entity.type in ("number", "quoted_phrase") for entities, _ in results for entity in entities)
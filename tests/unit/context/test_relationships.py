@@ -0,0 +1,70 @@
+"""
+Unit tests for windowed relationship extraction.
+"""
+
+import pytest
+from src.personal_agent.context.processor import ContextProcessor
+from src.personal_agent.context.relationships import (
+    RelationshipMatcher, RELATIONSHIP_KEYWORDS, find_keyword_occurrences
+)
+
+
+SAMPLES = [
+    "John Smith works at Acme Corp in New York.",
+    "Mary from Boston went to Paris tomorrow with Bob",
+    "Alice is connected to Bob and Related To Carol, based in Berlin",
+    "İstanbul Office is located in Turkey near Ankara Hub",
+    "Dave " + "filler words " * 10 + "from Erin",
+]
+
+
+def reference_pairs(entities, text):
+    """Compare every ordered pair, as extraction worked before the matcher."""
+    pairs = []
+    for i, entity1 in enumerate(entities):
+        for j, entity2 in enumerate(entities):
+            if i == j:
+                continue
+            pos1 = entity1.metadata["position"]
+            pos2 = entity2.metadata["position"]
+            if abs(pos1[0] - pos2[0]) < 50:
+                between = text[min(pos1[1], pos2[1]):max(pos1[0], pos2[0])].lower()
+                for keyword in RELATIONSHIP_KEYWORDS:
+                    if keyword in between:
+                        pairs.append((entity1.id, entity2.id, keyword, between))
+                        break
+    return pairs
+
+
+class TestRelationshipMatcher:
+    """Test that windowed matching keeps the pairwise semantics."""
+    
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_matches_reference(self, text):
+        """Test identical relationships, order and metadata."""
+        processor = ContextProcessor()
+        entities = processor.extract_entities(text)
+        relationships = processor.extract_relationships(entities, text)
+        
+        assert [
+            (r.source_entity_id, r.target_entity_id, r.relationship_type, r.metadata["text"])
+            for r in relationships
+        ] == reference_pairs(entities, text)
+    
+    def test_keyword_priority_and_substrings(self):
+        """Test that the first listed keyword wins and substrings count."""
+        matcher = RelationshipMatcher("a tomorrow from b")
+        assert matcher.keyword_between(0, 17) == "from"
+        assert matcher.keyword_between(0, 10) == "to"
+        assert matcher.keyword_between(3, 4) is None
+    
+    def test_window(self):
+        """Test that entities 50 or more characters apart are not paired."""
+        matcher = RelationshipMatcher("x" * 100 + " to ")
+        assert matcher.match([(0, 1), (49, 50)]) == []
+        matcher = RelationshipMatcher("a to b")
+        assert matcher.match([(0, 1), (5, 6)]) == [(0, 1, "to", 1, 5), (1, 0, "to", 1, 5)]
+    
+    def test_overlapping_occurrences(self):
+        """Test that overlapping keyword occurrences are all found."""
+        assert find_keyword_occurrences("tototo", ["toto"]) == {"toto": [0, 2]}
@@ -0,0 +1,119 @@
+"""
+Unit tests for cached relevance scoring.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from src.personal_agent.context.processor import ContextProcessor, ContextRelevanceScore
+from src.personal_agent.context.scoring import RelevanceScorer, extract_keywords
+from src.personal_agent.memory.models import MemoryItem
+
+
+NOW = datetime(2024, 1, 15, 12, 0, 0)
+
+
+def make_item(item_id, content, item_type="knowledge", age=timedelta(0)):
+    """Create a memory item last updated ``age`` before NOW."""
+    return MemoryItem(id=item_id, type=item_type, content=content, updated_at=NOW - age)
+
+
+class TestRelevanceScorer:
+    """Test keyword caching and recency decay."""
+
+    def test_keywords_cached_per_item_version(self):
+        """Test that an item is tokenized once until it is updated."""
+        scorer = RelevanceScorer()
+        item = make_item("k1", {"fact": "Alice likes tea"})
+
+        with patch("src.personal_agent.context.scoring.extract_keywords",
+                   side_effect=extract_keywords) as tokenize:
+            scorer.score_batch("does alice like tea", [item], now=NOW)
+            scorer.score_batch("what about coffee", [item], now=NOW)
+            # One call per batch for the user input, one for the item
+            assert tokenize.call_count == 3
+
+            item.content = {"fact": "Alice likes coffee"}
+            item.updated_at = NOW
+            # Same version: only the user input is tokenized
+            scorer.score_batch("what about coffee", [item], now=NOW)
+            assert tokenize.call_count == 4
+
+            item.updated_at = NOW + timedelta(seconds=1)
+            scores = scorer.score_batch("what about coffee", [item], now=NOW + timedelta(seconds=1))
+            assert tokenize.call_count == 6
+            assert scores[0][1]["keyword_overlap"] == pytest.approx(1 / 3)
+
+    def test_cache_is_bounded(self):
+        """Test that the least recently used items are evicted."""
+        scorer = RelevanceScorer(max_cached_items=2)
+        items = [make_item(f"k{i}", {"fact": f"fact {i}"}) for i in range(3)]
+
+        scorer.score_batch("fact", items, now=NOW)
+
+        assert len(scorer._keywords) == 2
+        assert ("k0", NOW) not in scorer._keywords
+
+    def test_recency_decays_with_half_life(self):
+        """Test that the recency factor halves every half-life."""
+        scorer = RelevanceScorer(recency_half_life=3600)
+
+        assert scorer.recency_factor(make_item("a", {}), NOW) == pytest.approx(1.0)
+        assert scorer.recency_factor(make_item("b", {}, age=timedelta(hours=1)), NOW) == pytest.approx(0.5)
+        assert scorer.recency_factor(make_item("c", {}, age=timedelta(hours=2)), NOW) == pytest.approx(0.25)
+        # Items updated after the reference time are not boosted
+        assert scorer.recency_factor(make_item("d", {}, age=-timedelta(hours=1)), NOW) == pytest.approx(1.0)
+
+    def test_score_combines_factors(self):
+        """Test the weighting of keyword overlap, type relevance and recency."""
+        scorer = RelevanceScorer(recency_half_life=3600)
+        item = make_item("k1", {"fact": "alice likes tea"}, age=timedelta(hours=1))
+
+        [(score, factors)] = scorer.score_batch("alice drinks coffee tea", [item], now=NOW)
+
+        assert factors == {"keyword_overlap": 0.5, "type_relevance": 0.9, "recency": 0.5}
+        assert score == pytest.approx(0.5 * 0.5 + 0.3 * 0.9 + 0.2 * 0.5)
+
+
+class TestContextProcessorScoring:
+    """Test relevance scoring through the context processor."""
+
+    def test_output_shape_and_order(self):
+        """Test that scores keep their shape and are sorted by score."""
+        processor = ContextProcessor()
+        items = [
+            make_item("c1", {"user_input": "hello there"}, item_type="conversation"),
+            make_item("k1", {"fact": "Alice likes tea"}),
+            make_item("k2", {"fact": "Bob likes coffee"}),
+        ]
+
+        scored = processor.score_context_relevance("Does Alice like tea?", items)
+
+        assert [item.id for item, _ in scored] == ["k1", "k2", "c1"]
+        for _, relevance in scored:
+            assert isinstance(relevance, ContextRelevanceScore)
+            assert set(relevance.factors) == {"keyword_overlap", "type_relevance", "recency"}
+            assert relevance.reasoning.startswith("Keyword overlap: ")
+            assert 0.0 <= relevance.score <= 1.0
+
+    def test_older_items_score_lower(self):
+        """Test that recency breaks ties between otherwise equal items."""
+        processor = ContextProcessor()
+        now = datetime.now()
+        items = [
+            MemoryItem(id="old", type="knowledge", content={"fact": "Alice likes tea"},
+                       updated_at=now - timedelta(days=30)),
+            MemoryItem(id="new", type="knowledge", content={"fact": "Alice likes tea"},
+                       updated_at=now),
+        ]
+
+        scored = processor.score_context_relevance("alice", items)
+
+        assert [item.id for item, _ in scored] == ["new", "old"]
+        assert scored[0][1].score > scored[1][1].score
+
+    def test_empty_items(self):
+        """Test scoring an empty batch."""
+        processor = ContextProcessor()
+
+        assert processor.score_context_relevance("anything", []) == []
@@ -0,0 +1 @@
+"""Unit tests for conversation modules."""
\ No newline at end of file
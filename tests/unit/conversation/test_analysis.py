@@ -0,0 +1,49 @@
+"""
+Unit tests for batch conversation analysis.
+"""
+
+import pytest
+from src.personal_agent.conversation.analysis import TextAnalysis, analyze_text, analyze_batch
+from src.personal_agent.conversation.ambiguity_detector import AmbiguityDetector
+from src.personal_agent.conversation.dialogue_act import DialogueActRecognizer
+from src.personal_agent.conversation.state import DialogueAct
+
+
+TEXTS = [
+    "Hello there",
+    "Can you help me with this?",
+    "What about the thing we discussed later?",
+    "Goodbye",
+    "",
+]
+
+
+class TestAnalyzeBatch:
+    """Test analysis of text batches."""
+
+    def test_analyze_text(self):
+        """Test that a text is analyzed by both analyzers."""
+        analysis = analyze_text("Can you help me with this?")
+
+        assert isinstance(analysis, TextAnalysis)
+        assert (analysis.dialogue_act, analysis.dialogue_act_confidence) == \
+            DialogueActRecognizer().recognize_act("Can you help me with this?")
+        assert analysis.ambiguities == AmbiguityDetector().detect_ambiguities("Can you help me with this?")
+
+    def test_in_process_batch(self):
+        """Test that a single worker analyzes the batch in order."""
+        assert analyze_batch(TEXTS, workers=1) == [analyze_text(text) for text in TEXTS]
+
+    def test_process_pool_batch(self):
+        """Test that worker processes return the same results in order."""
+        assert analyze_batch(TEXTS, workers=2, chunksize=2) == [analyze_text(text) for text in TEXTS]
+
+    def test_custom_analyzers(self):
+        """Test that customized analyzers are used by the workers."""
+        recognizer = DialogueActRecognizer()
+        recognizer.patterns[DialogueAct.GREETING] = [r'\bahoy\b']
+
+        results = analyze_batch(["ahoy", "hello"], workers=2, recognizer=recognizer)
+
+        assert results[0].dialogue_act == DialogueAct.GREETING
+        assert results[1].dialogue_act != DialogueAct.GREETING
@@ -0,0 +1,71 @@
+"""
+Unit tests for dialogue act recognition.
+"""
+
+import pickle
+import pytest
+from src.personal_agent.conversation.dialogue_act import DialogueActRecognizer, dialogue_act_recognizer
+from src.personal_agent.conversation.state import DialogueAct
+
+
+class TestDialogueActRecognizer:
+    """Test the compiled, memoized dialogue act recognizer."""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("hello", (DialogueAct.GREETING, 0.9)),
+        ("Hello, how are you?", (DialogueAct.GREETING, 0.7)),
+        ("What time is it?", (DialogueAct.QUESTION, 0.9)),
+        ("Is it done, do you think?", (DialogueAct.QUESTION, 0.9)),
+        ("Well, is it done?", (DialogueAct.QUESTION, 0.7)),
+        ("please send the report", (DialogueAct.REQUEST, 0.7)),
+        ("Thanks", (DialogueAct.ACKNOWLEDGMENT, 0.9)),
+        ("  ", (DialogueAct.ERROR, 0.0)),
+        ("The report is done", (DialogueAct.STATEMENT, 0.1)),
+    ])
+    def test_recognize_act(self, text, expected):
+        """Test recognition of common dialogue acts."""
+        assert DialogueActRecognizer().recognize_act(text) == expected
+
+    def test_multiple_acts(self):
+        """Test that all acts are scored and the best ones returned."""
+        acts = DialogueActRecognizer().recognize_multiple_acts("ok", top_n=2)
+        assert acts == [(DialogueAct.CONFIRMATION, 0.9), (DialogueAct.ACKNOWLEDGMENT, 0.9)]
+
+    def test_memo_is_keyed_on_normalized_text(self):
+        """Test that repeated inputs are scored once."""
+        recognizer = DialogueActRecognizer()
+        first = recognizer.recognize_act("Thanks ")
+        second = recognizer.recognize_act("thanks")
+
+        assert first == second
+        assert list(recognizer._memo) == ["thanks"]
+
+    def test_memo_is_bounded(self):
+        """Test that the least recently used inputs are evicted."""
+        recognizer = DialogueActRecognizer(memo_size=2)
+        for text in ("hi", "ok", "hi", "bye"):
+            recognizer.recognize_act(text)
+
+        assert list(recognizer._memo) == ["hi", "bye"]
+
+    def test_memo_disabled(self):
+        """Test that a memo size of zero disables memoization."""
+        recognizer = DialogueActRecognizer(memo_size=0)
+        assert recognizer.recognize_act("hi") == (DialogueAct.GREETING, 0.9)
+        assert len(recognizer._memo) == 0
+
+    def test_changed_patterns_are_recompiled(self):
+        """Test that changing the patterns invalidates compiled patterns and memo."""
+        recognizer = DialogueActRecognizer()
+        assert recognizer.recognize_act("ahoy")[0] == DialogueAct.STATEMENT
+
+        recognizer.patterns[DialogueAct.GREETING].append(r'\bahoy\b')
+        assert recognizer.recognize_act("ahoy") == (DialogueAct.GREETING, 0.9)
+
+    def test_pickle(self):
+        """Test that the recognizer can be sent to worker processes."""
+        dialogue_act_recognizer.recognize_act("hello")
+        copy = pickle.loads(pickle.dumps(dialogue_act_recognizer))
+
+        assert copy.recognize_act("hello") == (DialogueAct.GREETING, 0.9)
+        assert len(copy._memo) == 1
@@ -0,0 +1,128 @@
+"""
+Unit tests for the bounded conversation history.
+"""
+
+import os
+import tempfile
+import shutil
+import pytest
+from src.personal_agent.conversation.history import ConversationHistory, HistoryView
+from src.personal_agent.conversation.manager import ConversationManager
+from src.personal_agent.memory.storage import SQLiteMemoryStorage
+
+
+def message(index: int) -> dict:
+    """Create a numbered message."""
+    return {"role": "user" if index % 2 == 0 else "assistant", "content": f"m{index}", "id": f"id{index}"}
+
+
+class TestConversationHistory:
+    """Test the ring buffer of messages."""
+
+    def test_bounded(self):
+        """Test that only the most recent messages are kept."""
+        history = ConversationHistory(max_messages=3)
+        for index in range(5):
+            history.append(message(index))
+
+        assert len(history) == 3
+        assert [m["content"] for m in history] == ["m2", "m3", "m4"]
+        assert history[-1]["id"] == "id4"
+
+    def test_recent_view(self):
+        """Test that recent history is a fixed read-only view."""
+        history = ConversationHistory(max_messages=10)
+        for index in range(4):
+            history.append(message(index))
+
+        view = history.recent(2)
+        history.append(message(4))
+
+        assert isinstance(view, HistoryView)
+        assert view == [message(2), message(3)]
+        assert view[-2:] == [message(2), message(3)]
+        assert list(reversed(view)) == [message(3), message(2)]
+        assert not hasattr(view, "append")
+        assert history.recent(0) == []
+        assert len(history.recent(100)) == 5
+
+    def test_evicted_message_in_view(self):
+        """Test that reading an evicted message from an old view fails loudly."""
+        history = ConversationHistory(max_messages=2)
+        history.append(message(0))
+        view = history.recent(1)
+        history.append(message(1))
+        history.append(message(2))
+
+        with pytest.raises(IndexError):
+            view[0]
+
+    def test_index_by_id(self):
+        """Test lookup of kept messages by ID."""
+        history = ConversationHistory(max_messages=2)
+        for index in range(3):
+            history.append(message(index))
+
+        assert history.get("id2") == message(2)
+        assert history.get("id0") is None
+
+    def test_spill_in_batches(self):
+        """Test that evicted messages are spilled in batches and on flush."""
+        spilled = []
+        history = ConversationHistory(max_messages=2, spill=spilled.append, spill_batch=2)
+        for index in range(5):
+            history.append(message(index))
+
+        assert spilled == [[message(0), message(1)]]
+        history.flush()
+        assert spilled == [[message(0), message(1)], [message(2)]]
+
+    def test_clear(self):
+        """Test that clearing removes messages and their index."""
+        history = ConversationHistory()
+        history.append(message(0))
+        history.clear()
+
+        assert len(history) == 0
+        assert history.get("id0") is None
+        assert list(history.recent(10)) == []
+
+
+class TestManagerHistory:
+    """Test the conversation manager's use of the bounded history."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for databases."""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+
+    def test_recent_history_window(self):
+        """Test that the default window comes from the manager's configuration."""
+        manager = ConversationManager(history_window=3)
+        for index in range(5):
+            manager.add_user_message(f"m{index}")
+
+        assert [m["content"] for m in manager.get_recent_history()] == ["m2", "m3", "m4"]
+        assert len(manager.get_recent_history(limit=1)) == 1
+
+    def test_find_conversation_id(self):
+        """Test that messages are found by ID in the kept history."""
+        manager = ConversationManager()
+        message = manager.add_agent_message("Hello", message_id="response-1")
+
+        assert manager.find_conversation_id(message["id"]) == manager.conversation_id
+        assert manager.find_conversation_id("unknown") is None
+
+    def test_evicted_messages_spill_to_storage(self, temp_dir):
+        """Test that messages evicted from the history are saved to storage."""
+        storage = SQLiteMemoryStorage(os.path.join(temp_dir, "test_history.db"))
+        manager = ConversationManager(memory_storage=storage, history_window=2, max_history_messages=2)
+        for index in range(22):
+            manager.add_user_message(f"m{index}")
+
+        [item] = storage.get_conversation_history(limit=10)
+        assert [turn["content"] for turn in item.content["turns"]] == [f"m{index}" for index in range(20)]
+        assert item.content["conversation_id"] == manager.conversation_id
@@ -0,0 +1,105 @@
+"""
+Unit tests for compiled pattern sets.
+"""
+
+import random
+import re
+import pytest
+from src.personal_agent.conversation.pattern_set import PatternSet, parse_word_list, get_pattern_set
+from src.personal_agent.conversation.ambiguity_detector import AmbiguityDetector
+
+
+PATTERNS = [
+    r'\b(it|this|that)\b',
+    r'\b(a few|a few of those things|few)\b',
+    r'\b(in a bit|in a moment)\b',
+    r'\b(when|while)\b.*\?',
+    r'\bhello\b',
+]
+
+
+def reference_spans(patterns, text, flags=re.IGNORECASE):
+    """Spans of every pattern as found by re.finditer."""
+    return [[match.span() for match in re.finditer(pattern, text, flags)] for pattern in patterns]
+
+
+class TestParseWordList:
+    """Test recognition of word-list patterns."""
+
+    def test_word_lists(self):
+        """Test that plain alternations of words and phrases are parsed."""
+        assert parse_word_list(r'\b(it|this|that)\b') == ["it", "this", "that"]
+        assert parse_word_list(r'\b(the thing|this one)\b') == ["the thing", "this one"]
+        assert parse_word_list(r'\bhello\b') == ["hello"]
+
+    def test_other_patterns(self):
+        """Test that patterns with other syntax are left to the regex engine."""
+        assert parse_word_list(r'\b(when|while)\b.*\?') == []
+        assert parse_word_list(r'\b(of (them|it))\b') == []
+        assert parse_word_list(r'(it|this)') == []
+
+
+class TestPatternSet:
+    """Test scanning with a pattern set."""
+
+    @pytest.mark.parametrize("text", [
+        "",
+        "it is this, not that",
+        "a few of those things and a few more",
+        "wait a few, in a  moment or in a moment",
+        "when is it? while that?",
+        "itself thisthat it_that hello-world",
+        "HELLO It THIS",
+        "café it İstanbul this",
+    ])
+    def test_matches_re_finditer(self, text):
+        """Test that the spans are those of re.finditer for each pattern."""
+        pattern_set = PatternSet(PATTERNS, re.IGNORECASE)
+        assert pattern_set.finditer_spans(text) == reference_spans(PATTERNS, text)
+
+    def test_random_texts(self):
+        """Test random texts against re.finditer with the detector's patterns."""
+        detector = AmbiguityDetector()
+        patterns = [pattern for patterns in detector.patterns.values() for pattern in patterns]
+        pattern_set = PatternSet(patterns, re.IGNORECASE)
+        words = ["it", "this", "a", "few", "of", "them", "in", "case", "that", "as", "we",
+                 "discussed", "help", "me", "?", "one", "refer", "to", "lot", ",", "-"]
+        rng = random.Random(0)
+
+        for _ in range(500):
+            text = rng.choice([" ", "  ", "-"]).join(rng.choice(words) for _ in range(rng.randint(0, 15)))
+            assert pattern_set.finditer_spans(text) == reference_spans(patterns, text)
+
+    def test_case_sensitive(self):
+        """Test that patterns are case sensitive without IGNORECASE."""
+        pattern_set = PatternSet([r'\b(hello|hi)\b'])
+        assert pattern_set.finditer_spans("Hello hi HI") == [[(6, 8)]]
+
+    def test_get_pattern_set_is_cached(self):
+        """Test that pattern sets are compiled once per pattern list."""
+        first = get_pattern_set(tuple(PATTERNS), re.IGNORECASE)
+        assert get_pattern_set(tuple(PATTERNS), re.IGNORECASE) is first
+        assert get_pattern_set(tuple(PATTERNS)) is not first
+
+
+class TestCompiledDetector:
+    """Test the ambiguity detector on the compiled pattern set."""
+
+    def test_overlapping_patterns_reported_once(self):
+        """Test that an interval matched by two patterns of a type is reported once."""
+        detector = AmbiguityDetector()
+        ambiguities = detector.detect_ambiguities("Tell me about a few")
+
+        positions = [(ambiguity.type, ambiguity.position) for ambiguity in ambiguities]
+        assert len(positions) == len(set(positions))
+        assert any(ambiguity.position == (14, 19) for ambiguity in ambiguities)
+
+    def test_descriptions(self):
+        """Test the description and clarification of a pattern match."""
+        detector = AmbiguityDetector()
+        [ambiguity] = [a for a in detector.detect_ambiguities("Please send those documents")
+                       if a.position == (12, 17)]
+
+        assert ambiguity.description == "Unclear reference to 'those'"
+        assert ambiguity.suggested_clarification == \
+            "Could you be more specific about what you're referring to?"
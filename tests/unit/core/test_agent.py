@@ -7,12 +7,14 @@ Tests Agent functionality with proper mocking to avoid external dependencies.
 import os
 import tempfile
 import shutil
+import asyncio
 import pytest
 from unittest.mock import Mock, patch
 from src.personal_agent.core.agent import Agent
+from src.personal_agent.core.latency_metrics import latency_metrics_collector
 from src.personal_agent.config.settings import Config
 from src.personal_agent.memory.storage import SQLiteMemoryStorage
-from tests.fixtures.mock_llm import create_mock_llm_client, create_test_config
+from tests.fixtures.mock_llm import MockLLMClient, create_mock_llm_client, create_test_config
 
 
 class TestAgent:
@@ -302,6 +304,21 @@ class TestAgent:
         assert isinstance(response, str)
         # Should contain some error message or fallback
         assert len(response) > 0
+    
+    def test_tiered_memory_summarizes_until_closed(self, test_config, mock_llm_client, temp_storage):
+        """Test that a tiered agent runs background summarization until it is closed."""
+        test_config.memory.tiered = True
+        agent = Agent(
+            user_id="test_user",
+            config=test_config,
+            memory_storage=temp_storage,
+            llm_client=mock_llm_client
+        )
+        summarizer = agent.memory_service.conversation_summarizer
+        assert summarizer.is_running()
+        
+        assert agent.close() is True
+        assert not summarizer.is_running()
 
 
 class TestAgentConfiguration:
@@ -330,4 +347,160 @@ class TestAgentConfiguration:
             agent = Agent(user_id="test_user", config=config)
             
             assert agent.config.agent.name == "CustomAgent"
-            assert agent.config.agent.personality == "friendly"
\ No newline at end of file
+            assert agent.config.agent.personality == "friendly"
+
+class SlowLLMClient(MockLLMClient):
+    """Mock LLM client whose async responses take a while, recording cancellation."""
+    
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.cancelled = False
+    
+    async def generate_response_async(self, messages, **kwargs):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.generate_response(messages, **kwargs)
+
+
+class TestAgentAsync:
+    """Test the async input processing pipeline."""
+    
+    @pytest.fixture
+    def temp_storage(self):
+        """Create temporary storage for testing."""
+        temp_dir = tempfile.mkdtemp()
+        storage = SQLiteMemoryStorage(db_path=os.path.join(temp_dir, "test_agent_async.db"))
+        
+        yield storage
+        
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+    
+    def create_agent(self, temp_storage, llm_client=None):
+        """Create an agent on temporary storage."""
+        return Agent(
+            user_id="test_user",
+            config=create_test_config(),
+            memory_storage=temp_storage,
+            llm_client=llm_client or create_mock_llm_client()
+        )
+    
+    def test_turns_are_answered_and_saved(self, temp_storage):
+        """Test that async turns match the sync flow and are saved to memory."""
+        llm_client = create_mock_llm_client()
+        agent = self.create_agent(temp_storage, llm_client)
+        
+        async def conversation():
+            first = await agent.process_input_async("Hello, how are you?")
+            second = await agent.process_input_async("Tell me about the weather")
+            await agent.flush_async()
+            return first, second
+        
+        responses = asyncio.run(conversation())
+        
+        assert all(isinstance(response, str) and response for response in responses)
+        assert len(llm_client.get_call_history()) == 2
+        assert len(agent.conversation_manager.get_recent_history()) == 4
+        assert len(temp_storage.get_conversation_history(limit=10)) == 2
+    
+    def test_save_survives_closed_event_loop(self, temp_storage):
+        """Test that a save cancelled with its event loop is redone on the next turn."""
+        agent = self.create_agent(temp_storage)
+        
+        asyncio.run(agent.process_input_async("Hello, how are you?"))
+        asyncio.run(agent.process_input_async("Tell me about the weather"))
+        asyncio.run(agent.flush_async())
+        
+        assert len(temp_storage.get_conversation_history(limit=10)) == 2
+    
+    def test_turn_timeout_cancels_llm_call(self, temp_storage):
+        """Test that a turn over its timeout raises and cancels the LLM request."""
+        llm_client = SlowLLMClient(delay=5)
+        agent = self.create_agent(temp_storage, llm_client)
+        
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(agent.process_input_async("Tell me about the weather", timeout=0.2))
+        assert llm_client.cancelled
+    
+    def test_cancellation_propagates(self, temp_storage):
+        """Test that cancelling a turn cancels its LLM request."""
+        llm_client = SlowLLMClient(delay=5)
+        agent = self.create_agent(temp_storage, llm_client)
+        
+        async def cancel_turn():
+            turn = asyncio.ensure_future(agent.process_input_async("Tell me about the weather", timeout=0))
+            await asyncio.sleep(0.2)
+            turn.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await turn
+        
+        asyncio.run(cancel_turn())
+        assert llm_client.cancelled
+
+
+class TestAgentTracing:
+    """Test per-stage latency tracing of agent turns."""
+    
+    @pytest.fixture
+    def temp_storage(self):
+        """Create temporary storage for testing."""
+        temp_dir = tempfile.mkdtemp()
+        storage = SQLiteMemoryStorage(db_path=os.path.join(temp_dir, "test_agent_tracing.db"))
+        latency_metrics_collector.reset_metrics()
+        
+        yield storage
+        
+        latency_metrics_collector.reset_metrics()
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+    
+    def create_agent(self, temp_storage, llm_client=None, trace_turns=True):
+        """Create an agent on temporary storage."""
+        config = create_test_config()
+        config.agent.trace_turns = trace_turns
+        return Agent(
+            user_id="traced_user",
+            config=config,
+            memory_storage=temp_storage,
+            llm_client=llm_client or create_mock_llm_client()
+        )
+    
+    def test_turn_stages_are_traced(self, temp_storage):
+        """Test that a turn records a trace with its stages and stage percentiles."""
+        agent = self.create_agent(temp_storage)
+        agent.process_input("Hello, how are you?")
+        agent.process_input("Tell me about the weather")
+        
+        traces = agent.get_recent_traces()
+        assert len(traces) == 2 and traces[0]["trace_id"] != traces[1]["trace_id"]
+        stages = [span["stage"] for span in traces[1]["spans"]]
+        for stage in ("validation", "classification", "memory_context", "llm", "enhancement", "persistence"):
+            assert stage in stages
+        assert all(span["offset_ms"] + span["duration_ms"] <= traces[1]["duration_ms"] for span in traces[1]["spans"])
+        
+        metrics = agent.get_latency_metrics()
+        assert metrics["turn"]["count"] == 2
+        assert metrics["llm"]["p50_ms"] <= metrics["llm"]["p99_ms"] <= metrics["llm"]["max_ms"]
+    
+    def test_async_turn_is_traced(self, temp_storage):
+        """Test that async turns are traced, including turns that time out."""
+        agent = self.create_agent(temp_storage, SlowLLMClient(delay=5))
+        
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(agent.process_input_async("Tell me about the weather", timeout=0.2))
+        
+        trace = agent.get_recent_traces()[-1]
+        assert trace["error"] == "TimeoutError"
+        assert "memory_context" in [span["stage"] for span in trace["spans"]]
+    
+    def test_tracing_can_be_disabled(self, temp_storage):
+        """Test that turns of an agent with tracing off record nothing."""
+        agent = self.create_agent(temp_storage, trace_turns=False)
+        agent.process_input("Hello, how are you?")
+        
+        assert agent.get_recent_traces() == []
+        assert agent.get_latency_metrics() == {}
@@ -0,0 +1,79 @@
+"""
+Unit tests for the latency metrics collector.
+"""
+
+import asyncio
+import pytest
+from src.personal_agent.core.latency_metrics import LatencyMetricsCollector, NULL_TRACE
+
+
+class TestLatencyMetricsCollector:
+    """Test turn traces and per-stage percentiles."""
+
+    def test_spans_are_recorded(self):
+        """Test that spans record their stage, offset and duration."""
+        collector = LatencyMetricsCollector()
+        trace = collector.start_trace("alice")
+        with trace.span("validation"):
+            pass
+        with pytest.raises(ValueError):
+            with trace.span("llm"):
+                raise ValueError("failed")
+        collector.finish_trace(trace)
+
+        recorded = collector.get_recent_traces()[0]
+        assert [span["stage"] for span in recorded["spans"]] == ["validation", "llm"]
+        assert recorded["spans"][1]["offset_ms"] >= recorded["spans"][0]["duration_ms"]
+        assert recorded["duration_ms"] >= recorded["spans"][1]["offset_ms"]
+
+    def test_timed_awaitables(self):
+        """Test that concurrent awaitables are timed as overlapping stages."""
+        collector = LatencyMetricsCollector()
+        trace = collector.start_trace("alice")
+
+        async def turn():
+            await asyncio.gather(trace.timed("memory_context", asyncio.sleep(0.05)),
+                                 trace.timed("feedback", asyncio.sleep(0.05)))
+
+        asyncio.run(turn())
+        collector.finish_trace(trace)
+
+        durations = {stage: duration for stage, _, duration in trace.spans}
+        assert set(durations) == {"memory_context", "feedback"}
+        assert trace.duration < sum(durations.values())
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles over the recent timings of a stage."""
+        collector = LatencyMetricsCollector()
+        for milliseconds in range(1, 101):
+            trace = collector.start_trace("alice")
+            trace.spans.append(("llm", 0.0, milliseconds / 1000))
+            collector.finish_trace(trace)
+
+        llm = collector.get_latency_summary()["llm"]
+        assert llm["count"] == 100
+        assert (llm["p50_ms"], llm["p95_ms"], llm["p99_ms"], llm["max_ms"]) == pytest.approx((50, 95, 99, 100))
+        assert collector.get_latency_summary()["turn"]["count"] == 100
+
+    def test_buffers_are_bounded(self):
+        """Test that old traces and timings are dropped but counts are kept."""
+        collector = LatencyMetricsCollector(max_traces=3, max_samples=5)
+        for user_id in ["alice", "bob"] * 5:
+            trace = collector.start_trace(user_id)
+            trace.spans.append(("llm", 0.0, 0.001))
+            collector.finish_trace(trace)
+
+        assert [trace["user_id"] for trace in collector.get_recent_traces()] == ["bob", "alice", "bob"]
+        assert len(collector.get_recent_traces(user_id="alice")) == 1
+        assert len(collector.stage_samples["llm"]) == 5
+        assert collector.get_latency_summary()["llm"]["count"] == 10
+
+    def test_null_trace_records_nothing(self):
+        """Test that the disabled trace is ignored."""
+        collector = LatencyMetricsCollector()
+        with NULL_TRACE.span("llm"):
+            pass
+        collector.finish_trace(NULL_TRACE)
+
+        assert collector.get_recent_traces() == []
+        assert collector.get_latency_summary() == {}
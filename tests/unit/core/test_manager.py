@@ -0,0 +1,75 @@
+"""
+Unit tests for the agent manager.
+"""
+
+import copy
+import os
+import tempfile
+import shutil
+import threading
+import pytest
+from src.personal_agent.core.manager import AgentManager
+from src.personal_agent.config.constants import DATABASE
+from tests.fixtures.mock_llm import create_test_config
+
+
+class TestAgentManager:
+    """Test the lifecycle of managed agents."""
+
+    @pytest.fixture
+    def config(self):
+        """Create a configuration with background memory work on temporary paths."""
+        temp_dir = tempfile.mkdtemp()
+        config = create_test_config()
+        config.memory.database_path = os.path.join(temp_dir, "test_manager.db")
+        config.memory.background_enrichment = True
+        config.memory.tiered = True
+        config.agent.session_directory = os.path.join(temp_dir, "sessions")
+        yield config
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+
+    def test_agents_share_background_threads(self, config):
+        """Test that agents share the memory workers, which stop once at shutdown."""
+        existing = set(threading.enumerate())
+        manager = AgentManager(config)
+        for index in range(20):
+            user_id = f"user-{index}"
+            manager.start_agent(user_id).memory_service.save_conversation_turn(user_id, "Hello", "Hi there")
+
+        started = [thread for thread in threading.enumerate()
+                   if thread not in existing and thread.name.startswith("memory_")]
+        assert 0 < len(started) <= DATABASE.ENRICHMENT_WORKERS + 1
+
+        manager.shutdown()
+        assert not any(thread.is_alive() for thread in started)
+
+    def test_removed_agent_leaves_shared_workers_running(self, config):
+        """Test that removing an agent neither stops the shared workers nor loses its queued turns."""
+        manager = AgentManager(config)
+        alice = manager.start_agent("alice")
+        bob = manager.start_agent("bob")
+        assert alice.memory_service.enrichment_queue is bob.memory_service.enrichment_queue
+        threads = list(alice.memory_service.enrichment_queue._threads)
+
+        alice.memory_service.save_conversation_turn("alice", "Email alice@example.com", "Will do")
+        assert manager.remove_agent("alice") is True
+        assert all(thread.is_alive() for thread in threads)
+        assert bob.memory_service.drain_enrichment(timeout=5)
+        assert len(bob.memory_service.find_memories_by_entity("email", "alice@example.com")) == 1
+
+        manager.shutdown()
+        assert not any(thread.is_alive() for thread in threads)
+
+    def test_rehydrated_agent_keeps_its_config(self, config):
+        """Test that an agent created with its own config gets it back after eviction."""
+        manager = AgentManager(config)
+        own_config = copy.deepcopy(config)
+        own_config.agent.max_history_length = 7
+        manager.create_agent("alice", config=own_config)
+        manager.create_agent("bob")
+
+        manager.sessions.save_all()
+        assert manager.get_agent("alice").config is own_config
+        assert manager.get_agent("bob").config is config
+        manager.shutdown()
@@ -0,0 +1,92 @@
+"""
+Unit tests for request classification.
+"""
+
+import os
+import json
+import tempfile
+import pytest
+from src.personal_agent.core.request_classifier import RequestClassifier, RequestClassification
+from src.personal_agent.config.settings import Config
+
+
+class TestRequestClassifier:
+    """Test one-pass, multi-label request classification."""
+
+    @pytest.mark.parametrize("text,category", [
+        ("I need help planning my project", "planning"),
+        ("Help me reason through this", "reasoning"),
+        ("Which one should I pick?", "decision_tree"),
+        ("What should I do about it?", "decision_tree"),
+        ("Tell me a joke", "general"),
+    ])
+    def test_category(self, text, category):
+        """Test the category that handles common requests."""
+        classifier = RequestClassifier()
+        assert classifier.classify(text).category == category
+        assert classifier.classify_request(text) == category
+
+    def test_all_matching_categories(self):
+        """Test that every matching category is returned, in priority order."""
+        classification = RequestClassifier().classify("Schedule time to think about which one to choose")
+
+        assert list(classification.scores) == ["planning", "reasoning", "decision_tree"]
+        assert classification.keywords["decision_tree"] == ["choose", "which one", "schedule"]
+        assert classification.scores["decision_tree"] == 0.875
+        assert classification.category == "planning"
+
+    def test_word_boundaries(self):
+        """Test that keywords match at the start of words only."""
+        classifier = RequestClassifier()
+
+        assert classifier.classify("Please explain this").scores == {}
+        assert classifier.classify("This is illogical").scores == {}
+        assert "reasoning" in classifier.classify("I keep thinking").scores
+        assert classifier.classify("how tomorrow looks").scores == {}
+        assert classifier.classify("HOW   TO start").scores == {}
+        assert "planning" in classifier.classify("HOW TO start").scores
+
+    def test_predicates_use_classification(self):
+        """Test the single-category checks."""
+        classifier = RequestClassifier()
+        assert classifier.is_planning_request("Organize my week")
+        assert classifier.is_decision_tree_request("Schedule a call")
+        assert not classifier.is_reasoning_request("Organize my week")
+
+    def test_custom_keywords(self):
+        """Test that keyword tables can be replaced and extended."""
+        classifier = RequestClassifier(keywords={
+            "planning": ["roadmap"],
+            "shopping": ["buy", "order"]
+        })
+
+        assert classifier.classify("Draft a roadmap").category == "planning"
+        assert classifier.classify("Make a plan").scores == {}
+        assert classifier.classify("Buy milk").scores == {"shopping": 0.5}
+        assert classifier.get_keywords_for_category("shopping") == ["buy", "order"]
+
+    def test_changed_keywords_are_reindexed(self):
+        """Test that edits to the keyword lists take effect."""
+        classifier = RequestClassifier()
+        assert classifier.classify("Brainstorm ideas").category == "general"
+
+        classifier.planning_keywords.append("brainstorm")
+        assert classifier.classify("Brainstorm ideas").category == "planning"
+
+    def test_empty_input(self):
+        """Test that empty input has no category."""
+        classification = RequestClassifier().classify("")
+        assert classification == RequestClassification()
+        assert classification.category == "general"
+
+    def test_keywords_from_config(self):
+        """Test loading keyword tables from a configuration file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, "config.json")
+            with open(config_path, "w") as f:
+                json.dump({"agent": {"request_keywords": {"reasoning": ["why"]}}}, f)
+
+            config = Config.load(config_path)
+
+        classifier = RequestClassifier(keywords=config.agent.request_keywords)
+        assert classifier.classify("Why is the sky blue?").category == "reasoning"
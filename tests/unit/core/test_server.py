@@ -0,0 +1,141 @@
+"""
+Unit tests for the agent server.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import shutil
+import pytest
+from src.personal_agent.core.manager import AgentManager
+from src.personal_agent.core.server import AgentServer
+from tests.fixtures.mock_llm import create_test_config
+
+
+async def exchange(address, requests, finished):
+    """Send request lines to the server and read events until `finished` requests ended."""
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address)
+    else:
+        reader, writer = await asyncio.open_connection(*address)
+    for request in requests:
+        line = request if isinstance(request, bytes) else json.dumps(request).encode("utf-8")
+        writer.write(line + b"\n")
+    await writer.drain()
+
+    events = []
+    ended = 0
+    while ended < finished:
+        event = json.loads(await asyncio.wait_for(reader.readline(), 10))
+        events.append(event)
+        if event["event"] in ("done", "error", "pong", "stats"):
+            ended += 1
+    writer.close()
+    return events
+
+
+class TestAgentServer:
+    """Test the JSON-lines protocol, admission control and per-user ordering."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the database and sessions."""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def manager(self, temp_dir):
+        """Create an agent manager using the mock LLM provider."""
+        config = create_test_config()
+        config.memory.database_path = os.path.join(temp_dir, "test_server.db")
+        config.agent.session_directory = os.path.join(temp_dir, "sessions")
+        return AgentManager(config)
+
+    def run_server(self, manager, scenario, **kwargs):
+        """Start a server on a free port, run the scenario against it and close it."""
+        async def main():
+            server = AgentServer(manager, **kwargs)
+            address = await server.start_tcp("127.0.0.1", 0)
+            try:
+                return await scenario(server, address)
+            finally:
+                await server.close()
+
+        return asyncio.run(main())
+
+    def test_streamed_reply(self, manager):
+        """Test that a message is accepted, streamed in chunks and completed."""
+        async def scenario(server, address):
+            return await exchange(address, [{"id": "1", "user_id": "alice", "text": "Hello, how are you?"}], 1)
+
+        events = self.run_server(manager, scenario, chunk_chars=8)
+
+        assert events[0] == {"id": "1", "event": "accepted"}
+        assert events[-1]["event"] == "done"
+        chunks = [event["text"] for event in events if event["event"] == "chunk"]
+        assert chunks and "".join(chunks) == events[-1]["text"]
+        assert all(len(chunk) <= 8 for chunk in chunks)
+
+    def test_messages_of_a_user_are_processed_in_order(self, manager):
+        """Test that one user's messages are processed one at a time, in order."""
+        messages = ["Hello there", "What is the weather like?", "Thanks, goodbye"]
+
+        async def scenario(server, address):
+            requests = [{"id": str(i), "user_id": "alice", "text": text} for i, text in enumerate(messages)]
+            requests.append({"id": "b", "user_id": "bob", "text": "Hello"})
+            return await exchange(address, requests, 4)
+
+        events = self.run_server(manager, scenario)
+
+        done = [event["id"] for event in events if event["event"] == "done" and event["id"] != "b"]
+        assert done == ["0", "1", "2"]
+        # Closing the server saved the sessions; alice's history has her messages in order
+        alice = manager.start_agent("alice")
+        user_messages = [entry["content"] for entry in alice.conversation_manager.get_recent_history()
+                         if entry["role"] == "user"]
+        assert user_messages == messages
+
+    def test_busy_user_is_rejected(self, manager):
+        """Test that messages beyond the per-user limit are rejected as busy."""
+        async def scenario(server, address):
+            requests = [{"id": str(i), "user_id": "alice", "text": "Hello"} for i in range(3)]
+            return await exchange(address, requests, 3)
+
+        events = self.run_server(manager, scenario, max_pending_per_user=1)
+
+        outcomes = {event["id"]: event.get("error", event["event"]) for event in events
+                    if event["event"] in ("done", "error")}
+        assert outcomes == {"0": "done", "1": "busy", "2": "busy"}
+
+    def test_invalid_requests(self, manager):
+        """Test that malformed requests get errors and the connection stays usable."""
+        async def scenario(server, address):
+            requests = [b"not json", {"id": "1", "type": "message", "text": "no user"}, {"id": "2", "type": "ping"}]
+            return await exchange(address, requests, 3)
+
+        events = self.run_server(manager, scenario)
+
+        assert {"id": None, "event": "error", "error": "invalid request"} in events
+        assert {"id": "1", "event": "error", "error": "invalid request"} in events
+        assert {"id": "2", "event": "pong"} in events
+
+    def test_unix_socket_and_stats(self, manager, temp_dir):
+        """Test serving over a Unix socket and reporting counters."""
+        path = os.path.join(temp_dir, "agent.sock")
+
+        async def main():
+            server = AgentServer(manager)
+            await server.start_unix(path)
+            try:
+                await exchange(path, [{"id": "1", "user_id": "alice", "text": "Hello"}], 1)
+                return await exchange(path, [{"id": "2", "type": "stats"}], 1)
+            finally:
+                await server.close()
+
+        events = asyncio.run(main())
+
+        stats = events[0]["stats"]
+        assert (stats["connections"], stats["turns"], stats["pending"], stats["agents"]) == (2, 1, 0, 1)
@@ -0,0 +1,190 @@
+"""
+Unit tests for the session store.
+"""
+
+import os
+import tempfile
+import shutil
+import threading
+import pytest
+from src.personal_agent.core.agent import Agent
+from src.personal_agent.core.session_store import SessionStore
+from src.personal_agent.memory.storage import SQLiteMemoryStorage
+from tests.fixtures.mock_llm import create_mock_llm_client, create_test_config
+
+
+class FakeSession:
+    """Lightweight session recording its exported state."""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.messages = []
+
+    def export_session(self):
+        return {"user_id": self.user_id, "messages": list(self.messages)}
+
+    def restore_session(self, session):
+        self.messages = list(session["messages"])
+
+
+class ClosingSession(FakeSession):
+    """Session recording whether it was closed and whether the store was locked then."""
+
+    store = None
+
+    def __init__(self, user_id):
+        super().__init__(user_id)
+        self.closed = False
+        self.store_locked = None
+
+    def close(self):
+        self.closed = True
+        acquired = []
+
+        def probe():
+            # From another thread, as the store lock is reentrant
+            acquired.append(self.store._lock.acquire(timeout=1))
+            if acquired[0]:
+                self.store._lock.release()
+
+        thread = threading.Thread(target=probe)
+        thread.start()
+        thread.join()
+        self.store_locked = not acquired[0]
+
+
+class TestSessionStore:
+    """Test eviction and rehydration of sessions."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary session directory."""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+
+    def test_lru_eviction_and_rehydration(self, temp_dir):
+        """Test that the least recently used session is saved and restored on demand."""
+        store = SessionStore(FakeSession, temp_dir, max_active=2)
+        store.get("alice").messages.append("hi")
+        store.get("bob")
+        store.get("alice")
+        store.get("carol")
+
+        assert list(store.sessions) == ["alice", "carol"]
+        assert "bob" in store
+
+        store.get("bob")
+        alice = store.get("alice")
+        assert alice.messages == ["hi"]
+        stats = store.get_stats()
+        assert (stats["created"], stats["rehydrated"], stats["active"]) == (3, 2, 2)
+
+    def test_idle_sessions_are_evicted(self, temp_dir):
+        """Test that idle sessions leave memory and come back with their state."""
+        store = SessionStore(FakeSession, temp_dir, idle_timeout=60)
+        store.get("alice").messages.append("hi")
+        store.get("bob")
+        store._last_active["alice"] -= 120
+
+        assert store.evict_idle() == 1
+        assert list(store.sessions) == ["bob"]
+        assert store.get("alice").messages == ["hi"]
+        # Saved sessions are consumed on rehydration
+        assert not os.path.exists(store._path("alice"))
+
+    def test_expired_sessions_start_fresh(self, temp_dir):
+        """Test that sessions saved longer than session_timeout are discarded."""
+        store = SessionStore(FakeSession, temp_dir, session_timeout=60)
+        store.get("alice").messages.append("hi")
+        store._last_active["alice"] -= 120
+        store.save_all()
+
+        assert store.get("alice").messages == []
+        assert store.get_stats()["expired"] == 1
+
+    def test_get_without_create(self, temp_dir):
+        """Test that unknown users get no session unless asked to create one."""
+        store = SessionStore(FakeSession, temp_dir)
+        assert store.get("nobody", create=False) is None
+        assert store.get_stats()["active"] == 0
+
+    def test_remove_deletes_saved_session(self, temp_dir):
+        """Test that removal drops the session from memory and disk."""
+        store = SessionStore(FakeSession, temp_dir)
+        store.get("alice")
+        store.save_all()
+
+        assert store.remove("alice")
+        assert "alice" not in store
+        assert not store.remove("alice")
+
+    def test_sessions_leaving_memory_are_closed(self, temp_dir):
+        """Test that evicted, replaced and removed sessions are closed outside the store lock."""
+        store = SessionStore(ClosingSession, temp_dir, max_active=1)
+        ClosingSession.store = store
+        alice = store.get("alice")
+        bob = store.get("bob")
+        assert alice.closed and alice.store_locked is False
+
+        replacement = ClosingSession("bob")
+        store.add("bob", replacement)
+        assert bob.closed and bob.store_locked is False
+
+        store.remove("bob")
+        assert replacement.closed and replacement.store_locked is False
+
+    def test_slow_rehydration_blocks_only_its_user(self, temp_dir):
+        """Test that sessions are built outside the store lock, once per user."""
+        release = threading.Event()
+        built = []
+
+        def factory(user_id):
+            built.append(user_id)
+            if user_id == "alice":
+                release.wait(5)
+            return FakeSession(user_id)
+
+        store = SessionStore(factory, temp_dir)
+        bob = store.get("bob")
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(store.get("alice"))) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        while "alice" not in built:
+            threading.Event().wait(0.001)
+
+        lookups = []
+        lookup = threading.Thread(target=lambda: lookups.append(store.get("bob")))
+        lookup.start()
+        lookup.join(1)
+        assert lookups == [bob]
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert results[0] is results[1]
+        assert built == ["bob", "alice"]
+
+    def test_agent_session_round_trip(self, temp_dir):
+        """Test that an agent's conversation survives eviction."""
+        config = create_test_config()
+        storage = SQLiteMemoryStorage(db_path=os.path.join(temp_dir, "test_sessions.db"))
+
+        def factory(user_id):
+            return Agent(user_id=user_id, config=config, memory_storage=storage,
+                         llm_client=create_mock_llm_client())
+
+        store = SessionStore(factory, os.path.join(temp_dir, "sessions"))
+        agent = store.get("alice")
+        agent.process_input("Hello, how are you?")
+        conversation_id = agent.conversation_manager.conversation_id
+        history = list(agent.conversation_manager.get_recent_history())
+        store.save_all()
+
+        restored = store.get("alice")
+        assert restored is not agent
+        assert restored.conversation_manager.conversation_id == conversation_id
+        assert list(restored.conversation_manager.get_recent_history()) == history
+        restored_context = restored.response_processor.conversation_interface.state_manager.context
+        assert restored_context.turn_count == agent.response_processor.conversation_interface.state_manager.context.turn_count
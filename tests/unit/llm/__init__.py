@@ -0,0 +1 @@
+"""Unit tests for LLM modules."""
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+Unit tests for token usage and prompt cache reporting.
+"""
+
+import pytest
+from types import SimpleNamespace
+from src.personal_agent.llm.models import LLMResponse
+from src.personal_agent.llm.providers.base import usage_to_dict
+from src.personal_agent.llm.service import LLMService
+from src.personal_agent.context.budget import PROMPT_LAYOUT_PREFIX_STABLE
+from tests.fixtures.mock_llm import create_mock_llm_client, create_test_config
+
+
+class UsageReportingClient:
+    """LLM client returning responses with usage."""
+
+    def __init__(self, usages):
+        self.usages = list(usages)
+        self.calls = []
+
+    def generate_response(self, messages, **kwargs):
+        self.calls.append(messages)
+        return LLMResponse(content="ok", finish_reason="stop", usage=self.usages.pop(0), model="test")
+
+
+class TestUsage:
+    """Test usage conversion and aggregation."""
+
+    def test_usage_with_cached_tokens(self):
+        """Test that cached prompt tokens are read from the prompt token details."""
+        usage = SimpleNamespace(prompt_tokens=1200, completion_tokens=50, total_tokens=1250,
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=1024))
+
+        assert usage_to_dict(usage) == {
+            "prompt_tokens": 1200,
+            "completion_tokens": 50,
+            "total_tokens": 1250,
+            "cached_tokens": 1024
+        }
+
+    def test_usage_without_details(self):
+        """Test providers that do not report cached tokens."""
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        assert usage_to_dict(usage)["cached_tokens"] == 0
+
+        usage.prompt_tokens_details = SimpleNamespace(cached_tokens=None)
+        assert usage_to_dict(usage)["cached_tokens"] == 0
+
+    def test_service_totals(self):
+        """Test that the LLM service accumulates usage and the cache ratio."""
+        client = UsageReportingClient([
+            {"prompt_tokens": 1000, "completion_tokens": 10, "total_tokens": 1010, "cached_tokens": 0},
+            {"prompt_tokens": 1000, "completion_tokens": 10, "total_tokens": 1010, "cached_tokens": 800},
+        ])
+        service = LLMService(config=create_test_config(), llm_client=client)
+
+        service.generate_response("Hi", [])
+        service.generate_response("Hi again", [])
+
+        stats = service.get_usage_stats()
+        assert stats["requests"] == 2
+        assert stats["prompt_tokens"] == 2000
+        assert stats["cached_tokens"] == 800
+        assert stats["completion_tokens"] == 20
+        assert stats["cached_prompt_ratio"] == pytest.approx(0.4)
+
+    def test_responses_without_usage(self):
+        """Test clients whose responses carry no usage."""
+        service = LLMService(config=create_test_config(), llm_client=create_mock_llm_client())
+
+        service.generate_response("Hello", [])
+
+        assert service.get_usage_stats()["requests"] == 0
+        assert service.get_usage_stats()["cached_prompt_ratio"] == 0.0
+
+    def test_configured_layout(self):
+        """Test that the configured prompt layout is used."""
+        config = create_test_config()
+        config.llm.prompt_layout = PROMPT_LAYOUT_PREFIX_STABLE
+        client = UsageReportingClient([{}])
+        service = LLMService(config=config, llm_client=client)
+
+        service.generate_response("Hi", [{"role": "user", "content": "Earlier"}],
+                                  "Known about the user:\nFact: x\n\nRecent conversation history:\nuser: y\n")
+
+        roles = [message.role for message in client.calls[0]]
+        assert roles == ["system", "system", "user", "system", "user"]
@@ -0,0 +1,95 @@
+"""
+Unit tests for memory database backups.
+"""
+
+import os
+import sqlite3
+import tempfile
+import shutil
+import pytest
+from src.personal_agent.memory.storage import SQLiteMemoryStorage
+from src.personal_agent.memory.backup import MemoryBackupManager
+from src.personal_agent.memory.models import MemoryItem
+
+
+class TestMemoryBackupManager:
+    """Test snapshot, rotation and restore of the memory database."""
+    
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the database and snapshots."""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+    
+    @pytest.fixture
+    def storage(self, temp_dir):
+        """Create a storage with one saved item."""
+        storage = SQLiteMemoryStorage(db_path=os.path.join(temp_dir, "memory.db"))
+        storage.save(MemoryItem(id="item-1", type="knowledge", content={"fact": "original"}))
+        return storage
+    
+    @pytest.fixture
+    def manager(self, storage, temp_dir):
+        """Create a backup manager for the storage."""
+        return MemoryBackupManager(storage.db_path, backup_dir=os.path.join(temp_dir, "backups"),
+                                   max_snapshots=2, pages_per_step=1, step_sleep=0)
+    
+    def test_create_snapshot(self, manager):
+        """Test taking a consistent snapshot of the live database."""
+        path = manager.create_snapshot()
+        
+        assert path is not None
+        assert MemoryBackupManager.verify_snapshot(path)
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT id FROM memory_items").fetchall() == [("item-1",)]
+    
+    def test_snapshot_of_missing_database(self, temp_dir):
+        """Test that a missing database yields no snapshot."""
+        manager = MemoryBackupManager(os.path.join(temp_dir, "missing.db"),
+                                      backup_dir=os.path.join(temp_dir, "backups"))
+        assert manager.create_snapshot() is None
+    
+    def test_rotation_keeps_newest(self, manager):
+        """Test that rotation keeps only the newest snapshots."""
+        paths = [manager.create_snapshot() for _ in range(4)]
+        
+        snapshots = manager.list_snapshots()
+        assert [s["path"] for s in snapshots] == paths[:-3:-1]
+    
+    def test_restore(self, storage, manager):
+        """Test restoring a snapshot into the live database."""
+        snapshot = manager.create_snapshot()
+        storage.delete("item-1")
+        assert storage.retrieve("item-1") is None
+        
+        assert manager.restore(snapshot) is True
+        assert storage.retrieve("item-1").content == {"fact": "original"}
+        assert any(s["path"].endswith("-pre-restore.db") for s in manager.list_snapshots())
+    
+    def test_restore_oldest_snapshot_at_limit(self, storage, manager):
+        """Test that the pre-restore snapshot does not rotate away the snapshot being restored."""
+        oldest = manager.create_snapshot()
+        manager.create_snapshot()
+        storage.delete("item-1")
+        
+        assert manager.restore(oldest) is True
+        assert storage.retrieve("item-1").content == {"fact": "original"}
+        assert os.path.exists(oldest)
+        assert len(manager.list_snapshots()) == 2
+    
+    def test_copy_from_missing_source_fails(self, manager, temp_dir):
+        """Test that copying from a missing database raises instead of copying an empty one."""
+        target = os.path.join(temp_dir, "target.db")
+        with pytest.raises(sqlite3.Error):
+            manager._copy(os.path.join(temp_dir, "missing.db"), target)
+        assert not os.path.exists(os.path.join(temp_dir, "missing.db"))
+    
+    def test_restore_rejects_invalid_snapshot(self, manager, temp_dir):
+        """Test that a corrupt snapshot is not restored."""
+        bogus = os.path.join(temp_dir, "bogus.db")
+        with open(bogus, "w") as f:
+            f.write("not a database")
+        
+        assert manager.restore(bogus) is False
@@ -0,0 +1,174 @@
+"""
+Unit tests for the incremental memory context builder.
+"""
+
+from datetime import datetime, timedelta
+import pytest
+from src.personal_agent.memory import context_builder
+from src.personal_agent.memory.context_builder import MemoryContextBuilder
+from src.personal_agent.memory.models import MemoryItem
+from src.personal_agent.context.processor import ContextProcessor
+
+
+class CountingContextProcessor(ContextProcessor):
+    """Context processor that counts scored items."""
+    
+    def __init__(self):
+        super().__init__()
+        self.scored = 0
+    
+    def score_context_relevance(self, user_input, context_items):
+        self.scored += len(context_items)
+        return super().score_context_relevance(user_input, context_items)
+
+
+def conversation(index):
+    return MemoryItem(
+        id=f"conv-{index}",
+        type="conversation",
+        content={"turns": [
+            {"role": "user", "content": f"Question {index}"},
+            {"role": "assistant", "content": f"Answer {index}"}
+        ]}
+    )
+
+
+def knowledge(index, text, age_days=0):
+    updated_at = datetime.now() - timedelta(days=age_days)
+    return MemoryItem(id=f"know-{index}", type="knowledge", content={"preference": text},
+                      created_at=updated_at, updated_at=updated_at)
+
+
+class TestMemoryContextBuilder:
+    """Test incremental context assembly."""
+    
+    @pytest.fixture
+    def processor(self):
+        """Create a counting context processor."""
+        return CountingContextProcessor()
+    
+    def test_build_formats_sections(self, processor):
+        """Test the assembled context layout."""
+        builder = MemoryContextBuilder(processor)
+        builder.add_conversation(conversation(1))
+        builder.add_conversation(conversation(2))
+        builder.add_knowledge(knowledge(1, "I like coffee"))
+        
+        assert builder.build() == (
+            "Recent conversation history:\n"
+            "user: Question 2\nassistant: Answer 2\n"
+            "user: Question 1\nassistant: Answer 1\n"
+            "\n"
+            "User knowledge:\n"
+            "Preference: I like coffee\n"
+        )
+        assert builder.build().sections == [
+            ("Recent conversation history:",
+             ["user: Question 2", "assistant: Answer 2", "user: Question 1", "assistant: Answer 1"]),
+            ("User knowledge:", ["Preference: I like coffee"])
+        ]
+        assert MemoryContextBuilder(processor).build() == ""
+    
+    def test_relevance_keeps_top_items(self, processor):
+        """Test that scoring keeps the most relevant knowledge."""
+        builder = MemoryContextBuilder(processor, top_knowledge=1)
+        builder.add_knowledge(knowledge(1, "I like coffee"))
+        builder.add_knowledge(knowledge(2, "I like jazz"))
+        
+        context = builder.build("coffee please")
+        assert "Preference: I like coffee" in context
+        assert "jazz" not in context
+    
+    def test_pinned_knowledge_does_not_depend_on_input(self, processor):
+        """Test that the newest knowledge is pinned in creation order and the rest is ranked."""
+        builder = MemoryContextBuilder(processor, top_knowledge=1, pinned_knowledge=2)
+        builder.add_knowledge(knowledge(1, "I like coffee", age_days=3))
+        builder.add_knowledge(knowledge(2, "I like jazz", age_days=2))
+        builder.add_knowledge(knowledge(3, "I like tea", age_days=1))
+        builder.add_knowledge(knowledge(4, "I like hiking"))
+        
+        coffee = dict(builder.build("coffee please").sections)
+        jazz = dict(builder.build("jazz please").sections)
+        
+        pinned = ["Preference: I like tea", "Preference: I like hiking"]
+        assert coffee["Known about the user:"] == jazz["Known about the user:"] == pinned
+        assert coffee["User knowledge:"] == ["Preference: I like coffee"]
+        assert jazz["User knowledge:"] == ["Preference: I like jazz"]
+    
+    def test_only_new_items_are_scored(self, processor):
+        """Test that scores of unchanged items are reused between turns."""
+        builder = MemoryContextBuilder(processor)
+        for index in range(4):
+            builder.add_knowledge(knowledge(index, f"topic {index}"))
+        
+        builder.build("topic")
+        assert processor.scored == 4
+        
+        builder.add_conversation(conversation(1))
+        builder.build("topic")
+        assert processor.scored == 4
+        
+        builder.add_knowledge(knowledge(9, "topic 9"))
+        builder.build("topic")
+        assert processor.scored == 5
+    
+    def test_recency_is_recomputed_when_building(self, processor, monkeypatch):
+        """Test that cached scores rank by the recency at build time, without rescoring."""
+        builder = MemoryContextBuilder(processor, top_knowledge=1)
+        builder.add_knowledge(knowledge(1, "coffee tea jazz", age_days=30))
+        builder.add_knowledge(knowledge(2, "coffee tea"))
+        
+        assert "Preference: coffee tea\n" in builder.build("coffee tea jazz rock")
+        
+        class Later(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.now(tz) + timedelta(days=60)
+        
+        monkeypatch.setattr(context_builder, "datetime", Later)
+        assert "Preference: coffee tea jazz\n" in builder.build("coffee tea jazz rock")
+        assert processor.scored == 2
+    
+    def test_refresh_loads_only_changed_items(self, processor):
+        """Test that a refresh to unchanged versions needs no items and keeps the scores."""
+        builder = MemoryContextBuilder(processor)
+        items = [knowledge(index, f"topic {index}") for index in range(3)]
+        builder.reset([conversation(1)], items)
+        first = builder.build("topic")
+        
+        versions = [(item.id, item.updated_at) for item in items]
+        conversation_versions = [(conversation(1).id, builder._conversations[0][1])]
+        assert builder.stale_ids(conversation_versions, versions) == []
+        
+        new_item = knowledge(9, "topic 9")
+        versions = [(new_item.id, new_item.updated_at)] + versions
+        assert builder.stale_ids(conversation_versions, versions) == ["know-9"]
+        builder.refresh(None, versions, [new_item])
+        
+        context = builder.build("topic")
+        assert context.startswith(first.split("User knowledge:")[0])
+        assert "Preference: topic 9" in context
+        assert processor.scored == 4
+    
+    def test_reset_reuses_unchanged_items(self, processor):
+        """Test that reloading the same items does not rescore them."""
+        builder = MemoryContextBuilder(processor)
+        items = [knowledge(index, f"topic {index}") for index in range(3)]
+        builder.reset([conversation(1)], items)
+        first = builder.build("topic")
+        
+        builder.reset([conversation(1)], items)
+        assert builder.build("topic") == first
+        assert processor.scored == 3
+    
+    def test_limits(self, processor):
+        """Test that conversation and knowledge items are bounded."""
+        builder = MemoryContextBuilder(processor, conversation_limit=2, knowledge_limit=2)
+        for index in range(5):
+            builder.add_conversation(conversation(index))
+            builder.add_knowledge(knowledge(index, f"topic {index}"))
+        
+        assert builder.conversation_count == 2
+        assert builder.knowledge_count == 2
+        assert "Question 4" in builder.build()
+        assert "Question 2" not in builder.build()
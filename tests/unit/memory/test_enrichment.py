@@ -0,0 +1,172 @@
+"""
+Unit tests for background enrichment of memory items.
+"""
+
+import os
+import tempfile
+import shutil
+import threading
+import time
+import asyncio
+import pytest
+from src.personal_agent.memory.enrichment import EnrichmentQueue, get_shared_enrichment_queue
+from src.personal_agent.memory.models import MemoryItem
+from src.personal_agent.memory.storage import SQLiteMemoryStorage
+from src.personal_agent.memory.service import MemoryService
+from tests.fixtures.mock_llm import create_test_config
+
+
+class TestEnrichmentQueue:
+    """Test the bounded enrichment queue."""
+
+    def test_items_are_handled_in_background(self):
+        """Test that submitted items are handled and counted."""
+        handled = []
+        queue = EnrichmentQueue(lambda item: handled.append(item.id))
+
+        items = [MemoryItem() for _ in range(5)]
+        assert all(queue.submit(item) for item in items)
+        assert queue.drain(timeout=5)
+
+        assert handled == [item.id for item in items]
+        stats = queue.get_stats()
+        assert stats["submitted"] == 5
+        assert stats["completed"] == 5
+        assert stats["depth"] == 0
+        assert stats["pending"] == 0
+        queue.shutdown()
+
+    def test_full_queue_rejects(self):
+        """Test backpressure: a full queue rejects so the caller enriches inline."""
+        release = threading.Event()
+        queue = EnrichmentQueue(lambda item: release.wait(5), max_size=1, submit_timeout=0.01)
+
+        assert queue.submit(MemoryItem())
+        # Wait for the worker to pick up the first item, then fill the queue
+        while queue.get_stats()["depth"]:
+            time.sleep(0.001)
+        assert queue.submit(MemoryItem())
+        assert not queue.submit(MemoryItem())
+
+        stats = queue.get_stats()
+        assert stats["rejected"] == 1
+        assert stats["max_depth"] == 1
+        assert stats["pending"] == 2
+
+        release.set()
+        assert queue.shutdown()
+
+    def test_failures_are_counted(self):
+        """Test that a failing handler does not stop the worker."""
+        def handler(item):
+            if item.type == "bad":
+                raise ValueError("boom")
+
+        queue = EnrichmentQueue(handler)
+        queue.submit(MemoryItem(type="bad"))
+        queue.submit(MemoryItem())
+
+        assert queue.drain(timeout=5)
+        stats = queue.get_stats()
+        assert (stats["failed"], stats["completed"]) == (1, 1)
+        queue.shutdown()
+
+    def test_shutdown_drains_pending_items(self):
+        """Test that shutdown enriches pending items and then rejects new ones."""
+        handled = []
+        queue = EnrichmentQueue(handled.append)
+        items = [MemoryItem() for _ in range(20)]
+        for item in items:
+            queue.submit(item)
+
+        assert queue.shutdown(drain=True, timeout=5)
+
+        assert handled == items
+        assert not queue.submit(MemoryItem())
+
+
+class TestSharedEnrichmentQueue:
+    """Test the enrichment queue shared by the memory services of a storage."""
+
+    def test_one_queue_per_storage(self):
+        """Test that a storage's services share a queue, each with its own handler."""
+        storage, other_storage = object(), object()
+        queue = get_shared_enrichment_queue(storage)
+        assert get_shared_enrichment_queue(storage) is queue
+        assert get_shared_enrichment_queue(other_storage) is not queue
+
+        handled = []
+        queue.submit(MemoryItem(type="first"), handler=lambda item: handled.append(("first", item.type)))
+        queue.submit(MemoryItem(type="second"), handler=lambda item: handled.append(("second", item.type)))
+        assert queue.shutdown(drain=True, timeout=5)
+        assert handled == [("first", "first"), ("second", "second")]
+
+        replacement = get_shared_enrichment_queue(storage)
+        assert replacement is not queue
+        assert not replacement.closed
+
+
+class TestServiceEnrichment:
+    """Test background enrichment in the memory service."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for databases."""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+
+    def create_service(self, temp_dir, background=True, embedder=None):
+        """Create a memory service on a temporary database."""
+        config = create_test_config()
+        config.memory.background_enrichment = background
+        storage = SQLiteMemoryStorage(os.path.join(temp_dir, "test_enrichment.db"))
+        return MemoryService(config=config, memory_storage=storage, embedder=embedder)
+
+    def test_turn_saved_raw_then_patched(self, temp_dir):
+        """Test that entities are added to the stored item after the turn."""
+        service = self.create_service(temp_dir, embedder=lambda text: [float(len(text))])
+        assert service.save_conversation_turn("user-1", "Email alice@example.com", "Will do")
+        assert service.drain_enrichment(timeout=5)
+
+        [item] = service.find_memories_by_entity("email", "alice@example.com")
+        assert item.content["turns"][0]["content"] == "Email alice@example.com"
+        stored = service.storage.retrieve(item.id)
+        assert stored.embedding == [float(len("Email alice@example.com\nWill do"))]
+        assert service.get_enrichment_stats()["completed"] == 1
+        assert service.shutdown()
+
+    def test_patch_keeps_content_and_timestamps(self, temp_dir):
+        """Test that enrichment only touches entities, relationships and embedding."""
+        service = self.create_service(temp_dir)
+        service.save_conversation_turn("user-1", "Call Bob at 555-123-4567", "Sure")
+        service.drain_enrichment(timeout=5)
+
+        [item] = service.storage.get_conversation_history(limit=1)
+        before = service.storage.retrieve(item.id)
+        assert service.storage.update_item_enrichment(item.id, [], [])
+        after = service.storage.retrieve(item.id)
+
+        assert (after.content, after.updated_at) == (before.content, before.updated_at)
+        assert after.entities == []
+        assert not service.storage.update_item_enrichment("missing", [], [])
+        service.shutdown()
+
+    def test_async_turn_is_enriched(self, temp_dir):
+        """Test that async saves are enriched in the background too."""
+        service = self.create_service(temp_dir)
+        assert asyncio.run(service.save_conversation_turn_async("user-1", "Visit https://example.com", "OK"))
+        assert service.drain_enrichment(timeout=5)
+
+        assert len(service.find_memories_by_entity("url", "https://example.com")) == 1
+        service.shutdown()
+
+    def test_disabled_extracts_inline(self, temp_dir):
+        """Test that entities are saved with the turn when enrichment is disabled."""
+        service = self.create_service(temp_dir, background=False)
+        service.save_conversation_turn("user-1", "Email alice@example.com", "Will do")
+
+        assert service.enrichment_queue is None
+        assert service.get_enrichment_stats() == {}
+        assert len(service.find_memories_by_entity("email", "alice@example.com")) == 1
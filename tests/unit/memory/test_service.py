@@ -0,0 +1,206 @@
+"""
+Unit tests for the memory service.
+"""
+
+import os
+import tempfile
+import shutil
+import time
+import asyncio
+import pytest
+from src.personal_agent.memory.storage import SQLiteMemoryStorage
+from src.personal_agent.memory.service import MemoryService
+from src.personal_agent.memory.tiered import TieredMemoryService
+from tests.fixtures.mock_llm import create_test_config
+
+
+class SlowKnowledgeStorage(SQLiteMemoryStorage):
+    """SQLite storage whose knowledge search is slow."""
+    
+    def search(self, query, type=None, limit=10):
+        if type == "knowledge":
+            time.sleep(0.5)
+        return super().search(query, type, limit)
+
+
+class SlowSaveStorage(SQLiteMemoryStorage):
+    """SQLite storage whose saves are slow."""
+    
+    def save(self, item):
+        time.sleep(0.3)
+        return super().save(item)
+
+
+class LoadCountingStorage(SQLiteMemoryStorage):
+    """SQLite storage that records the items loaded by ID and counts full reads."""
+    
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.loaded = []
+        self.full_reads = 0
+    
+    def get_items(self, ids):
+        self.loaded.append(sorted(ids))
+        return super().get_items(ids)
+    
+    def get_conversation_history(self, limit=10, user_id=None):
+        self.full_reads += 1
+        return super().get_conversation_history(limit, user_id)
+    
+    def search(self, query, type=None, limit=10, user_id=None):
+        self.full_reads += 1
+        return super().search(query, type, limit, user_id)
+
+
+class TestMemoryContextRefresh:
+    """Test that the sync memory context loads only changed items."""
+    
+    @pytest.fixture
+    def storage(self):
+        """Create a temporary load-counting storage."""
+        temp_dir = tempfile.mkdtemp()
+        yield LoadCountingStorage(os.path.join(temp_dir, "test_service.db"))
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+    
+    def test_only_new_items_are_loaded(self, storage):
+        """Test that each turn loads only the items saved since the previous one."""
+        service = MemoryService(config=create_test_config(), memory_storage=storage)
+        service.remember_preference("user-1", "I like coffee")
+        service.save_conversation_turn("user-1", "Hello", "Hi there")
+        
+        first = service.get_memory_context("user-1", [], "coffee")
+        assert len(storage.loaded) == 1 and len(storage.loaded[0]) == 2
+        
+        assert service.get_memory_context("user-1", [], "coffee") == first
+        assert len(storage.loaded) == 1
+        
+        service.save_conversation_turn("user-1", "How are you?", "Fine")
+        context = service.get_memory_context("user-1", [], "coffee")
+        assert len(storage.loaded) == 2 and len(storage.loaded[1]) == 1
+        assert storage.full_reads == 0
+        
+        base = MemoryService(config=create_test_config(), memory_storage=SQLiteMemoryStorage(storage.db_path))
+        assert context == base.get_memory_context("user-1", [], "coffee")
+        assert "user: How are you?" in context and "Preference: I like coffee" in context
+
+
+class TestMemoryContextAsync:
+    """Test concurrent retrieval of memory context sources."""
+    
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for databases."""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+    
+    def test_matches_sync_context(self, temp_dir):
+        """Test that the async context equals the sync context."""
+        storage = SQLiteMemoryStorage(os.path.join(temp_dir, "test_service.db"))
+        service = MemoryService(config=create_test_config(), memory_storage=storage)
+        service.remember_preference("user-1", "I like coffee")
+        service.save_conversation_turn("user-1", "Hello", "Hi there")
+        
+        context = asyncio.run(service.get_memory_context_async("user-1", [], "coffee"))
+        
+        assert context == service.get_memory_context("user-1", [], "coffee")
+        assert "Preference: I like coffee" in context
+        assert "user: Hello" in context
+    
+    def test_slow_source_degrades_gracefully(self, temp_dir):
+        """Test that a timed-out source is skipped without delaying the turn."""
+        storage = SlowKnowledgeStorage(os.path.join(temp_dir, "test_service.db"))
+        service = MemoryService(config=create_test_config(), memory_storage=storage)
+        service.remember_preference("user-1", "I like coffee")
+        service.save_conversation_turn("user-1", "Hello", "Hi there")
+        
+        async def timed_context():
+            start = time.perf_counter()
+            context = await service.get_memory_context_async("user-1", [], "coffee", timeout=0.1)
+            return context, time.perf_counter() - start
+        
+        context, elapsed = asyncio.run(timed_context())
+        
+        assert "user: Hello" in context
+        assert "coffee" not in context
+        assert elapsed < 0.5
+    
+    def test_tiered_warms_session_asynchronously(self, temp_dir):
+        """Test that the tiered service warms a cold session from concurrent sources."""
+        storage = SQLiteMemoryStorage(os.path.join(temp_dir, "test_service.db"))
+        MemoryService(config=create_test_config(), memory_storage=storage).remember_fact("user-1", "Birthday is in May")
+        
+        service = TieredMemoryService(config=create_test_config(), memory_storage=storage)
+        context = asyncio.run(service.get_memory_context_async("user-1", []))
+        
+        assert "Fact: Birthday is in May" in context
+        assert service.get_hot_tier_stats()["sessions"] == 1
+    
+    def test_save_keeps_event_loop_responsive(self, temp_dir):
+        """Test that other coroutines keep running while a turn is saved."""
+        storage = SlowSaveStorage(os.path.join(temp_dir, "test_service.db"))
+        service = MemoryService(config=create_test_config(), memory_storage=storage)
+        
+        async def save_while_ticking():
+            ticks = 0
+            
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+            
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0)
+            saved = await service.save_conversation_turn_async("user-1", "Hello", "Hi there")
+            task.cancel()
+            return saved, ticks
+        
+        saved, ticks = asyncio.run(save_while_ticking())
+        
+        assert saved
+        assert ticks > 10
+        assert "user: Hello" in service.get_memory_context("user-1", [])
+
+
+class TestConversationTurnEntities:
+    """Test the entities and relationships saved for both sides of a turn."""
+    
+    @pytest.fixture
+    def service(self):
+        """Create a memory service on a temporary database."""
+        temp_dir = tempfile.mkdtemp()
+        storage = SQLiteMemoryStorage(os.path.join(temp_dir, "test_turn_entities.db"))
+        yield MemoryService(config=create_test_config(), memory_storage=storage)
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+    
+    def test_both_sides_of_a_turn_are_indexed(self, service):
+        """Test that the user's and the response's entities do not overwrite each other."""
+        service.save_conversation_turn("user-1", "Alice works at Acme", "Bob lives in Paris")
+        
+        for value in ("Alice", "Acme", "Bob", "Paris"):
+            assert len(service.find_memories_by_entity("person", value)) == 1
+        assert [entity["value"] for entity in service.get_related_entities("person", "Alice")] == ["Acme"]
+        assert service.get_related_entities("person", "Bob") == []
+    
+    def test_graph_over_two_sided_turns(self, service):
+        """Test graph traversal over relationships from both sides of conversation turns."""
+        service.save_conversation_turn("user-1", "Alice works at Acme", "Acme is based in Berlin")
+        service.save_conversation_turn("user-1", "Bob is from Berlin", "Carol works at Initech")
+        storage = service.storage
+        
+        neighbors = storage.get_entity_neighbors("person", "Acme")
+        assert {(n["value"], n["relationship_type"]) for n in neighbors} == {
+            ("Alice", "works at"), ("Berlin", "based in")
+        }
+        assert {n["value"] for n in storage.get_entity_neighbors("person", "Carol")} == {"Initech"}
+        
+        expanded = storage.expand_entity_graph("person", "Alice", max_hops=3)
+        assert [(e["value"], e["depth"]) for e in expanded] == [("Acme", 1), ("Berlin", 2), ("Bob", 3)]
+        
+        path = storage.find_entity_path("person", "Alice", "person", "Bob")
+        assert [e["value"] for e in path] == ["Alice", "Acme", "Berlin", "Bob"]
+        assert storage.find_entity_path("person", "Bob", "person", "Initech") == []
@@ -232,6 +232,23 @@ class TestSQLiteMemoryStorage:
         results = temp_storage.search("")
         assert len(results) == 0
     
+    def test_search_by_user(self, temp_storage):
+        """Test that user-scoped queries find items written before the user_id column existed."""
+        import sqlite3
+        with sqlite3.connect(temp_storage.db_path) as conn:
+            conn.execute("CREATE TABLE memory_items (id TEXT PRIMARY KEY, type TEXT, content TEXT, "
+                         "metadata TEXT, created_at TEXT, updated_at TEXT)")
+            now = datetime.now().isoformat()
+            for index, user_id in enumerate(("user-1", "user-2")):
+                conn.execute("INSERT INTO memory_items VALUES (?, 'conversation', ?, '{}', ?, ?)",
+                             (f"conversation-{index}", f'{{"user_id": "{user_id}", "turns": []}}', now, now))
+                conn.execute("INSERT INTO memory_items VALUES (?, 'knowledge', '{}', ?, ?, ?)",
+                             (f"knowledge-{index}", f'{{"user_id": "{user_id}"}}', now, now))
+        
+        assert [item.id for item in temp_storage.get_conversation_history(user_id="user-2")] == ["conversation-1"]
+        assert [item.id for item in temp_storage.search("", type="knowledge", user_id="user-1")] == ["knowledge-0"]
+        assert len(temp_storage.search("", type="knowledge")) == 2
+    
     def test_storage_with_complex_content(self, temp_storage):
         """Test storage with complex nested content."""
         complex_item = MemoryItem(
@@ -301,4 +318,346 @@ class TestMemoryItemModel:
         assert item.entities[0].id == "test-entity"
         assert item.entities[0].type == "person"
         assert item.entities[0].value == "Test Person"
-        assert item.entities[0].confidence == 0.95
\ No newline at end of file
+        assert item.entities[0].confidence == 0.95
+
+class TestEntityRegistry:
+    """Test the canonical entity registry and mention index."""
+    
+    @pytest.fixture
+    def temp_storage(self):
+        """Create a temporary storage for testing."""
+        temp_dir = tempfile.mkdtemp()
+        db_path = os.path.join(temp_dir, "test_entities.db")
+        storage = SQLiteMemoryStorage(db_path=db_path)
+        
+        yield storage
+        
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+    
+    def _item_mentioning(self, item_id, value):
+        return MemoryItem(
+            id=item_id,
+            type="conversation",
+            content={"message": f"I met {value}"},
+            entities=[Entity(id="entity_1", type="person", value=value, confidence=0.6)]
+        )
+    
+    def test_local_entity_ids_do_not_collide(self, temp_storage):
+        """Test that per-call entity ids from different items are kept apart."""
+        temp_storage.save(self._item_mentioning("item-1", "Alice"))
+        temp_storage.save(self._item_mentioning("item-2", "Bob"))
+        
+        first = temp_storage.retrieve("item-1")
+        second = temp_storage.retrieve("item-2")
+        assert first.entities[0].value == "Alice"
+        assert second.entities[0].value == "Bob"
+    
+    def test_find_memories_by_entity(self, temp_storage):
+        """Test finding every memory that mentions an entity."""
+        temp_storage.save(self._item_mentioning("item-1", "Alice"))
+        temp_storage.save(self._item_mentioning("item-2", "Bob"))
+        temp_storage.save(self._item_mentioning("item-3", "alice "))
+        
+        results = temp_storage.find_memories_by_entity("person", "ALICE")
+        assert {item.id for item in results} == {"item-1", "item-3"}
+        
+        assert temp_storage.find_memories_by_entity("person", "Carol") == []
+    
+    def test_canonical_entity_is_interned(self, temp_storage):
+        """Test that equivalent mentions share one registry entry."""
+        temp_storage.save(self._item_mentioning("item-1", "Alice"))
+        temp_storage.save(self._item_mentioning("item-2", "Alice"))
+        
+        entity = temp_storage.get_canonical_entity("person", "alice")
+        assert entity is not None
+        assert entity["normalized_value"] == "alice"
+        assert entity["mention_count"] == 2
+    
+    def test_delete_removes_mentions(self, temp_storage):
+        """Test that deleting an item drops it from the mention index."""
+        temp_storage.save(self._item_mentioning("item-1", "Alice"))
+        temp_storage.delete("item-1")
+        
+        assert temp_storage.find_memories_by_entity("person", "Alice") == []
+
+
+class TestEntityGraph:
+    """Test knowledge-graph traversal over stored relationships."""
+    
+    @pytest.fixture
+    def graph_storage(self):
+        """Create a storage holding the chain Alice - Acme - Berlin - Bob."""
+        temp_dir = tempfile.mkdtemp()
+        storage = SQLiteMemoryStorage(db_path=os.path.join(temp_dir, "test_graph.db"))
+        
+        chain = [("Alice", "Acme", "works at"), ("Acme", "Berlin", "based in"), ("Berlin", "Bob", "from")]
+        for index, (source, target, keyword) in enumerate(chain):
+            storage.save(MemoryItem(
+                id=f"turn-{index}",
+                type="conversation",
+                content={"message": f"{source} {keyword} {target}"},
+                entities=[
+                    Entity(id="entity_1", type="person", value=source, confidence=0.6),
+                    Entity(id="entity_2", type="person", value=target, confidence=0.6)
+                ],
+                relationships=[
+                    Relationship(source_entity_id="entity_1", target_entity_id="entity_2",
+                                 relationship_type=keyword, confidence=0.7)
+                ]
+            ))
+        
+        yield storage
+        
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+    
+    def test_neighbors(self, graph_storage):
+        """Test direct neighbours across memory items."""
+        neighbors = graph_storage.get_entity_neighbors("person", "acme")
+        assert {(n["value"], n["direction"]) for n in neighbors} == {("Alice", "in"), ("Berlin", "out")}
+        
+        filtered = graph_storage.get_entity_neighbors("person", "Acme", relationship_type="based in")
+        assert [n["value"] for n in filtered] == ["Berlin"]
+    
+    def test_k_hop_expansion(self, graph_storage):
+        """Test bounded k-hop expansion."""
+        one_hop = graph_storage.expand_entity_graph("person", "Alice", max_hops=1)
+        assert [(e["value"], e["depth"]) for e in one_hop] == [("Acme", 1)]
+        
+        three_hops = graph_storage.expand_entity_graph("person", "Alice", max_hops=3)
+        assert [(e["value"], e["depth"]) for e in three_hops] == [("Acme", 1), ("Berlin", 2), ("Bob", 3)]
+    
+    def test_shortest_path(self, graph_storage):
+        """Test shortest path between entities."""
+        path = graph_storage.find_entity_path("person", "Alice", "person", "Bob")
+        assert [e["value"] for e in path] == ["Alice", "Acme", "Berlin", "Bob"]
+        
+        assert graph_storage.find_entity_path("person", "Alice", "person", "Bob", max_hops=2) == []
+    
+    def test_graph_follows_deletes(self, graph_storage):
+        """Test that deleting a memory item removes its edges."""
+        graph_storage.delete("turn-1")
+        
+        assert graph_storage.find_entity_path("person", "Alice", "person", "Bob") == []
+    
+    def test_ambiguous_entity_ids_add_no_edges(self, graph_storage):
+        """Test that relationships between ids shared by different entities are skipped."""
+        graph_storage.save(MemoryItem(
+            id="merged",
+            type="conversation",
+            content={"message": "Carol works at Initech. Dave lives in Rome"},
+            entities=[
+                Entity(id="entity_1", type="person", value="Carol", confidence=0.6),
+                Entity(id="entity_2", type="person", value="Initech", confidence=0.6),
+                Entity(id="entity_1", type="person", value="Dave", confidence=0.6),
+                Entity(id="entity_2", type="person", value="Rome", confidence=0.6)
+            ],
+            relationships=[
+                Relationship(source_entity_id="entity_1", target_entity_id="entity_2",
+                             relationship_type="works at", confidence=0.7)
+            ]
+        ))
+        
+        assert graph_storage.get_entity_neighbors("person", "Dave") == []
+    
+    def test_rebuild_entity_graph(self, graph_storage):
+        """Test rebuilding edges from the relationships table."""
+        assert graph_storage.rebuild_entity_graph() == 3
+        
+        path = graph_storage.find_entity_path("person", "Alice", "person", "Bob")
+        assert len(path) == 4
+
+
+class TestContentDeduplication:
+    """Test content-hash deduplication of knowledge items."""
+    
+    @pytest.fixture
+    def temp_storage(self):
+        """Create a temporary storage for testing."""
+        temp_dir = tempfile.mkdtemp()
+        storage = SQLiteMemoryStorage(db_path=os.path.join(temp_dir, "test_dedup.db"))
+        
+        yield storage
+        
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+    
+    def _preference(self, text, user_id="user-1"):
+        return MemoryItem(
+            type="knowledge",
+            content={"preference": text},
+            metadata={"user_id": user_id, "category": "preference"}
+        )
+    
+    def test_duplicate_save_is_upsert(self, temp_storage):
+        """Test that saving the same knowledge twice keeps one item."""
+        first = self._preference("I like coffee")
+        assert temp_storage.save(first) is True
+        
+        second = self._preference("i like  Coffee ")
+        assert temp_storage.save(second) is True
+        
+        assert second.id == first.id
+        results = temp_storage.search("", type="knowledge")
+        assert len(results) == 1
+        assert results[0].content == {"preference": "i like  Coffee "}
+        assert results[0].updated_at >= first.updated_at
+        assert results[0].created_at == first.created_at
+    
+    def test_concurrent_duplicate_keeps_existing_rows(self, temp_storage, monkeypatch):
+        """Test that losing a race to a duplicate save reuses the stored item without deleting it."""
+        first = self._preference("I like coffee")
+        first.entities = [Entity(id="entity_1", type="food", value="coffee", confidence=0.9)]
+        assert temp_storage.save(first) is True
+        
+        # The pre-insert check misses the stored item, as it would for a concurrent save
+        async_storage = temp_storage.async_storage
+        adopt_duplicate = async_storage._adopt_duplicate
+        calls = []
+        
+        async def racing_adopt(db, item, user_id, content_hash):
+            calls.append(item.id)
+            if len(calls) > 1:
+                await adopt_duplicate(db, item, user_id, content_hash)
+        
+        monkeypatch.setattr(async_storage, "_adopt_duplicate", racing_adopt)
+        second = self._preference("I like coffee")
+        second.entities = [Entity(id="entity_1", type="food", value="coffee", confidence=0.9)]
+        assert temp_storage.save(second) is True
+        
+        assert len(calls) == 2
+        assert second.id == first.id
+        assert len(temp_storage.search("", type="knowledge")) == 1
+        assert [item.id for item in temp_storage.find_memories_by_entity("food", "coffee")] == [first.id]
+    
+    def test_deduplication_is_per_user(self, temp_storage):
+        """Test that identical knowledge of different users is kept apart."""
+        temp_storage.save(self._preference("I like coffee", user_id="user-1"))
+        temp_storage.save(self._preference("I like coffee", user_id="user-2"))
+        
+        assert len(temp_storage.search("", type="knowledge")) == 2
+    
+    def test_other_types_are_not_deduplicated(self, temp_storage):
+        """Test that conversation items are always inserted."""
+        for _ in range(2):
+            temp_storage.save(MemoryItem(type="conversation", content={"turns": []}))
+        
+        assert len(temp_storage.search("", type="conversation")) == 2
+    
+    def test_deduplicate_existing_database(self, temp_storage):
+        """Test the one-off dedup pass over rows written without hashes."""
+        for _ in range(3):
+            temp_storage.save(self._preference("I like tea"))
+        temp_storage.save(self._preference("I like jazz"))
+        
+        # Simulate rows written before content hashing existed
+        import sqlite3
+        with sqlite3.connect(temp_storage.db_path) as conn:
+            rows = conn.execute("SELECT id, type, content, metadata, created_at, updated_at "
+                                "FROM memory_items").fetchall()
+            conn.execute("DELETE FROM memory_items")
+            for index in range(3):
+                for row in rows:
+                    conn.execute("INSERT INTO memory_items (id, type, content, metadata, created_at, "
+                                 "updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                                 (f"{row[0]}-{index}",) + row[1:])
+        
+        assert len(temp_storage.search("", type="knowledge", limit=100)) == 6
+        assert temp_storage.deduplicate_memory_items() == 4
+        assert len(temp_storage.search("", type="knowledge", limit=100)) == 2
+        assert temp_storage.deduplicate_memory_items() == 0
+
+
+class TestFeedbackStats:
+    """Test incrementally maintained feedback aggregates."""
+    
+    @pytest.fixture
+    def temp_storage(self):
+        """Create a temporary storage for testing."""
+        temp_dir = tempfile.mkdtemp()
+        storage = SQLiteMemoryStorage(db_path=os.path.join(temp_dir, "test_feedback.db"))
+        
+        yield storage
+        
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+    
+    def _feedback(self, id, rating, user_id="user-1", timestamp=None):
+        return {
+            'id': id,
+            'conversation_id': None,
+            'user_id': user_id,
+            'rating': rating,
+            'comment': None,
+            'timestamp': timestamp or datetime.now()
+        }
+    
+    def _raw_stats(self, storage, user_id):
+        """Compute stats with a full scan, as get_feedback_stats used to."""
+        import sqlite3
+        with sqlite3.connect(storage.db_path) as conn:
+            total, average, positive, negative = conn.execute(
+                "SELECT COUNT(*), AVG(rating), COUNT(CASE WHEN rating >= 4 THEN 1 END), "
+                "COUNT(CASE WHEN rating <= 2 THEN 1 END) FROM feedback WHERE user_id = ?",
+                (user_id,)
+            ).fetchone()
+        return {
+            'total_feedback': total,
+            'average_rating': round(average or 0, 2),
+            'positive_feedback': positive,
+            'negative_feedback': negative
+        }
+    
+    def test_stats_match_full_scan(self, temp_storage):
+        """Test that aggregates match the stats computed from raw feedback."""
+        for index, rating in enumerate([5, 4, 3, 1, 2]):
+            assert temp_storage.save_feedback(self._feedback(f"fb-{index}", rating)) is True
+        temp_storage.save_feedback(self._feedback("fb-other", 1, user_id="user-2"))
+        
+        stats = temp_storage.get_feedback_stats("user-1")
+        assert stats == self._raw_stats(temp_storage, "user-1")
+        assert stats == {
+            'total_feedback': 5,
+            'average_rating': 3.0,
+            'positive_feedback': 2,
+            'negative_feedback': 2
+        }
+        assert temp_storage.get_feedback_stats()['total_feedback'] == 6
+    
+    def test_replacing_feedback_updates_stats(self, temp_storage):
+        """Test that re-saving feedback replaces its contribution."""
+        temp_storage.save_feedback(self._feedback("fb-1", 1))
+        temp_storage.save_feedback(self._feedback("fb-1", 5))
+        
+        stats = temp_storage.get_feedback_stats("user-1")
+        assert stats['total_feedback'] == 1
+        assert stats['average_rating'] == 5.0
+        assert stats['negative_feedback'] == 0
+        assert stats == self._raw_stats(temp_storage, "user-1")
+    
+    def test_rolling_window(self, temp_storage):
+        """Test that windowed stats only count recent feedback."""
+        from datetime import timedelta
+        temp_storage.save_feedback(self._feedback("fb-old", 1, timestamp=datetime.now() - timedelta(days=40)))
+        temp_storage.save_feedback(self._feedback("fb-new", 5))
+        
+        assert temp_storage.get_feedback_stats("user-1")['total_feedback'] == 2
+        recent = temp_storage.get_feedback_stats("user-1", window_days=7)
+        assert recent['total_feedback'] == 1
+        assert recent['average_rating'] == 5.0
+    
+    def test_rebuild_from_raw_feedback(self, temp_storage):
+        """Test that aggregates can be recomputed from the raw feedback."""
+        for index, rating in enumerate([4, 2, 5]):
+            temp_storage.save_feedback(self._feedback(f"fb-{index}", rating))
+        
+        import sqlite3
+        with sqlite3.connect(temp_storage.db_path) as conn:
+            conn.execute("DELETE FROM feedback_stats")
+            conn.execute("DELETE FROM feedback_daily_stats")
+        assert temp_storage.get_feedback_stats("user-1")['total_feedback'] == 0
+        
+        assert temp_storage.rebuild_feedback_stats() is True
+        assert temp_storage.get_feedback_stats("user-1") == self._raw_stats(temp_storage, "user-1")
+        assert temp_storage.get_feedback_stats("user-1", window_days=1)['total_feedback'] == 3
@@ -0,0 +1,198 @@
+"""
+Unit tests for the tiered memory service.
+"""
+
+import os
+import tempfile
+import shutil
+import asyncio
+import threading
+from datetime import datetime, timedelta
+import pytest
+from src.personal_agent.memory.storage import SQLiteMemoryStorage
+from src.personal_agent.memory.service import MemoryService
+from src.personal_agent.memory.tiered import TieredMemoryService, summarize_turns
+from src.personal_agent.memory.models import MemoryItem
+from tests.fixtures.mock_llm import create_test_config
+
+
+class CountingStorage(SQLiteMemoryStorage):
+    """SQLite storage that counts read queries."""
+    
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.reads = 0
+    
+    def get_conversation_history(self, limit: int = 10, user_id=None):
+        self.reads += 1
+        return super().get_conversation_history(limit, user_id)
+    
+    def search(self, query, type=None, limit=10, user_id=None):
+        self.reads += 1
+        return super().search(query, type, limit, user_id)
+
+
+class TestTieredMemoryService:
+    """Test hot-tier reads and cold-tier summarization."""
+    
+    @pytest.fixture
+    def storage(self):
+        """Create a temporary counting storage."""
+        temp_dir = tempfile.mkdtemp()
+        storage = CountingStorage(os.path.join(temp_dir, "test_tiered.db"))
+        yield storage
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+    
+    @pytest.fixture
+    def service(self, storage):
+        """Create a tiered memory service over the storage."""
+        return TieredMemoryService(config=create_test_config(), memory_storage=storage)
+    
+    def test_active_session_reads_do_not_touch_disk(self, service, storage):
+        """Test that only the first read of a session queries storage."""
+        service.save_conversation_turn("user-1", "Hello", "Hi there")
+        reads_after_warmup = storage.reads
+        
+        service.remember_preference("user-1", "I like coffee")
+        service.save_conversation_turn("user-1", "How are you?", "Fine")
+        context = service.get_memory_context("user-1", [], "coffee")
+        
+        assert storage.reads == reads_after_warmup
+        assert "user: How are you?" in context
+        assert "Preference: I like coffee" in context
+    
+    def test_context_matches_base_service(self, service, storage):
+        """Test that the hot tier produces the same context as a cold read."""
+        service.remember_fact("user-1", "Birthday is in May")
+        for index in range(7):
+            service.save_conversation_turn("user-1", f"Question {index}", f"Answer {index}")
+        
+        base = MemoryService(config=create_test_config(), memory_storage=storage)
+        assert service.get_memory_context("user-1", [], "") == base.get_memory_context("user-1", [], "")
+    
+    def test_warm_up_is_scoped_to_user(self, service, storage):
+        """Test that a session is warmed with its own user's memory only."""
+        service.save_conversation_turn("user-1", "My question", "My answer")
+        service.remember_preference("user-1", "I like coffee")
+        service.save_conversation_turn("user-2", "Other question", "Other answer")
+        service.remember_preference("user-2", "I like tea")
+        
+        # Fresh services have no hot tiers, so they warm the session from storage
+        cold = TieredMemoryService(config=create_test_config(), memory_storage=storage)
+        sync_context = cold.get_memory_context("user-1", [], "")
+        cold = TieredMemoryService(config=create_test_config(), memory_storage=storage)
+        async_context = asyncio.run(cold.get_memory_context_async("user-1", [], ""))
+        
+        for context in (sync_context, async_context):
+            assert "user: My question" in context
+            assert "Preference: I like coffee" in context
+            assert "Other question" not in context
+            assert "I like tea" not in context
+    
+    def test_shutdown_stops_background_summarization(self, service):
+        """Test that shutting the service down stops the summarization thread."""
+        service.start_background_summarization(interval=3600)
+        assert service.conversation_summarizer.is_running()
+        
+        assert service.shutdown() is True
+        assert not service.conversation_summarizer.is_running()
+    
+    def test_services_share_one_summarizer(self, service, storage):
+        """Test that services of one storage run a single summarization thread until all stop."""
+        other = TieredMemoryService(config=create_test_config(), memory_storage=storage)
+        assert other.conversation_summarizer is service.conversation_summarizer
+        
+        service.start_background_summarization(interval=3600)
+        other.start_background_summarization(interval=3600)
+        other.start_background_summarization(interval=3600)
+        assert [t.name for t in threading.enumerate()].count("memory_summarizer") == 1
+        
+        service.stop_background_summarization()
+        assert other.conversation_summarizer.is_running()
+        other.stop_background_summarization()
+        assert not other.conversation_summarizer.is_running()
+    
+    def test_hot_tier_is_bounded(self, storage):
+        """Test that sessions and items are bounded."""
+        service = TieredMemoryService(config=create_test_config(), memory_storage=storage,
+                                      hot_conversation_limit=2, max_hot_sessions=2)
+        for user in ("a", "b", "c"):
+            for index in range(3):
+                service.save_conversation_turn(user, f"q{index}", f"a{index}")
+        
+        stats = service.get_hot_tier_stats()
+        assert stats["sessions"] == 2
+        assert stats["conversation_items"] == 4
+    
+    def test_summarize_aged_conversations(self, service, storage):
+        """Test rolling aged conversations into one summary item per user."""
+        old = datetime.now() - timedelta(days=2)
+        for index in range(3):
+            storage.save(MemoryItem(
+                type="conversation",
+                content={"user_id": "user-1", "turns": [
+                    {"role": "user", "content": f"old question {index}"},
+                    {"role": "assistant", "content": f"old answer {index}"}
+                ]},
+                created_at=old,
+                updated_at=old
+            ))
+        service.save_conversation_turn("user-1", "fresh", "reply")
+        
+        assert service.summarize_aged_conversations() == 3
+        
+        summaries = storage.search("", type="summary")
+        assert len(summaries) == 1
+        assert summaries[0].content["turn_count"] == 6
+        assert "user: old question 0" in summaries[0].content["summary"]
+        assert len(storage.search("", type="conversation")) == 1
+    
+    def test_overlapping_roll_ups_save_one_summary(self, service, storage):
+        """Test that a roll-up of items another run already replaced saves nothing."""
+        old = datetime.now() - timedelta(days=2)
+        storage.save(MemoryItem(
+            type="conversation",
+            content={"user_id": "user-1", "turns": [{"role": "user", "content": "old question"}]},
+            created_at=old,
+            updated_at=old
+        ))
+        aged = storage.get_items_updated_before("conversation", datetime.now())
+        storage.get_items_updated_before = lambda *args, **kwargs: aged
+        
+        assert service.summarize_aged_conversations() == 1
+        assert service.summarize_aged_conversations() == 0
+        assert len(storage.search("", type="summary")) == 1
+    
+    def test_summaries_are_read_back(self, service, storage):
+        """Test that rolled-up conversations reach the memory context and the history."""
+        old = datetime.now() - timedelta(days=2)
+        storage.save(MemoryItem(
+            type="conversation",
+            content={"user_id": "user-1", "turns": [
+                {"role": "user", "content": "Where did I park?"},
+                {"role": "assistant", "content": "Level 3"}
+            ]},
+            created_at=old,
+            updated_at=old
+        ))
+        assert service.summarize_aged_conversations() == 1
+        
+        sync_context = service.get_memory_context("user-1", [], "")
+        cold = TieredMemoryService(config=create_test_config(), memory_storage=storage)
+        async_context = asyncio.run(cold.get_memory_context_async("user-1", [], ""))
+        other_user = service.get_memory_context("user-2", [], "")
+        
+        for context in (sync_context, async_context):
+            assert "Earlier conversation summaries:" in context
+            assert "user: Where did I park? | assistant: Level 3" in context
+        assert "Where did I park?" not in other_user
+        
+        history = service.get_recent_conversation_history()
+        assert [item.type for item in history] == ["summary"]
+        assert asyncio.run(service.get_recent_conversation_history_async()) == history
+    
+    def test_summarize_turns_is_bounded(self):
+        """Test that summaries respect the length limit."""
+        turns = [{"role": "user", "content": "x" * 500} for _ in range(10)]
+        assert len(summarize_turns(turns, max_length=300)) <= 300
@@ -0,0 +1,77 @@
+"""
+Unit tests for lazy imports and deferred agent components.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import shutil
+import pytest
+from src.personal_agent.utils.lazy_import import lazy_import, module_available
+from src.personal_agent.core.agent import Agent
+from src.personal_agent.memory.storage import SQLiteMemoryStorage
+from tests.fixtures.mock_llm import create_mock_llm_client, create_test_config
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+
+class TestLazyImport:
+    """Test modules imported on first use."""
+
+    def test_module_is_imported_on_first_use(self):
+        """Test that a lazy module is imported by the first attribute access."""
+        sys.modules.pop("this", None)
+        module = lazy_import("this")
+        assert "this" not in sys.modules
+        assert module.s
+        assert "this" in sys.modules
+
+    def test_missing_module(self):
+        """Test that a missing module is reported without importing it and fails on use."""
+        assert module_available("json")
+        assert not module_available("no_such_module_here")
+        with pytest.raises(ImportError):
+            lazy_import("no_such_module_here").anything
+
+    def test_agent_creation_defers_slow_imports(self):
+        """Test that importing the agent and creating one imports no deferred module."""
+        code = (
+            "import sys\n"
+            "from src.personal_agent.core.agent import Agent\n"
+            "Agent(user_id='cold_start_user')\n"
+            "print('loaded:' + ','.join(name for name in ('openai', 'bleach', 'yaml', 'aiosqlite') if name in sys.modules))\n"
+        )
+        temp_dir = tempfile.mkdtemp()
+        try:
+            env = dict(os.environ, PYTHONPATH=REPO_ROOT, PA_LLM__API_KEY="test-key",
+                       PA_MEMORY__DATABASE_PATH=os.path.join(temp_dir, "test_cold_start.db"))
+            result = subprocess.run([sys.executable, "-c", code], cwd=temp_dir, env=env,
+                                    capture_output=True, text=True, check=True)
+        finally:
+            shutil.rmtree(temp_dir)
+
+        assert result.stdout.strip().splitlines()[-1] == "loaded:"
+
+
+class TestDeferredAgentComponents:
+    """Test that agents build their engines on first use."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for the database."""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+
+    def test_engines_are_created_on_first_use(self, temp_dir):
+        """Test that the planning and reasoning engines are created once, when first used."""
+        storage = SQLiteMemoryStorage(db_path=os.path.join(temp_dir, "test_deferred.db"))
+        agent = Agent(user_id="alice", config=create_test_config(), memory_storage=storage,
+                      llm_client=create_mock_llm_client())
+
+        assert "planning_engine" not in vars(agent)
+        assert "reasoning_engine" not in vars(agent)
+        assert agent.planning_engine is agent.planning_engine
+        assert agent.reasoning_engine.llm_client is agent.llm_service.client
@@ -0,0 +1,56 @@
+"""
+Unit tests for parallel batch processing.
+"""
+
+import pytest
+from src.personal_agent.utils.parallel import process_map, effective_workers, default_chunksize
+
+
+def square(value):
+    """Module-level function so it can be sent to worker processes."""
+    return value * value
+
+
+_offset = 0
+
+
+def set_offset(offset):
+    """Worker initializer."""
+    global _offset
+    _offset = offset
+
+
+def add_offset(value):
+    """Add the offset set by the worker initializer."""
+    return value + _offset
+
+
+class TestParallel:
+    """Test process pool mapping."""
+
+    def test_effective_workers(self):
+        """Test that workers are capped by the batch size."""
+        assert effective_workers(10, 4) == 4
+        assert effective_workers(2, 4) == 2
+        assert effective_workers(0, 4) == 1
+        assert effective_workers(10, 0) == 1
+        assert effective_workers(1) == 1
+
+    def test_default_chunksize(self):
+        """Test that each worker gets a few chunks."""
+        assert default_chunksize(1000, 2) == 125
+        assert default_chunksize(3, 2) == 1
+
+    def test_results_in_order(self):
+        """Test that results come back in item order across chunks."""
+        items = list(range(50))
+
+        assert process_map(square, items, workers=2, chunksize=7) == [i * i for i in items]
+
+    def test_initializer(self):
+        """Test that the initializer sets up each worker."""
+        assert process_map(add_offset, [1, 2, 3], workers=2, initializer=set_offset, initargs=(10,)) == [11, 12, 13]
+
+    def test_empty_batch(self):
+        """Test that an empty batch starts no pool."""
+        assert process_map(square, [], workers=2) == []
@@ -0,0 +1,97 @@
+"""
+Unit tests for the shared resource registry.
+"""
+
+import os
+import tempfile
+import shutil
+import threading
+import pytest
+from src.personal_agent.utils.resources import ResourceRegistry, config_key
+from src.personal_agent.config.settings import LLMConfig
+from src.personal_agent.core.agent import Agent
+from src.personal_agent.memory.storage import SQLiteMemoryStorage
+from tests.fixtures.mock_llm import create_mock_llm_client, create_test_config
+
+
+class TestResourceRegistry:
+    """Test creation and reuse of shared resources."""
+
+    def test_resources_are_created_once(self):
+        """Test that a kind and key always give the same resource."""
+        registry = ResourceRegistry()
+        first = registry.get("thing", "a", object)
+        assert registry.get("thing", "a", object) is first
+        assert registry.get("thing", "b", object) is not first
+        assert registry.get("other", "a", object) is not first
+
+        stats = registry.get_stats()
+        assert (stats["created"], stats["reused"], stats["thing"], stats["other"]) == (3, 1, 2, 1)
+
+    def test_failed_factory_registers_nothing(self):
+        """Test that a resource whose creation fails is retried on the next get."""
+        registry = ResourceRegistry()
+
+        def fail():
+            raise ValueError("no API key")
+
+        with pytest.raises(ValueError):
+            registry.get("client", None, fail)
+        assert registry.get("client", None, lambda: "client") == "client"
+
+    def test_concurrent_first_use(self):
+        """Test that threads racing on first use share one resource."""
+        registry = ResourceRegistry()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("pool", None, object)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(result) for result in results}) == 1
+
+    def test_remove_and_clear(self):
+        """Test that dropped resources are recreated."""
+        registry = ResourceRegistry()
+        first = registry.get("thing", None, object)
+        assert registry.remove("thing", None)
+        assert not registry.remove("thing", None)
+        second = registry.get("thing", None, object)
+        assert second is not first
+
+        registry.clear()
+        assert registry.get("thing", None, object) is not second
+
+    def test_config_key(self):
+        """Test that equal configurations give equal keys."""
+        assert config_key(LLMConfig(model="a")) == config_key(LLMConfig(model="a"))
+        assert config_key(LLMConfig(model="a")) != config_key(LLMConfig(model="b"))
+
+
+class TestSharedAgentResources:
+    """Test that agents share their stateless components."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for databases."""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+
+    def test_agents_share_analyzers_and_client(self, temp_dir):
+        """Test that two agents share analyzers but keep their own conversations."""
+        config = create_test_config()
+        storage = SQLiteMemoryStorage(db_path=os.path.join(temp_dir, "test_resources.db"))
+        llm_client = create_mock_llm_client()
+        first = Agent(user_id="alice", config=config, memory_storage=storage, llm_client=llm_client)
+        second = Agent(user_id="bob", config=config, memory_storage=storage, llm_client=llm_client)
+
+        assert first.context_processor is second.context_processor
+        assert first.llm_service.context_processor is first.context_processor
+        assert first.decision_tree_manager is second.decision_tree_manager
+        assert first.request_classifier is second.request_classifier
+        assert first.reasoning_engine.llm_client is first.llm_service.client
+        assert first.conversation_manager is not second.conversation_manager